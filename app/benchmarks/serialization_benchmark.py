@@ -0,0 +1,104 @@
+"""JSONシリアライズ方式のベンチマーク
+
+従来の model_dump() → json.dump(indent=2) と、serializationモジュールの
+高速パス（pydantic_core.to_json でバイト列を直接書き込み）を比較します。
+両方式ともatomic_writeで書き込むため、一時ファイル・fsync・renameの
+I/Oは同一で、差はシリアライズの方式のみです。
+
+実行方法:
+    uv run python -m benchmarks.serialization_benchmark --records 100000
+"""
+
+import argparse
+import json
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+from movie_metadata.atomic_io import atomic_write
+from movie_metadata.models import MovieMetadata
+from movie_metadata.serialization import write_json
+
+
+def build_records(count: int) -> list[MovieMetadata]:
+    """ベンチマーク用のメタデータを生成する"""
+    return [
+        MovieMetadata(
+            title=f"映画タイトル {i}",
+            japanese_titles=[f"邦題 {i}", f"別題 {i}"],
+            original_work="同名の小説",
+            original_authors=["原作者A", "原作者B"],
+            release_date="2024-01-01",
+            country="日本",
+            distributor="配給会社",
+            production_companies=["制作会社A", "制作会社B"],
+            box_office="10億円",
+            cast=[f"俳優{j}" for j in range(10)],
+            screenwriters=["脚本家"],
+            music=["作曲家"],
+            voice_actors=[f"声優{j}" for j in range(5)],
+        )
+        for i in range(count)
+    ]
+
+
+def legacy_write(records: list[MovieMetadata], path: Path) -> None:
+    """従来方式: 辞書に変換してからjson.dumpで書き込む"""
+    with atomic_write(path) as f:
+        json.dump(
+            [record.model_dump() for record in records],
+            f,
+            ensure_ascii=False,
+            indent=2,
+        )
+
+
+def fast_write(records: list[MovieMetadata], path: Path) -> None:
+    """高速方式: モデルから直接JSONバイト列を書き込む"""
+    write_json(path, records)
+
+
+def measure(
+    label: str,
+    writer: Callable[[list[MovieMetadata], Path], None],
+    records: list[MovieMetadata],
+    path: Path,
+) -> float:
+    """書き込み時間とピークメモリを計測して表示する
+
+    tracemallocは処理を大きく遅くするため、時間とメモリは別々に計測します。
+    """
+    start = time.perf_counter()
+    writer(records, path)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    writer(records, path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    size_mb = path.stat().st_size / 1024 / 1024
+    print(
+        f"{label}: {elapsed:.2f}秒, ピークメモリ {peak / 1024 / 1024:.1f}MB, "
+        f"ファイルサイズ {size_mb:.1f}MB"
+    )
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="JSONシリアライズのベンチマーク")
+    parser.add_argument("--records", type=int, default=100_000, help="レコード数")
+    args = parser.parse_args()
+
+    records = build_records(args.records)
+    print(f"レコード数: {len(records)}")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        legacy = measure("従来方式", legacy_write, records, Path(temp_dir) / "a.json")
+        fast = measure("高速方式", fast_write, records, Path(temp_dir) / "b.json")
+    print(f"速度向上: {legacy / fast:.1f}倍")
+
+
+if __name__ == "__main__":
+    main()
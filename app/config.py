@@ -5,6 +5,7 @@
 
 import os
 from pathlib import Path
+from typing import Literal
 
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -45,6 +46,48 @@ class AppConfig(BaseSettings):
     csv_filename: str | None = Field(default=None, validation_alias="CSV_FILENAME")
     csv_path: Path = Field(default=Path("data/movies_test3.csv"))
     output_dir: Path = Field(default=Path("data/output"))
+    evaluation_cache_path: Path | None = Field(
+        default=Path("data/cache/evaluation_cache.jsonl"),
+        validation_alias="EVALUATION_CACHE_PATH",
+    )
+    cost_history_path: Path | None = Field(
+        default=None, validation_alias="COST_HISTORY_PATH"
+    )
+    refine_workers: int = Field(default=1, ge=1, validation_alias="REFINE_WORKERS")
+    watch_state_path: Path = Field(
+        default=Path("data/cache/watch_state.json"),
+        validation_alias="WATCH_STATE_PATH",
+    )
+    watch_poll_interval: float = Field(
+        default=1.0, gt=0.0, validation_alias="WATCH_POLL_INTERVAL"
+    )
+    metadata_store_path: Path | None = Field(
+        default=None,
+        validation_alias="METADATA_STORE_PATH",
+    )
+    metadata_ttl_days: float | None = Field(
+        default=None, validation_alias="METADATA_TTL_DAYS"
+    )
+    metadata_field_ttl_days: dict[str, float] = Field(
+        default_factory=dict, validation_alias="METADATA_FIELD_TTL_DAYS"
+    )
+    input_dedup: bool = Field(default=False, validation_alias="INPUT_DEDUP")
+    input_parse_workers: int = Field(
+        default=1, ge=1, validation_alias="INPUT_PARSE_WORKERS"
+    )
+    compact_history: bool = Field(default=False, validation_alias="COMPACT_HISTORY")
+    metadata_blob_dir: Path | None = Field(
+        default=None, validation_alias="METADATA_BLOB_DIR"
+    )
+    metadata_blob_gc: bool = Field(default=False, validation_alias="METADATA_BLOB_GC")
+    parquet_export: bool = Field(default=False, validation_alias="PARQUET_EXPORT")
+    output_index: bool = Field(default=False, validation_alias="OUTPUT_INDEX")
+    output_compression: Literal["gzip", "zstd"] | None = Field(
+        default=None, validation_alias="OUTPUT_COMPRESSION"
+    )
+    output_compression_level: int | None = Field(
+        default=None, validation_alias="OUTPUT_COMPRESSION_LEVEL"
+    )
     model_name: str = Field(default="gemini-3-flash-preview")
     rate_limit_sleep: float = Field(default=1.0)
     log_level: str = Field(default="INFO")
@@ -0,0 +1,42 @@
+"""LLM as a Judge用のGenAIクライアント管理
+
+評価関数はclientを受け取り、渡されたクライアントを再利用します。
+多数の回答を評価する場合は1つのクライアントを共有することで、
+クライアントの初期化コストを省き、コネクションを再利用できます。
+"""
+
+from collections.abc import Iterator
+from contextlib import closing, contextmanager
+
+from google import genai
+
+
+@contextmanager
+def judge_client(
+    api_key: str, client: genai.Client | None = None
+) -> Iterator[genai.Client]:
+    """
+    評価に使用するクライアントを取得
+
+    clientが渡された場合はそのまま使用し、閉じません(呼び出し元が管理)。
+    渡されない場合はクライアントを生成し、終了時に閉じます。
+
+    Args:
+        api_key: Google GenAI APIキー(clientが渡された場合は使用しない)
+        client: 共有するクライアント
+
+    Yields:
+        genai.Client: 評価に使用するクライアント
+
+    Examples:
+        with closing(genai.Client(api_key=api_key)) as client:
+            for answer in answers:
+                assess_answer(question, answer.text, answer.answer_id,
+                              api_key, client=client)
+    """
+    if client is not None:
+        yield client
+        return
+
+    with closing(genai.Client(api_key=api_key)) as owned_client:
+        yield owned_client
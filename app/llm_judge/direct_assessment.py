@@ -3,6 +3,7 @@
 from google import genai
 from google.genai import types
 
+from llm_judge.client import judge_client
 from llm_judge.models import DirectAssessmentOutput, DirectAssessmentResult
 from llm_judge.prompts import build_direct_assessment_prompt
 
@@ -13,6 +14,7 @@ def assess_answer(
     answer_id: str,
     api_key: str,
     model: str = "gemini-2.0-flash",
+    client: genai.Client | None = None,
 ) -> DirectAssessmentResult:
     """
     Direct Assessment: 単一回答を複数観点で評価
@@ -23,6 +25,7 @@ def assess_answer(
         answer_id: 回答ID
         api_key: Google GenAI APIキー
         model: 使用するモデル名
+        client: 共有するクライアント(Noneの場合は呼び出しごとに生成して閉じる)
 
     Returns:
         DirectAssessmentResult: 評価結果
@@ -30,21 +33,20 @@ def assess_answer(
     Raises:
         Exception: API呼び出しまたはパースに失敗した場合
     """
-    client = genai.Client(api_key=api_key)
-
     # プロンプト構築
     prompt = build_direct_assessment_prompt(question=question, answer=answer)
 
     try:
         # API呼び出し
-        response = client.models.generate_content(
-            model=model,
-            contents=prompt,
-            config=types.GenerateContentConfig(
-                response_mime_type="application/json",
-                response_schema=DirectAssessmentOutput,
-            ),
-        )
+        with judge_client(api_key, client) as genai_client:
+            response = genai_client.models.generate_content(
+                model=model,
+                contents=prompt,
+                config=types.GenerateContentConfig(
+                    response_mime_type="application/json",
+                    response_schema=DirectAssessmentOutput,
+                ),
+            )
 
         # Pydanticモデルでパース
         if response.text is None:
@@ -1,8 +1,12 @@
 """Pairwise Comparison: 2つの回答を比較評価"""
 
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
 from google import genai
 from google.genai import types
 
+from llm_judge.client import judge_client
 from llm_judge.models import (
     PairwiseAggregatedResult,
     PairwiseComparisonResult,
@@ -17,6 +21,7 @@ def _compare_single(
     answer_b: str,
     api_key: str,
     model: str = "gemini-2.0-flash",
+    client: genai.Client | None = None,
 ) -> PairwiseComparisonResult:
     """
     1回のPairwise Comparison評価
@@ -27,12 +32,11 @@ def _compare_single(
         answer_b: 回答B
         api_key: Google GenAI APIキー
         model: 使用するモデル名
+        client: 共有するクライアント(Noneの場合は呼び出しごとに生成して閉じる)
 
     Returns:
         PairwiseComparisonResult: 比較結果
     """
-    client = genai.Client(api_key=api_key)
-
     # プロンプト構築
     prompt = build_pairwise_comparison_prompt(
         question=question, answer_a=answer_a, answer_b=answer_b
@@ -40,14 +44,15 @@ def _compare_single(
 
     try:
         # API呼び出し
-        response = client.models.generate_content(
-            model=model,
-            contents=prompt,
-            config=types.GenerateContentConfig(
-                response_mime_type="application/json",
-                response_schema=PairwiseOutput,
-            ),
-        )
+        with judge_client(api_key, client) as genai_client:
+            response = genai_client.models.generate_content(
+                model=model,
+                contents=prompt,
+                config=types.GenerateContentConfig(
+                    response_mime_type="application/json",
+                    response_schema=PairwiseOutput,
+                ),
+            )
 
         # Pydanticモデルでパース
         if response.text is None:
@@ -74,6 +79,7 @@ def compare_pair(
     answer_b: str,
     api_key: str,
     model: str = "gemini-2.0-flash",
+    client: genai.Client | None = None,
 ) -> PairwiseComparisonResult:
     """
     2つの回答を比較評価(単純版、Position bias対策なし)
@@ -84,6 +90,7 @@ def compare_pair(
         answer_b: 回答B
         api_key: Google GenAI APIキー
         model: 使用するモデル名
+        client: 共有するクライアント(Noneの場合は呼び出しごとに生成して閉じる)
 
     Returns:
         PairwiseComparisonResult: 比較結果
@@ -94,6 +101,7 @@ def compare_pair(
         answer_b=answer_b,
         api_key=api_key,
         model=model,
+        client=client,
     )
 
 
@@ -103,37 +111,61 @@ def compare_with_position_bias_check(
     answer_b: str,
     api_key: str,
     model: str = "gemini-2.0-flash",
+    client: genai.Client | None = None,
+    concurrent: bool = True,
 ) -> PairwiseAggregatedResult:
     """
     Position bias対策: A-B と B-A の両方向で評価
 
+    2つの評価は互いに独立しているため、既定では同時に実行し、
+    待ち時間を1回分の評価とほぼ同じにします。
+
     Args:
         question: 質問文
         answer_a: 回答A
         answer_b: 回答B
         api_key: Google GenAI APIキー
         model: 使用するモデル名
+        client: 共有するクライアント(Noneの場合は呼び出しごとに生成して閉じる)
+        concurrent: Trueの場合は両方向の評価をスレッドで同時に実行する
 
     Returns:
         PairwiseAggregatedResult: 集約結果(両方向の比較 + 一貫性チェック)
     """
-    print("  [1/2] A vs B を評価中...")
-    comparison_ab = _compare_single(
-        question=question,
-        answer_a=answer_a,
-        answer_b=answer_b,
-        api_key=api_key,
-        model=model,
-    )
+    # 両方向の評価で同じクライアントを使用する
+    with judge_client(api_key, client) as genai_client:
+        compare_ab = partial(
+            _compare_single,
+            question=question,
+            answer_a=answer_a,
+            answer_b=answer_b,
+            api_key=api_key,
+            model=model,
+            client=genai_client,
+        )
+        compare_ba = partial(
+            _compare_single,
+            question=question,
+            answer_a=answer_b,  # 順序を入れ替え
+            answer_b=answer_a,
+            api_key=api_key,
+            model=model,
+            client=genai_client,
+        )
 
-    print("  [2/2] B vs A を評価中(Position bias対策)...")
-    comparison_ba = _compare_single(
-        question=question,
-        answer_a=answer_b,  # 順序を入れ替え
-        answer_b=answer_a,
-        api_key=api_key,
-        model=model,
-    )
+        if concurrent:
+            print("  A vs B と B vs A を同時に評価中(Position bias対策)...")
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                future_ab = executor.submit(compare_ab)
+                future_ba = executor.submit(compare_ba)
+                comparison_ab = future_ab.result()
+                comparison_ba = future_ba.result()
+        else:
+            print("  [1/2] A vs B を評価中...")
+            comparison_ab = compare_ab()
+
+            print("  [2/2] B vs A を評価中(Position bias対策)...")
+            comparison_ba = compare_ba()
 
     # 一貫性チェック
     final_winner, consistency_note = _check_consistency(comparison_ab, comparison_ba)
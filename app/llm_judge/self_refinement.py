@@ -3,6 +3,7 @@
 from google import genai
 from google.genai import types
 
+from llm_judge.client import judge_client
 from llm_judge.models import (
     RefinementEvaluationOutput,
     RefinementIteration,
@@ -19,6 +20,7 @@ def _generate_answer(
     feedback: str | None,
     api_key: str,
     model: str = "gemini-2.0-flash",
+    client: genai.Client | None = None,
 ) -> str:
     """
     回答を生成(または改善)
@@ -28,21 +30,21 @@ def _generate_answer(
         feedback: 前回の評価フィードバック(初回はNone)
         api_key: Google GenAI APIキー
         model: 使用するモデル名
+        client: 共有するクライアント(Noneの場合は呼び出しごとに生成して閉じる)
 
     Returns:
         str: 生成された回答
     """
-    client = genai.Client(api_key=api_key)
-
     # プロンプト構築
     prompt = build_refinement_generator_prompt(question=question, feedback=feedback)
 
     try:
         # API呼び出し(通常のテキスト生成)
-        response = client.models.generate_content(
-            model=model,
-            contents=prompt,
-        )
+        with judge_client(api_key, client) as genai_client:
+            response = genai_client.models.generate_content(
+                model=model,
+                contents=prompt,
+            )
 
         if response.text is None:
             raise ValueError("API応答が空です")
@@ -60,6 +62,7 @@ def _evaluate_answer(
     threshold: float,
     api_key: str,
     model: str = "gemini-2.0-flash",
+    client: genai.Client | None = None,
 ) -> RefinementEvaluationOutput:
     """
     回答を評価し、改善提案を生成
@@ -70,12 +73,11 @@ def _evaluate_answer(
         threshold: 合格閾値
         api_key: Google GenAI APIキー
         model: 使用するモデル名
+        client: 共有するクライアント(Noneの場合は呼び出しごとに生成して閉じる)
 
     Returns:
         RefinementEvaluationOutput: 評価結果と改善提案
     """
-    client = genai.Client(api_key=api_key)
-
     # プロンプト構築
     prompt = build_refinement_evaluator_prompt(
         question=question, answer=answer, threshold=threshold
@@ -83,14 +85,15 @@ def _evaluate_answer(
 
     try:
         # API呼び出し
-        response = client.models.generate_content(
-            model=model,
-            contents=prompt,
-            config=types.GenerateContentConfig(
-                response_mime_type="application/json",
-                response_schema=RefinementEvaluationOutput,
-            ),
-        )
+        with judge_client(api_key, client) as genai_client:
+            response = genai_client.models.generate_content(
+                model=model,
+                contents=prompt,
+                config=types.GenerateContentConfig(
+                    response_mime_type="application/json",
+                    response_schema=RefinementEvaluationOutput,
+                ),
+            )
 
         if response.text is None:
             raise ValueError("API応答が空です")
@@ -109,6 +112,7 @@ def refine_with_feedback(
     threshold: float = 4.0,
     max_iterations: int = 3,
     model: str = "gemini-2.0-flash",
+    client: genai.Client | None = None,
 ) -> SelfRefinementResult:
     """
     Self-Refinement: 評価→改善のループで品質を段階的に向上
@@ -119,10 +123,23 @@ def refine_with_feedback(
         threshold: 合格閾値(1.0-5.0)
         max_iterations: 最大イテレーション数
         model: 使用するモデル名
+        client: 共有するクライアント(Noneの場合は呼び出しごとに生成して閉じる)
 
     Returns:
         SelfRefinementResult: 全イテレーションの履歴と最終結果
     """
+    if client is None:
+        # 全イテレーションで同じクライアントを使用する
+        with judge_client(api_key) as shared_client:
+            return refine_with_feedback(
+                question=question,
+                api_key=api_key,
+                threshold=threshold,
+                max_iterations=max_iterations,
+                model=model,
+                client=shared_client,
+            )
+
     iterations: list[RefinementIteration] = []
     feedback: str | None = None
 
@@ -141,6 +158,7 @@ def refine_with_feedback(
             feedback=feedback,
             api_key=api_key,
             model=model,
+            client=client,
         )
 
         # 2. 評価
@@ -151,6 +169,7 @@ def refine_with_feedback(
             threshold=threshold,
             api_key=api_key,
             model=model,
+            client=client,
         )
 
         # 閾値判定
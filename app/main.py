@@ -1,18 +1,34 @@
 import logging
+import signal
+import sys
+import threading
+from datetime import timedelta
 from pathlib import Path
 
 from config import AppConfig
 from logging_config import setup_logging
 from movie_metadata.csv_reader import CSVReader
 from movie_metadata.genai_client import GenAIClient
+from movie_metadata.input_watcher import InputWatcher
 from movie_metadata.json_writer import JSONWriter
 from movie_metadata.metadata_service import MetadataService
+from movie_metadata.metadata_store import MetadataStore
+from movie_metadata.output_index import INDEX_FILENAME, OutputIndex
+from movie_metadata.sharding import parse_shard_args, shard_path
 
 logger = logging.getLogger(__name__)
 
 
-def main() -> None:
-    """映画メタ情報取得システムのメインエントリーポイント"""
+def main(argv: list[str] | None = None) -> None:
+    """映画メタ情報取得システムのメインエントリーポイント
+
+    Args:
+        argv: コマンドライン引数（--shard-index / --shard-count / --input / --watch）
+    """
+    args = parse_shard_args(
+        "映画メタ情報取得システム", argv, input_argument=True, watch_argument=True
+    )
+
     # 設定読み込み
     config = AppConfig()
 
@@ -25,9 +41,26 @@ def main() -> None:
         api_key=config.gemini_api_key,
         model_name=config.model_name,
     ) as client:
+        # パス設定
+        csv_path = args.input or Path(__file__).parent / config.csv_path
+        output_dir = Path(__file__).parent / config.output_dir
+
         # 依存コンポーネントの初期化
-        csv_reader = CSVReader()
-        json_writer = JSONWriter()
+        csv_reader = CSVReader(parse_workers=config.input_parse_workers)
+        json_writer = JSONWriter(
+            compression=config.output_compression,
+            compression_level=config.output_compression_level,
+            output_index=(
+                OutputIndex(output_dir / INDEX_FILENAME)
+                if config.output_index
+                else None
+            ),
+        )
+        metadata_store = (
+            MetadataStore(Path(__file__).parent / config.metadata_store_path)
+            if config.metadata_store_path
+            else None
+        )
 
         # サービス初期化（依存性注入）
         service = MetadataService(
@@ -35,22 +68,52 @@ def main() -> None:
             csv_reader=csv_reader,
             json_writer=json_writer,
             rate_limit_sleep=config.rate_limit_sleep,
+            metadata_store=metadata_store,
+            ttl=(
+                timedelta(days=config.metadata_ttl_days)
+                if config.metadata_ttl_days is not None
+                else None
+            ),
+            field_ttls={
+                field_name: timedelta(days=days)
+                for field_name, days in config.metadata_field_ttl_days.items()
+            },
+            deduplicate=config.input_dedup,
+            shard_index=args.shard_index,
+            shard_count=args.shard_count,
         )
 
-        # パス設定
-        csv_path = Path(__file__).parent / config.csv_path
-        output_dir = Path(__file__).parent / config.output_dir
-
         # 処理実行
         try:
-            result = service.process(csv_path, output_dir)
+            if args.watch:
+                # シャードごとに処理済み位置を記録するため、状態ファイルを分ける
+                watcher = InputWatcher(
+                    csv_path,
+                    shard_path(
+                        Path(__file__).parent / config.watch_state_path,
+                        args.shard_index,
+                        args.shard_count,
+                    ),
+                    poll_interval=config.watch_poll_interval,
+                )
+                # Ctrl+C / SIGTERMでは処理中のバッチを出力してから終了する
+                stop = threading.Event()
+                for signum in (signal.SIGINT, signal.SIGTERM):
+                    signal.signal(signum, lambda *_: stop.set())
+                result = service.watch(watcher, output_dir, stop)
+            else:
+                result = service.process(csv_path, output_dir)
             logger.info(
                 f"処理結果: {result['success']}/{result['total']}件成功, "
-                f"{result['failed']}件失敗"
+                f"{result['failed']}件失敗, {result['cached']}件は保存済みを使用, "
+                f"{result['collapsed']}件は重複として集約"
             )
         except Exception as e:
             logger.error(f"処理中にエラーが発生しました: {e}")
+        finally:
+            if metadata_store is not None:
+                metadata_store.close()
 
 
 if __name__ == "__main__":
-    main()
+    main(sys.argv[1:])
@@ -1,10 +1,12 @@
 """LLM as a Judge デモ実行スクリプト"""
 
 import argparse
-import json
 import os
+from contextlib import closing
 from pathlib import Path
 
+from google import genai
+
 from llm_judge.direct_assessment import assess_answer
 from llm_judge.pairwise_comparison import (
     compare_pair,
@@ -20,6 +22,7 @@ from llm_judge.sample_data import (
     SAMPLE_QUESTIONS,
 )
 from llm_judge.self_refinement import refine_with_feedback
+from movie_metadata.serialization import write_json
 
 
 def get_api_key() -> str:
@@ -33,7 +36,7 @@ def get_api_key() -> str:
     return api_key
 
 
-def demo_direct_assessment(api_key: str) -> None:
+def demo_direct_assessment(api_key: str, client: genai.Client) -> None:
     """Direct Assessmentのデモ実行"""
     print("\n" + "=" * 80)
     print("Demo 1: Direct Assessment (単一回答の複数観点評価)")
@@ -57,6 +60,7 @@ def demo_direct_assessment(api_key: str) -> None:
                 answer=answer.text,
                 answer_id=answer.answer_id,
                 api_key=api_key,
+                client=client,
             )
 
             print(f"\n✓ 評価完了: 総合スコア {result.overall_score}/5.0")
@@ -77,18 +81,12 @@ def demo_direct_assessment(api_key: str) -> None:
     output_dir.mkdir(parents=True, exist_ok=True)
     output_file = output_dir / "direct_assessment_results.json"
 
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(
-            [r.model_dump() for r in results],
-            f,
-            ensure_ascii=False,
-            indent=2,
-        )
+    write_json(output_file, results)
 
     print(f"\n✓ 結果を保存しました: {output_file}")
 
 
-def demo_pairwise_comparison(api_key: str) -> None:
+def demo_pairwise_comparison(api_key: str, client: genai.Client) -> None:
     """Pairwise Comparisonのデモ実行"""
     print("\n" + "=" * 80)
     print("Demo 2: Pairwise Comparison (2つの回答を比較評価)")
@@ -103,6 +101,7 @@ def demo_pairwise_comparison(api_key: str) -> None:
             answer_a=Q3_ANSWER_A.text,
             answer_b=Q3_ANSWER_B.text,
             api_key=api_key,
+            client=client,
         )
 
         print("\n✓ 比較完了")
@@ -120,6 +119,7 @@ def demo_pairwise_comparison(api_key: str) -> None:
             answer_a=Q3_ANSWER_A.text,
             answer_b=Q3_ANSWER_B.text,
             api_key=api_key,
+            client=client,
         )
 
         print("\n✓ 両方向評価完了")
@@ -133,13 +133,7 @@ def demo_pairwise_comparison(api_key: str) -> None:
         output_dir.mkdir(parents=True, exist_ok=True)
         output_file = output_dir / "pairwise_comparison_results.json"
 
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(
-                result_aggregated.model_dump(),
-                f,
-                ensure_ascii=False,
-                indent=2,
-            )
+        write_json(output_file, result_aggregated)
 
         print(f"\n✓ 結果を保存しました: {output_file}")
 
@@ -147,7 +141,7 @@ def demo_pairwise_comparison(api_key: str) -> None:
         print(f"✗ エラー: {e}")
 
 
-def demo_self_refinement(api_key: str) -> None:
+def demo_self_refinement(api_key: str, client: genai.Client) -> None:
     """Self-Refinementのデモ実行"""
     print("\n" + "=" * 80)
     print("Demo 3: Self-Refinement (評価→改善のイテレーション)")
@@ -161,6 +155,7 @@ def demo_self_refinement(api_key: str) -> None:
             api_key=api_key,
             threshold=4.2,  # 高めの閾値
             max_iterations=3,
+            client=client,
         )
 
         print("\n" + "=" * 80)
@@ -184,13 +179,7 @@ def demo_self_refinement(api_key: str) -> None:
         output_dir.mkdir(parents=True, exist_ok=True)
         output_file = output_dir / "self_refinement_results.json"
 
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(
-                result.model_dump(),
-                f,
-                ensure_ascii=False,
-                indent=2,
-            )
+        write_json(output_file, result)
 
         print(f"\n✓ 結果を保存しました: {output_file}")
 
@@ -215,14 +204,16 @@ def main() -> None:
         print(f"エラー: {e}")
         return
 
-    if args.pattern in ["direct", "all"]:
-        demo_direct_assessment(api_key)
+    # 全デモで1つのクライアントを共有し、終了時に閉じる
+    with closing(genai.Client(api_key=api_key)) as client:
+        if args.pattern in ["direct", "all"]:
+            demo_direct_assessment(api_key, client)
 
-    if args.pattern in ["pairwise", "all"]:
-        demo_pairwise_comparison(api_key)
+        if args.pattern in ["pairwise", "all"]:
+            demo_pairwise_comparison(api_key, client)
 
-    if args.pattern in ["refinement", "all"]:
-        demo_self_refinement(api_key)
+        if args.pattern in ["refinement", "all"]:
+            demo_self_refinement(api_key, client)
 
     print("\n" + "=" * 80)
     print("全デモ完了")
@@ -0,0 +1,147 @@
+"""出力済みメタデータのタイトル検索スクリプト
+
+出力ディレクトリのインデックス（index.jsonl、OUTPUT_INDEX=trueで作成）から、
+タイトルに対応する最新のメタデータを取得して表示します。出力ファイル全体はパースせず、該当レコードのみを読み込みます。
+--refresh を指定した場合は、複数の候補を並列に取得・評価してメタデータを取得し直し、
+出力ディレクトリに保存してから表示します。
+
+Examples:
+    uv run python main_lookup.py "千と千尋の神隠し"
+    uv run python main_lookup.py "Spirited Away" --release-date 2001-07-20 --all
+    uv run python main_lookup.py "Spirited Away" --release-date 2001-07-20 \
+        --country 日本 --refresh
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from config import AppConfig
+from movie_metadata.blob_store import MetadataBlobStore
+from movie_metadata.models import MovieInput
+from movie_metadata.output_index import INDEX_FILENAME, OutputIndex
+from movie_metadata.refinement_writer import RefinementResultWriter
+from movie_metadata.refiner import MetadataRefiner
+
+
+def _refresh(
+    config: AppConfig,
+    movie_input: MovieInput,
+    output_dir: Path,
+    blob_store: MetadataBlobStore | None,
+) -> int:
+    """並列候補生成でメタデータを取得し直し、出力ディレクトリに保存して表示する
+
+    Args:
+        config: アプリケーション設定
+        movie_input: 取得し直す映画
+        output_dir: 出力ディレクトリ（インデックスにも追記する）
+        blob_store: ハッシュ参照形式で出力する場合のメタデータの保存先
+
+    Returns:
+        終了コード（常に0。合格しなかった場合は終了理由を標準エラーに表示）
+    """
+    refiner = MetadataRefiner(
+        api_key=config.gemini_api_key,
+        model_name=config.model_name,
+        rate_limit_sleep=config.rate_limit_sleep,
+    )
+    result = refiner.refine_speculative(
+        movie_input, threshold=config.quality_score_threshold
+    )
+    RefinementResultWriter(
+        blob_store=blob_store, output_index=OutputIndex(output_dir / INDEX_FILENAME)
+    ).write(result, output_dir)
+    if not result.success:
+        print(
+            f"一部のフィールドが閾値未満です（終了理由: {result.stop_reason}）",
+            file=sys.stderr,
+        )
+    print(result.final_metadata.model_dump_json(indent=2))
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    """タイトル検索のエントリーポイント
+
+    Args:
+        argv: コマンドライン引数（Noneの場合はsys.argvを使用）
+
+    Returns:
+        終了コード（見つからない、または復元できない場合は1）
+    """
+    parser = argparse.ArgumentParser(description="出力済みメタデータのタイトル検索")
+    parser.add_argument("title", help="映画のタイトル（日本語タイトルも可）")
+    parser.add_argument("--release-date", help="公開日（YYYY-MM-DD形式）で絞り込む")
+    parser.add_argument("--country", help="制作国で絞り込む")
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        help="出力ディレクトリ（デフォルト: 設定の出力ディレクトリ）",
+    )
+    parser.add_argument(
+        "--blob-dir",
+        type=Path,
+        help="ハッシュ参照形式で出力した場合のメタデータの保存先（METADATA_BLOB_DIR）",
+    )
+    parser.add_argument(
+        "--all", action="store_true", help="最新のメタデータではなく全出力位置を表示"
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help=(
+            "メタデータを取得し直して保存してから表示"
+            "（--release-date と --country が必要）"
+        ),
+    )
+    args = parser.parse_args(argv)
+    config = AppConfig()
+    output_dir = args.output_dir or Path(__file__).parent / config.output_dir
+
+    if args.refresh:
+        if not (args.release_date and args.country):
+            parser.error("--refresh には --release-date と --country が必要です")
+        return _refresh(
+            config,
+            MovieInput(
+                title=args.title, release_date=args.release_date, country=args.country
+            ),
+            output_dir,
+            MetadataBlobStore(args.blob_dir) if args.blob_dir else None,
+        )
+
+    index = OutputIndex(output_dir / INDEX_FILENAME)
+    if args.all:
+        entries = index.find(args.title, args.release_date, args.country)
+        for entry in entries:
+            location = (
+                f"{entry.file}@{entry.offset}"
+                if entry.offset is not None
+                else entry.file
+            )
+            print(
+                f"{entry.written_at.isoformat()} {entry.kind} {location} "
+                f"({entry.title}, {entry.release_date}, {entry.country})"
+            )
+        return 0 if entries else 1
+
+    blob_store = MetadataBlobStore(args.blob_dir) if args.blob_dir else None
+    try:
+        metadata = index.lookup(args.title, args.release_date, args.country, blob_store)
+    except ValueError as e:
+        print(
+            f"メタデータを復元できません: {e}"
+            "（ハッシュ参照形式の出力は --blob-dir の指定が必要です）",
+            file=sys.stderr,
+        )
+        return 1
+    if metadata is None:
+        print(f"メタデータが見つかりません: {args.title}", file=sys.stderr)
+        return 1
+    print(metadata.model_dump_json(indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+"""シャード出力のマージスクリプト
+
+--shard-index / --shard-count で分担して実行した main.py / main_refine.py の
+出力ファイルを1つの結果にまとめます。
+
+Examples:
+    uv run python main_merge.py data/output/merged.json \
+        data/output/movie_metadata_*_shard-*-of-4.json
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from logging_config import setup_logging
+from movie_metadata.sharding import merge_shard_outputs
+
+
+def main(argv: list[str] | None = None) -> int:
+    """シャード出力のマージのエントリーポイント
+
+    Args:
+        argv: コマンドライン引数（Noneの場合はsys.argvを使用）
+
+    Returns:
+        終了コード（マージに失敗した場合は1）
+    """
+    parser = argparse.ArgumentParser(description="シャード出力のマージ")
+    parser.add_argument(
+        "output", type=Path, help="マージ結果の出力先（.gz / .zst で圧縮）"
+    )
+    parser.add_argument("inputs", type=Path, nargs="+", help="各シャードの出力ファイル")
+    args = parser.parse_args(argv)
+
+    setup_logging("INFO")
+    try:
+        merge_shard_outputs(args.inputs, args.output)
+    except (OSError, ValueError) as e:
+        print(f"エラー: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
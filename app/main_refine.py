@@ -4,22 +4,219 @@ CSVから映画情報を読み込み、LLM as a Judgeを使用してメタデー
 基準を満たすまで改善を繰り返します。
 """
 
+import heapq
 import logging
+import sqlite3
+import sys
 import time
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime
 from pathlib import Path
 
 from config import AppConfig
 from logging_config import setup_logging
+from movie_metadata.blob_store import MetadataBlobStore
 from movie_metadata.csv_reader import CSVReader
-from movie_metadata.models import BatchRefinementResult
-from movie_metadata.refinement_writer import RefinementResultWriter
+from movie_metadata.evaluation_cache import EvaluationCache
+from movie_metadata.history_codec import collect_metadata_refs, iter_journal
+from movie_metadata.metadata_store import MetadataStore
+from movie_metadata.models import (
+    BatchRefinementSummary,
+    MetadataRefinementResult,
+    MovieInput,
+)
+from movie_metadata.output_index import INDEX_FILENAME, OutputIndex
+from movie_metadata.parquet_exporter import ParquetExporter
+from movie_metadata.refinement_writer import (
+    RefinementResultWriter,
+    find_refinement_outputs,
+)
 from movie_metadata.refiner import MetadataRefiner
+from movie_metadata.scheduler import CostModel, order_by_cost
+from movie_metadata.sharding import (
+    parse_shard_args,
+    select_shard,
+    shard_path,
+    shard_suffix,
+)
 
 logger = logging.getLogger(__name__)
 
 
-def main() -> None:
-    """映画メタ情報の品質評価・改善ループシステムのメインエントリーポイント"""
+def _log_refinement_result(result: MetadataRefinementResult, threshold: float) -> None:
+    """リファインメント結果をコンソールに表示する"""
+    logger.info("=== 最終結果 ===")
+    logger.info(f"成功: {result.success}")
+    logger.info(f"総イテレーション数: {result.total_iterations}")
+    logger.info(f"終了理由: {result.stop_reason}")
+
+    # 各イテレーションのスコアを表示
+    for i, entry in enumerate(result.history, start=1):
+        logger.info(f"\nイテレーション {i}:")
+        for field_score in entry.evaluation.field_scores:
+            logger.info(f"  - {field_score.field_name}: {field_score.score:.2f}")
+        logger.info(f"  ステータス: {entry.evaluation.overall_status}")
+
+    # 最終スコアサマリー
+    final_entry = result.history[-1]
+    logger.info("\n=== 最終スコア ===")
+    for field_score in final_entry.evaluation.field_scores:
+        status = "✓" if field_score.score >= threshold else "✗"
+        logger.info(f"{status} {field_score.field_name}: {field_score.score:.2f}")
+
+
+# 並列実行時に、入力順で未出力の先頭から何件先までの映画を投入対象にするか
+# （並列数あたりの件数。完了済みで出力待ちの結果はこの範囲に収まる）
+_REORDER_WINDOW_PER_WORKER = 4
+
+
+def _refine_in_input_order(
+    refiner: MetadataRefiner,
+    movies: list[MovieInput],
+    threshold: float,
+    workers: int,
+    cost_model: CostModel | None,
+) -> Iterator[tuple[MovieInput, MetadataRefinementResult | Exception]]:
+    """映画を順にリファインし、結果（失敗した場合は例外）を入力の順序で返す
+
+    workersが2以上の場合はスレッドプールで並列に実行し、予測処理時間の長い映画から
+    投入します（LPT）。先に完了した結果は、それより前の映画が完了するまで保持するため、
+    完了順に関わらず入力の順序で返します。投入するのは未出力の先頭から
+    workers * _REORDER_WINDOW_PER_WORKER 件以内の映画に限るため、
+    出力待ちで保持する結果の件数は入力の件数によらず一定です。
+
+    Args:
+        refiner: リファインに使うMetadataRefiner
+        movies: 処理対象の映画
+        threshold: 各フィールドの合格閾値
+        workers: 並列に実行する映画の数
+        cost_model: 処理時間の予測と実績の記録に使うモデル（Noneの場合は記録しない）
+
+    Yields:
+        (映画, リファインメント結果または発生した例外)のタプル
+    """
+
+    def refine(movie_input: MovieInput) -> MetadataRefinementResult:
+        movie_start_time = time.perf_counter()
+        result = refiner.refine(
+            movie_input=movie_input, max_iterations=3, threshold=threshold
+        )
+        if cost_model is not None:
+            cost_model.record(
+                movie_input,
+                result.total_iterations,
+                time.perf_counter() - movie_start_time,
+            )
+        return result
+
+    if workers <= 1:
+        for movie_input in movies:
+            try:
+                yield movie_input, refine(movie_input)
+            except Exception as e:
+                yield movie_input, e
+        return
+
+    order = order_by_cost(movies, cost_model or CostModel())
+    rank = [0] * len(movies)
+    for lpt_rank, position in enumerate(order):
+        rank[position] = lpt_rank
+    window = workers * _REORDER_WINDOW_PER_WORKER
+
+    ready: list[tuple[int, int]] = []  # (LPT順の順位, 位置)のヒープ
+    admitted = 0
+    running: dict[Future[MetadataRefinementResult], int] = {}
+    completed: dict[int, MetadataRefinementResult | Exception] = {}
+    next_position = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while next_position < len(movies):
+            # 未出力の先頭からwindow件以内の映画を投入対象に加える
+            while admitted < min(next_position + window, len(movies)):
+                heapq.heappush(ready, (rank[admitted], admitted))
+                admitted += 1
+            # 空いているワーカーに投入対象のうち予測処理時間の長い映画から投入する
+            while ready and len(running) < workers:
+                _, position = heapq.heappop(ready)
+                running[executor.submit(refine, movies[position])] = position
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                position = running.pop(future)
+                try:
+                    completed[position] = future.result()
+                except Exception as e:
+                    completed[position] = e
+            while next_position in completed:
+                yield movies[next_position], completed.pop(next_position)
+                next_position += 1
+
+
+def _save_to_store(
+    metadata_store: MetadataStore,
+    records: list[tuple[MovieInput, MetadataRefinementResult]],
+) -> None:
+    """溜めた改善結果と最終的なメタデータをまとめてストアに保存する
+
+    保存に失敗してもジャーナルには記録済みのため、エラーを記録して処理を続けます。
+    保存後（失敗時も）recordsは空にします。
+
+    Args:
+        metadata_store: 保存先のストア
+        records: (リファイン元の入力, リファインメント結果)のリスト
+    """
+    try:
+        metadata_store.upsert_refinement_results(records)
+        metadata_store.upsert_metadata(
+            (movie_input, result.final_metadata) for movie_input, result in records
+        )
+    except sqlite3.Error as e:
+        logger.error(
+            f"{len(records)} 件のリファインメント結果を"
+            f"ストアに保存できませんでした: {e}",
+            exc_info=True,
+        )
+    records.clear()
+
+
+def _sweep_blob_store(
+    blob_store: MetadataBlobStore, output_dir: Path, shard_count: int
+) -> None:
+    """出力ディレクトリのどのファイルからも参照されないメタデータを削除する
+
+    参照を収集できない出力ファイルがある場合、およびシャーディング実行中
+    （他のシャードが同じストアに書き込み中）の場合は削除しません。
+
+    Args:
+        blob_store: 削除対象のストア
+        output_dir: ストアを参照する出力ファイルのディレクトリ
+        shard_count: シャードの総数
+    """
+    if shard_count > 1:
+        logger.warning(
+            "シャーディング実行中は他のシャードがメタデータストアを共有しているため、"
+            "参照されないメタデータの削除をスキップします"
+            "（全シャードの完了後にシャーディングせずに実行してください）"
+        )
+        return
+    try:
+        referenced = collect_metadata_refs(find_refinement_outputs(output_dir))
+    except ValueError as e:
+        logger.warning(f"参照されないメタデータの削除をスキップします: {e}")
+        return
+    blob_store.sweep(referenced)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """映画メタ情報の品質評価・改善ループシステムのメインエントリーポイント
+
+    Args:
+        argv: コマンドライン引数（--shard-index / --shard-count / --input）
+    """
+    args = parse_shard_args(
+        "映画メタ情報の品質評価・改善ループシステム", argv, input_argument=True
+    )
+
     # 設定読み込み
     config = AppConfig()
 
@@ -28,11 +225,11 @@ def main() -> None:
     logger.info("=== 映画メタ情報品質評価・改善ループシステム起動 ===")
 
     # パス設定
-    csv_path = Path(__file__).parent / config.csv_path
+    csv_path = args.input or Path(__file__).parent / config.csv_path
     output_dir = Path(__file__).parent / config.output_dir
 
     # CSVから映画情報を読み込み
-    csv_reader = CSVReader()
+    csv_reader = CSVReader(parse_workers=config.input_parse_workers)
     try:
         movies = csv_reader.read(csv_path)
         if not movies:
@@ -43,83 +240,174 @@ def main() -> None:
         logger.error(f"CSVファイルの読み込みに失敗しました: {e}")
         return
 
+    if args.shard_count > 1:
+        movies = select_shard(movies, args.shard_index, args.shard_count)
+        logger.info(
+            f"シャード {args.shard_index}/{args.shard_count} の"
+            f" {len(movies)} 件を処理します"
+        )
+        if not movies:
+            return
+
+    # 処理実績（並列実行時に時間のかかる映画から投入する順序の予測に使用）
+    # 処理実績と評価キャッシュは追記されるため、シャードごとにファイルを分ける
+    cost_model = (
+        CostModel(
+            shard_path(
+                Path(__file__).parent / config.cost_history_path,
+                args.shard_index,
+                args.shard_count,
+            )
+        )
+        if config.cost_history_path
+        else None
+    )
+
     # メタデータ改善ループを実行
     try:
+        # 評価結果のキャッシュ（同一メタデータの再評価を省略）
+        evaluation_cache = (
+            EvaluationCache(
+                shard_path(
+                    Path(__file__).parent / config.evaluation_cache_path,
+                    args.shard_index,
+                    args.shard_count,
+                )
+            )
+            if config.evaluation_cache_path
+            else None
+        )
         refiner = MetadataRefiner(
             api_key=config.gemini_api_key,
             model_name=config.model_name,
             rate_limit_sleep=config.rate_limit_sleep,
+            evaluation_cache=evaluation_cache,
         )
 
         logger.info("評価・改善ループを開始します")
         start_time = time.perf_counter()
         total_count = len(movies)
-        results = []
+        success_count = 0
         errors = []
 
-        writer = RefinementResultWriter()
+        # メタデータを内容ハッシュで重複排除して保存するストア
+        blob_store = (
+            MetadataBlobStore(Path(__file__).parent / config.metadata_blob_dir)
+            if config.metadata_blob_dir
+            else None
+        )
+        writer = RefinementResultWriter(
+            compact_history=config.compact_history,
+            compression=config.output_compression,
+            compression_level=config.output_compression_level,
+            blob_store=blob_store,
+            name_suffix=shard_suffix(args.shard_index, args.shard_count),
+            output_index=(
+                OutputIndex(output_dir / INDEX_FILENAME)
+                if config.output_index
+                else None
+            ),
+        )
+        metadata_store = (
+            MetadataStore(Path(__file__).parent / config.metadata_store_path)
+            if config.metadata_store_path
+            else None
+        )
 
-        for index, movie_input in enumerate(movies, start=1):
-            logger.info(
-                f"処理中: {index}/{total_count}件完了（タイトル: {movie_input.title}）"
-            )
-            logger.info(
-                f"処理対象: {movie_input.title} ({movie_input.country}, "
-                f"{movie_input.release_date})"
-            )
+        # ストアへの保存はbatch_size件ごとに1トランザクションでまとめる
+        pending_store: list[tuple[MovieInput, MetadataRefinementResult]] = []
 
-            try:
-                threshold = config.quality_score_threshold
-                result = refiner.refine(
-                    movie_input=movie_input,
-                    max_iterations=3,
-                    threshold=threshold,
+        threshold = config.quality_score_threshold
+        outcomes = _refine_in_input_order(
+            refiner, movies, threshold, config.refine_workers, cost_model
+        )
+        with writer.open_journal(output_dir) as journal:
+            for index, (movie_input, outcome) in enumerate(outcomes, start=1):
+                logger.info(
+                    f"処理中: {index}/{total_count}件完了"
+                    f"（タイトル: {movie_input.title}）"
                 )
-                results.append(result)
-
-                # 最終結果をコンソールに表示
-                logger.info("=== 最終結果 ===")
-                logger.info(f"成功: {result.success}")
-                logger.info(f"総イテレーション数: {result.total_iterations}")
-
-                # 各イテレーションのスコアを表示
-                for i, entry in enumerate(result.history, start=1):
-                    logger.info(f"\nイテレーション {i}:")
-                    for field_score in entry.evaluation.field_scores:
-                        logger.info(
-                            f"  - {field_score.field_name}: {field_score.score:.2f}"
-                        )
-                    logger.info(f"  ステータス: {entry.evaluation.overall_status}")
-
-                # 最終スコアサマリー
-                final_entry = result.history[-1]
-                logger.info("\n=== 最終スコア ===")
-                for field_score in final_entry.evaluation.field_scores:
-                    status = "✓" if field_score.score >= threshold else "✗"
-                    logger.info(
-                        f"{status} {field_score.field_name}: {field_score.score:.2f}"
-                    )
-            except Exception as e:
-                logger.error("処理中にエラーが発生しました: %s", e, exc_info=True)
-                errors.append({"title": movie_input.title, "message": str(e)})
-                continue
+                logger.info(
+                    f"処理対象: {movie_input.title} ({movie_input.country}, "
+                    f"{movie_input.release_date})"
+                )
+
+                try:
+                    if isinstance(outcome, Exception):
+                        raise outcome
+                    result = outcome
+                    # 完了した結果をすぐに永続化し、集計のみを保持する
+                    journal.append(result)
+                    success_count += result.success
+                    if metadata_store is not None:
+                        pending_store.append((movie_input, result))
+
+                    # 最終結果をコンソールに表示
+                    _log_refinement_result(result, threshold)
+                except Exception as e:
+                    logger.error("処理中にエラーが発生しました: %s", e, exc_info=True)
+                    errors.append({"title": movie_input.title, "message": str(e)})
+                    continue
+
+                if (
+                    metadata_store is not None
+                    and len(pending_store) >= metadata_store.batch_size
+                ):
+                    _save_to_store(metadata_store, pending_store)
+
+            if metadata_store is not None and pending_store:
+                _save_to_store(metadata_store, pending_store)
 
         total_time = time.perf_counter() - start_time
         logger.info(f"総処理時間: {total_time:.2f}秒")
+        if evaluation_cache is not None:
+            evaluation_cache.close()
+            logger.info(
+                f"評価キャッシュ: {evaluation_cache.hits}件ヒット, "
+                f"{evaluation_cache.misses}件ミス"
+            )
+        if metadata_store is not None:
+            metadata_store.close()
+            logger.info("リファインメント結果をストアに保存しました")
+        if cost_model is not None:
+            cost_model.close()
 
-        success_count = sum(result.success for result in results)
         error_count = len(errors)
-        batch_result = BatchRefinementResult(
-            results=results,
+        summary = BatchRefinementSummary(
             total_count=total_count,
             success_count=success_count,
             error_count=error_count,
             errors=errors,
             processing_time=total_time,
         )
-        writer.write_batch(batch_result, output_dir)
+        writer.write_batch_from_journal(journal.path, summary, output_dir)
         logger.info(f"バッチ結果をJSON形式で保存しました: {output_dir}")
 
+        if config.parquet_export and total_count > error_count:
+            # 分析用にメタデータとフィールドスコアを列指向形式でも出力
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            exporter = ParquetExporter()
+            exporter.write_metadata(
+                (
+                    result.final_metadata
+                    for result in iter_journal(journal.path, blob_store)
+                ),
+                output_dir / f"refined_metadata_{timestamp}.parquet",
+            )
+            exporter.write_field_scores(
+                (
+                    result.to_model()
+                    for result in iter_journal(journal.path, blob_store)
+                ),
+                output_dir / f"field_scores_{timestamp}.parquet",
+            )
+
+        # バッチ結果に取り込んだジャーナルは削除する（中断時は残り、途中結果となる）
+        journal.path.unlink(missing_ok=True)
+
+        if blob_store is not None and config.metadata_blob_gc:
+            _sweep_blob_store(blob_store, output_dir, args.shard_count)
+
         if errors:
             error_titles = ", ".join(error["title"] for error in errors)
             logger.error(f"エラー件数: {error_count}")
@@ -131,4 +419,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    main(sys.argv[1:])
@@ -0,0 +1,198 @@
+"""クラッシュに安全なファイル書き込みモジュール
+
+一時ファイルへの書き込み → fsync → renameによるアトミックな書き込みと、
+追記型のストリーミング出力でfsyncをまとめて行うグループコミットを提供します。
+"""
+
+import logging
+import os
+import time
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from types import TracebackType
+from typing import IO, Any, Self
+
+from movie_metadata.compressed_io import CompressionType, wrap_writer
+
+logger = logging.getLogger(__name__)
+
+
+def fsync_directory(directory: Path) -> None:
+    """ディレクトリエントリの変更（作成・rename）を永続化する
+
+    ディレクトリのfsyncに対応していないプラットフォームでは何もしません。
+
+    Args:
+        directory: 対象ディレクトリ
+    """
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def atomic_write(
+    path: Path, mode: str = "w", encoding: str | None = "utf-8"
+) -> Iterator[IO[Any]]:
+    """ファイルをアトミックに書き込むコンテキストマネージャー
+
+    同じディレクトリの一時ファイルに書き込み、fsync後に最終パスへrenameします。
+    途中で例外やクラッシュが発生しても、最終パスには以前の内容か
+    完全な新しい内容のいずれかしか存在しません。
+
+    Args:
+        path: 最終的な出力先パス
+        mode: 書き込みモード（"w" または "wb"）
+        encoding: テキストモードのエンコーディング（バイナリモードでは無視）
+
+    Yields:
+        一時ファイルのファイルオブジェクト
+
+    Raises:
+        ValueError: modeが書き込みモードでない場合
+
+    Examples:
+        with atomic_write(Path("output/result.json")) as f:
+            json.dump(data, f, ensure_ascii=False)
+    """
+    if mode not in ("w", "wb"):
+        raise ValueError(f"modeには'w'または'wb'を指定してください（指定値: {mode}）")
+
+    temp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    exclusive_mode = mode.replace("w", "x")
+    file_encoding = None if "b" in mode else encoding
+    try:
+        with temp_path.open(exclusive_mode, encoding=file_encoding) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+    fsync_directory(path.parent)
+
+
+class GroupCommitWriter:
+    """グループコミットで追記するJSON Lines等の行指向ライター
+
+    各行は書き込み直後にOSへflushするため、プロセスがクラッシュしても失われません。
+    圧縮しない場合は1行を1回の書き込みで追記するため、複数のプロセスが
+    同じファイルに追記しても行が混ざることはありません。
+    一方、1行ごとにfsyncするとスループットが大きく低下するため、
+    max_records件の書き込み、または前回のfsyncからmax_interval秒が経過した時点で
+    まとめてfsyncします。close()時には未同期の行をすべて同期します。
+
+    圧縮を指定した場合は、同期のたびに圧縮ストリームをフラッシュするため、
+    クラッシュしても最後に同期した行までは展開して読み込めます
+    （行ごとのOSへのflushは圧縮率が下がるため行いません）。
+
+    Args:
+        path: 追記先ファイルのパス
+        max_records: この件数に達したらfsyncする
+        max_interval: 前回のfsyncからこの秒数が経過したらfsyncする
+        compression: 圧縮形式（Noneの場合は無圧縮）
+        compression_level: 圧縮レベル（Noneの場合は各形式の既定値）
+
+    Raises:
+        ValueError: max_recordsが1未満、またはmax_intervalが負の場合
+
+    Examples:
+        with GroupCommitWriter(Path("output/results.jsonl")) as writer:
+            for record in records:
+                writer.write_line(record.model_dump_json())
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_records: int = 100,
+        max_interval: float = 1.0,
+        compression: CompressionType | None = None,
+        compression_level: int | None = None,
+    ) -> None:
+        if max_records < 1:
+            raise ValueError(
+                f"max_recordsは1以上を指定してください（指定値: {max_records}）"
+            )
+        if max_interval < 0:
+            raise ValueError(
+                f"max_intervalは0以上を指定してください（指定値: {max_interval}）"
+            )
+        self._path = path
+        self._max_records = max_records
+        self._max_interval = max_interval
+        path.parent.mkdir(parents=True, exist_ok=True)
+        is_new = not path.exists()
+        self._compressed = compression is not None
+        self._raw = path.open("ab")
+        self._file = wrap_writer(self._raw, compression, compression_level)
+        if is_new:
+            fsync_directory(path.parent)
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        self.sync_count = 0
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    @property
+    def path(self) -> Path:
+        """追記先ファイルのパス"""
+        return self._path
+
+    def write_line(self, line: str) -> None:
+        """1行を追記し、必要に応じてグループコミットする
+
+        Args:
+            line: 追記する文字列（改行は自動で付与）
+        """
+        self._file.write((line + "\n").encode("utf-8"))
+        if not self._compressed:
+            self._file.flush()
+        self._pending += 1
+        elapsed = time.monotonic() - self._last_sync
+        if self._pending >= self._max_records or elapsed >= self._max_interval:
+            self.sync()
+
+    def sync(self) -> None:
+        """未同期の行をディスクに同期する"""
+        if self._pending == 0:
+            return
+        if self._compressed:
+            self._file.flush()
+            self._raw.flush()
+        os.fsync(self._raw.fileno())
+        logger.debug(f"{self._path} に {self._pending} 行を同期しました")
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        self.sync_count += 1
+
+    def close(self) -> None:
+        """未同期の行を同期してファイルを閉じる"""
+        if self._raw.closed:
+            return
+        self.sync()
+        if self._compressed:
+            # 圧縮ストリームの終端を書き込んでから同期する
+            self._file.close()
+            self._raw.flush()
+            os.fsync(self._raw.fileno())
+        self._raw.close()
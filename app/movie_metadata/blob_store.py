@@ -0,0 +1,181 @@
+"""メタデータのコンテンツアドレス型ストレージモジュール
+
+リファインメントの各イテレーションや再実行、重複するCSVでは同一のMovieMetadataが
+何度も出力されます。このモジュールでは正規化したJSONのSHA-256ハッシュをキーとして
+メタデータを1度だけ保存し、出力ファイルからはハッシュで参照できるようにします。
+参照されなくなったメタデータはマーク&スイープで削除します。
+"""
+
+import gzip
+import hashlib
+import logging
+import time
+from collections.abc import Iterable
+from datetime import timedelta
+from pathlib import Path
+
+import pydantic_core
+
+from movie_metadata.atomic_io import atomic_write
+from movie_metadata.models import MovieMetadata
+
+logger = logging.getLogger(__name__)
+
+# メタデータファイルの拡張子（正規化JSONをgzip圧縮して保存）
+_BLOB_SUFFIX = ".json.gz"
+
+
+def canonical_metadata_bytes(metadata: MovieMetadata) -> bytes:
+    """メタデータを正規化したJSONのバイト列に変換する
+
+    キーをソートし、空白を含まない形式にするため、
+    同じ内容のメタデータは常に同じバイト列になります。
+
+    Args:
+        metadata: 変換するメタデータ
+
+    Returns:
+        正規化したJSONのバイト列
+    """
+    return pydantic_core.to_json(dict(sorted(metadata.model_dump().items())))
+
+
+def metadata_hash(metadata: MovieMetadata) -> str:
+    """メタデータの内容ハッシュを返す
+
+    同じ内容のメタデータは同じハッシュになるため、
+    ハッシュの比較でメタデータの同一性を判定できます。
+
+    Args:
+        metadata: ハッシュを計算するメタデータ
+
+    Returns:
+        SHA-256の16進文字列
+    """
+    return hashlib.sha256(canonical_metadata_bytes(metadata)).hexdigest()
+
+
+class MetadataBlobStore:
+    """内容ハッシュをキーとしてメタデータを保存するストレージ
+
+    メタデータは root/{ハッシュの先頭2文字}/{残りのハッシュ}.json.gz に
+    アトミックに書き込みます。同じ内容のメタデータは何度put()しても1度しか保存されません。
+
+    Args:
+        root: 保存先ディレクトリ
+
+    Examples:
+        store = MetadataBlobStore(Path("data/metadata_blobs"))
+        ref = store.put(metadata)
+        assert store.get(ref) == metadata
+        store.sweep(referenced={ref})
+    """
+
+    def __init__(self, root: Path) -> None:
+        self._root = root
+        self._known: set[str] = set()
+
+    @property
+    def root(self) -> Path:
+        """保存先ディレクトリ"""
+        return self._root
+
+    def put(self, metadata: MovieMetadata) -> str:
+        """メタデータを保存し、参照用のハッシュを返す
+
+        Args:
+            metadata: 保存するメタデータ
+
+        Returns:
+            メタデータの内容ハッシュ
+
+        Raises:
+            OSError: ファイル書き込みに失敗した場合
+        """
+        data = canonical_metadata_bytes(metadata)
+        ref = hashlib.sha256(data).hexdigest()
+        if ref in self._known:
+            return ref
+
+        path = self._blob_path(ref)
+        if path.exists():
+            # 更新日時を新しくし、実行中のsweep()で削除されないようにする
+            path.touch()
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with atomic_write(path, mode="wb") as f:
+                # mtimeを固定し、同じ内容からは同じファイルを生成する
+                f.write(gzip.compress(data, mtime=0))
+            logger.debug(f"メタデータを保存しました: {ref}")
+        self._known.add(ref)
+        return ref
+
+    def get(self, ref: str) -> MovieMetadata:
+        """ハッシュからメタデータを読み込む
+
+        Args:
+            ref: put()が返したハッシュ
+
+        Returns:
+            保存されていたメタデータ
+
+        Raises:
+            KeyError: ハッシュに対応するメタデータが存在しない場合
+        """
+        path = self._blob_path(ref)
+        try:
+            data = gzip.decompress(path.read_bytes())
+        except FileNotFoundError as e:
+            raise KeyError(f"メタデータが見つかりません: {ref}") from e
+        return MovieMetadata.model_validate_json(data)
+
+    def __contains__(self, ref: object) -> bool:
+        if not isinstance(ref, str):
+            return False
+        try:
+            return self._blob_path(ref).exists()
+        except ValueError:
+            return False
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self._iter_blob_paths())
+
+    def sweep(
+        self, referenced: Iterable[str], min_age: timedelta = timedelta(hours=1)
+    ) -> int:
+        """参照されていないメタデータを削除する（マーク&スイープのスイープ）
+
+        作成からmin_ageが経過していないメタデータは、実行中の処理が
+        参照を書き込む前である可能性があるため削除しません。
+
+        Args:
+            referenced: 出力ファイル等から参照されているハッシュ（マーク済みの集合）
+            min_age: 削除対象とする最小の経過時間
+
+        Returns:
+            削除したメタデータの件数
+        """
+        live = set(referenced)
+        cutoff = time.time() - min_age.total_seconds()
+        removed = 0
+        for path in list(self._iter_blob_paths()):
+            ref = path.parent.name + path.name.removesuffix(_BLOB_SUFFIX)
+            if ref in live or path.stat().st_mtime > cutoff:
+                continue
+            path.unlink(missing_ok=True)
+            self._known.discard(ref)
+            removed += 1
+        logger.info(f"参照されていないメタデータを {removed} 件削除しました")
+        return removed
+
+    def _blob_path(self, ref: str) -> Path:
+        """ハッシュに対応するファイルパスを返す"""
+        if len(ref) != 64 or any(c not in "0123456789abcdef" for c in ref):
+            raise ValueError(f"不正なメタデータの参照です: {ref}")
+        return self._root / ref[:2] / f"{ref[2:]}{_BLOB_SUFFIX}"
+
+    def _iter_blob_paths(self) -> Iterable[Path]:
+        """保存されているメタデータのファイルパスを列挙する"""
+        if not self._root.exists():
+            return
+        yield from self._root.glob(f"??/*{_BLOB_SUFFIX}")
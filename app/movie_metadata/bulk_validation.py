@@ -0,0 +1,88 @@
+"""まとめて検証するバリデーションモジュール
+
+1行ずつモデルを生成するとPython側の呼び出しと例外処理のオーバーヘッドが
+レコード数に比例して発生します。このモジュールでは1度だけ生成した
+TypeAdapter(list[Model])でチャンク全体を1回の呼び出しで検証し、
+エラーは配列の位置から元の行番号に対応付けます。
+"""
+
+import logging
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+from pydantic import TypeAdapter, ValidationError
+
+from movie_metadata.compressed_io import open_read
+from movie_metadata.models import MovieInput, MovieMetadata
+
+logger = logging.getLogger(__name__)
+
+# モデルのリストを検証するTypeAdapter（生成コストが高いためモジュールで1度だけ生成）
+_MOVIE_INPUT_LIST_ADAPTER: TypeAdapter[list[MovieInput]] = TypeAdapter(list[MovieInput])
+_MOVIE_METADATA_LIST_ADAPTER: TypeAdapter[list[MovieMetadata]] = TypeAdapter(
+    list[MovieMetadata]
+)
+
+
+def validate_rows(
+    records: Sequence[tuple[int, dict[str, Any]]],
+) -> tuple[list[tuple[int, MovieInput]], list[tuple[int, str]]]:
+    """行番号付きの入力行をまとめてMovieInputに検証する
+
+    不正な行がある場合は、その行のみを除いて検証し直します。
+
+    Args:
+        records: (行番号, 行の辞書)のシーケンス
+
+    Returns:
+        (行番号とMovieInputのリスト, 不正な行の行番号とエラー内容のリスト)のタプル
+        （いずれも入力の順序を維持）
+    """
+    adapter = _MOVIE_INPUT_LIST_ADAPTER
+    rows = [row for _, row in records]
+    try:
+        movies = adapter.validate_python(rows)
+    except ValidationError as e:
+        errors: dict[int, list[str]] = {}
+        for error in e.errors():
+            position, *field = error["loc"]
+            location = ".".join(str(part) for part in field)
+            errors.setdefault(int(position), []).append(
+                f"{location}: {error['msg']}" if location else error["msg"]
+            )
+        valid = [record for index, record in enumerate(records) if index not in errors]
+        movies = adapter.validate_python([row for _, row in valid])
+        skipped = [
+            (records[index][0], "; ".join(messages))
+            for index, messages in sorted(errors.items())
+        ]
+        return [
+            (row_num, movie) for (row_num, _), movie in zip(valid, movies, strict=True)
+        ], skipped
+
+    return [
+        (row_num, movie) for (row_num, _), movie in zip(records, movies, strict=True)
+    ], []
+
+
+def load_metadata_json(path: Path) -> list[MovieMetadata]:
+    """出力済みのメタデータのJSON配列を読み込む
+
+    JSONのパースと検証を1回の呼び出しで行うため、
+    Pythonの辞書を経由して1件ずつ検証するより高速です。
+
+    Args:
+        path: JSONWriterが出力したファイルのパス（.gz / .zst も可）
+
+    Returns:
+        MovieMetadataのリスト
+
+    Raises:
+        FileNotFoundError: ファイルが存在しない場合
+        ValueError: JSONの形式またはメタデータの内容が不正な場合
+    """
+    with open_read(path) as f:
+        metadata_list = _MOVIE_METADATA_LIST_ADAPTER.validate_json(f.read())
+    logger.debug(f"{path} から {len(metadata_list)} 件のメタデータを読み込みました")
+    return metadata_list
@@ -0,0 +1,182 @@
+"""圧縮出力・読み込みモジュール
+
+gzipとzstdによるストリーミング圧縮の書き込みと、対応するストリーミング読み込みを
+提供します。zstdは標準ライブラリのcompression.zstd（Python 3.14以降）を使用します。
+"""
+
+import gzip
+import io
+import json
+import logging
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any, Literal, cast
+
+try:
+    from compression import zstd
+except ImportError:  # Python 3.14未満
+    zstd = None
+
+logger = logging.getLogger(__name__)
+
+CompressionType = Literal["gzip", "zstd"]
+
+# 圧縮形式ごとのファイル拡張子
+COMPRESSION_SUFFIXES: dict[CompressionType, str] = {"gzip": ".gz", "zstd": ".zst"}
+
+# gzipの既定の圧縮レベル（9は速度に対して圧縮率の向上が小さいため6を使用）
+_DEFAULT_GZIP_LEVEL = 6
+
+
+def compressed_path(path: Path, compression: CompressionType | None) -> Path:
+    """圧縮形式に応じた拡張子を付与したパスを返す
+
+    Args:
+        path: 元のパス（例: result.json）
+        compression: 圧縮形式（Noneの場合は無圧縮）
+
+    Returns:
+        拡張子を付与したパス（例: result.json.gz）
+    """
+    if compression is None:
+        return path
+    return path.with_name(path.name + COMPRESSION_SUFFIXES[compression])
+
+
+def detect_compression(path: Path) -> CompressionType | None:
+    """拡張子から圧縮形式を判定する
+
+    Args:
+        path: ファイルパス
+
+    Returns:
+        圧縮形式（無圧縮の場合はNone）
+    """
+    for compression, suffix in COMPRESSION_SUFFIXES.items():
+        if path.name.endswith(suffix):
+            return compression
+    return None
+
+
+def wrap_writer(
+    raw: IO[bytes], compression: CompressionType | None, level: int | None = None
+) -> IO[bytes]:
+    """バイナリ書き込みストリームを圧縮ストリームでラップする
+
+    返されたストリームを閉じても、rawは閉じられません。
+
+    Args:
+        raw: 書き込み先のバイナリストリーム
+        compression: 圧縮形式（Noneの場合はrawをそのまま返す）
+        level: 圧縮レベル（Noneの場合は各形式の既定値）
+
+    Returns:
+        圧縮しながらrawに書き込むストリーム
+
+    Raises:
+        ValueError: zstdが利用できない環境、または未対応の圧縮形式の場合
+    """
+    if compression is None:
+        return raw
+    if compression == "gzip":
+        # GzipFileはIO[bytes]として使えるが、型定義上は別の型のため変換する
+        return cast(
+            IO[bytes],
+            gzip.GzipFile(
+                fileobj=raw,
+                mode="wb",
+                compresslevel=_DEFAULT_GZIP_LEVEL if level is None else level,
+            ),
+        )
+    if compression == "zstd":
+        return require_zstd().ZstdFile(raw, mode="w", level=level)
+    raise ValueError(f"未対応の圧縮形式です: {compression}")
+
+
+@contextmanager
+def compressing(
+    raw: IO[bytes], compression: CompressionType | None, level: int | None = None
+) -> Iterator[IO[bytes]]:
+    """rawに圧縮しながら書き込むストリームを扱うコンテキストマネージャー
+
+    終了時に圧縮ストリームの終端を書き込みます。rawは閉じません。
+
+    Args:
+        raw: 書き込み先のバイナリストリーム
+        compression: 圧縮形式（Noneの場合はrawをそのまま返す）
+        level: 圧縮レベル（Noneの場合は各形式の既定値）
+
+    Yields:
+        書き込み用のバイナリストリーム
+    """
+    if compression is None:
+        yield raw
+        return
+    with wrap_writer(raw, compression, level) as compressed:
+        yield compressed
+
+
+def open_read(path: Path) -> IO[bytes]:
+    """拡張子に応じて展開しながら読み込むバイナリストリームを開く
+
+    Args:
+        path: 読み込むファイルのパス（.gz / .zst / 無圧縮）
+
+    Returns:
+        展開済みのデータを返すバイナリストリーム
+    """
+    compression = detect_compression(path)
+    if compression == "gzip":
+        return cast(IO[bytes], gzip.open(path, "rb"))
+    if compression == "zstd":
+        return require_zstd().open(path, "rb")
+    return path.open("rb")
+
+
+def iter_lines(path: Path) -> Iterator[str]:
+    """JSON Lines等の行指向ファイルを1行ずつストリーミングで読み込む
+
+    圧縮ファイルの末尾がクラッシュ等で途切れている場合は、
+    読み込めた行までを返して警告をログ出力します。
+
+    Args:
+        path: 読み込むファイルのパス（.gz / .zst / 無圧縮）
+
+    Yields:
+        改行を除いた各行の文字列
+    """
+    with open_read(path) as raw:
+        reader = io.TextIOWrapper(raw, encoding="utf-8")
+        try:
+            for line in reader:
+                yield line.rstrip("\n")
+        except EOFError:
+            logger.warning(f"{path} の圧縮データが途中で終了しています")
+
+
+def read_json(path: Path) -> Any:
+    """JSONファイルを展開しながら読み込む
+
+    Args:
+        path: 読み込むファイルのパス（.gz / .zst / 無圧縮）
+
+    Returns:
+        読み込んだJSONの値
+    """
+    with open_read(path) as raw:
+        return json.load(raw)
+
+
+def require_zstd() -> Any:
+    """compression.zstdモジュールを返す
+
+    Returns:
+        compression.zstdモジュール
+
+    Raises:
+        ValueError: zstdが利用できない環境の場合
+    """
+    if zstd is None:
+        raise ValueError("zstd圧縮にはPython 3.14以降（compression.zstd）が必要です")
+    return zstd
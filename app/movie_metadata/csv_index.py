@@ -0,0 +1,157 @@
+"""入力CSVのバイト位置インデックスモジュール
+
+大きな入力CSVで任意の行範囲を読み込むために、interval行ごとのデータ行の
+開始バイト位置を記録します。読み込み時は最寄りの記録位置にseekし、
+残りの最大interval-1行のみをパースするため、開始行によらず一定の時間で読み込めます。
+インデックスはCSVと同じディレクトリに `{CSVファイル名}.idx.json` として保存します。
+"""
+
+import logging
+from collections.abc import Iterator
+from pathlib import Path
+from typing import IO
+
+from movie_metadata.models import CSVOffsetIndex
+from movie_metadata.serialization import write_json
+
+logger = logging.getLogger(__name__)
+
+# 開始位置を記録する行の既定の間隔
+DEFAULT_INDEX_INTERVAL = 1000
+
+
+def index_path_for(csv_path: Path) -> Path:
+    """CSVファイルに対応するインデックスファイルのパスを返す
+
+    Args:
+        csv_path: CSVファイルのパス
+
+    Returns:
+        インデックスファイルのパス（例: movies.csv.idx.json）
+    """
+    return csv_path.with_name(csv_path.name + ".idx.json")
+
+
+def iter_record_offsets(f: IO[bytes]) -> Iterator[int]:
+    """CSVの各レコード（ヘッダーを含む）の開始バイト位置を列挙する
+
+    引用符で囲まれたフィールド内の改行はレコードの区切りとみなしません。
+    csv.DictReaderと同様に空行はレコードとして数えません。
+
+    Args:
+        f: 先頭から読み込むバイナリストリーム
+
+    Yields:
+        各レコードの開始バイト位置
+    """
+    position = 0
+    record_start = 0
+    quotes = 0
+    for line in f:
+        position += len(line)
+        quotes += line.count(b'"')
+        # 引用符の数が奇数の間はフィールド内の改行のため、レコードが続く
+        if quotes % 2 == 1:
+            continue
+        if position - record_start > len(line) or line.strip(b"\r\n"):
+            yield record_start
+        record_start = position
+        quotes = 0
+    if record_start < position:
+        # 引用符が閉じられないままファイルが終了した場合
+        yield record_start
+
+
+def build_csv_index(
+    csv_path: Path, interval: int = DEFAULT_INDEX_INTERVAL
+) -> CSVOffsetIndex:
+    """CSVファイルを1回走査してバイト位置インデックスを作成する
+
+    Args:
+        csv_path: CSVファイルのパス
+        interval: 開始位置を記録する行の間隔
+
+    Returns:
+        作成したインデックス
+
+    Raises:
+        ValueError: intervalが1未満の場合
+        FileNotFoundError: CSVファイルが存在しない場合
+    """
+    if interval < 1:
+        raise ValueError(f"intervalは1以上を指定してください（指定値: {interval}）")
+
+    stat = csv_path.stat()
+    offsets: list[int] = []
+    row_count = 0
+    with csv_path.open("rb") as f:
+        records = iter_record_offsets(f)
+        next(records, None)  # ヘッダー
+        for row_count, offset in enumerate(records, start=1):
+            if (row_count - 1) % interval == 0:
+                offsets.append(offset)
+
+    logger.info(f"{csv_path} のインデックスを作成しました（{row_count}行）")
+    return CSVOffsetIndex(
+        interval=interval,
+        row_count=row_count,
+        offsets=offsets,
+        file_size=stat.st_size,
+        mtime_ns=stat.st_mtime_ns,
+    )
+
+
+def load_csv_index(
+    csv_path: Path, interval: int = DEFAULT_INDEX_INTERVAL
+) -> CSVOffsetIndex:
+    """保存済みのインデックスを読み込む（CSVが更新されている場合は作り直す）
+
+    作り直したインデックスは保存を試み、書き込めない場合は警告のみ出力します。
+
+    Args:
+        csv_path: CSVファイルのパス
+        interval: 作り直す場合に開始位置を記録する行の間隔
+
+    Returns:
+        CSVファイルの現在の内容に対応するインデックス
+    """
+    path = index_path_for(csv_path)
+    stat = csv_path.stat()
+    if path.exists():
+        try:
+            index = CSVOffsetIndex.model_validate_json(path.read_bytes())
+        except ValueError as e:
+            logger.warning(f"インデックスを読み込めないため作り直します: {e}")
+        else:
+            if (
+                index.file_size == stat.st_size
+                and index.mtime_ns == stat.st_mtime_ns
+                and index.interval == interval
+            ):
+                return index
+
+    index = build_csv_index(csv_path, interval)
+    try:
+        write_json(path, index, pretty=False)
+    except OSError as e:
+        logger.warning(f"インデックスを保存できませんでした: {e}")
+    return index
+
+
+def locate_row(index: CSVOffsetIndex, row: int) -> tuple[int, int]:
+    """データ行の読み込み開始位置を返す
+
+    Args:
+        index: CSVのインデックス
+        row: データ行の番号（0始まり、ヘッダーを除く）
+
+    Returns:
+        (seekするバイト位置, そこから読み飛ばす行数)のタプル
+
+    Raises:
+        IndexError: rowが範囲外の場合
+    """
+    if not 0 <= row < index.row_count:
+        raise IndexError(f"行番号が範囲外です: {row}（データ行数: {index.row_count}）")
+    block, skip = divmod(row, index.interval)
+    return index.offsets[block], skip
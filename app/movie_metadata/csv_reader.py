@@ -1,23 +1,177 @@
 import csv
+import io
 import logging
+import re
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate, batched, islice, repeat
 from pathlib import Path
 
-from movie_metadata.models import MovieInput
+from movie_metadata.bulk_validation import validate_rows
+from movie_metadata.csv_index import (
+    iter_record_offsets,
+    load_csv_index,
+    locate_row,
+)
+from movie_metadata.input_stream import (
+    is_plain_csv,
+    is_stdin,
+    iter_records,
+    validate_header,
+)
+from movie_metadata.models import (
+    CollapsedInputRow,
+    CSVOffsetIndex,
+    DeduplicatedInput,
+    MovieInput,
+)
+from movie_metadata.normalization import normalize_text
 
 logger = logging.getLogger(__name__)
 
+# CSVに必要なフィールド
+REQUIRED_FIELDS = {"title", "release_date", "country"}
+
+# まとめて検証する行数
+_VALIDATION_BATCH_SIZE = 1000
+
+# 並列読み込みで1チャンクに含める既定のバイト数
+_DEFAULT_CHUNK_BYTES = 8 * 1024 * 1024
+
+
+def make_input_key(title: str, release_date: str) -> tuple[str, str]:
+    """入力行の重複判定キーを生成する
+
+    タイトルはNFKC正規化・大文字小文字の同一視・空白と記号の除去を行い、
+    公開日は年のみを使用します（配信元による公開日の差を吸収するため）。
+
+    Args:
+        title: 映画のタイトル
+        release_date: 公開日（YYYY-MM-DD形式）
+
+    Returns:
+        (正規化したタイトル, 公開年)のタプル
+    """
+    match = re.match(r"\s*(\d{4})", release_date)
+    year = match.group(1) if match else release_date.strip()
+    return normalize_text(title), year
+
+
+def _count_quotes(csv_path: Path, start: int, end: int) -> int:
+    """CSVのバイト範囲 [start, end) に含まれる引用符の数を返す（ワーカーで実行）
+
+    Args:
+        csv_path: CSVファイルのパス
+        start: 範囲の開始バイト位置
+        end: 範囲の終了バイト位置
+
+    Returns:
+        引用符（"）の数
+    """
+    with csv_path.open("rb") as f:
+        f.seek(start)
+        return f.read(end - start).count(b'"')
+
+
+def _parse_chunk(
+    csv_path: Path,
+    fieldnames: list[str],
+    start: int,
+    end: int,
+    in_quotes: bool,
+) -> tuple[list[tuple[int, MovieInput]], list[tuple[int, str]], int]:
+    """バイト範囲 [start, end) で始まるレコードをパースする（ワーカーで実行）
+
+    範囲の先頭がレコードの途中の場合は、次のレコードの先頭まで読み飛ばします
+    （そのレコードは前のチャンクが読み込みます）。範囲の末尾をまたぐレコードは
+    最後まで読み込みます。ワーカーのログは親プロセスに届かないため、
+    スキップした行は戻り値で返します。
+
+    Args:
+        csv_path: CSVファイルのパス
+        fieldnames: ヘッダーのフィールド名
+        start: 範囲の開始バイト位置（データ行の先頭より後）
+        end: 範囲の終了バイト位置
+        in_quotes: startが引用符で囲まれたフィールドの内側かどうか
+
+    Returns:
+        (チャンク内の番号とMovieInputのリスト, スキップした番号とエラーのリスト,
+        チャンク内のレコード数)のタプル（番号はチャンク内の0始まり）
+    """
+    lines: list[bytes] = []
+    with csv_path.open("rb") as f:
+        f.seek(start - 1)
+        position = start
+        # 直前が引用符の外の改行であれば、startはレコードの先頭
+        if f.read(1) != b"\n" or in_quotes:
+            quoted = in_quotes
+            for line in f:
+                position += len(line)
+                quoted ^= line.count(b'"') % 2 == 1
+                if not quoted and line.endswith(b"\n"):
+                    break
+        if position < end:
+            quoted = False
+            for line in f:
+                lines.append(line)
+                position += len(line)
+                quoted ^= line.count(b'"') % 2 == 1
+                if not quoted and position >= end:
+                    break
+
+    reader = csv.DictReader(
+        io.StringIO(b"".join(lines).decode("utf-8"), newline=""),
+        fieldnames=fieldnames,
+    )
+    records = list(enumerate(reader))
+    rows, skipped = validate_rows(records)
+    return rows, skipped, len(records)
+
 
 class CSVReader:
     """CSV読み込みクラス
 
     CSVファイルから映画情報を読み込む機能を提供します。
+    parse_workersに2以上を指定すると、非圧縮のCSVファイルはchunk_bytesごとの
+    バイト範囲に分割し、プロセスプールで並列にパース・検証します。
+    各ワーカーは範囲の先頭をレコードの境界に合わせて読み込むため、
+    親プロセスでファイル全体を走査しません（結果の順序とスキップ時の警告は
+    逐次読み込みと同じです）。
+
+    Args:
+        parse_workers: パースに使うプロセス数（1の場合は逐次読み込み）
+        chunk_bytes: 並列読み込みで1チャンクに含めるバイト数
+
+    Raises:
+        ValueError: parse_workersまたはchunk_bytesが1未満の場合
+
+    Examples:
+        reader = CSVReader(parse_workers=8)
+        movies = reader.read(Path("data/catalog.csv"))
     """
 
+    def __init__(
+        self, parse_workers: int = 1, chunk_bytes: int = _DEFAULT_CHUNK_BYTES
+    ) -> None:
+        if parse_workers < 1:
+            raise ValueError(
+                f"parse_workersは1以上を指定してください（指定値: {parse_workers}）"
+            )
+        if chunk_bytes < 1:
+            raise ValueError(
+                f"chunk_bytesは1以上を指定してください（指定値: {chunk_bytes}）"
+            )
+        self._parse_workers = parse_workers
+        self._chunk_bytes = chunk_bytes
+
     def read(self, csv_path: Path) -> list[MovieInput]:
         """CSVファイルから映画情報を読み込む
 
+        gzip / zstd圧縮されたファイルやJSON Linesのファイルも読み込めます
+        （形式はiter_movies()と同様に自動判定します）。
+
         Args:
-            csv_path: CSVファイルのパス
+            csv_path: CSVファイルのパス（"-" の場合は標準入力）
 
         Returns:
             MovieInputのリスト
@@ -26,44 +180,228 @@ class CSVReader:
             FileNotFoundError: CSVファイルが存在しない場合
             ValueError: CSVフォーマットが不正な場合
         """
-        logger.debug(f"CSVファイルを読み込み中: {csv_path}")
+        movies = list(self.iter_movies(csv_path))
+        logger.info(f"{csv_path} から {len(movies)} 件の映画を読み込みました")
+        return movies
+
+    def iter_movies(self, source: Path | str) -> Iterator[MovieInput]:
+        """入力元から映画情報を1件ずつ遅延して読み込む
+
+        圧縮形式（gzip / zstd）は先頭のマジックバイトで、入力形式（CSV / JSON Lines）は
+        拡張子または先頭の文字で自動判定します。全件をメモリに保持しないため、
+        大きなファイルや標準入力からのパイプでも一定のメモリで処理できます。
+        JSON Linesの各行は title, release_date, country を持つオブジェクトとします。
+
+        Args:
+            source: 入力元のパス（"-" の場合は標準入力）
+
+        Yields:
+            MovieInput（不正な行はスキップ）
+
+        Raises:
+            FileNotFoundError: ファイルが存在しない場合（最初の要素の取得時）
+            ValueError: フォーマットが不正な場合
+
+        Examples:
+            for movie in CSVReader().iter_movies(Path("movies.jsonl.gz")):
+                print(movie.title)
+        """
+        for _, movie in self._read_rows(source):
+            yield movie
+
+    def read_deduplicated(self, csv_path: Path) -> DeduplicatedInput:
+        """CSVファイルから映画情報を読み込み、重複する行を集約する
+
+        タイトルの表記揺れ（大文字小文字、全角・半角、空白や記号）と公開年が
+        一致する行を重複とみなし、最初に出現した行を代表として残します。
+        入力形式はread()と同様に自動判定します。
+
+        Args:
+            csv_path: CSVファイルのパス（"-" の場合は標準入力）
 
+        Returns:
+            代表行のリスト、各行と代表行の対応、集約した行のレポート
+
+        Raises:
+            FileNotFoundError: CSVファイルが存在しない場合
+            ValueError: CSVフォーマットが不正な場合
+        """
+        movies: list[MovieInput] = []
+        row_to_movie: list[int] = []
+        collapsed: list[CollapsedInputRow] = []
+        kept: dict[tuple[str, str], tuple[int, int]] = {}
+
+        for row_num, movie in self._read_rows(csv_path):
+            key = make_input_key(movie.title, movie.release_date)
+            if key not in kept:
+                kept[key] = (len(movies), row_num)
+                movies.append(movie)
+                row_to_movie.append(len(movies) - 1)
+                continue
+
+            movie_index, kept_row_num = kept[key]
+            row_to_movie.append(movie_index)
+            collapsed.append(
+                CollapsedInputRow(
+                    row_number=row_num,
+                    title=movie.title,
+                    release_date=movie.release_date,
+                    country=movie.country,
+                    kept_row_number=kept_row_num,
+                    kept_title=movies[movie_index].title,
+                )
+            )
+            logger.debug(
+                f"行 {row_num} を行 {kept_row_num} に集約しました（{movie.title}）"
+            )
+
+        logger.info(
+            f"{csv_path} から {len(row_to_movie)} 件の映画を読み込みました"
+            f"（重複を集約して {len(movies)} 件）"
+        )
+        return DeduplicatedInput(
+            movies=movies, row_to_movie=row_to_movie, collapsed=collapsed
+        )
+
+    def read_range(
+        self,
+        csv_path: Path,
+        start: int,
+        stop: int | None = None,
+        index: CSVOffsetIndex | None = None,
+    ) -> list[MovieInput]:
+        """CSVファイルのデータ行の範囲 [start, stop) のみを読み込む
+
+        バイト位置インデックスを使って開始行の近くへ直接seekするため、
+        開始行より前の行はパースしません。ヘッダーの検証はread()と同様に行います。
+
+        Args:
+            csv_path: CSVファイルのパス
+            start: 開始行の番号（0始まり、ヘッダーを除くデータ行の番号）
+            stop: 終了行の番号（この行は含まない、Noneの場合は最終行まで）
+            index: CSVのバイト位置インデックス（Noneの場合は保存済みの
+                インデックスを読み込み、なければ作成する）
+
+        Returns:
+            範囲内のMovieInputのリスト
+
+        Raises:
+            FileNotFoundError: CSVファイルが存在しない場合
+            ValueError: CSVフォーマットが不正な場合、または範囲が不正な場合
+        """
+        if start < 0 or (stop is not None and stop < start):
+            raise ValueError(f"不正な行範囲です: [{start}, {stop})")
         if not csv_path.exists():
             logger.error(f"CSVファイルが見つかりません: {csv_path}")
             raise FileNotFoundError(f"CSVファイルが見つかりません: {csv_path}")
 
-        movies: list[MovieInput] = []
-
         try:
-            with csv_path.open("r", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-
-                # ヘッダーチェック
-                required_fields = {"title", "release_date", "country"}
-                if not required_fields.issubset(set(reader.fieldnames or [])):
-                    raise ValueError(
-                        f"CSVに必要なフィールドがありません。必要: {required_fields}"
-                    )
+            with csv_path.open("r", encoding="utf-8", newline="") as f:
+                fieldnames = next(csv.reader(f), [])
+            validate_header(fieldnames, REQUIRED_FIELDS)
 
-                for row_num, row in enumerate(reader, start=2):
-                    try:
-                        movie = MovieInput(
-                            title=row["title"],
-                            release_date=row["release_date"],
-                            country=row["country"],
-                        )
-                        movies.append(movie)
-                    except Exception as e:
-                        logger.warning(
-                            f"行 {row_num} をスキップしました（エラー: {e}）"
-                        )
-                        continue
+            index = index or load_csv_index(csv_path)
+            stop = index.row_count if stop is None else min(stop, index.row_count)
+            if start >= stop:
+                return []
 
+            offset, skip = locate_row(index, start)
+            with csv_path.open("rb") as raw:
+                raw.seek(offset)
+                with io.TextIOWrapper(raw, encoding="utf-8", newline="") as f:
+                    reader = csv.DictReader(f, fieldnames=fieldnames)
+                    records = islice(reader, skip, skip + stop - start)
+                    rows = list(self._parse_rows(enumerate(records, start=start + 2)))
         except ValueError:
             raise
         except Exception as e:
             logger.error(f"CSVファイルの読み込みに失敗しました: {e}")
             raise ValueError(f"CSVファイルの読み込みに失敗しました: {e}") from e
 
-        logger.info(f"{csv_path} から {len(movies)} 件の映画を読み込みました")
-        return movies
+        logger.info(
+            f"{csv_path} の {start}〜{stop - 1}行目から "
+            f"{len(rows)} 件の映画を読み込みました"
+        )
+        return [movie for _, movie in rows]
+
+    def _read_rows(self, source: Path | str) -> Iterator[tuple[int, MovieInput]]:
+        """入力元の各行を行番号とともに遅延して読み込む"""
+        logger.debug(f"入力を読み込み中: {source}")
+
+        if not is_stdin(source) and not Path(source).exists():
+            logger.error(f"CSVファイルが見つかりません: {source}")
+            raise FileNotFoundError(f"CSVファイルが見つかりません: {source}")
+
+        try:
+            if self._parse_workers > 1 and is_plain_csv(source):
+                yield from self._read_rows_parallel(Path(source))
+            else:
+                # 標準入力やパイプは次の行が届くまで待つため、まとめずに1行ずつ検証する
+                streaming = is_stdin(source) or not Path(source).is_file()
+                yield from self._parse_rows(
+                    iter_records(source, REQUIRED_FIELDS),
+                    batch_size=1 if streaming else _VALIDATION_BATCH_SIZE,
+                )
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error(f"CSVファイルの読み込みに失敗しました: {e}")
+            raise ValueError(f"CSVファイルの読み込みに失敗しました: {e}") from e
+
+    def _read_rows_parallel(self, csv_path: Path) -> Iterator[tuple[int, MovieInput]]:
+        """CSVファイルをバイト範囲のチャンクに分割し、プロセスプールで並列に読み込む"""
+        with csv_path.open("r", encoding="utf-8", newline="") as f:
+            fieldnames = next(csv.reader(f), [])
+        validate_header(fieldnames, REQUIRED_FIELDS)
+        with csv_path.open("rb") as f:
+            records = iter_record_offsets(f)
+            next(records, None)  # ヘッダー
+            data_start = next(records, None)
+        if data_start is None:
+            return
+
+        size = csv_path.stat().st_size
+        starts = list(range(data_start, size, self._chunk_bytes))
+        ends = [*starts[1:], size]
+        logger.debug(
+            f"{csv_path} を {len(starts)} チャンクに分割し、"
+            f"{self._parse_workers} プロセスで読み込みます"
+        )
+        with ProcessPoolExecutor(max_workers=self._parse_workers) as executor:
+            # 各チャンクの先頭が引用符の内側かどうかを、引用符の数の偶奇から求める
+            quote_counts = executor.map(_count_quotes, repeat(csv_path), starts, ends)
+            in_quotes = [total % 2 == 1 for total in accumulate(quote_counts)]
+            chunks = executor.map(
+                _parse_chunk,
+                repeat(csv_path),
+                repeat(fieldnames),
+                starts,
+                ends,
+                [False, *in_quotes[:-1]],
+            )
+            # チャンク内の番号を、前のチャンクまでのレコード数から行番号に変換する
+            first_row_num = 2
+            for rows, skipped, record_count in chunks:
+                for index, error in skipped:
+                    logger.warning(
+                        f"行 {first_row_num + index} をスキップしました"
+                        f"（エラー: {error}）"
+                    )
+                for index, movie in rows:
+                    yield first_row_num + index, movie
+                first_row_num += record_count
+
+    def _parse_rows(
+        self,
+        records: Iterable[tuple[int, dict[str, str]]],
+        batch_size: int = _VALIDATION_BATCH_SIZE,
+    ) -> Iterator[tuple[int, MovieInput]]:
+        """行番号付きの各行をMovieInputに変換する（不正な行はスキップ）
+
+        batch_size行ずつまとめて検証します。
+        """
+        for batch in batched(records, batch_size, strict=False):
+            rows, skipped = validate_rows(batch)
+            for row_num, error in skipped:
+                logger.warning(f"行 {row_num} をスキップしました（エラー: {error}）")
+            yield from rows
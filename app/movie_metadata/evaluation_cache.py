@@ -0,0 +1,152 @@
+"""メタデータ評価結果のキャッシュモジュール
+
+同一内容のMovieMetadataに対する評価結果を再利用し、重複したLLM呼び出しを削減します。
+キャッシュするのは閾値に依存しないスコアと改善提案のみで、
+合格判定は利用時の閾値で再計算します。
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from pathlib import Path
+
+from movie_metadata.atomic_io import GroupCommitWriter
+from movie_metadata.fingerprint import canonical_metadata_json
+from movie_metadata.models import MetadataEvaluationOutput, MovieMetadata
+from movie_metadata.prompts import (
+    METADATA_BATCH_EVALUATION_PROMPT_TEMPLATE,
+    METADATA_EVALUATION_PROMPT_TEMPLATE,
+)
+
+logger = logging.getLogger(__name__)
+
+# 保存する内容の形式（ルールベースのスコアをマージする前のLLMの出力）。
+# 形式を変更した場合は更新し、以前の形式のエントリを無効にする
+_CACHE_FORMAT = "llm-output-v2"
+
+# 評価基準のバージョン（単体・バッチいずれかのプロンプトが変われば
+# キャッシュは自動的に無効になる）
+EVALUATION_RUBRIC_VERSION = hashlib.sha256(
+    "\n".join(
+        [
+            _CACHE_FORMAT,
+            METADATA_EVALUATION_PROMPT_TEMPLATE,
+            METADATA_BATCH_EVALUATION_PROMPT_TEMPLATE,
+        ]
+    ).encode("utf-8")
+).hexdigest()[:16]
+
+
+class EvaluationCache:
+    """メタデータ評価結果のキャッシュクラス
+
+    正規化したメタデータ、評価基準のバージョン、モデル名から生成したキーで
+    LLMが返したMetadataEvaluationOutputを保持します。ルールベースの事前評価は
+    ルールの変更がすぐ反映されるよう、キャッシュには含めず読み出し後に適用します。
+    pathを指定した場合はJSON Lines形式で追記保存し、次回以降の実行でも再利用します。
+    追記はグループコミットでまとめてfsyncするため、使用後はclose()を呼び出してください。
+
+    Args:
+        path: 永続化先のJSON Linesファイルのパス（Noneの場合はメモリのみ）
+
+    Examples:
+        cache = EvaluationCache(Path("data/cache/evaluation_cache.jsonl"))
+        key = cache.make_key(metadata, model_name="gemini-2.0-flash")
+        output = cache.get(key)
+    """
+
+    def __init__(self, path: Path | None = None) -> None:
+        self._path = path
+        self._writer: GroupCommitWriter | None = None
+        self._entries: dict[str, MetadataEvaluationOutput] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if path is not None and path.exists():
+            self._load(path)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def make_key(metadata: MovieMetadata, model_name: str) -> str:
+        """キャッシュキーを生成する
+
+        Args:
+            metadata: 評価対象のメタデータ
+            model_name: 評価に使用するモデル名
+
+        Returns:
+            キャッシュキー（SHA-256の16進文字列）
+        """
+        payload = "\n".join(
+            [
+                EVALUATION_RUBRIC_VERSION,
+                model_name,
+                canonical_metadata_json(metadata),
+            ]
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> MetadataEvaluationOutput | None:
+        """キャッシュされた評価結果を取得する
+
+        Args:
+            key: make_key()で生成したキー
+
+        Returns:
+            キャッシュされた評価結果（存在しない場合はNone）
+        """
+        with self._lock:
+            output = self._entries.get(key)
+            if output is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return output
+
+    def put(self, key: str, output: MetadataEvaluationOutput) -> None:
+        """評価結果をキャッシュに保存する
+
+        Args:
+            key: make_key()で生成したキー
+            output: 閾値に依存しない評価結果
+        """
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = output
+            if self._path is not None:
+                self._append(self._path, key, output)
+
+    def close(self) -> None:
+        """未同期の追記内容を同期して永続化ファイルを閉じる"""
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+    def _load(self, path: Path) -> None:
+        """永続化ファイルからキャッシュを読み込む（壊れた行はスキップ）"""
+        with path.open("r", encoding="utf-8") as f:
+            for line_num, line in enumerate(f, start=1):
+                try:
+                    record = json.loads(line)
+                    output = MetadataEvaluationOutput.model_validate(record["output"])
+                    self._entries[record["key"]] = output
+                except Exception as e:
+                    logger.warning(
+                        f"評価キャッシュの {line_num} 行目をスキップしました"
+                        f"（エラー: {e}）"
+                    )
+        logger.info(
+            f"{path} から {len(self._entries)} 件の評価キャッシュを読み込みました"
+        )
+
+    def _append(self, path: Path, key: str, output: MetadataEvaluationOutput) -> None:
+        """評価結果を永続化ファイルに追記する（ロック取得済みで呼び出す）"""
+        if self._writer is None:
+            self._writer = GroupCommitWriter(path)
+        record = {"key": key, "output": output.model_dump()}
+        self._writer.write_line(json.dumps(record, ensure_ascii=False))
@@ -5,13 +5,21 @@ MovieMetadataの各項目をLLM as a Judge（Direct Assessment）で評価する
 
 import logging
 
+from movie_metadata.evaluation_cache import EvaluationCache
 from movie_metadata.genai_client import GenAIClient
 from movie_metadata.models import (
+    MetadataBatchEvaluationItem,
+    MetadataBatchEvaluationOutput,
     MetadataEvaluationOutput,
     MetadataEvaluationResult,
+    MetadataFieldScore,
     MovieMetadata,
 )
-from movie_metadata.prompts import build_metadata_evaluation_prompt
+from movie_metadata.pre_evaluator import EVALUATED_FIELDS, RuleBasedPreEvaluator
+from movie_metadata.prompts import (
+    build_metadata_batch_evaluation_prompt,
+    build_metadata_evaluation_prompt,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -20,11 +28,16 @@ class MetadataEvaluator:
     """メタデータ評価クラス
 
     MovieMetadataの各フィールドをLLMで評価し、品質スコアと改善提案を生成します。
+    LLM呼び出しの前にルールベースの事前評価を行い、すべてのフィールドが
+    明らかな欠損と判定された場合はLLM呼び出しを省略します。
+    キャッシュを指定した場合、同一内容のメタデータの評価結果を再利用します。
 
     Args:
         api_key: Google GenAI APIキー
         model_name: 使用するモデル名（デフォルト: gemini-2.0-flash）
         threshold: 合格判定の閾値（デフォルト: 4.0）
+        pre_evaluator: ルールベースの事前評価器（デフォルト: RuleBasedPreEvaluator）
+        cache: 評価結果のキャッシュ（デフォルト: None、キャッシュしない）
 
     Examples:
         evaluator = MetadataEvaluator(api_key="YOUR_KEY", threshold=4.0)
@@ -33,24 +46,35 @@ class MetadataEvaluator:
     """
 
     def __init__(
-        self, api_key: str, model_name: str = "gemini-2.0-flash", threshold: float = 4.0
+        self,
+        api_key: str,
+        model_name: str = "gemini-2.0-flash",
+        threshold: float = 4.0,
+        pre_evaluator: RuleBasedPreEvaluator | None = None,
+        cache: EvaluationCache | None = None,
     ) -> None:
         self.api_key = api_key
         self.model_name = model_name
         self.threshold = threshold
+        self.pre_evaluator = pre_evaluator or RuleBasedPreEvaluator()
+        self.cache = cache
         logger.info(
             f"MetadataEvaluatorを初期化しました（モデル: {model_name}, "
             f"閾値: {threshold}）"
         )
 
     def evaluate(
-        self, metadata: MovieMetadata, iteration: int = 1
+        self,
+        metadata: MovieMetadata,
+        iteration: int = 1,
+        threshold: float | None = None,
     ) -> MetadataEvaluationResult:
         """メタデータを評価する
 
         Args:
             metadata: 評価対象のメタデータ
             iteration: イテレーション番号（デフォルト: 1）
+            threshold: 合格判定の閾値（デフォルト: 初期化時の閾値）
 
         Returns:
             MetadataEvaluationResult: 評価結果
@@ -64,7 +88,35 @@ class MetadataEvaluator:
             f"タイトル: {metadata.title}）"
         )
 
-        # 1. プロンプト構築
+        # 1. ルールベースの事前評価（すべて欠損ならLLM呼び出しを省略）
+        rule_scores = self.pre_evaluator.evaluate(metadata)
+        if self.pre_evaluator.is_decisive(rule_scores):
+            logger.info(
+                "ルールベース評価で全フィールドが欠損と判定されたため、"
+                "LLM評価をスキップします"
+            )
+            return self._build_result(
+                iteration=iteration,
+                threshold=threshold,
+                field_scores=rule_scores,
+                improvement_suggestions=self.pre_evaluator.build_suggestions(
+                    rule_scores
+                ),
+            )
+
+        # 2. キャッシュ済みのLLMの評価結果があれば再利用
+        # （ルールベースのスコアのマージと合格判定は現在の設定で再計算）
+        cached = self._get_cached(metadata)
+        if cached is not None:
+            logger.info("キャッシュ済みの評価結果を再利用します")
+            return self._build_result(
+                iteration=iteration,
+                threshold=threshold,
+                field_scores=self.pre_evaluator.merge(cached.field_scores, rule_scores),
+                improvement_suggestions=cached.improvement_suggestions,
+            )
+
+        # 3. プロンプト構築
         prompt = build_metadata_evaluation_prompt(
             title=metadata.title,
             release_date=metadata.release_date,
@@ -81,7 +133,7 @@ class MetadataEvaluator:
             voice_actors=metadata.voice_actors,
         )
 
-        # 2. GenAIClientで評価実行
+        # 4. GenAIClientで評価実行
         with GenAIClient(api_key=self.api_key, model_name=self.model_name) as client:
             try:
                 response_text = client.generate_content(
@@ -89,7 +141,7 @@ class MetadataEvaluator:
                     response_schema=MetadataEvaluationOutput,
                 )
 
-                # 3. パース
+                # 5. パース
                 output = MetadataEvaluationOutput.model_validate_json(response_text)
 
                 logger.debug(
@@ -100,22 +152,239 @@ class MetadataEvaluator:
                 logger.error(f"メタデータ評価に失敗しました ({type(e).__name__}: {e})")
                 raise
 
-        # 4. overall_statusを計算
+        # 6. LLMの出力をキャッシュに保存し、ルールベースの判定を優先してマージ
+        self._put_cached(metadata, output.field_scores, output.improvement_suggestions)
+        field_scores = self.pre_evaluator.merge(output.field_scores, rule_scores)
+
+        return self._build_result(
+            iteration=iteration,
+            threshold=threshold,
+            field_scores=field_scores,
+            improvement_suggestions=output.improvement_suggestions,
+        )
+
+    def evaluate_batch(
+        self,
+        metadata_list: list[MovieMetadata],
+        iteration: int = 1,
+        batch_size: int = 10,
+        threshold: float | None = None,
+    ) -> list[MetadataEvaluationResult]:
+        """複数のメタデータをまとめて評価する
+
+        batch_size件ずつ1回のリクエストで評価し、評価基準の送信とリクエスト数を
+        削減します。応答に含まれなかった作品や不正な応答の作品は、
+        evaluate()による1件ずつの評価にフォールバックします。
+
+        Args:
+            metadata_list: 評価対象のメタデータのリスト
+            iteration: イテレーション番号（デフォルト: 1）
+            batch_size: 1リクエストあたりの作品数（デフォルト: 10）
+            threshold: 合格判定の閾値（デフォルト: 初期化時の閾値）
+
+        Returns:
+            metadata_listと同じ順序の評価結果のリスト
+
+        Raises:
+            ValueError: batch_sizeが1未満の場合
+            Exception: フォールバック評価でAPI呼び出しまたはパースに失敗した場合
+        """
+        if batch_size < 1:
+            raise ValueError(
+                f"batch_sizeは1以上である必要があります（受け取った値: {batch_size}）"
+            )
+
+        logger.info(
+            f"バッチ評価を開始します（件数: {len(metadata_list)}, "
+            f"バッチサイズ: {batch_size}, イテレーション: {iteration}）"
+        )
+
+        results: list[MetadataEvaluationResult | None] = [None] * len(metadata_list)
+        rule_scores_list = [self.pre_evaluator.evaluate(m) for m in metadata_list]
+
+        # ルールベースで確定した作品はLLMに送らない
+        pending: list[int] = []
+        for index, rule_scores in enumerate(rule_scores_list):
+            cached = self._get_cached(metadata_list[index])
+            if self.pre_evaluator.is_decisive(rule_scores):
+                results[index] = self._build_result(
+                    iteration=iteration,
+                    threshold=threshold,
+                    field_scores=rule_scores,
+                    improvement_suggestions=self.pre_evaluator.build_suggestions(
+                        rule_scores
+                    ),
+                )
+            elif cached is not None:
+                results[index] = self._build_result(
+                    iteration=iteration,
+                    threshold=threshold,
+                    field_scores=self.pre_evaluator.merge(
+                        cached.field_scores, rule_scores
+                    ),
+                    improvement_suggestions=cached.improvement_suggestions,
+                )
+            else:
+                pending.append(index)
+
+        fallback: list[int] = []
+        for start in range(0, len(pending), batch_size):
+            chunk = pending[start : start + batch_size]
+
+            # 同一チャンク内でタイトルが重複する作品は応答を対応付けられない
+            chunk_titles: set[str] = set()
+            batch_indices: list[int] = []
+            for index in chunk:
+                title = metadata_list[index].title
+                if title in chunk_titles:
+                    fallback.append(index)
+                else:
+                    chunk_titles.add(title)
+                    batch_indices.append(index)
+
+            items = self._evaluate_chunk([metadata_list[i] for i in batch_indices])
+            for index in batch_indices:
+                item = items.get(metadata_list[index].title)
+                if item is None:
+                    fallback.append(index)
+                    continue
+                self._put_cached(
+                    metadata_list[index],
+                    item.field_scores,
+                    item.improvement_suggestions,
+                )
+                field_scores = self.pre_evaluator.merge(
+                    item.field_scores, rule_scores_list[index]
+                )
+                results[index] = self._build_result(
+                    iteration=iteration,
+                    threshold=threshold,
+                    field_scores=field_scores,
+                    improvement_suggestions=item.improvement_suggestions,
+                )
+
+        if fallback:
+            logger.warning(
+                f"バッチ評価で結果が得られなかった{len(fallback)}件を1件ずつ評価します"
+            )
+        for index in fallback:
+            results[index] = self.evaluate(metadata_list[index], iteration, threshold)
+
+        return [result for result in results if result is not None]
+
+    def _evaluate_chunk(
+        self, metadata_list: list[MovieMetadata]
+    ) -> dict[str, MetadataBatchEvaluationItem]:
+        """1回のリクエストで複数作品を評価し、タイトルをキーにした辞書を返す
+
+        API呼び出しやパースに失敗した場合は空の辞書を返し、
+        呼び出し側のフォールバックに委ねます。評価対象フィールドのスコアが
+        欠けている作品も辞書に含めず、1件ずつの評価にフォールバックさせます。
+
+        Args:
+            metadata_list: 評価対象のメタデータ（タイトルの重複なし）
+
+        Returns:
+            タイトルをキーにしたLLM出力の辞書
+        """
+        if not metadata_list:
+            return {}
+
+        prompt = build_metadata_batch_evaluation_prompt(metadata_list)
+
+        with GenAIClient(api_key=self.api_key, model_name=self.model_name) as client:
+            try:
+                response_text = client.generate_content(
+                    prompt=prompt,
+                    response_schema=MetadataBatchEvaluationOutput,
+                )
+                output = MetadataBatchEvaluationOutput.model_validate_json(
+                    response_text
+                )
+            except Exception as e:
+                logger.warning(
+                    f"バッチ評価に失敗しました ({type(e).__name__}: {e})。"
+                    f"1件ずつの評価にフォールバックします"
+                )
+                return {}
+
+        expected_titles = {metadata.title for metadata in metadata_list}
+        items: dict[str, MetadataBatchEvaluationItem] = {}
+        for item in output.results:
+            if item.title not in expected_titles:
+                continue
+            scored = {score.field_name for score in item.field_scores}
+            missing_fields = set(EVALUATED_FIELDS) - scored
+            if missing_fields:
+                logger.warning(
+                    f"バッチ評価の応答で評価対象フィールドが欠けています"
+                    f"（タイトル: {item.title}, 欠落: {sorted(missing_fields)}）"
+                )
+                continue
+            items[item.title] = item
+        missing = expected_titles - items.keys()
+        if missing:
+            logger.warning(f"バッチ評価の応答に含まれない作品があります: {missing}")
+        return items
+
+    def _get_cached(self, metadata: MovieMetadata) -> MetadataEvaluationOutput | None:
+        """キャッシュ済みの評価結果を返す（キャッシュ未設定・未登録の場合はNone）"""
+        if self.cache is None:
+            return None
+        return self.cache.get(self.cache.make_key(metadata, self.model_name))
+
+    def _put_cached(
+        self,
+        metadata: MovieMetadata,
+        field_scores: list[MetadataFieldScore],
+        improvement_suggestions: str,
+    ) -> None:
+        """閾値・ルールベースの判定に依存しないLLMの評価結果をキャッシュに保存する"""
+        if self.cache is None:
+            return
+        self.cache.put(
+            self.cache.make_key(metadata, self.model_name),
+            MetadataEvaluationOutput(
+                field_scores=field_scores,
+                improvement_suggestions=improvement_suggestions,
+            ),
+        )
+
+    def _build_result(
+        self,
+        iteration: int,
+        field_scores: list[MetadataFieldScore],
+        improvement_suggestions: str,
+        threshold: float | None = None,
+    ) -> MetadataEvaluationResult:
+        """フィールドスコアから評価結果を構築する
+
+        Args:
+            iteration: イテレーション番号
+            field_scores: 各フィールドのスコア
+            improvement_suggestions: 改善提案
+            threshold: 合格判定の閾値（Noneの場合は初期化時の閾値）
+
+        Returns:
+            MetadataEvaluationResult: 評価結果
+        """
+        if threshold is None:
+            threshold = self.threshold
+
         # すべてのフィールドが閾値以上なら"pass"、1つでも閾値未満なら"fail"
-        all_pass = all(score.score >= self.threshold for score in output.field_scores)
+        all_pass = all(score.score >= threshold for score in field_scores)
         overall_status = "pass" if all_pass else "fail"
 
         # 平均スコアを計算
-        avg_score = sum(s.score for s in output.field_scores) / len(output.field_scores)
+        avg_score = sum(s.score for s in field_scores) / len(field_scores)
         logger.info(
             f"評価結果: {overall_status} (平均スコア: {avg_score:.2f}, "
-            f"閾値: {self.threshold})"
+            f"閾値: {threshold})"
         )
 
-        # 5. MetadataEvaluationResultを構築して返す
         return MetadataEvaluationResult(
             iteration=iteration,
-            field_scores=output.field_scores,
+            field_scores=field_scores,
             overall_status=overall_status,
-            improvement_suggestions=output.improvement_suggestions,
+            improvement_suggestions=improvement_suggestions,
         )
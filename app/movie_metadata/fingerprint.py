@@ -0,0 +1,42 @@
+"""メタデータのフィンガープリント生成モジュール
+
+MovieMetadataを正規化したJSONからハッシュ値を生成し、
+同一内容のメタデータを高速に比較できるようにします。
+"""
+
+import hashlib
+import json
+
+from movie_metadata.models import MovieMetadata
+
+
+def canonical_metadata_json(metadata: MovieMetadata) -> str:
+    """メタデータを正規化したJSON文字列に変換する
+
+    キー順序と区切り文字を固定するため、同じ内容なら常に同じ文字列になります。
+
+    Args:
+        metadata: 対象のメタデータ
+
+    Returns:
+        正規化されたJSON文字列
+    """
+    return json.dumps(
+        metadata.model_dump(),
+        ensure_ascii=False,
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+
+
+def metadata_fingerprint(metadata: MovieMetadata) -> str:
+    """メタデータのフィンガープリント（SHA-256の16進文字列）を返す
+
+    Args:
+        metadata: 対象のメタデータ
+
+    Returns:
+        フィンガープリント
+    """
+    canonical = canonical_metadata_json(metadata)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
@@ -79,6 +79,7 @@ class GenAIClient:
         *,
         response_schema: type[BaseModel] | None = None,
         use_google_search: bool = False,
+        temperature: float | None = None,
     ) -> str:
         """コンテンツを生成する
 
@@ -86,6 +87,7 @@ class GenAIClient:
             prompt: 生成プロンプト
             response_schema: レスポンスのPydanticスキーマ（JSON出力時）
             use_google_search: Google Search groundingを使用するか
+            temperature: サンプリング温度（Noneの場合はモデルのデフォルト）
 
         Returns:
             生成されたテキスト
@@ -104,6 +106,7 @@ class GenAIClient:
             tools=tools,
             response_mime_type="application/json" if response_schema else None,
             response_schema=response_schema,
+            temperature=temperature,
         )
 
         logger.debug(
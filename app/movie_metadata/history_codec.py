@@ -0,0 +1,389 @@
+"""リファインメント履歴の差分エンコーディングモジュール
+
+MetadataRefinementResult.historyは各イテレーションのMovieMetadataを丸ごと保持するため、
+バッチ出力が大きくなります。このモジュールでは1イテレーション目のみ完全なメタデータを
+保持し、以降は前イテレーションから変化したフィールドのみを保存する形式に変換します。
+MetadataBlobStoreを使う形式では、メタデータ自体をストアに保存し、内容ハッシュで参照します。
+読み込み時は履歴エントリを参照されたときに初めて復元します。
+"""
+
+import json
+from collections.abc import Iterable, Iterator, Sequence
+from pathlib import Path
+from typing import Any, overload
+
+from movie_metadata.blob_store import MetadataBlobStore
+from movie_metadata.compressed_io import detect_compression, iter_lines, read_json
+from movie_metadata.models import (
+    BatchRefinementResult,
+    MetadataEvaluationResult,
+    MetadataRefinementResult,
+    MovieMetadata,
+    RefinementHistoryEntry,
+)
+
+# 差分エンコーディング形式の識別子（形式を変更した場合は更新する）
+HISTORY_ENCODING = "delta-v1"
+
+# メタデータをMetadataBlobStoreのハッシュで参照する形式の識別子
+BLOB_REF_ENCODING = "blob-ref-v1"
+
+
+def diff_metadata(previous: dict[str, Any], current: dict[str, Any]) -> dict[str, Any]:
+    """2つのメタデータ辞書の差分を返す
+
+    Args:
+        previous: 比較元のメタデータ辞書
+        current: 比較先のメタデータ辞書
+
+    Returns:
+        currentで値が変化したフィールドのみを含む辞書
+    """
+    return {
+        field_name: value
+        for field_name, value in current.items()
+        if previous.get(field_name) != value
+    }
+
+
+def encode_refinement_result(result: MetadataRefinementResult) -> dict[str, Any]:
+    """リファインメント結果を差分エンコーディング形式の辞書に変換する
+
+    Args:
+        result: 変換するリファインメント結果
+
+    Returns:
+        1イテレーション目のみ完全なメタデータを持ち、
+        以降はmetadata_diffを持つ辞書
+    """
+    history: list[dict[str, Any]] = []
+    previous: dict[str, Any] | None = None
+    for entry in result.history:
+        metadata = entry.metadata.model_dump()
+        encoded: dict[str, Any] = {"iteration": entry.iteration}
+        if previous is None:
+            encoded["metadata"] = metadata
+        else:
+            encoded["metadata_diff"] = diff_metadata(previous, metadata)
+        encoded["evaluation"] = entry.evaluation.model_dump()
+        history.append(encoded)
+        previous = metadata
+
+    final_metadata = result.final_metadata.model_dump()
+    data: dict[str, Any] = {"history_encoding": HISTORY_ENCODING}
+    if previous is None:
+        data["final_metadata"] = final_metadata
+    else:
+        data["final_metadata_diff"] = diff_metadata(previous, final_metadata)
+    data.update(
+        history=history,
+        success=result.success,
+        total_iterations=result.total_iterations,
+        stop_reason=result.stop_reason,
+    )
+    return data
+
+
+def encode_refinement_result_refs(
+    result: MetadataRefinementResult, blob_store: MetadataBlobStore
+) -> dict[str, Any]:
+    """リファインメント結果のメタデータをストアに保存し、ハッシュ参照の辞書に変換する
+
+    Args:
+        result: 変換するリファインメント結果
+        blob_store: メタデータの保存先
+
+    Returns:
+        metadataの代わりにmetadata_ref（内容ハッシュ）を持つ辞書
+    """
+    history = [
+        {
+            "iteration": entry.iteration,
+            "metadata_ref": blob_store.put(entry.metadata),
+            "evaluation": entry.evaluation.model_dump(),
+        }
+        for entry in result.history
+    ]
+    return {
+        "history_encoding": BLOB_REF_ENCODING,
+        "final_metadata_ref": blob_store.put(result.final_metadata),
+        "history": history,
+        "success": result.success,
+        "total_iterations": result.total_iterations,
+        "stop_reason": result.stop_reason,
+    }
+
+
+def encode_batch_refinement_result(
+    batch_result: BatchRefinementResult,
+    blob_store: MetadataBlobStore | None = None,
+) -> dict[str, Any]:
+    """バッチ結果の各リファインメント結果を差分エンコーディング形式に変換する
+
+    Args:
+        batch_result: 変換するバッチ結果
+        blob_store: 指定した場合はメタデータをストアに保存し、ハッシュで参照する
+
+    Returns:
+        resultsを差分エンコーディング（またはハッシュ参照に変換）した辞書
+    """
+    data = batch_result.model_dump(exclude={"results"})
+    data["results"] = [
+        encode_refinement_result(result)
+        if blob_store is None
+        else encode_refinement_result_refs(result, blob_store)
+        for result in batch_result.results
+    ]
+    return data
+
+
+def iter_metadata_refs(data: dict[str, Any]) -> Iterator[str]:
+    """エンコード済みのリファインメント結果が参照するハッシュを列挙する
+
+    Args:
+        data: encode_refinement_result_refs()の戻り値
+
+    Yields:
+        final_metadataと各履歴エントリのメタデータのハッシュ
+    """
+    if not isinstance(data, dict):
+        return
+    if "final_metadata_ref" in data:
+        yield data["final_metadata_ref"]
+    for entry in data.get("history", []):
+        if "metadata_ref" in entry:
+            yield entry["metadata_ref"]
+
+
+class LazyRefinementHistory(Sequence[RefinementHistoryEntry]):
+    """差分エンコーディングされた履歴を遅延復元するシーケンス
+
+    エントリにアクセスされた時点で、先頭から差分を適用してメタデータを復元します。
+    復元済みのメタデータ辞書はキャッシュし、同じ差分を二度適用しません。
+    metadataを持つエントリ（非圧縮形式）は、その時点で完全な値として扱います。
+
+    Args:
+        encoded_entries: encode_refinement_result()が生成したhistoryのリスト
+        blob_store: metadata_refを持つエントリの復元に使うストア
+    """
+
+    def __init__(
+        self,
+        encoded_entries: list[dict[str, Any]],
+        blob_store: MetadataBlobStore | None = None,
+    ) -> None:
+        self._encoded = encoded_entries
+        self._blob_store = blob_store
+        self._metadata_dicts: list[dict[str, Any]] = []
+        self._entries: dict[int, RefinementHistoryEntry] = {}
+
+    def __len__(self) -> int:
+        return len(self._encoded)
+
+    @overload
+    def __getitem__(self, index: int) -> RefinementHistoryEntry: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[RefinementHistoryEntry]: ...
+
+    def __getitem__(
+        self, index: int | slice
+    ) -> RefinementHistoryEntry | list[RefinementHistoryEntry]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("履歴のインデックスが範囲外です")
+        if index not in self._entries:
+            encoded = self._encoded[index]
+            self._entries[index] = RefinementHistoryEntry(
+                iteration=encoded["iteration"],
+                metadata=MovieMetadata.model_validate(self.metadata_dict(index)),
+                evaluation=MetadataEvaluationResult.model_validate(
+                    encoded["evaluation"]
+                ),
+            )
+        return self._entries[index]
+
+    def __iter__(self) -> Iterator[RefinementHistoryEntry]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def metadata_dict(self, index: int) -> dict[str, Any]:
+        """指定したエントリのメタデータ辞書を復元する
+
+        Args:
+            index: 履歴のインデックス（0始まり）
+
+        Returns:
+            復元したメタデータ辞書
+        """
+        while len(self._metadata_dicts) <= index:
+            encoded = self._encoded[len(self._metadata_dicts)]
+            if "metadata" in encoded:
+                restored = dict(encoded["metadata"])
+            elif "metadata_ref" in encoded:
+                restored = _resolve_ref(
+                    self._blob_store, encoded["metadata_ref"]
+                ).model_dump()
+            else:
+                restored = {**self._metadata_dicts[-1], **encoded["metadata_diff"]}
+            self._metadata_dicts.append(restored)
+        return self._metadata_dicts[index]
+
+
+class LazyRefinementResult:
+    """差分エンコーディングされたリファインメント結果の遅延ローダー
+
+    success等の軽量なフィールドは即座に参照でき、
+    final_metadataとhistoryは参照時に復元します。
+
+    Args:
+        data: encode_refinement_result()・encode_refinement_result_refs()の戻り値、
+            またはMetadataRefinementResult.model_dump()の戻り値
+        blob_store: ハッシュ参照形式の復元に使うストア
+
+    Examples:
+        result = LazyRefinementResult(data)
+        if not result.success:
+            print(result.history[-1].evaluation.improvement_suggestions)
+    """
+
+    def __init__(
+        self, data: dict[str, Any], blob_store: MetadataBlobStore | None = None
+    ) -> None:
+        self._data = data
+        self._blob_store = blob_store
+        self.history = LazyRefinementHistory(data["history"], blob_store)
+        self.success: bool = data["success"]
+        self.total_iterations: int = data["total_iterations"]
+        self.stop_reason: str | None = data.get("stop_reason")
+        self._final_metadata: MovieMetadata | None = None
+
+    @property
+    def final_metadata(self) -> MovieMetadata:
+        """最終的なメタデータ（初回参照時に復元）"""
+        if self._final_metadata is None:
+            if self.final_metadata_ref is not None:
+                self._final_metadata = _resolve_ref(
+                    self._blob_store, self.final_metadata_ref
+                )
+                return self._final_metadata
+            if "final_metadata" in self._data:
+                final = self._data["final_metadata"]
+            else:
+                final = {
+                    **self.history.metadata_dict(len(self.history) - 1),
+                    **self._data["final_metadata_diff"],
+                }
+            self._final_metadata = MovieMetadata.model_validate(final)
+        return self._final_metadata
+
+    @property
+    def final_metadata_ref(self) -> str | None:
+        """最終的なメタデータの内容ハッシュ（ハッシュ参照形式の場合のみ）
+
+        同じハッシュを持つ結果は最終的なメタデータが同一であるため、
+        メタデータを復元せずに比較できます。
+        """
+        return self._data.get("final_metadata_ref")
+
+    def to_model(self) -> MetadataRefinementResult:
+        """完全なMetadataRefinementResultに復元する
+
+        Returns:
+            すべての履歴を復元したリファインメント結果
+        """
+        return MetadataRefinementResult(
+            final_metadata=self.final_metadata,
+            history=list(self.history),
+            success=self.success,
+            total_iterations=self.total_iterations,
+            stop_reason=self.stop_reason,
+        )
+
+
+def load_refinement_results(
+    path: Path, blob_store: MetadataBlobStore | None = None
+) -> list[LazyRefinementResult]:
+    """バッチ結果ファイルからリファインメント結果を遅延ローダーとして読み込む
+
+    差分エンコーディング形式、ハッシュ参照形式と従来の形式、
+    gzip / zstd圧縮のいずれにも対応します。
+
+    Args:
+        path: write_batch()が出力したJSONファイルのパス（.gz / .zst も可）
+        blob_store: ハッシュ参照形式の復元に使うストア
+
+    Returns:
+        各映画のLazyRefinementResultのリスト
+    """
+    data = read_json(path)
+    return [LazyRefinementResult(result, blob_store) for result in data["results"]]
+
+
+def iter_journal(
+    path: Path, blob_store: MetadataBlobStore | None = None
+) -> Iterator[LazyRefinementResult]:
+    """ジャーナル（JSON Lines）からリファインメント結果を1件ずつ読み込む
+
+    Args:
+        path: RefinementResultJournalが出力したファイルのパス（.gz / .zst も可）
+        blob_store: ハッシュ参照形式の復元に使うストア
+
+    Yields:
+        各映画のLazyRefinementResult
+    """
+    for line in iter_lines(path):
+        if line:
+            yield LazyRefinementResult(json.loads(line), blob_store)
+
+
+def collect_metadata_refs(paths: Iterable[Path]) -> set[str]:
+    """出力ファイルが参照するハッシュを収集する（マーク&スイープのマーク）
+
+    バッチ結果・個別結果のJSONファイルとジャーナル（.jsonl）に対応します。
+    収集した集合をMetadataBlobStore.sweep()に渡すと、
+    どの出力からも参照されていないメタデータを削除できます。
+    読み込めないファイルがある場合、その参照を見落としたままスイープすると
+    使用中のメタデータを削除してしまうため、ValueErrorを送出します。
+
+    Args:
+        paths: 出力ファイルのパス（.gz / .zst も可）
+
+    Returns:
+        参照されているハッシュの集合
+
+    Raises:
+        ValueError: 読み込めない出力ファイルがある場合
+    """
+    refs: set[str] = set()
+    for path in paths:
+        name = path.name
+        compression = detect_compression(path)
+        if compression is not None:
+            name = name.rsplit(".", 1)[0]
+        try:
+            if name.endswith(".jsonl"):
+                results: Iterable[Any] = (
+                    json.loads(line) for line in iter_lines(path) if line
+                )
+            else:
+                data = read_json(path)
+                is_batch = isinstance(data, dict) and "results" in data
+                results = data["results"] if is_batch else [data]
+            for result in results:
+                refs.update(iter_metadata_refs(result))
+        except (OSError, ValueError) as e:
+            raise ValueError(f"{path} の参照を収集できません: {e}") from e
+    return refs
+
+
+def _resolve_ref(blob_store: MetadataBlobStore | None, ref: str) -> MovieMetadata:
+    """ハッシュ参照をストアから復元する"""
+    if blob_store is None:
+        raise ValueError(
+            "ハッシュで参照されたメタデータの復元にはMetadataBlobStoreが必要です"
+        )
+    return blob_store.get(ref)
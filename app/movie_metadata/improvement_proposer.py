@@ -48,6 +48,7 @@ class ImprovementProposer:
         movie_input: MovieInput,
         current_metadata: MovieMetadata,
         evaluation: MetadataEvaluationResult,
+        threshold: float | None = None,
     ) -> str:
         """改善提案を生成する
 
@@ -55,6 +56,7 @@ class ImprovementProposer:
             movie_input: 映画の基本情報
             current_metadata: 現在のメタデータ
             evaluation: 評価結果
+            threshold: 品質スコアの閾値（デフォルト: 初期化時の閾値）
 
         Returns:
             改善提案の文字列
@@ -78,7 +80,7 @@ class ImprovementProposer:
             movie_input=movie_input,
             current_metadata=current_metadata,
             evaluation=evaluation,
-            threshold=self.threshold,
+            threshold=self.threshold if threshold is None else threshold,
         )
 
         # 2. GenAIClientで改善提案を生成
@@ -0,0 +1,181 @@
+"""入力ファイルのストリーミング読み込みモジュール
+
+gzip / zstd圧縮とCSV / JSON Lines形式を自動判定し、ディスクに展開せずに
+1レコードずつ読み込みます。パスに "-" を指定すると標準入力から読み込むため、
+前段のジョブの出力をパイプでそのまま渡せます。
+"""
+
+import csv
+import gzip
+import io
+import json
+import logging
+import sys
+from collections.abc import Iterable, Iterator
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from typing import Literal, cast
+
+from movie_metadata.compressed_io import COMPRESSION_SUFFIXES, require_zstd
+
+logger = logging.getLogger(__name__)
+
+InputFormat = Literal["csv", "jsonl"]
+
+# 標準入力を表すパス
+STDIN_PATH = Path("-")
+
+# 圧縮形式を判定するマジックバイト
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# JSON Linesとみなす拡張子
+_JSONL_SUFFIXES = (".jsonl", ".ndjson")
+
+
+def is_stdin(source: Path | str) -> bool:
+    """入力元が標準入力かを判定する
+
+    Args:
+        source: 入力元のパス
+
+    Returns:
+        "-" が指定された場合はTrue
+    """
+    return str(source) == str(STDIN_PATH)
+
+
+def validate_header(fieldnames: Iterable[str] | None, required: set[str]) -> None:
+    """CSVのヘッダーに必要なフィールドが含まれているか検証する
+
+    Args:
+        fieldnames: ヘッダーのフィールド名
+        required: 必要なフィールド名
+
+    Raises:
+        ValueError: 必要なフィールドが含まれていない場合
+    """
+    if not required.issubset(set(fieldnames or [])):
+        raise ValueError(f"CSVに必要なフィールドがありません。必要: {required}")
+
+
+def is_plain_csv(source: Path | str) -> bool:
+    """入力元がseekして読み込める非圧縮のCSVファイルかを判定する
+
+    Args:
+        source: 入力元のパス
+
+    Returns:
+        標準入力・圧縮ファイル・JSON Linesのいずれでもない場合はTrue
+    """
+    if is_stdin(source):
+        return False
+    with Path(source).open("rb") as f:
+        head = f.read(64)
+    if head.startswith((_GZIP_MAGIC, _ZSTD_MAGIC)):
+        return False
+    return detect_input_format(source, head) == "csv"
+
+
+@contextmanager
+def open_input(source: Path | str) -> Iterator[io.BufferedReader]:
+    """入力元を開き、圧縮を展開したバイナリストリームを返す
+
+    圧縮形式は拡張子ではなく先頭のマジックバイトで判定するため、
+    標準入力や拡張子のないファイルにも対応します。標準入力は閉じません。
+
+    Args:
+        source: 入力元のパス（"-" の場合は標準入力）
+
+    Yields:
+        展開済みのデータを返すバイナリストリーム（peek()で先読み可能）
+
+    Raises:
+        ValueError: zstd圧縮でzstdが利用できない場合
+    """
+    with ExitStack() as stack:
+        if is_stdin(source):
+            # 標準入力のbufferはBufferedReader（型定義上はBinaryIO）
+            buffered = cast(io.BufferedReader, sys.stdin.buffer)
+        else:
+            buffered = stack.enter_context(Path(source).open("rb"))
+        head = buffered.peek(len(_ZSTD_MAGIC))
+        if head.startswith(_GZIP_MAGIC):
+            yield io.BufferedReader(gzip.GzipFile(fileobj=buffered, mode="rb"))
+        elif head.startswith(_ZSTD_MAGIC):
+            yield io.BufferedReader(require_zstd().ZstdFile(buffered, mode="r"))
+        else:
+            yield buffered
+
+
+def detect_input_format(source: Path | str, head: bytes) -> InputFormat:
+    """入力の形式（CSV / JSON Lines）を判定する
+
+    拡張子（圧縮の拡張子を除く）で判定できない場合は、
+    先頭の空白以外の文字が "{" であればJSON Linesとみなします。
+
+    Args:
+        source: 入力元のパス
+        head: 展開後の先頭のバイト列
+
+    Returns:
+        入力の形式
+    """
+    name = Path(source).name.lower()
+    for suffix in COMPRESSION_SUFFIXES.values():
+        name = name.removesuffix(suffix)
+    if name.endswith(_JSONL_SUFFIXES):
+        return "jsonl"
+    if name.endswith(".csv"):
+        return "csv"
+    return "jsonl" if head.lstrip(b"\xef\xbb\xbf \t\r\n").startswith(b"{") else "csv"
+
+
+def iter_records(
+    source: Path | str, required_fields: set[str]
+) -> Iterator[tuple[int, dict[str, str]]]:
+    """入力元から1レコードずつ辞書として読み込む
+
+    CSVは行番号（ヘッダーを1行目とする）、JSON Linesは行番号（1始まり）とともに
+    返します。
+    JSONとして解析できない行やオブジェクトでない行は警告を出力してスキップします。
+
+    Args:
+        source: 入力元のパス（"-" の場合は標準入力）
+        required_fields: CSVのヘッダーに必要なフィールド名
+
+    Yields:
+        (行番号, レコードの辞書)のタプル
+
+    Raises:
+        ValueError: CSVのヘッダーに必要なフィールドがない場合
+    """
+    with open_input(source) as stream:
+        input_format = detect_input_format(source, stream.peek(64))
+        logger.debug(f"入力形式を {input_format} と判定しました: {source}")
+        text = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+        try:
+            if input_format == "csv":
+                reader = csv.DictReader(text)
+                validate_header(reader.fieldnames, required_fields)
+                yield from enumerate(reader, start=2)
+                return
+
+            for line_num, line in enumerate(text, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    logger.warning(f"行 {line_num} をスキップしました（エラー: {e}）")
+                    continue
+                if not isinstance(record, dict):
+                    logger.warning(
+                        f"行 {line_num} をスキップしました"
+                        "（エラー: オブジェクトではありません）"
+                    )
+                    continue
+                yield line_num, record
+        finally:
+            # 下位のストリームはopen_input()が閉じる
+            text.detach()
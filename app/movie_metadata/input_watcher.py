@@ -0,0 +1,231 @@
+"""入力ファイルの監視モジュール
+
+入力CSVへの追記、または投入ディレクトリへの新しいファイルの追加を監視し、
+新しい映画が現れた時点で返します。処理済みの位置は状態ファイルに保存するため、
+再起動しても処理済みの行を再処理せずに続きから監視を再開できます。
+"""
+
+import csv
+import io
+import logging
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+from movie_metadata.bulk_validation import validate_rows
+from movie_metadata.compressed_io import COMPRESSION_SUFFIXES
+from movie_metadata.csv_reader import REQUIRED_FIELDS, CSVReader
+from movie_metadata.input_stream import validate_header
+from movie_metadata.models import InputWatchState, MovieInput
+from movie_metadata.serialization import write_json
+
+logger = logging.getLogger(__name__)
+
+# 投入ディレクトリで処理対象とする拡張子（圧縮の拡張子を除く）
+_DROP_FILE_SUFFIXES = (".csv", ".jsonl", ".ndjson")
+
+
+def _complete_length(data: bytes) -> int:
+    """末尾の書き込み途中のレコードを除いた、完結したレコードのバイト長を返す"""
+    end = 0
+    position = 0
+    quotes = 0
+    for line in data.splitlines(keepends=True):
+        position += len(line)
+        quotes += line.count(b'"')
+        # 引用符の数が奇数の間はフィールド内の改行のため、レコードが続く
+        if line.endswith(b"\n") and quotes % 2 == 0:
+            end = position
+            quotes = 0
+    return end
+
+
+class InputWatcher:
+    """入力CSVへの追記、または投入ディレクトリへのファイル追加を監視するクラス
+
+    pathがファイルの場合は、前回処理したバイト位置以降に追記された行を読み込みます
+    （書き込み途中の最終行は次回に読み込みます）。ファイルが切り詰められた場合や
+    置き換えられた場合は先頭から読み直します。
+    pathがディレクトリの場合は、未処理の .csv / .jsonl / .ndjson（.gz / .zst も可）を
+    更新日時の古い順に読み込みます。書き込み中のファイルを読まないよう、
+    更新からpoll_interval秒以上経過したファイルのみを対象とします。
+
+    Args:
+        path: 監視する入力CSVファイル、または投入ディレクトリのパス
+        state_path: 処理済みの位置を保存するファイルのパス
+        poll_interval: 新しい入力を確認する間隔（秒）
+
+    Examples:
+        watcher = InputWatcher(Path("data/movies.csv"), Path("data/watch_state.json"))
+        for movies in watcher.watch():
+            print(f"{len(movies)}件の映画が追加されました")
+    """
+
+    def __init__(
+        self, path: Path, state_path: Path, poll_interval: float = 1.0
+    ) -> None:
+        self._path = path
+        self._state_path = state_path
+        self._poll_interval = poll_interval
+        self._state = self._load_state()
+        self._pending: InputWatchState | None = None
+
+    @property
+    def state(self) -> InputWatchState:
+        """処理済みの位置"""
+        return self._state
+
+    def poll(self) -> list[MovieInput]:
+        """前回の確認以降に追加された映画を読み込む
+
+        読み込んだ位置はcommit()を呼び出すまで保存しません。
+        commit()せずに再度poll()した場合は同じ映画を返します。
+
+        Returns:
+            新しく追加された映画のリスト（ない場合は空のリスト）
+        """
+        if self._path.is_dir():
+            movies, self._pending = self._poll_directory()
+        elif self._path.exists():
+            movies, self._pending = self._poll_file()
+        else:
+            movies, self._pending = [], None
+        return movies
+
+    def commit(self) -> None:
+        """直前のpoll()で読み込んだ位置を処理済みとして保存する
+
+        Raises:
+            OSError: 状態ファイルの書き込みに失敗した場合
+        """
+        if self._pending is None:
+            return
+        self._state = self._pending
+        self._pending = None
+        self._state_path.parent.mkdir(parents=True, exist_ok=True)
+        write_json(self._state_path, self._state)
+
+    def watch(self, stop: threading.Event | None = None) -> Iterator[list[MovieInput]]:
+        """新しい映画が追加されるたびに返し続ける
+
+        返した映画は、呼び出し元が次の要素を要求した時点で処理済みとして保存します
+        （処理中に中断した場合は、再開時に同じ映画を再び返します）。
+
+        Args:
+            stop: セットされると監視を終了するイベント（Noneの場合は無期限に監視）
+
+        Yields:
+            新しく追加された映画のリスト（空のリストは返さない）
+        """
+        logger.info(f"入力の監視を開始します: {self._path}")
+        while stop is None or not stop.is_set():
+            movies = self.poll()
+            if movies:
+                yield movies
+            self.commit()
+            if not movies:
+                if stop is None:
+                    time.sleep(self._poll_interval)
+                else:
+                    stop.wait(self._poll_interval)
+        logger.info(f"入力の監視を終了しました: {self._path}")
+
+    def _poll_file(self) -> tuple[list[MovieInput], InputWatchState | None]:
+        """入力CSVに追記された行を読み込む"""
+        stat = self._path.stat()
+        state = self._state
+        if state.inode not in (None, stat.st_ino) or stat.st_size < state.offset:
+            logger.warning(
+                f"{self._path} が置き換えられたため、先頭から読み込み直します"
+            )
+            state = InputWatchState()
+        if stat.st_size == state.offset:
+            return [], None
+
+        with self._path.open("rb") as f:
+            header = f.readline()
+            if not header.endswith(b"\n"):
+                # ヘッダーの書き込み途中
+                return [], None
+            fieldnames = next(csv.reader([header.decode("utf-8")]), [])
+            validate_header(fieldnames, REQUIRED_FIELDS)
+            offset = max(state.offset, len(header))
+            f.seek(offset)
+            data = f.read()
+
+        length = _complete_length(data)
+        if length == 0:
+            return [], None
+        reader = csv.DictReader(
+            io.StringIO(data[:length].decode("utf-8"), newline=""),
+            fieldnames=fieldnames,
+        )
+        records = list(enumerate(reader, start=state.row_count + 2))
+        rows, skipped = validate_rows(records)
+        for row_num, error in skipped:
+            logger.warning(f"行 {row_num} をスキップしました（エラー: {error}）")
+        movies = [movie for _, movie in rows]
+        if movies:
+            logger.info(f"{self._path} に追記された {len(movies)} 件を読み込みました")
+        return movies, InputWatchState(
+            offset=offset + length,
+            row_count=state.row_count + len(records),
+            inode=stat.st_ino,
+        )
+
+    def _poll_directory(self) -> tuple[list[MovieInput], InputWatchState | None]:
+        """投入ディレクトリに追加されたファイルを読み込む"""
+        processed = set(self._state.processed_files)
+        settled_before = time.time() - self._poll_interval
+        candidates = sorted(
+            (
+                path
+                for path in self._path.iterdir()
+                if path.is_file()
+                and path.name not in processed
+                and self._is_drop_file(path)
+                and path.stat().st_mtime <= settled_before
+            ),
+            key=lambda path: (path.stat().st_mtime, path.name),
+        )
+        if not candidates:
+            return [], None
+
+        reader = CSVReader()
+        movies: list[MovieInput] = []
+        names: list[str] = []
+        for path in candidates:
+            try:
+                movies.extend(reader.iter_movies(path))
+            except ValueError as e:
+                logger.error(f"投入ファイルを読み込めないためスキップします: {e}")
+            names.append(path.name)
+        return movies, self._state.model_copy(
+            update={"processed_files": [*self._state.processed_files, *names]}
+        )
+
+    @staticmethod
+    def _is_drop_file(path: Path) -> bool:
+        """処理対象の投入ファイルかを判定する（隠しファイルは書き込み途中とみなす）"""
+        if path.name.startswith("."):
+            return False
+        name = path.name.lower()
+        for suffix in COMPRESSION_SUFFIXES.values():
+            name = name.removesuffix(suffix)
+        return name.endswith(_DROP_FILE_SUFFIXES)
+
+    def _load_state(self) -> InputWatchState:
+        """保存済みの処理位置を読み込む（存在しない・壊れている場合は先頭から）"""
+        if not self._state_path.exists():
+            return InputWatchState()
+        try:
+            state = InputWatchState.model_validate_json(self._state_path.read_bytes())
+        except ValueError as e:
+            logger.warning(f"監視の状態を読み込めないため先頭から処理します: {e}")
+            return InputWatchState()
+        logger.info(
+            f"{self._state_path} から監視の状態を読み込みました"
+            f"（処理済み: {state.row_count}行, {len(state.processed_files)}ファイル）"
+        )
+        return state
@@ -1,8 +1,12 @@
-import json
 import logging
+from datetime import UTC, datetime
 from pathlib import Path
 
+from movie_metadata.atomic_io import atomic_write
+from movie_metadata.compressed_io import CompressionType, compressed_path, compressing
 from movie_metadata.models import MovieMetadata
+from movie_metadata.output_index import OutputIndex
+from movie_metadata.serialization import to_json_bytes, write_json, write_json_array
 
 logger = logging.getLogger(__name__)
 
@@ -11,8 +15,28 @@ class JSONWriter:
     """JSON出力クラス
 
     メタデータをJSON形式でファイルに出力する機能を提供します。
+    書き込みはアトミックに行われ、途中で失敗しても不完全なファイルは残りません。
+
+    Args:
+        pretty: Trueの場合はインデントして整形出力する
+        compression: 圧縮形式（"gzip" / "zstd"、Noneの場合は無圧縮）。
+            指定した場合は出力パスに拡張子（.gz / .zst）を付与する
+        compression_level: 圧縮レベル（Noneの場合は各形式の既定値）
+        output_index: 指定した場合は出力した各メタデータの位置をインデックスに追記する
     """
 
+    def __init__(
+        self,
+        pretty: bool = True,
+        compression: CompressionType | None = None,
+        compression_level: int | None = None,
+        output_index: OutputIndex | None = None,
+    ) -> None:
+        self._pretty = pretty
+        self._compression: CompressionType | None = compression
+        self._compression_level = compression_level
+        self._output_index = output_index
+
     def write(
         self,
         metadata_list: list[MovieMetadata],
@@ -27,22 +51,24 @@ class JSONWriter:
         Raises:
             OSError: ファイル書き込みに失敗した場合
         """
+        output_path = compressed_path(output_path, self._compression)
         logger.debug(f"メタデータを出力中: {output_path}")
 
         # 出力ディレクトリが存在しない場合は作成
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
         try:
-            # PydanticモデルをJSONシリアライズ可能な辞書に変換
-            data = [metadata.model_dump() for metadata in metadata_list]
-
-            with output_path.open("w", encoding="utf-8") as f:
-                json.dump(
-                    data,
-                    f,
-                    ensure_ascii=False,  # 日本語を正しく出力
-                    indent=2,  # 整形出力
+            if self._output_index is None:
+                # Python辞書を経由せずにモデルから直接JSONバイト列を書き込む
+                write_json(
+                    output_path,
+                    metadata_list,
+                    pretty=self._pretty,
+                    compression=self._compression,
+                    compression_level=self._compression_level,
                 )
+            else:
+                self._write_indexed(metadata_list, output_path, self._output_index)
 
             logger.info(
                 f"{output_path} に {len(metadata_list)} 件のメタデータを出力しました"
@@ -51,3 +77,38 @@ class JSONWriter:
         except Exception as e:
             logger.error(f"JSONファイルの書き込みに失敗しました: {e}")
             raise OSError(f"JSONファイルの書き込みに失敗しました: {e}") from e
+
+    def _write_indexed(
+        self,
+        metadata_list: list[MovieMetadata],
+        output_path: Path,
+        output_index: OutputIndex,
+    ) -> None:
+        """メタデータを1件ずつ書き込み、各レコードの位置をインデックスに追記する"""
+        with (
+            atomic_write(output_path, mode="wb") as raw,
+            compressing(raw, self._compression, self._compression_level) as f,
+        ):
+            spans = write_json_array(
+                f,
+                (to_json_bytes(m, pretty=self._pretty) for m in metadata_list),
+                pretty=self._pretty,
+            )
+
+        written_at = datetime.now(UTC)
+        entries = []
+        for position, (metadata, span) in enumerate(
+            zip(metadata_list, spans, strict=True)
+        ):
+            entries.extend(
+                output_index.make_entries(
+                    metadata,
+                    output_path,
+                    "metadata",
+                    position=position,
+                    # 圧縮ファイルのバイト位置は展開後の位置のため使用しない
+                    span=span if self._compression is None else None,
+                    written_at=written_at,
+                )
+            )
+        output_index.add(entries)
@@ -51,12 +51,18 @@ class MovieMetadataFetcher:
             lines.append(f"{description}: {value}")
         return "\n".join(lines)
 
-    def _fetch_metadata(self, movie_input: MovieInput, prompt: str) -> MovieMetadata:
+    def _fetch_metadata(
+        self,
+        movie_input: MovieInput,
+        prompt: str,
+        temperature: float | None = None,
+    ) -> MovieMetadata:
         """メタデータを取得する共通ロジック
 
         Args:
             movie_input: 映画の基本情報
             prompt: 取得用プロンプト
+            temperature: サンプリング温度（Noneの場合はモデルのデフォルト）
 
         Returns:
             取得したメタデータ
@@ -72,6 +78,7 @@ class MovieMetadataFetcher:
                 prompt,
                 response_schema=MovieMetadata,
                 use_google_search=True,
+                temperature=temperature,
             )
 
             # Pydanticモデルでパース
@@ -112,13 +119,16 @@ class MovieMetadataFetcher:
             logger.exception(f"{movie_input.title} の予期しないエラー")
             raise
 
-    def fetch(self, movie_input: MovieInput) -> MovieMetadata:
+    def fetch(
+        self, movie_input: MovieInput, temperature: float | None = None
+    ) -> MovieMetadata:
         """映画のメタデータを取得
 
         Google Search groundingを使用して、映画の詳細なメタデータを取得します。
 
         Args:
             movie_input: 映画の基本情報
+            temperature: サンプリング温度（Noneの場合はモデルのデフォルト）
 
         Returns:
             取得したメタデータ
@@ -135,10 +145,13 @@ class MovieMetadataFetcher:
         input_info = self._build_input_info(movie_input)
         prompt = build_metadata_fetch_prompt(input_info)
 
-        return self._fetch_metadata(movie_input, prompt)
+        return self._fetch_metadata(movie_input, prompt, temperature)
 
     def fetch_with_improvement(
-        self, movie_input: MovieInput, improvement_instruction: str
+        self,
+        movie_input: MovieInput,
+        improvement_instruction: str,
+        temperature: float | None = None,
     ) -> MovieMetadata:
         """改善指示に基づいてメタデータを再取得
 
@@ -147,6 +160,7 @@ class MovieMetadataFetcher:
         Args:
             movie_input: 映画の基本情報
             improvement_instruction: 改善指示
+            temperature: サンプリング温度（Noneの場合はモデルのデフォルト）
 
         Returns:
             取得したメタデータ
@@ -163,4 +177,4 @@ class MovieMetadataFetcher:
         input_info = self._build_input_info(movie_input)
         prompt = build_metadata_fetch_prompt(input_info, improvement_instruction)
 
-        return self._fetch_metadata(movie_input, prompt)
+        return self._fetch_metadata(movie_input, prompt, temperature)
@@ -1,18 +1,34 @@
 """映画メタデータ取得サービスモジュール
 
-CSV読込 → API取得 → JSON出力の一連のビジネスロジックを管理します。
+CSV読込 → API取得 → JSON出力・ストア保存の一連のビジネスロジックを管理します。
+インクリメンタルモードでは、ストアに新鮮な結果がある映画の取得を省略します。
+監視モードでは、入力に追加された映画を随時取得して出力に追記します。
+重複排除を有効にすると、表記揺れのある同一映画の行を1回の取得にまとめ、
+結果を元の各行に展開して出力します。
 """
 
 import logging
+import threading
 import time
-from datetime import datetime
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
-from typing import TypedDict
+from typing import Literal, TypedDict
 
+from movie_metadata.atomic_io import GroupCommitWriter
 from movie_metadata.csv_reader import CSVReader
 from movie_metadata.genai_client import GenAIClient
+from movie_metadata.input_watcher import InputWatcher
 from movie_metadata.json_writer import JSONWriter
 from movie_metadata.metadata_fetcher import MovieMetadataFetcher
+from movie_metadata.metadata_store import MetadataStore
+from movie_metadata.models import MovieInput, MovieMetadata
+from movie_metadata.serialization import write_json
+from movie_metadata.sharding import (
+    select_shard,
+    select_shard_deduplicated,
+    shard_suffix,
+    validate_shard,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -21,18 +37,45 @@ class ProcessResult(TypedDict):
     total: int
     success: int
     failed: int
+    cached: int
+    collapsed: int
 
 
 class MetadataService:
     """映画メタデータ取得サービス
 
     CSV読込、API取得、JSON出力の処理フローを管理します。
+    ttlを指定するとインクリメンタルモードになり、ストアの結果が新鮮な映画は
+    取得を省略して保存済みのメタデータを出力に含めます。
 
     Args:
         client: GenAIClientインスタンス
         csv_reader: CSVReaderインスタンス
         json_writer: JSONWriterインスタンス
         rate_limit_sleep: API呼び出し間の待機時間（秒）
+        metadata_store: 取得結果をupsertするMetadataStore（Noneの場合は保存しない）
+        ttl: 保存済みメタデータの有効期間（Noneの場合は毎回すべて取得する）
+        field_ttls: フィールドごとの有効期間（例: {"box_office": timedelta(days=7)}）。
+            いずれかの期間を超えた映画は再取得する（ttl指定時のみ有効）
+        deduplicate: Trueの場合、正規化したタイトルと公開年が一致する行を
+            1回の取得にまとめ、結果を元の各行に展開して出力する
+        shard_index: 担当するシャードの番号（0始まり）
+        shard_count: シャードの総数。2以上の場合は担当するシャードの映画のみを
+            処理し、出力ファイル名にシャードの接尾辞を付与する
+
+    Raises:
+        ValueError: ttlを指定してmetadata_storeがNoneの場合、
+            field_ttlsに存在しないフィールド名が含まれる場合、
+            またはシャードの指定が不正な場合
+
+    Examples:
+        service = MetadataService(
+            client, csv_reader, json_writer,
+            metadata_store=store,
+            ttl=timedelta(days=30),
+            field_ttls={"box_office": timedelta(days=7)},
+        )
+        result = service.process(csv_path, output_dir)
     """
 
     def __init__(
@@ -41,11 +84,34 @@ class MetadataService:
         csv_reader: CSVReader,
         json_writer: JSONWriter,
         rate_limit_sleep: float = 1.0,
+        metadata_store: MetadataStore | None = None,
+        ttl: timedelta | None = None,
+        field_ttls: dict[str, timedelta] | None = None,
+        deduplicate: bool = False,
+        shard_index: int = 0,
+        shard_count: int = 1,
     ) -> None:
+        if ttl is not None and metadata_store is None:
+            raise ValueError(
+                "インクリメンタルモード（ttl指定）にはmetadata_storeが必要です"
+            )
+        unknown_fields = set(field_ttls or {}) - set(MovieMetadata.model_fields)
+        if unknown_fields:
+            raise ValueError(
+                f"field_ttlsに存在しないフィールドが指定されています: "
+                f"{', '.join(sorted(unknown_fields))}"
+            )
+        validate_shard(shard_index, shard_count)
         self._client = client
         self._csv_reader = csv_reader
         self._json_writer = json_writer
         self._rate_limit_sleep = rate_limit_sleep
+        self._metadata_store = metadata_store
+        self._ttl = ttl
+        self._field_ttls = field_ttls or {}
+        self._deduplicate = deduplicate
+        self._shard_index = shard_index
+        self._shard_count = shard_count
         self._fetcher = MovieMetadataFetcher(client)
 
     def process(
@@ -60,49 +126,223 @@ class MetadataService:
             output_dir: JSON出力ディレクトリ
 
         Returns:
-            処理結果の辞書（total, success, failed）
+            処理結果の辞書（total, success, failed, cached, collapsed）。
+            件数はCSVの行単位で数える
         """
         output_dir.mkdir(parents=True, exist_ok=True)
 
         # CSV読み込み
-        movies = self._csv_reader.read(csv_path)
+        collapsed = []
+        sharded = self._shard_count > 1
+        if self._deduplicate:
+            deduplicated = self._csv_reader.read_deduplicated(csv_path)
+            if sharded:
+                deduplicated = select_shard_deduplicated(
+                    deduplicated, self._shard_index, self._shard_count
+                )
+            movies = deduplicated.movies
+            row_to_movie = deduplicated.row_to_movie
+            collapsed = deduplicated.collapsed
+        else:
+            movies = self._csv_reader.read(csv_path)
+            if sharded:
+                movies = select_shard(movies, self._shard_index, self._shard_count)
+            row_to_movie = list(range(len(movies)))
         logger.info(f"CSVから {len(movies)} 件の映画を読み込みました")
+        if sharded:
+            logger.info(
+                f"シャード {self._shard_index}/{self._shard_count} の"
+                f" {len(row_to_movie)} 行を処理します"
+            )
+        suffix = shard_suffix(self._shard_index, self._shard_count)
+        if collapsed:
+            logger.info(
+                f"重複する {len(collapsed)} 行を集約しました"
+                f"（{len(row_to_movie)}行 → {len(movies)}件を取得）"
+            )
 
         # 各映画のメタデータを取得
-        metadata_list = []
+        results: list[MovieMetadata | None] = []
+        statuses: list[Literal["fetched", "cached", "failed"]] = []
+        fetched_list: list[tuple[MovieInput, MovieMetadata]] = []
         total = len(movies)
-        failed_count = 0
+        now = datetime.now(UTC)
 
         for i, movie in enumerate(movies, start=1):
-            logger.info(f"処理中 [{i}/{total}]: {movie.title}")
-
-            try:
-                metadata = self._fetcher.fetch(movie)
-                metadata_list.append(metadata)
+            metadata, status = self._fetch_movie(movie, now, f"{i}/{total}")
+            results.append(metadata)
+            statuses.append(status)
+            if status == "fetched" and metadata is not None:
+                fetched_list.append((movie, metadata))
 
                 # レート制限対策: 最後の映画以外は待機
                 if i < total:
                     time.sleep(self._rate_limit_sleep)
 
-            except Exception as e:
-                logger.error(f"{movie.title} のメタデータ取得に失敗しました: {e}")
-                failed_count += 1
-                continue
+        # 取得結果を元の各行に展開する
+        metadata_list = [
+            metadata
+            for metadata in (results[index] for index in row_to_movie)
+            if metadata is not None
+        ]
+        row_statuses = [statuses[index] for index in row_to_movie]
+        success_count = sum(status != "failed" for status in row_statuses)
+        failed_count = row_statuses.count("failed")
+        cached_count = row_statuses.count("cached")
+        row_total = len(row_to_movie)
 
         # JSON出力
         if metadata_list:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_path = output_dir / f"movie_metadata_{timestamp}.json"
+            output_path = output_dir / f"movie_metadata_{timestamp}{suffix}.json"
             self._json_writer.write(metadata_list, output_path)
+            if self._metadata_store is not None and fetched_list:
+                self._metadata_store.upsert_metadata(fetched_list)
             logger.info(
-                f"=== 完了: {len(metadata_list)}/{total}件成功, "
-                f"{failed_count}件失敗 ==="
+                f"=== 完了: {success_count}/{row_total}件成功, {failed_count}件失敗 ==="
             )
+            if self._ttl is not None:
+                logger.info(
+                    f"インクリメンタル実行: {cached_count}件は保存済みを使用, "
+                    f"{len(fetched_list)}件を新規・再取得"
+                )
         else:
             logger.error("エラー: メタデータを取得できませんでした")
 
+        if collapsed:
+            # 集約した行のレポート（どの行がどの行の取得結果を使ったか）
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            report_path = output_dir / f"collapsed_rows_{timestamp}{suffix}.json"
+            write_json(report_path, collapsed)
+            logger.info(f"集約した行のレポートを出力しました: {report_path}")
+
         return ProcessResult(
-            total=total,
-            success=len(metadata_list),
+            total=row_total,
+            success=success_count,
             failed=failed_count,
+            cached=cached_count,
+            collapsed=len(collapsed),
+        )
+
+    def watch(
+        self,
+        watcher: InputWatcher,
+        output_dir: Path,
+        stop: threading.Event | None = None,
+    ) -> ProcessResult:
+        """入力を監視し、追加された映画のメタデータを取得し続ける
+
+        取得したメタデータは1件ごとに
+        output_dir/movie_metadata_stream{シャードの接尾辞}.jsonl に追記するため、
+        追加された映画は次のバッチ実行を待たずに出力されます。
+        重複排除は行いません（インクリメンタルモードでは保存済みの結果を再利用します）。
+
+        Args:
+            watcher: 入力の監視に使うInputWatcher
+            output_dir: 出力ディレクトリ
+            stop: セットされると監視を終了するイベント（Noneの場合は無期限に監視）
+
+        Returns:
+            監視終了までの処理結果の辞書（total, success, failed, cached, collapsed）
+        """
+        output_dir.mkdir(parents=True, exist_ok=True)
+        suffix = shard_suffix(self._shard_index, self._shard_count)
+        output_path = output_dir / f"movie_metadata_stream{suffix}.jsonl"
+        statuses: list[Literal["fetched", "cached", "failed"]] = []
+
+        with GroupCommitWriter(output_path) as writer:
+            for movies in watcher.watch(stop):
+                if self._shard_count > 1:
+                    movies = select_shard(movies, self._shard_index, self._shard_count)
+                now = datetime.now(UTC)
+                total = len(movies)
+                for i, movie in enumerate(movies, start=1):
+                    metadata, status = self._fetch_movie(movie, now, f"{i}/{total}")
+                    statuses.append(status)
+                    if metadata is not None:
+                        writer.write_line(metadata.model_dump_json())
+                    if status == "fetched" and metadata is not None:
+                        if self._metadata_store is not None:
+                            self._metadata_store.upsert_metadata([(movie, metadata)])
+                        time.sleep(self._rate_limit_sleep)
+                # 次の入力を待つ前に、このバッチの出力を永続化する
+                writer.sync()
+                logger.info(f"{total} 件の結果を出力しました: {output_path}")
+
+        failed_count = statuses.count("failed")
+        return ProcessResult(
+            total=len(statuses),
+            success=len(statuses) - failed_count,
+            failed=failed_count,
+            cached=statuses.count("cached"),
+            collapsed=0,
+        )
+
+    def _fetch_movie(
+        self, movie: MovieInput, now: datetime, progress: str
+    ) -> tuple[MovieMetadata | None, Literal["fetched", "cached", "failed"]]:
+        """1件の映画のメタデータを取得する（新鮮な保存済みの結果があれば再利用する）
+
+        Args:
+            movie: 対象の映画
+            now: 判定基準の現在時刻（UTC）
+            progress: ログに表示する進捗（例: "3/10"）
+
+        Returns:
+            (メタデータ, 取得結果の種類)のタプル。取得に失敗した場合は
+            期限切れでも保存済みのメタデータを返し、保存済みもなければNone
+        """
+        cached = self._find_cached(movie, now)
+        if cached is not None and not cached[1]:
+            logger.info(f"スキップ [{progress}]: {movie.title}（保存済み）")
+            return cached[0], "cached"
+
+        if cached is not None:
+            logger.info(
+                f"再取得 [{progress}]: {movie.title}"
+                f"（有効期限切れ: {', '.join(cached[1])}）"
+            )
+        else:
+            logger.info(f"処理中 [{progress}]: {movie.title}")
+
+        try:
+            return self._fetcher.fetch(movie), "fetched"
+        except Exception as e:
+            logger.error(f"{movie.title} のメタデータ取得に失敗しました: {e}")
+            # 再取得に失敗した場合は期限切れでも保存済みの値を出力する
+            if cached is not None:
+                logger.warning(f"{movie.title} は保存済みのメタデータを出力します")
+                return cached[0], "failed"
+            return None, "failed"
+
+    def _find_cached(
+        self, movie: MovieInput, now: datetime
+    ) -> tuple[MovieMetadata, list[str]] | None:
+        """保存済みのメタデータと期限切れの有効期間名を返す
+
+        Args:
+            movie: 対象の映画
+            now: 判定基準の現在時刻（UTC）
+
+        Returns:
+            (保存済みメタデータ, 期限切れの有効期間名のリスト)のタプル。
+            リストが空なら新鮮。インクリメンタルモードでない場合や未保存の場合はNone
+            （取得結果は入力をキーに保存するため、入力の値で検索する）
+        """
+        if self._ttl is None or self._metadata_store is None:
+            return None
+        record = self._metadata_store.get_metadata_record(
+            movie.title, movie.release_date, movie.country
+        )
+        if record is None:
+            return None
+
+        metadata, updated_at = record
+        age = now - updated_at
+        expired = ["全体"] if age >= self._ttl else []
+        expired.extend(
+            field_name
+            for field_name, field_ttl in self._field_ttls.items()
+            if age >= field_ttl
         )
+        return metadata, expired
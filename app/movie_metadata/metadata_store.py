@@ -0,0 +1,348 @@
+"""SQLiteによるメタデータストアモジュール
+
+取得したMovieMetadataとリファインメント結果をSQLiteに保存します。
+取得元の入力（MovieInput）の正規化した（タイトル, 公開日, 制作国）をキーに
+upsertするため、入力CSVの行から最新結果を実行ファイルを走査せずに
+インデックス経由で取得できます。
+"""
+
+import logging
+import sqlite3
+from collections.abc import Iterable, Iterator
+from datetime import UTC, datetime
+from itertools import islice
+from pathlib import Path
+from types import TracebackType
+from typing import Self
+
+from movie_metadata.models import MetadataRefinementResult, MovieInput, MovieMetadata
+from movie_metadata.normalization import normalize_text
+
+logger = logging.getLogger(__name__)
+
+# 他のプロセス（シャード）の書き込み完了を待つ最大秒数
+_BUSY_TIMEOUT = 30.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS movie_metadata (
+    title_key TEXT NOT NULL,
+    release_date TEXT NOT NULL,
+    country_key TEXT NOT NULL,
+    title TEXT NOT NULL,
+    metadata_json TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (title_key, release_date, country_key)
+);
+CREATE INDEX IF NOT EXISTS idx_movie_metadata_updated_at
+    ON movie_metadata (updated_at);
+
+CREATE TABLE IF NOT EXISTS refinement_results (
+    title_key TEXT NOT NULL,
+    release_date TEXT NOT NULL,
+    country_key TEXT NOT NULL,
+    title TEXT NOT NULL,
+    success INTEGER NOT NULL,
+    total_iterations INTEGER NOT NULL,
+    stop_reason TEXT,
+    result_json TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (title_key, release_date, country_key)
+);
+CREATE INDEX IF NOT EXISTS idx_refinement_results_updated_at
+    ON refinement_results (updated_at);
+"""
+
+_UPSERT_METADATA_SQL = """
+INSERT INTO movie_metadata (
+    title_key, release_date, country_key, title, metadata_json, updated_at
+) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (title_key, release_date, country_key) DO UPDATE SET
+    title = excluded.title,
+    metadata_json = excluded.metadata_json,
+    updated_at = excluded.updated_at
+"""
+
+_UPSERT_REFINEMENT_SQL = """
+INSERT INTO refinement_results (
+    title_key, release_date, country_key, title,
+    success, total_iterations, stop_reason, result_json, updated_at
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (title_key, release_date, country_key) DO UPDATE SET
+    title = excluded.title,
+    success = excluded.success,
+    total_iterations = excluded.total_iterations,
+    stop_reason = excluded.stop_reason,
+    result_json = excluded.result_json,
+    updated_at = excluded.updated_at
+"""
+
+_KEY_CONDITION = "title_key = ? AND release_date = ? AND country_key = ?"
+
+
+def make_store_key(title: str, release_date: str, country: str) -> tuple[str, str, str]:
+    """ストアの検索キーを生成する
+
+    Args:
+        title: 映画のタイトル
+        release_date: 公開日（YYYY-MM-DD形式）
+        country: 制作国
+
+    Returns:
+        正規化した（タイトル, 公開日, 制作国）のタプル
+    """
+    return normalize_text(title), release_date.strip(), normalize_text(country)
+
+
+class MetadataStore:
+    """SQLiteによるメタデータストアクラス
+
+    WALモードで開き、書き込みはbatch_size件ごとに1トランザクションでまとめて
+    コミットします。複数のプロセスから同じデータベースに書き込む場合、
+    他のプロセスのトランザクションの完了を最大30秒待ちます。コンテキストマネージャーとして使用すると終了時に接続を閉じます。
+
+    Args:
+        db_path: SQLiteデータベースファイルのパス（":memory:"も指定可能）
+        batch_size: 1トランザクションで書き込む最大件数
+
+    Raises:
+        ValueError: batch_sizeが1未満の場合
+
+    Examples:
+        with MetadataStore(Path("data/metadata.sqlite3")) as store:
+            store.upsert_metadata([(movie_input, metadata)])
+            metadata = store.get_metadata("Spirited Away", "2001-07-20", "Japan")
+    """
+
+    def __init__(self, db_path: Path | str, batch_size: int = 1000) -> None:
+        if batch_size < 1:
+            raise ValueError(
+                f"batch_sizeは1以上を指定してください（指定値: {batch_size}）"
+            )
+        if isinstance(db_path, Path):
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._batch_size = batch_size
+        self._conn = sqlite3.connect(db_path, timeout=_BUSY_TIMEOUT)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        logger.debug(f"メタデータストアを開きました: {db_path}")
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    @property
+    def batch_size(self) -> int:
+        """1トランザクションで書き込む最大件数"""
+        return self._batch_size
+
+    def close(self) -> None:
+        """データベース接続を閉じる"""
+        self._conn.close()
+
+    def upsert_metadata(
+        self,
+        records: Iterable[tuple[MovieInput, MovieMetadata]],
+        updated_at: datetime | None = None,
+    ) -> int:
+        """メタデータを取得元の入力をキーにupsertする
+
+        LLMが返すタイトル・制作国は日本語表記などに変わることがあるため、
+        キーには入力のタイトル・公開日・制作国を使用します。
+
+        Args:
+            records: (取得元の入力, 保存するメタデータ)のタプル
+            updated_at: 更新日時（Noneの場合は現在時刻）
+
+        Returns:
+            書き込んだ件数
+        """
+        timestamp = self._format_timestamp(updated_at)
+        rows = (
+            (
+                *make_store_key(movie.title, movie.release_date, movie.country),
+                m.title,
+                m.model_dump_json(),
+                timestamp,
+            )
+            for movie, m in records
+        )
+        count = self._write_batches(_UPSERT_METADATA_SQL, rows)
+        logger.debug(f"{count} 件のメタデータをストアに保存しました")
+        return count
+
+    def upsert_refinement_results(
+        self,
+        records: Iterable[tuple[MovieInput, MetadataRefinementResult]],
+        updated_at: datetime | None = None,
+    ) -> int:
+        """リファインメント結果をリファイン元の入力をキーにupsertする
+
+        キーにはfinal_metadataではなく入力のタイトル・公開日・制作国を使用します。
+
+        Args:
+            records: (リファイン元の入力, 保存するリファインメント結果)のタプル
+            updated_at: 更新日時（Noneの場合は現在時刻）
+
+        Returns:
+            書き込んだ件数
+        """
+        timestamp = self._format_timestamp(updated_at)
+        rows = (
+            (
+                *make_store_key(movie.title, movie.release_date, movie.country),
+                r.final_metadata.title,
+                int(r.success),
+                r.total_iterations,
+                r.stop_reason,
+                r.model_dump_json(),
+                timestamp,
+            )
+            for movie, r in records
+        )
+        count = self._write_batches(_UPSERT_REFINEMENT_SQL, rows)
+        logger.debug(f"{count} 件のリファインメント結果をストアに保存しました")
+        return count
+
+    def get_metadata(
+        self, title: str, release_date: str, country: str
+    ) -> MovieMetadata | None:
+        """メタデータを取得する
+
+        Args:
+            title: 入力の映画のタイトル（表記ゆれは正規化して照合）
+            release_date: 公開日（YYYY-MM-DD形式）
+            country: 制作国
+
+        Returns:
+            保存済みのメタデータ（存在しない場合はNone）
+        """
+        row = self._conn.execute(
+            f"SELECT metadata_json FROM movie_metadata WHERE {_KEY_CONDITION}",
+            make_store_key(title, release_date, country),
+        ).fetchone()
+        return MovieMetadata.model_validate_json(row[0]) if row else None
+
+    def get_refinement_result(
+        self, title: str, release_date: str, country: str
+    ) -> MetadataRefinementResult | None:
+        """リファインメント結果を取得する
+
+        Args:
+            title: 入力の映画のタイトル（表記ゆれは正規化して照合）
+            release_date: 公開日（YYYY-MM-DD形式）
+            country: 制作国
+
+        Returns:
+            保存済みのリファインメント結果（存在しない場合はNone）
+        """
+        row = self._conn.execute(
+            f"SELECT result_json FROM refinement_results WHERE {_KEY_CONDITION}",
+            make_store_key(title, release_date, country),
+        ).fetchone()
+        return MetadataRefinementResult.model_validate_json(row[0]) if row else None
+
+    def get_metadata_record(
+        self, title: str, release_date: str, country: str
+    ) -> tuple[MovieMetadata, datetime] | None:
+        """メタデータと更新日時を1回の検索で取得する
+
+        Args:
+            title: 入力の映画のタイトル（表記ゆれは正規化して照合）
+            release_date: 公開日（YYYY-MM-DD形式）
+            country: 制作国
+
+        Returns:
+            (メタデータ, 更新日時（UTC）)のタプル（存在しない場合はNone）
+        """
+        row = self._conn.execute(
+            "SELECT metadata_json, updated_at FROM movie_metadata "
+            f"WHERE {_KEY_CONDITION}",
+            make_store_key(title, release_date, country),
+        ).fetchone()
+        if row is None:
+            return None
+        return MovieMetadata.model_validate_json(row[0]), datetime.fromisoformat(row[1])
+
+    def get_metadata_updated_at(
+        self, title: str, release_date: str, country: str
+    ) -> datetime | None:
+        """メタデータの更新日時を取得する
+
+        Args:
+            title: 入力の映画のタイトル（表記ゆれは正規化して照合）
+            release_date: 公開日（YYYY-MM-DD形式）
+            country: 制作国
+
+        Returns:
+            更新日時（UTC、存在しない場合はNone）
+        """
+        row = self._conn.execute(
+            f"SELECT updated_at FROM movie_metadata WHERE {_KEY_CONDITION}",
+            make_store_key(title, release_date, country),
+        ).fetchone()
+        return datetime.fromisoformat(row[0]) if row else None
+
+    def find_metadata_by_title(self, title: str) -> list[MovieMetadata]:
+        """タイトルが一致するメタデータを公開日順に取得する
+
+        Args:
+            title: 入力の映画のタイトル（表記ゆれは正規化して照合）
+
+        Returns:
+            一致したメタデータのリスト（同名の別作品を含む）
+        """
+        rows = self._conn.execute(
+            "SELECT metadata_json FROM movie_metadata WHERE title_key = ? "
+            "ORDER BY release_date",
+            (normalize_text(title),),
+        ).fetchall()
+        return [MovieMetadata.model_validate_json(row[0]) for row in rows]
+
+    def list_metadata_updated_since(self, since: datetime) -> list[MovieMetadata]:
+        """指定日時以降に更新されたメタデータを更新日時順に取得する
+
+        Args:
+            since: 基準日時（タイムゾーンなしの場合はUTCとして扱う）
+
+        Returns:
+            更新日時がsince以降のメタデータのリスト
+        """
+        rows = self._conn.execute(
+            "SELECT metadata_json FROM movie_metadata WHERE updated_at >= ? "
+            "ORDER BY updated_at",
+            (self._format_timestamp(since),),
+        ).fetchall()
+        return [MovieMetadata.model_validate_json(row[0]) for row in rows]
+
+    def _write_batches(self, sql: str, rows: Iterable[tuple]) -> int:
+        """batch_size件ごとにトランザクションをまとめて書き込む"""
+        count = 0
+        for batch in self._chunked(rows, self._batch_size):
+            with self._conn:
+                self._conn.executemany(sql, batch)
+            count += len(batch)
+        return count
+
+    @staticmethod
+    def _chunked(rows: Iterable[tuple], size: int) -> Iterator[list[tuple]]:
+        """イテラブルをsize件ずつのリストに分割する"""
+        iterator = iter(rows)
+        while batch := list(islice(iterator, size)):
+            yield batch
+
+    @staticmethod
+    def _format_timestamp(value: datetime | None) -> str:
+        """日時をUTCのISO 8601文字列に変換する（辞書順と時刻順が一致する形式）"""
+        if value is None:
+            value = datetime.now(UTC)
+        elif value.tzinfo is None:
+            value = value.replace(tzinfo=UTC)
+        return value.astimezone(UTC).isoformat(timespec="microseconds")
@@ -1,3 +1,6 @@
+from datetime import datetime
+from typing import Literal
+
 from pydantic import BaseModel, Field
 
 
@@ -9,6 +12,57 @@ class MovieInput(BaseModel):
     country: str = Field(description="制作国")
 
 
+class CSVOffsetIndex(BaseModel):
+    """入力CSVのバイト位置インデックス（interval行ごとのデータ行の開始位置）"""
+
+    interval: int = Field(description="開始位置を記録する行の間隔")
+    row_count: int = Field(description="データ行の件数（ヘッダーを除く）")
+    offsets: list[int] = Field(
+        description="データ行 0, interval, 2*interval, ... の開始バイト位置"
+    )
+    file_size: int = Field(description="インデックス作成時のファイルサイズ")
+    mtime_ns: int = Field(description="インデックス作成時のファイル更新日時（ns）")
+
+
+class InputWatchState(BaseModel):
+    """監視モードで処理済みの入力の位置"""
+
+    offset: int = Field(
+        default=0, description="処理済みのバイト位置（0の場合はヘッダーから読み込む）"
+    )
+    row_count: int = Field(default=0, description="処理済みのデータ行の件数")
+    inode: int | None = Field(
+        default=None, description="監視中のファイルのinode（置き換えの検出に使用）"
+    )
+    processed_files: list[str] = Field(
+        default_factory=list,
+        description="処理済みの投入ファイル名（ディレクトリ監視時）",
+    )
+
+
+class CollapsedInputRow(BaseModel):
+    """重複として集約された入力行"""
+
+    row_number: int = Field(description="CSVの行番号（ヘッダーを1行目とする）")
+    title: str = Field(description="入力行のタイトル")
+    release_date: str = Field(description="入力行の公開日")
+    country: str = Field(description="入力行の制作国")
+    kept_row_number: int = Field(description="代表として取得する行の行番号")
+    kept_title: str = Field(description="代表として取得する行のタイトル")
+
+
+class DeduplicatedInput(BaseModel):
+    """重複を集約したCSV入力"""
+
+    movies: list[MovieInput] = Field(description="取得対象の映画（重複を除いた代表行）")
+    row_to_movie: list[int] = Field(
+        description="CSVの各行（読み込み順）が対応するmoviesのインデックス"
+    )
+    collapsed: list[CollapsedInputRow] = Field(
+        default_factory=list, description="代表行に集約された重複行"
+    )
+
+
 class MovieMetadata(BaseModel):
     """LLM出力用の映画メタデータモデル"""
 
@@ -108,6 +162,30 @@ class MetadataRefinementResult(BaseModel):
     history: list[RefinementHistoryEntry] = Field(description="全イテレーションの履歴")
     success: bool = Field(description="すべてのフィールドが閾値以上を達成したか")
     total_iterations: int = Field(description="実行したイテレーション数")
+    stop_reason: str | None = Field(
+        default=None,
+        description=(
+            "終了理由（'passed': 全フィールド合格, 'max_iterations': 最大回数到達, "
+            "'unchanged_metadata': メタデータが前回と同一, "
+            "'score_plateau': スコアの変化がイプシロン未満, "
+            "'same_failures': 同じフィールドが同じ値で不合格, "
+            "'no_passing_candidate': 並列候補のいずれも合格しなかった）"
+        ),
+    )
+
+
+class FetchVariant(BaseModel):
+    """並列候補生成で使用するメタデータ取得のバリエーション"""
+
+    model_name: str | None = Field(
+        default=None, description="使用するモデル名（Noneの場合はRefinerのモデル）"
+    )
+    temperature: float | None = Field(
+        default=None, description="サンプリング温度（Noneの場合はモデルのデフォルト）"
+    )
+    improvement_instruction: str | None = Field(
+        default=None, description="取得プロンプトに追加する指示（任意）"
+    )
 
 
 class BatchRefinementResult(BaseModel):
@@ -123,6 +201,51 @@ class BatchRefinementResult(BaseModel):
     processing_time: float = Field(description="全体の処理時間（秒）")
 
 
+class BatchRefinementSummary(BaseModel):
+    """複数レコードの改善結果の集計（各映画の結果を含まない）"""
+
+    total_count: int = Field(description="処理対象の総件数")
+    success_count: int = Field(description="成功した件数")
+    error_count: int = Field(description="エラーが発生した件数")
+    errors: list[dict[str, str]] = Field(
+        description="エラー情報（映画タイトル、エラーメッセージを含む）"
+    )
+    processing_time: float = Field(description="全体の処理時間（秒）")
+
+
+class ProcessingCostRecord(BaseModel):
+    """1件の映画の処理実績（処理順序の計画に使用）"""
+
+    title: str = Field(description="映画のタイトル")
+    release_date: str = Field(description="公開日（YYYY-MM-DD形式）")
+    country: str = Field(description="制作国")
+    iterations: int = Field(description="実行したイテレーション数", ge=0)
+    seconds: float = Field(description="処理時間（秒）", ge=0.0)
+
+
+class OutputIndexEntry(BaseModel):
+    """出力ディレクトリのインデックスの1エントリ（タイトルから出力位置への対応）"""
+
+    title_key: str = Field(description="正規化したタイトル（検索キー）")
+    title: str = Field(description="映画のタイトル")
+    release_date: str = Field(description="公開日（YYYY-MM-DD形式）")
+    country: str = Field(description="制作国")
+    file: str = Field(description="出力ファイルのパス（インデックスからの相対パス）")
+    kind: Literal["metadata", "refinement"] = Field(
+        description="レコードの種類（metadata: MovieMetadata、refinement: 改善結果）"
+    )
+    position: int | None = Field(
+        default=None, description="ファイル内の配列での位置（単体のファイルはNone）"
+    )
+    offset: int | None = Field(
+        default=None, description="レコードの開始バイト位置（圧縮ファイルはNone）"
+    )
+    length: int | None = Field(
+        default=None, description="レコードのバイト長（圧縮ファイルはNone）"
+    )
+    written_at: datetime = Field(description="出力日時")
+
+
 class MetadataEvaluationOutput(BaseModel):
     """メタデータ評価用のLLM出力スキーマ"""
 
@@ -130,3 +253,19 @@ class MetadataEvaluationOutput(BaseModel):
     improvement_suggestions: str = Field(
         description="改善提案（スコアが閾値未満のフィールドに対する具体的な提案。すべて閾値以上なら'なし'）"
     )
+
+
+class MetadataBatchEvaluationItem(BaseModel):
+    """バッチ評価における1作品分のLLM出力スキーマ"""
+
+    title: str = Field(description="評価対象の映画のタイトル（入力と同一の表記）")
+    field_scores: list[MetadataFieldScore] = Field(description="各フィールドのスコア")
+    improvement_suggestions: str = Field(
+        description="改善提案（スコアが閾値未満のフィールドに対する具体的な提案。すべて閾値以上なら'なし'）"
+    )
+
+
+class MetadataBatchEvaluationOutput(BaseModel):
+    """複数作品をまとめて評価するLLM出力スキーマ"""
+
+    results: list[MetadataBatchEvaluationItem] = Field(description="映画ごとの評価結果")
@@ -0,0 +1,26 @@
+"""タイトル等の正規化モジュール
+
+表記ゆれ（全角・半角、大文字・小文字、空白、記号）を吸収した比較用キーを生成します。
+"""
+
+import unicodedata
+
+
+def normalize_text(value: str) -> str:
+    """比較用に文字列を正規化する
+
+    NFKC正規化と大文字・小文字の統一を行い、空白と記号（句読点・シンボル）を除去します。
+    記号のみの文字列は、空白を除去しただけの値を返します。
+
+    Args:
+        value: 正規化する文字列
+
+    Returns:
+        正規化された文字列
+    """
+    normalized = unicodedata.normalize("NFKC", value).casefold()
+    without_spaces = "".join(ch for ch in normalized if not ch.isspace())
+    stripped = "".join(
+        ch for ch in without_spaces if unicodedata.category(ch)[0] not in ("P", "S")
+    )
+    return stripped or without_spaces
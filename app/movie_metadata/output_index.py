@@ -0,0 +1,268 @@
+"""出力ディレクトリのタイトル索引モジュール
+
+ライターが出力したファイルについて、正規化したタイトルから
+ファイルとレコードのバイト位置への対応をJSON Linesのインデックスに追記します。
+検索時はインデックスのみを読み込み、該当レコードのバイト範囲だけを読んで復元するため、
+出力ファイルが増えても1件の検索はファイル全体をパースせずに完了します。
+"""
+
+import json
+import logging
+import os
+from collections.abc import Iterable
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, Literal
+
+from movie_metadata.atomic_io import GroupCommitWriter
+from movie_metadata.blob_store import MetadataBlobStore
+from movie_metadata.bulk_validation import load_metadata_json
+from movie_metadata.compressed_io import read_json
+from movie_metadata.history_codec import LazyRefinementResult
+from movie_metadata.models import MovieMetadata, OutputIndexEntry
+from movie_metadata.normalization import normalize_text
+
+logger = logging.getLogger(__name__)
+
+# 出力ディレクトリ内のインデックスファイル名
+INDEX_FILENAME = "index.jsonl"
+
+
+class OutputIndex:
+    """出力ファイルのタイトル索引クラス
+
+    インデックスは追記のみのJSON Linesで、同じタイトルの新しい出力は
+    新しいエントリとして追記されます。検索では出力日時が最も新しいエントリを優先します。
+    タイトルに加えて日本語タイトルでも検索できます。
+
+    Args:
+        path: インデックスファイルのパス（通常は 出力ディレクトリ/index.jsonl）
+
+    Examples:
+        index = OutputIndex(Path("data/output/index.jsonl"))
+        metadata = index.lookup("千と千尋の神隠し")
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._entries: dict[str, list[OutputIndexEntry]] = {}
+        # 読み込み済みの位置と、作り直しを検出するためのファイルの識別子
+        self._loaded_size = 0
+        self._loaded_file: tuple[int, int] | None = None
+
+    @property
+    def path(self) -> Path:
+        """インデックスファイルのパス"""
+        return self._path
+
+    def make_entries(
+        self,
+        metadata: MovieMetadata,
+        file_path: Path,
+        kind: Literal["metadata", "refinement"],
+        position: int | None = None,
+        span: tuple[int, int] | None = None,
+        written_at: datetime | None = None,
+    ) -> list[OutputIndexEntry]:
+        """1件のレコードに対するインデックスエントリを生成する
+
+        タイトルと日本語タイトルのそれぞれを検索キーとするエントリを生成します。
+
+        Args:
+            metadata: レコードのメタデータ（検索キーの生成に使用）
+            file_path: レコードを含む出力ファイルのパス
+            kind: レコードの種類
+            position: ファイル内の配列での位置（単体のファイルはNone）
+            span: レコードの（開始バイト位置, バイト長）（圧縮ファイルはNone）
+            written_at: 出力日時（Noneの場合は現在時刻）
+
+        Returns:
+            検索キーごとのエントリのリスト
+        """
+        written_at = written_at or datetime.now(UTC)
+        offset, length = span if span is not None else (None, None)
+        keys = dict.fromkeys(
+            normalize_text(title)
+            for title in [metadata.title, *metadata.japanese_titles]
+        )
+        return [
+            OutputIndexEntry(
+                title_key=key,
+                title=metadata.title,
+                release_date=metadata.release_date,
+                country=metadata.country,
+                file=self._relative_file(file_path),
+                kind=kind,
+                position=position,
+                offset=offset,
+                length=length,
+                written_at=written_at,
+            )
+            for key in keys
+            if key
+        ]
+
+    def add(self, entries: Iterable[OutputIndexEntry]) -> int:
+        """エントリをインデックスに追記する
+
+        Args:
+            entries: 追記するエントリ
+
+        Returns:
+            追記した件数
+
+        Raises:
+            OSError: ファイル書き込みに失敗した場合
+        """
+        count = 0
+        with GroupCommitWriter(self._path, max_records=10_000) as writer:
+            for entry in entries:
+                writer.write_line(entry.model_dump_json())
+                count += 1
+        logger.debug(f"{self._path} に {count} 件のエントリを追記しました")
+        return count
+
+    def find(
+        self,
+        title: str,
+        release_date: str | None = None,
+        country: str | None = None,
+    ) -> list[OutputIndexEntry]:
+        """タイトルに一致するエントリを検索する
+
+        Args:
+            title: 映画のタイトル（日本語タイトルも可、表記揺れは正規化して比較）
+            release_date: 指定した場合は公開日も一致するエントリのみ返す
+            country: 指定した場合は制作国も一致するエントリのみ返す
+
+        Returns:
+            出力日時の新しい順に並べたエントリのリスト
+        """
+        self._refresh()
+        entries = [
+            entry
+            for entry in self._entries.get(normalize_text(title), [])
+            if (release_date is None or entry.release_date == release_date.strip())
+            and (
+                country is None
+                or normalize_text(entry.country) == normalize_text(country)
+            )
+        ]
+        return sorted(entries, key=lambda entry: entry.written_at, reverse=True)
+
+    def lookup(
+        self,
+        title: str,
+        release_date: str | None = None,
+        country: str | None = None,
+        blob_store: MetadataBlobStore | None = None,
+    ) -> MovieMetadata | None:
+        """タイトルから最新のメタデータを取得する
+
+        出力ファイルが削除されているエントリは読み飛ばし、次に新しいエントリを使用します。
+
+        Args:
+            title: 映画のタイトル（日本語タイトルも可）
+            release_date: 指定した場合は公開日も一致するレコードのみ対象とする
+            country: 指定した場合は制作国も一致するレコードのみ対象とする
+            blob_store: ハッシュ参照形式の改善結果の復元に使うストア
+
+        Returns:
+            最新のメタデータ（見つからない場合はNone）
+
+        Raises:
+            ValueError: ハッシュ参照形式の改善結果をストアなしで読み込んだ場合
+        """
+        for entry in self.find(title, release_date, country):
+            try:
+                return self.read_metadata(entry, blob_store)
+            except FileNotFoundError:
+                logger.warning(
+                    f"インデックスの出力ファイルが見つかりません: {entry.file}"
+                )
+        return None
+
+    def read_metadata(
+        self, entry: OutputIndexEntry, blob_store: MetadataBlobStore | None = None
+    ) -> MovieMetadata:
+        """エントリが指すレコードのメタデータを読み込む
+
+        Args:
+            entry: find()が返したエントリ
+            blob_store: ハッシュ参照形式の改善結果の復元に使うストア
+
+        Returns:
+            レコードのメタデータ（改善結果の場合は最終的なメタデータ）
+
+        Raises:
+            FileNotFoundError: 出力ファイルが存在しない場合
+        """
+        if (
+            entry.kind == "metadata"
+            and entry.offset is None
+            and entry.position is not None
+        ):
+            # ファイル全体を読む場合はパースと検証を1回の呼び出しで行う
+            return load_metadata_json(self._path.parent / entry.file)[entry.position]
+        data = self.read_record(entry)
+        if entry.kind == "refinement":
+            return LazyRefinementResult(data, blob_store).final_metadata
+        return MovieMetadata.model_validate(data)
+
+    def read_record(self, entry: OutputIndexEntry) -> Any:
+        """エントリが指すレコードをJSONとして読み込む
+
+        バイト位置を持つエントリは該当範囲のみを読み込み、
+        持たないエントリ（圧縮ファイル等）はファイル全体を読み込みます。
+
+        Args:
+            entry: find()が返したエントリ
+
+        Returns:
+            レコードのJSONの値
+
+        Raises:
+            FileNotFoundError: 出力ファイルが存在しない場合
+        """
+        file_path = self._path.parent / entry.file
+        if entry.offset is not None and entry.length is not None:
+            with file_path.open("rb") as f:
+                f.seek(entry.offset)
+                return json.loads(f.read(entry.length))
+
+        data = read_json(file_path)
+        if entry.position is None:
+            return data
+        records = data["results"] if isinstance(data, dict) else data
+        return records[entry.position]
+
+    def _refresh(self) -> None:
+        """前回の読み込み以降に追記された行のみを読み込む"""
+        try:
+            stat = self._path.stat()
+        except FileNotFoundError:
+            return
+        file_id = (stat.st_dev, stat.st_ino)
+        if file_id != self._loaded_file or stat.st_size < self._loaded_size:
+            # インデックスが作り直された場合は最初から読み込む
+            self._entries.clear()
+            self._loaded_size = 0
+            self._loaded_file = file_id
+        if stat.st_size == self._loaded_size:
+            return
+
+        with self._path.open("rb") as f:
+            f.seek(self._loaded_size)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # 書き込み途中の最終行は次回に読み込む
+                    break
+                self._loaded_size += len(line)
+                if not line.strip():
+                    continue
+                entry = OutputIndexEntry.model_validate_json(line)
+                self._entries.setdefault(entry.title_key, []).append(entry)
+
+    def _relative_file(self, file_path: Path) -> str:
+        """出力ファイルのパスをインデックスからの相対パスに変換する"""
+        return os.path.relpath(file_path, self._path.parent)
@@ -0,0 +1,160 @@
+"""Parquet形式の分析用エクスポートモジュール
+
+MovieMetadataと各イテレーションのフィールドスコアを列指向のParquetファイルに出力します。
+pyarrowはオプション依存のため、利用時にのみインポートします
+（`uv sync --extra analytics` でインストール）。
+"""
+
+import logging
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any, get_origin
+
+from movie_metadata.models import MetadataRefinementResult, MovieMetadata
+
+logger = logging.getLogger(__name__)
+
+# フィールドスコアの行で辞書エンコーディングする列（値の種類が少ない列）
+_SCORE_DICTIONARY_COLUMNS: list[str] = [
+    "title",
+    "release_date",
+    "country",
+    "field_name",
+    "overall_status",
+]
+
+
+def _import_pyarrow() -> tuple[Any, Any]:
+    """pyarrowとpyarrow.parquetをインポートする
+
+    Raises:
+        ImportError: pyarrowがインストールされていない場合
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError(
+            "Parquet出力にはpyarrowが必要です。"
+            "`uv sync --extra analytics` でインストールしてください。"
+        ) from e
+    return pa, pq
+
+
+class ParquetExporter:
+    """Parquet出力クラス
+
+    メタデータはリスト型のフィールドをlist<string>列として、
+    フィールドスコアは（映画, イテレーション, フィールド）ごとの1行として出力します。
+    文字列列は辞書エンコーディングで圧縮されます。
+
+    Raises:
+        ImportError: pyarrowがインストールされていない場合
+
+    Examples:
+        exporter = ParquetExporter()
+        exporter.write_metadata(metadata_list, Path("output/metadata.parquet"))
+        exporter.write_field_scores(results, Path("output/field_scores.parquet"))
+    """
+
+    def __init__(self) -> None:
+        self._pa, self._pq = _import_pyarrow()
+
+    def write_metadata(
+        self, metadata_list: Iterable[MovieMetadata], output_path: Path
+    ) -> int:
+        """メタデータをParquet形式で出力する
+
+        Args:
+            metadata_list: MovieMetadataのリスト
+            output_path: 出力先Parquetファイルのパス
+
+        Returns:
+            出力した行数
+
+        Raises:
+            OSError: ファイル書き込みに失敗した場合
+        """
+        schema = self._metadata_schema()
+        columns: dict[str, list[Any]] = {name: [] for name in schema.names}
+        for metadata in metadata_list:
+            for name, value in metadata.model_dump().items():
+                columns[name].append(value)
+
+        table = self._pa.Table.from_pydict(columns, schema=schema)
+        self._write(table, output_path, use_dictionary=True)
+        return table.num_rows
+
+    def write_field_scores(
+        self, results: Iterable[MetadataRefinementResult], output_path: Path
+    ) -> int:
+        """全イテレーションのフィールドスコアをParquet形式で出力する
+
+        Args:
+            results: リファインメント結果のリスト
+            output_path: 出力先Parquetファイルのパス
+
+        Returns:
+            出力した行数
+
+        Raises:
+            OSError: ファイル書き込みに失敗した場合
+        """
+        pa = self._pa
+        schema = pa.schema(
+            [
+                ("title", pa.string()),
+                ("release_date", pa.string()),
+                ("country", pa.string()),
+                ("iteration", pa.int32()),
+                ("field_name", pa.string()),
+                ("score", pa.float64()),
+                ("reasoning", pa.string()),
+                ("overall_status", pa.string()),
+                ("success", pa.bool_()),
+            ]
+        )
+        columns: dict[str, list[Any]] = {name: [] for name in schema.names}
+        for result in results:
+            final = result.final_metadata
+            for entry in result.history:
+                for field_score in entry.evaluation.field_scores:
+                    columns["title"].append(final.title)
+                    columns["release_date"].append(final.release_date)
+                    columns["country"].append(final.country)
+                    columns["iteration"].append(entry.iteration)
+                    columns["field_name"].append(field_score.field_name)
+                    columns["score"].append(field_score.score)
+                    columns["reasoning"].append(field_score.reasoning)
+                    columns["overall_status"].append(entry.evaluation.overall_status)
+                    columns["success"].append(result.success)
+
+        table = pa.Table.from_pydict(columns, schema=schema)
+        self._write(table, output_path, use_dictionary=_SCORE_DICTIONARY_COLUMNS)
+        return table.num_rows
+
+    def _metadata_schema(self) -> Any:
+        """MovieMetadataのフィールド定義からArrowスキーマを生成する"""
+        pa = self._pa
+        fields = []
+        for name, field_info in MovieMetadata.model_fields.items():
+            is_list = get_origin(field_info.annotation) is list
+            fields.append((name, pa.list_(pa.string()) if is_list else pa.string()))
+        return pa.schema(fields)
+
+    def _write(
+        self, table: Any, output_path: Path, use_dictionary: bool | list[str]
+    ) -> None:
+        """テーブルをParquetファイルに書き込む"""
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            self._pq.write_table(
+                table,
+                output_path,
+                use_dictionary=use_dictionary,
+                compression="zstd",
+            )
+        except Exception as e:
+            logger.error(f"Parquetファイルの書き込みに失敗しました: {e}")
+            raise OSError(f"Parquetファイルの書き込みに失敗しました: {e}") from e
+        logger.info(f"{output_path} に {table.num_rows} 行を出力しました")
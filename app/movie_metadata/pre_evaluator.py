@@ -0,0 +1,171 @@
+"""ルールベースの事前評価機能
+
+LLMによる評価の前に、明らかな欠損や不正な値を決定的なルールで検出します。
+検出したフィールドには0.0のスコアを割り当て、すべての評価対象フィールドが
+確定した場合はLLM呼び出しを省略できるようにします。
+"""
+
+import logging
+
+from movie_metadata.models import MetadataFieldScore, MovieMetadata
+
+logger = logging.getLogger(__name__)
+
+# LLM評価の対象となるフィールド（METADATA_EVALUATION_PROMPT_TEMPLATEと同じ並び）
+EVALUATED_FIELDS: tuple[str, ...] = (
+    "japanese_titles",
+    "original_work",
+    "original_authors",
+    "distributor",
+    "production_companies",
+    "box_office",
+    "cast",
+    "screenwriters",
+    "music",
+    "voice_actors",
+)
+
+# 情報が取得できなかったことを示すプレースホルダー（小文字で比較）
+PLACEHOLDER_VALUES: frozenset[str] = frozenset(
+    {"", "情報なし", "不明", "n/a", "unknown", "-"}
+)
+
+# 該当しない場合に空のリストまたはプレースホルダーのみ（['情報なし']）が
+# 正当な値になるフィールド（MovieMetadataのスキーマの説明に従う）。
+# 声優は実写作品など該当しない場合がある。原作者はオリジナル作品の場合のみ
+_NOT_APPLICABLE_ALLOWED_FIELDS: frozenset[str] = frozenset({"voice_actors"})
+
+# ルールだけで評価を確定させるために判定済みである必要があるフィールド
+# （1つでも0.0があれば不合格のため、該当なしを許容するフィールドは不要）
+_DECISIVE_FIELDS: frozenset[str] = frozenset(EVALUATED_FIELDS).difference(
+    _NOT_APPLICABLE_ALLOWED_FIELDS
+)
+
+_ORIGINAL_WORK_VALUE = "オリジナル"
+
+
+class RuleBasedPreEvaluator:
+    """ルールベースの事前評価クラス
+
+    プレースホルダー値や空リストを検出し、
+    該当フィールドに0.0のスコアを割り当てます。
+    声優（およびオリジナル作品の原作者）の空リスト・プレースホルダーのみのリストは
+    「該当なし」を表す正当な値のため判定せず、LLMの評価に委ねます。
+
+    Examples:
+        pre_evaluator = RuleBasedPreEvaluator()
+        scores = pre_evaluator.evaluate(metadata)
+        if pre_evaluator.is_decisive(scores):
+            print("LLM評価は不要です")
+    """
+
+    def evaluate(self, metadata: MovieMetadata) -> list[MetadataFieldScore]:
+        """ルールに違反したフィールドのスコアを返す
+
+        Args:
+            metadata: 評価対象のメタデータ
+
+        Returns:
+            ルール違反が検出されたフィールドのスコア（すべて0.0）のリスト
+        """
+        scores: list[MetadataFieldScore] = []
+
+        for field_name in EVALUATED_FIELDS:
+            value = getattr(metadata, field_name)
+            reasoning = (
+                self._check_list(field_name, value, metadata)
+                if isinstance(value, list)
+                else self._check_value(value)
+            )
+            if reasoning:
+                scores.append(self._zero_score(field_name, reasoning))
+
+        if scores:
+            logger.debug(
+                f"ルールベース評価で{len(scores)}個のフィールドを0.0と判定しました"
+                f"（タイトル: {metadata.title}）"
+            )
+        return scores
+
+    @staticmethod
+    def is_decisive(scores: list[MetadataFieldScore]) -> bool:
+        """事前評価だけで評価結果が確定したかを判定する
+
+        Args:
+            scores: evaluate()の戻り値
+
+        Returns:
+            該当なしを許容するフィールドを除くすべての評価対象フィールドが
+            ルールで判定済みの場合True
+        """
+        decided = {score.field_name for score in scores}
+        return decided.issuperset(_DECISIVE_FIELDS)
+
+    @staticmethod
+    def merge(
+        llm_scores: list[MetadataFieldScore], rule_scores: list[MetadataFieldScore]
+    ) -> list[MetadataFieldScore]:
+        """LLMのスコアにルールベースのスコアを上書きマージする
+
+        Args:
+            llm_scores: LLMが返したスコア
+            rule_scores: ルールベースのスコア
+
+        Returns:
+            ルールベースの判定を優先したスコアのリスト
+        """
+        overrides = {score.field_name: score for score in rule_scores}
+        merged = [overrides.pop(score.field_name, score) for score in llm_scores]
+        merged.extend(overrides.values())
+        return merged
+
+    @staticmethod
+    def build_suggestions(scores: list[MetadataFieldScore]) -> str:
+        """ルールベースの判定結果から改善提案を構築する
+
+        Args:
+            scores: evaluate()の戻り値
+
+        Returns:
+            改善提案の文字列
+        """
+        lines = [
+            "以下のフィールドで情報が取得できていません。"
+            "公式サイト、Wikipedia、映画データベースなど"
+            "信頼できる情報源で再検索してください。"
+        ]
+        lines.extend(f"- {score.field_name}: {score.reasoning}" for score in scores)
+        return "\n".join(lines)
+
+    @staticmethod
+    def _check_value(value: str) -> str | None:
+        """文字列フィールドのルール違反理由を返す（違反なしはNone）"""
+        if value.strip().lower() in PLACEHOLDER_VALUES:
+            return f"「{value}」と記載されており情報がありません"
+        return None
+
+    @staticmethod
+    def _check_list(
+        field_name: str, values: list[str], metadata: MovieMetadata
+    ) -> str | None:
+        """リストフィールドのルール違反理由を返す（違反なしはNone）"""
+        if not all(value.strip().lower() in PLACEHOLDER_VALUES for value in values):
+            return None
+        # 該当しないフィールドでは空・プレースホルダーのみが正当な値
+        if field_name in _NOT_APPLICABLE_ALLOWED_FIELDS:
+            return None
+        is_original = metadata.original_work.strip() == _ORIGINAL_WORK_VALUE
+        if field_name == "original_authors" and is_original:
+            return None
+        if not values:
+            return "リストが空で情報がありません"
+        return "プレースホルダーのみで情報がありません"
+
+    @staticmethod
+    def _zero_score(field_name: str, reasoning: str) -> MetadataFieldScore:
+        """0.0のスコアを生成する"""
+        return MetadataFieldScore(
+            field_name=field_name,
+            score=0.0,
+            reasoning=f"{reasoning}（ルールベース判定）",
+        )
@@ -6,17 +6,33 @@ from movie_metadata.models import (
     MovieMetadata,
 )
 
+
+def _format_list(items: list[str]) -> str:
+    """リストを読みやすい文字列に変換"""
+    if not items or items == ["情報なし"]:
+        return "情報なし"
+    return "\n".join(f"  - {item}" for item in items)
+
+
+def _format_value(value: str) -> str:
+    """文字列を読みやすい形式に変換"""
+    if not value or value == "情報なし":
+        return "情報なし"
+    return value
+
+
 # ========================================
 # メタデータ評価用プロンプト
 # ========================================
 
-METADATA_EVALUATION_PROMPT_TEMPLATE = """
+# 単一・バッチ評価で共通のセクション（評価基準はバッチ評価では1回だけ送信する）
+_EVALUATION_ROLE_SECTION = """
 # 役割: 映画メタデータ品質評価者
 
 あなたは、映画メタデータの品質を客観的に評価する専門家です。
+"""
 
-## 評価対象の映画
-
+_EVALUATION_MOVIE_SECTION = """
 **タイトル**: {title}
 **公開日**: {release_date}
 **制作国**: {country}
@@ -52,7 +68,9 @@ METADATA_EVALUATION_PROMPT_TEMPLATE = """
 
 ### 10. voice_actors (声優)
 {voice_actors}
+"""
 
+_EVALUATION_CRITERIA_SECTION = """
 ## 評価基準
 
 以下の10個のフィールドについて、それぞれ0.0〜5.0のスコアで評価してください。
@@ -97,13 +115,21 @@ METADATA_EVALUATION_PROMPT_TEMPLATE = """
 ## 閾値
 
 **合格基準**: すべてのフィールドが設定された閾値以上
+"""
 
+METADATA_EVALUATION_PROMPT_TEMPLATE = (
+    _EVALUATION_ROLE_SECTION
+    + "\n## 評価対象の映画\n"
+    + _EVALUATION_MOVIE_SECTION
+    + _EVALUATION_CRITERIA_SECTION
+    + """
 ## 出力形式
 
 各フィールドのスコアと理由、および改善提案を提供してください。
 - スコアが閾値未満のフィールドについては、具体的な改善提案を含めてください
 - すべてのフィールドが閾値以上の場合、improvement_suggestionsは「なし」としてください
 """
+)
 
 
 def build_metadata_evaluation_prompt(
@@ -142,32 +168,78 @@ def build_metadata_evaluation_prompt(
         構築されたプロンプト
     """
 
-    def format_list(items: list[str]) -> str:
-        """リストを読みやすい文字列に変換"""
-        if not items or items == ["情報なし"]:
-            return "情報なし"
-        return "\n".join(f"  - {item}" for item in items)
-
-    def format_value(value: str) -> str:
-        """文字列を読みやすい形式に変換"""
-        if not value or value == "情報なし":
-            return "情報なし"
-        return value
-
     return METADATA_EVALUATION_PROMPT_TEMPLATE.format(
         title=title,
         release_date=release_date,
         country=country,
-        japanese_titles=format_list(japanese_titles),
-        original_work=format_value(original_work),
-        original_authors=format_list(original_authors),
+        japanese_titles=_format_list(japanese_titles),
+        original_work=_format_value(original_work),
+        original_authors=_format_list(original_authors),
         distributor=distributor,
-        production_companies=format_list(production_companies),
+        production_companies=_format_list(production_companies),
         box_office=box_office,
-        cast=format_list(cast),
-        screenwriters=format_list(screenwriters),
-        music=format_list(music),
-        voice_actors=format_list(voice_actors),
+        cast=_format_list(cast),
+        screenwriters=_format_list(screenwriters),
+        music=_format_list(music),
+        voice_actors=_format_list(voice_actors),
+    )
+
+
+METADATA_BATCH_EVALUATION_PROMPT_TEMPLATE = (
+    _EVALUATION_ROLE_SECTION
+    + """
+## 評価対象の映画（{count}件）
+
+以下の{count}件の映画をそれぞれ独立に評価してください。
+
+{movies}
+"""
+    + _EVALUATION_CRITERIA_SECTION
+    + """
+## 出力形式
+
+resultsに映画ごとの評価結果を1件ずつ含めてください。
+- titleには評価対象の映画の**タイトル**をそのまま記載してください
+- {count}件すべての映画について、各フィールドのスコアと理由、改善提案を提供してください
+- スコアが閾値未満のフィールドについては、具体的な改善提案を含めてください
+- すべてのフィールドが閾値以上の場合、improvement_suggestionsは「なし」としてください
+"""
+)
+
+
+def build_metadata_batch_evaluation_prompt(metadata_list: list[MovieMetadata]) -> str:
+    """複数作品をまとめて評価するプロンプトを構築
+
+    評価基準は1回だけ含め、各作品のメタデータを並べて送信します。
+
+    Args:
+        metadata_list: 評価対象のメタデータのリスト
+
+    Returns:
+        構築されたプロンプト
+    """
+    count = len(metadata_list)
+    sections = []
+    for index, metadata in enumerate(metadata_list, start=1):
+        movie_section = _EVALUATION_MOVIE_SECTION.format(
+            title=metadata.title,
+            release_date=metadata.release_date,
+            country=metadata.country,
+            japanese_titles=_format_list(metadata.japanese_titles),
+            original_work=_format_value(metadata.original_work),
+            original_authors=_format_list(metadata.original_authors),
+            distributor=metadata.distributor,
+            production_companies=_format_list(metadata.production_companies),
+            box_office=metadata.box_office,
+            cast=_format_list(metadata.cast),
+            screenwriters=_format_list(metadata.screenwriters),
+            music=_format_list(metadata.music),
+            voice_actors=_format_list(metadata.voice_actors),
+        )
+        sections.append(f"---\n\n## 映画 {index}/{count}\n{movie_section}")
+
+    return METADATA_BATCH_EVALUATION_PROMPT_TEMPLATE.format(
+        count=count, movies="\n".join(sections)
     )
 
 
@@ -266,18 +338,6 @@ def build_improvement_proposal_prompt(
         構築されたプロンプト
     """
 
-    def format_list(items: list[str]) -> str:
-        """リストを読みやすい文字列に変換"""
-        if not items or items == ["情報なし"]:
-            return "情報なし"
-        return "\n".join(f"  - {item}" for item in items)
-
-    def format_value(value: str) -> str:
-        """文字列を読みやすい形式に変換"""
-        if not value or value == "情報なし":
-            return "情報なし"
-        return value
-
     # 評価結果のサマリーを構築
     evaluation_lines = []
     for field_score in evaluation.field_scores:
@@ -292,16 +352,16 @@ def build_improvement_proposal_prompt(
         title=movie_input.title,
         release_date=movie_input.release_date,
         country=movie_input.country,
-        japanese_titles=format_list(current_metadata.japanese_titles),
-        original_work=format_value(current_metadata.original_work),
-        original_authors=format_list(current_metadata.original_authors),
+        japanese_titles=_format_list(current_metadata.japanese_titles),
+        original_work=_format_value(current_metadata.original_work),
+        original_authors=_format_list(current_metadata.original_authors),
         distributor=current_metadata.distributor,
-        production_companies=format_list(current_metadata.production_companies),
+        production_companies=_format_list(current_metadata.production_companies),
         box_office=current_metadata.box_office,
-        cast=format_list(current_metadata.cast),
-        screenwriters=format_list(current_metadata.screenwriters),
-        music=format_list(current_metadata.music),
-        voice_actors=format_list(current_metadata.voice_actors),
+        cast=_format_list(current_metadata.cast),
+        screenwriters=_format_list(current_metadata.screenwriters),
+        music=_format_list(current_metadata.music),
+        voice_actors=_format_list(current_metadata.voice_actors),
         evaluation_summary=evaluation_summary,
     )
 
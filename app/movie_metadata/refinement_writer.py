@@ -2,14 +2,165 @@
 
 import json
 import re
-from datetime import datetime
+from collections.abc import Iterable, Iterator
+from datetime import UTC, datetime
 from pathlib import Path
+from types import TracebackType
+from typing import Any, Self
 
-from movie_metadata.models import BatchRefinementResult, MetadataRefinementResult
+from movie_metadata.atomic_io import GroupCommitWriter, atomic_write
+from movie_metadata.blob_store import MetadataBlobStore
+from movie_metadata.compressed_io import (
+    CompressionType,
+    compressed_path,
+    compressing,
+    iter_lines,
+)
+from movie_metadata.history_codec import (
+    LazyRefinementResult,
+    encode_batch_refinement_result,
+    encode_refinement_result,
+    encode_refinement_result_refs,
+)
+from movie_metadata.models import (
+    BatchRefinementResult,
+    BatchRefinementSummary,
+    MetadataRefinementResult,
+    MovieMetadata,
+    OutputIndexEntry,
+)
+from movie_metadata.output_index import OutputIndex
+from movie_metadata.serialization import to_json_bytes, write_json, write_json_array
+
+# RefinementResultWriterが出力するファイル名（個別結果・バッチ結果・ジャーナル）
+# アトミック書き込み中の一時ファイル（.{name}.{uuid}.tmp）には一致しない
+_REFINEMENT_OUTPUT_PATTERN = re.compile(
+    r"^(?!\.)(?:.+_refinement_\d{8}_\d{6}\.json"
+    r"|batch_refinement_result_\d{8}_\d{6}(?:_shard-\d+-of-\d+)?\.json"
+    r"|refinement_results_\d{8}_\d{6}(?:_shard-\d+-of-\d+)?\.jsonl)"
+    r"(?:\.gz|\.zst)?$"
+)
+
+
+def find_refinement_outputs(output_dir: Path) -> list[Path]:
+    """出力ディレクトリからリファインメント結果のファイルを列挙する
+
+    Args:
+        output_dir: 出力先ディレクトリパス
+
+    Returns:
+        個別結果・バッチ結果・ジャーナルのファイルのパス（名前順）
+    """
+    return sorted(
+        path
+        for path in output_dir.iterdir()
+        if path.is_file() and _REFINEMENT_OUTPUT_PATTERN.match(path.name)
+    )
+
+
+def _encode_result(
+    result: MetadataRefinementResult,
+    compact_history: bool,
+    blob_store: MetadataBlobStore | None,
+) -> Any:
+    """出力設定に応じてリファインメント結果を出力用の値に変換する"""
+    if blob_store is not None:
+        return encode_refinement_result_refs(result, blob_store)
+    if compact_history:
+        return encode_refinement_result(result)
+    return result
+
+
+class RefinementResultJournal:
+    """リファインメント結果を1件ずつ追記するJSON Linesジャーナル
+
+    結果が完成するたびに1行として追記し、グループコミットで永続化します。
+    処理が途中で中断しても、それまでに追記した結果は失われません。
+
+    Args:
+        path: ジャーナルファイルのパス
+        compact_history: Trueの場合、履歴を差分エンコーディングして追記する
+        compression: 圧縮形式（Noneの場合は無圧縮）
+        compression_level: 圧縮レベル（Noneの場合は各形式の既定値）
+        blob_store: 指定した場合はメタデータをストアに保存し、ハッシュで参照する
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        compact_history: bool = False,
+        compression: CompressionType | None = None,
+        compression_level: int | None = None,
+        blob_store: MetadataBlobStore | None = None,
+    ) -> None:
+        self._compact_history = compact_history
+        self._blob_store = blob_store
+        self._writer = GroupCommitWriter(
+            path, compression=compression, compression_level=compression_level
+        )
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    @property
+    def path(self) -> Path:
+        """ジャーナルファイルのパス"""
+        return self._writer.path
+
+    def append(self, result: MetadataRefinementResult) -> None:
+        """リファインメント結果を1行追記する
+
+        Args:
+            result: 追記するリファインメント結果
+        """
+        data = _encode_result(result, self._compact_history, self._blob_store)
+        self._writer.write_line(to_json_bytes(data, pretty=False).decode("utf-8"))
+
+    def close(self) -> None:
+        """未同期の結果を同期してジャーナルを閉じる"""
+        self._writer.close()
 
 
 class RefinementResultWriter:
-    """メタデータ改善プロセスの結果をJSON形式で出力する"""
+    """メタデータ改善プロセスの結果をJSON形式で出力する
+
+    Args:
+        compact_history: Trueの場合、履歴を差分エンコーディングし、
+            インデントなしのJSONで出力する（読み込みはhistory_codecを使用）
+        compression: 圧縮形式（"gzip" / "zstd"、Noneの場合は無圧縮）。
+            指定した場合はファイル名に拡張子（.gz / .zst）を付与する
+        compression_level: 圧縮レベル（Noneの場合は各形式の既定値）
+        blob_store: 指定した場合はメタデータをMetadataBlobStoreに保存し、
+            出力ファイルには内容ハッシュ（metadata_ref）のみを書き込む
+            （読み込み時は同じストアをhistory_codecに渡す）
+        output_index: 指定した場合は出力した各結果の位置をインデックスに追記する
+        name_suffix: バッチ結果・ジャーナルのファイル名に付与する接尾辞
+            （シャードごとに別のファイルへ出力する場合に使用）
+    """
+
+    def __init__(
+        self,
+        compact_history: bool = False,
+        compression: CompressionType | None = None,
+        compression_level: int | None = None,
+        blob_store: MetadataBlobStore | None = None,
+        output_index: OutputIndex | None = None,
+        name_suffix: str = "",
+    ) -> None:
+        self._compact_history = compact_history
+        self._blob_store = blob_store
+        self._output_index = output_index
+        self._name_suffix = name_suffix
+        self._compression: CompressionType | None = compression
+        self._compression_level = compression_level
 
     def write(self, result: MetadataRefinementResult, output_path: Path) -> None:
         """
@@ -36,12 +187,15 @@ class RefinementResultWriter:
         output_path.mkdir(parents=True, exist_ok=True)
 
         # JSON形式で書き込み
-        with file_path.open("w", encoding="utf-8") as f:
-            json.dump(
-                result.model_dump(),
-                f,
-                ensure_ascii=False,
-                indent=2,
+        data = _encode_result(result, self._compact_history, self._blob_store)
+        self._dump(data, file_path)
+        if self._output_index is not None:
+            self._output_index.add(
+                self._output_index.make_entries(
+                    result.final_metadata,
+                    compressed_path(file_path, self._compression),
+                    "refinement",
+                )
             )
 
     def write_batch(
@@ -57,19 +211,158 @@ class RefinementResultWriter:
         出力ファイル名: batch_refinement_result_{YYYYMMDD}_{HHMMSS}.json
         """
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"batch_refinement_result_{timestamp}.json"
+        filename = f"batch_refinement_result_{timestamp}{self._name_suffix}.json"
         file_path = output_dir / filename
 
         output_dir.mkdir(parents=True, exist_ok=True)
 
-        with file_path.open("w", encoding="utf-8") as f:
-            json.dump(
-                batch_result.model_dump(),
-                f,
-                ensure_ascii=False,
-                indent=2,
+        data = (
+            encode_batch_refinement_result(batch_result, self._blob_store)
+            if self._compact_history or self._blob_store is not None
+            else batch_result
+        )
+        self._dump(data, file_path)
+        if self._output_index is not None:
+            written_at = datetime.now(UTC)
+            self._output_index.add(
+                entry
+                for position, result in enumerate(batch_result.results)
+                for entry in self._output_index.make_entries(
+                    result.final_metadata,
+                    compressed_path(file_path, self._compression),
+                    "refinement",
+                    position=position,
+                    written_at=written_at,
+                )
             )
 
+    def open_journal(self, output_dir: Path) -> RefinementResultJournal:
+        """結果を1件ずつ追記するジャーナルを開く
+
+        Args:
+            output_dir: 出力先ディレクトリパス
+
+        Returns:
+            RefinementResultJournal（このライターの出力設定を引き継ぐ）
+
+        出力ファイル名: refinement_results_{YYYYMMDD}_{HHMMSS}.jsonl
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        file_path = compressed_path(
+            output_dir / f"refinement_results_{timestamp}{self._name_suffix}.jsonl",
+            self._compression,
+        )
+        return RefinementResultJournal(
+            file_path,
+            compact_history=self._compact_history,
+            compression=self._compression,
+            compression_level=self._compression_level,
+            blob_store=self._blob_store,
+        )
+
+    def write_batch_from_journal(
+        self,
+        journal_path: Path,
+        summary: BatchRefinementSummary,
+        output_dir: Path,
+    ) -> None:
+        """
+        ジャーナルと集計からバッチ処理の結果をJSON形式で保存する
+
+        write_batch()と同じ形式のファイルを、結果をメモリに展開せずに
+        ジャーナルの行をそのままストリーミングで書き込んで生成します。
+
+        Args:
+            journal_path: open_journal()で書き込んだジャーナルのパス
+            summary: バッチ処理の集計
+            output_dir: 出力先ディレクトリパス
+
+        出力ファイル名: batch_refinement_result_{YYYYMMDD}_{HHMMSS}.json
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        file_path = compressed_path(
+            output_dir / f"batch_refinement_result_{timestamp}{self._name_suffix}.json",
+            self._compression,
+        )
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        pretty = not self._compact_history
+
+        def elements() -> Iterator[bytes]:
+            for line in iter_lines(journal_path):
+                if not line:
+                    continue
+                if not pretty:
+                    yield line.encode("utf-8")
+                    continue
+                # 1行のJSONを整形する（インデントはwrite_json_arrayで付与）
+                yield to_json_bytes(json.loads(line), pretty=True)
+
+        # 集計部分（先頭の"{"を除く）を結果の配列の後ろに連結する
+        summary_json = to_json_bytes(summary, pretty=pretty)[1:]
+        prefix = b'{\n  "results": ' if pretty else b'{"results":'
+        with (
+            atomic_write(file_path, mode="wb") as raw,
+            compressing(raw, self._compression, self._compression_level) as f,
+        ):
+            f.write(prefix)
+            spans = write_json_array(f, elements(), pretty=pretty, depth=1)
+            f.write(b"," + summary_json)
+
+        if self._output_index is not None:
+            # 最終メタデータは保持せず、書き込み完了後にジャーナルから1件ずつ復元する
+            self._output_index.add(
+                self._batch_index_entries(
+                    self._output_index,
+                    file_path,
+                    self._iter_journal_finals(journal_path),
+                    spans,
+                    len(prefix),
+                )
+            )
+
+    def _iter_journal_finals(self, journal_path: Path) -> Iterator[MovieMetadata]:
+        """ジャーナルの各結果の最終メタデータを1件ずつ生成する"""
+        for line in iter_lines(journal_path):
+            if line:
+                data = json.loads(line)
+                yield LazyRefinementResult(data, self._blob_store).final_metadata
+
+    def _batch_index_entries(
+        self,
+        output_index: OutputIndex,
+        file_path: Path,
+        finals: Iterable[MovieMetadata],
+        spans: list[tuple[int, int]],
+        base_offset: int,
+    ) -> Iterator[OutputIndexEntry]:
+        """バッチ結果ファイルの各結果に対するインデックスエントリを生成する"""
+        written_at = datetime.now(UTC)
+        for position, (metadata, (offset, length)) in enumerate(
+            zip(finals, spans, strict=True)
+        ):
+            yield from output_index.make_entries(
+                metadata,
+                file_path,
+                "refinement",
+                position=position,
+                # 圧縮ファイルのバイト位置は展開後の位置のため使用しない
+                span=(base_offset + offset, length)
+                if self._compression is None
+                else None,
+                written_at=written_at,
+            )
+
+    def _dump(self, data: Any, file_path: Path) -> None:
+        """モデルまたは辞書をJSON形式でアトミックに書き込む（圧縮時はインデントなし）"""
+        write_json(
+            compressed_path(file_path, self._compression),
+            data,
+            pretty=not self._compact_history,
+            compression=self._compression,
+            compression_level=self._compression_level,
+        )
+
     def _sanitize_filename(self, title: str) -> str:
         """
         タイトルをファイル名として安全な形式に変換する
@@ -5,20 +5,42 @@
 
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 from config import AppConfig
+from movie_metadata.evaluation_cache import EvaluationCache
 from movie_metadata.evaluator import MetadataEvaluator
+from movie_metadata.fingerprint import metadata_fingerprint
 from movie_metadata.genai_client import GenAIClient
 from movie_metadata.improvement_proposer import ImprovementProposer
 from movie_metadata.metadata_fetcher import MovieMetadataFetcher
 from movie_metadata.models import (
+    FetchVariant,
+    MetadataEvaluationResult,
+    MetadataFieldScore,
     MetadataRefinementResult,
     MovieInput,
+    MovieMetadata,
     RefinementHistoryEntry,
 )
 
 logger = logging.getLogger(__name__)
 
+# 改善ループの終了理由（MetadataRefinementResult.stop_reason）
+STOP_REASON_PASSED = "passed"
+STOP_REASON_MAX_ITERATIONS = "max_iterations"
+STOP_REASON_UNCHANGED_METADATA = "unchanged_metadata"
+STOP_REASON_SCORE_PLATEAU = "score_plateau"
+STOP_REASON_SAME_FAILURES = "same_failures"
+STOP_REASON_NO_PASSING_CANDIDATE = "no_passing_candidate"
+
+# 並列候補生成のデフォルトのバリエーション（温度を変えて多様な候補を得る）
+DEFAULT_FETCH_VARIANTS: tuple[FetchVariant, ...] = (
+    FetchVariant(),
+    FetchVariant(temperature=0.4),
+    FetchVariant(temperature=1.0),
+)
+
 
 class MetadataRefiner:
     """メタデータ改善ループクラス
@@ -26,10 +48,16 @@ class MetadataRefiner:
     評価→改善提案→再取得のサイクルを自動的に繰り返し、
     すべてのフィールドが閾値以上になるまで改善を試みます。
 
+    前回と同じメタデータが返された場合、平均スコアの変化がイプシロン未満の場合、
+    または同じフィールドが同じ値のまま不合格の場合は収束したとみなし、
+    最大イテレーション数を待たずに終了します。
+
     Args:
         api_key: Google GenAI APIキー
         model_name: 使用するモデル名（デフォルト: gemini-2.0-flash）
         rate_limit_sleep: API呼び出し間のスリープ時間（秒）
+        score_epsilon: 収束とみなす平均スコア変化量の上限（デフォルト: 0.1）
+        evaluation_cache: 評価結果のキャッシュ（デフォルト: None、キャッシュしない）
 
     Examples:
         refiner = MetadataRefiner(api_key="YOUR_KEY")
@@ -42,10 +70,13 @@ class MetadataRefiner:
         api_key: str,
         model_name: str = "gemini-2.0-flash",
         rate_limit_sleep: float = 1.0,
+        score_epsilon: float = 0.1,
+        evaluation_cache: EvaluationCache | None = None,
     ) -> None:
         self.api_key = api_key
         self.model_name = model_name
         self.rate_limit_sleep = rate_limit_sleep
+        self.score_epsilon = score_epsilon
 
         # 環境変数から品質スコア閾値を取得
         config = AppConfig()
@@ -53,7 +84,10 @@ class MetadataRefiner:
 
         # 評価器と改善提案器を初期化
         self.evaluator = MetadataEvaluator(
-            api_key=api_key, model_name=model_name, threshold=self.default_threshold
+            api_key=api_key,
+            model_name=model_name,
+            threshold=self.default_threshold,
+            cache=evaluation_cache,
         )
         self.proposer = ImprovementProposer(
             api_key=api_key, model_name=model_name, threshold=self.default_threshold
@@ -69,11 +103,12 @@ class MetadataRefiner:
         self,
         movie_input: MovieInput,
         max_iterations: int = 3,
+        threshold: float | None = None,
     ) -> MetadataRefinementResult:
         """メタデータを改善する
 
         すべてのフィールドスコアが閾値以上になるまで、
-        または最大イテレーション数に達するまで改善を繰り返します。
+        最大イテレーション数に達するまで、または結果が収束するまで改善を繰り返します。
 
         Args:
             movie_input: 映画の基本情報
@@ -88,31 +123,16 @@ class MetadataRefiner:
             Exception: メタデータ取得、評価、改善提案のいずれかに失敗した場合
             ValueError: thresholdが0.0～5.0の範囲外の場合
         """
-        threshold = self.default_threshold
-
-        # バリデーション: thresholdは0.0～5.0の範囲内である必要がある
-        if not isinstance(threshold, (int, float)):
-            type_name = type(threshold).__name__
-            msg = f"thresholdは数値である必要があります（受け取った型: {type_name}）"
-            raise ValueError(msg)
-
-        if not (0.0 <= threshold <= 5.0):
-            msg = (
-                f"thresholdは0.0～5.0の範囲内である必要があります"
-                f"（受け取った値: {threshold}）"
-            )
-            raise ValueError(msg)
-
-        # evaluatorとproposerの閾値を更新
-        self.evaluator.threshold = threshold
-        self.proposer.threshold = threshold
+        # 閾値は呼び出しごとに渡す（並列実行時に共有の評価器の状態を変更しない）
+        threshold = self._resolve_threshold(threshold)
 
         logger.info(
             f"メタデータ改善ループを開始します（最大イテレーション: {max_iterations}, "
             f"閾値: {threshold}, タイトル: {movie_input.title}）"
         )
 
-        history = []
+        history: list[RefinementHistoryEntry] = []
+        previous_fingerprint: str | None = None
 
         # GenAIClientをコンテキストマネージャーとして使用
         with GenAIClient(api_key=self.api_key, model_name=self.model_name) as client:
@@ -135,11 +155,31 @@ class MetadataRefiner:
                         movie_input, improvement_instruction
                     )
 
+                # 前回と同一のメタデータなら評価を再利用して終了（評価呼び出しを省略）
+                fingerprint = metadata_fingerprint(metadata)
+                if history and fingerprint == previous_fingerprint:
+                    prev_evaluation = history[-1].evaluation
+                    evaluation = prev_evaluation.model_copy(
+                        update={"iteration": iteration}
+                    )
+                    history.append(
+                        RefinementHistoryEntry(
+                            iteration=iteration,
+                            metadata=metadata,
+                            evaluation=evaluation,
+                        )
+                    )
+                    logger.info("メタデータが前回と同一のため、改善ループを終了します")
+                    return self._build_result(
+                        metadata, history, STOP_REASON_UNCHANGED_METADATA
+                    )
+                previous_fingerprint = fingerprint
+
                 # レート制限対策のスリープ
                 time.sleep(self.rate_limit_sleep)
 
                 # 2. メタデータ評価
-                evaluation = self.evaluator.evaluate(metadata, iteration)
+                evaluation = self.evaluator.evaluate(metadata, iteration, threshold)
 
                 # レート制限対策のスリープ
                 time.sleep(self.rate_limit_sleep)
@@ -157,12 +197,7 @@ class MetadataRefiner:
                     logger.info(
                         f"すべてのフィールドが閾値{threshold}以上を達成しました"
                     )
-                    return MetadataRefinementResult(
-                        final_metadata=metadata,
-                        history=history,
-                        success=True,
-                        total_iterations=iteration,
-                    )
+                    return self._build_result(metadata, history, STOP_REASON_PASSED)
 
                 # 5. 最大イテレーション数に達したかチェック
                 if iteration >= max_iterations:
@@ -170,18 +205,24 @@ class MetadataRefiner:
                         f"最大イテレーション数{max_iterations}に達しました。"
                         f"一部のフィールドが閾値{threshold}未満です。"
                     )
-                    return MetadataRefinementResult(
-                        final_metadata=metadata,
-                        history=history,
-                        success=False,
-                        total_iterations=iteration,
+                    return self._build_result(
+                        metadata, history, STOP_REASON_MAX_ITERATIONS
                     )
 
-                # 6. 次のイテレーションのために改善提案を生成
+                # 6. 収束チェック（これ以上の改善が見込めない場合は早期終了）
+                stop_reason = self._detect_convergence(history, threshold)
+                if stop_reason:
+                    logger.warning(
+                        f"改善が収束したため早期終了します（理由: {stop_reason}）。"
+                        f"一部のフィールドが閾値{threshold}未満です。"
+                    )
+                    return self._build_result(metadata, history, stop_reason)
+
+                # 7. 次のイテレーションのために改善提案を生成
                 logger.info(
                     f"イテレーション {iteration + 1} のために改善提案を生成します"
                 )
-                self.proposer.propose(movie_input, metadata, evaluation)
+                self.proposer.propose(movie_input, metadata, evaluation, threshold)
 
                 # レート制限対策のスリープ（次のイテレーションの前）
                 time.sleep(self.rate_limit_sleep)
@@ -189,3 +230,237 @@ class MetadataRefiner:
         # このコードには到達しないはずだが、念のため
         msg = "予期しないエラー: ループ終了条件に達しませんでした"
         raise RuntimeError(msg)
+
+    def refine_speculative(
+        self,
+        movie_input: MovieInput,
+        variants: list[FetchVariant] | None = None,
+        threshold: float | None = None,
+        merge_fields: bool = True,
+    ) -> MetadataRefinementResult:
+        """複数の取得バリエーションを並列に実行し、最良の候補を選ぶ
+
+        取得→評価→再取得の逐次ループの代わりに、N個の候補を並列に取得・評価し、
+        1ラウンドで結果を確定させます。
+
+        Args:
+            movie_input: 映画の基本情報
+            variants: 取得バリエーションのリスト（デフォルト: DEFAULT_FETCH_VARIANTS）
+            threshold: 各フィールドの合格閾値
+                （デフォルト: 環境変数QUALITY_SCORE_THRESHOLD）
+            merge_fields: Trueの場合はフィールドごとに最高スコアの候補の値を採用し、
+                Falseの場合は平均スコアが最も高い候補をそのまま採用する
+
+        Returns:
+            MetadataRefinementResult: 改善プロセスの結果（イテレーション数は1）。
+                合格する候補がなかった場合の終了理由はno_passing_candidate
+
+        Raises:
+            Exception: すべての候補の取得または評価に失敗した場合（最初の例外）
+            ValueError: thresholdが0.0～5.0の範囲外の場合
+        """
+        threshold = self._resolve_threshold(threshold)
+        variants = list(variants or DEFAULT_FETCH_VARIANTS)
+
+        logger.info(
+            f"並列候補生成を開始します（候補数: {len(variants)}, "
+            f"閾値: {threshold}, タイトル: {movie_input.title}）"
+        )
+
+        candidates: list[RefinementHistoryEntry] = []
+        errors: list[Exception] = []
+        with ThreadPoolExecutor(max_workers=len(variants)) as executor:
+            futures = [
+                executor.submit(self._run_candidate, movie_input, variant, threshold)
+                for variant in variants
+            ]
+            # バリエーションの順序で集める（同点の場合に結果が実行順に依存しない）
+            for future in futures:
+                try:
+                    candidates.append(future.result())
+                except Exception as e:
+                    logger.warning(
+                        f"候補の取得または評価に失敗しました ({type(e).__name__}: {e})"
+                    )
+                    errors.append(e)
+
+        if not candidates:
+            raise errors[0]
+
+        best = max(candidates, key=self._candidate_rank)
+        entry = (
+            self._merge_candidates(candidates, best, threshold)
+            if merge_fields
+            else best
+        )
+
+        stop_reason = (
+            STOP_REASON_PASSED
+            if entry.evaluation.overall_status == "pass"
+            else STOP_REASON_NO_PASSING_CANDIDATE
+        )
+        logger.info(
+            f"並列候補生成が完了しました（成功候補: {len(candidates)}/{len(variants)}, "
+            f"ステータス: {entry.evaluation.overall_status}）"
+        )
+        return self._build_result(entry.metadata, [entry], stop_reason)
+
+    def _run_candidate(
+        self, movie_input: MovieInput, variant: FetchVariant, threshold: float
+    ) -> RefinementHistoryEntry:
+        """1つのバリエーションでメタデータを取得して評価する"""
+        model_name = variant.model_name or self.model_name
+        with GenAIClient(api_key=self.api_key, model_name=model_name) as client:
+            fetcher = MovieMetadataFetcher(client)
+            if variant.improvement_instruction:
+                metadata = fetcher.fetch_with_improvement(
+                    movie_input,
+                    variant.improvement_instruction,
+                    temperature=variant.temperature,
+                )
+            else:
+                metadata = fetcher.fetch(movie_input, temperature=variant.temperature)
+
+        evaluation = self.evaluator.evaluate(metadata, 1, threshold)
+        return RefinementHistoryEntry(
+            iteration=1, metadata=metadata, evaluation=evaluation
+        )
+
+    def _candidate_rank(self, entry: RefinementHistoryEntry) -> tuple[bool, float]:
+        """候補の優先順位（合格を優先し、次に平均スコア）を返す"""
+        return entry.evaluation.overall_status == "pass", self._average_score(entry)
+
+    @staticmethod
+    def _merge_candidates(
+        candidates: list[RefinementHistoryEntry],
+        best: RefinementHistoryEntry,
+        threshold: float,
+    ) -> RefinementHistoryEntry:
+        """フィールドごとに最高スコアの候補の値を採用して1つの候補に統合する
+
+        同じスコアの場合は先の候補（バリエーションの順序）の値を採用します。
+
+        Args:
+            candidates: 評価済みの候補（バリエーションの順序）
+            best: 平均スコアが最も高い候補（統合のベース）
+            threshold: 各フィールドの合格閾値
+
+        Returns:
+            統合された候補
+        """
+        winners: dict[str, tuple[MetadataFieldScore, MovieMetadata]] = {}
+        for candidate in candidates:
+            for score in candidate.evaluation.field_scores:
+                current = winners.get(score.field_name)
+                if current is None or score.score > current[0].score:
+                    winners[score.field_name] = (score, candidate.metadata)
+
+        updates = {
+            field_name: getattr(metadata, field_name)
+            for field_name, (_, metadata) in winners.items()
+            if field_name in MovieMetadata.model_fields
+        }
+        merged_metadata = best.metadata.model_copy(update=updates)
+        field_scores = [score for score, _ in winners.values()]
+        all_pass = all(score.score >= threshold for score in field_scores)
+
+        return RefinementHistoryEntry(
+            iteration=1,
+            metadata=merged_metadata,
+            evaluation=MetadataEvaluationResult(
+                iteration=1,
+                field_scores=field_scores,
+                overall_status="pass" if all_pass else "fail",
+                improvement_suggestions=(
+                    "なし" if all_pass else best.evaluation.improvement_suggestions
+                ),
+            ),
+        )
+
+    def _resolve_threshold(self, threshold: float | None) -> float:
+        """閾値を検証して返す（Noneの場合はデフォルト閾値）
+
+        Raises:
+            ValueError: thresholdが数値でない、または0.0～5.0の範囲外の場合
+        """
+        if threshold is None:
+            threshold = self.default_threshold
+
+        # バリデーション: thresholdは0.0～5.0の範囲内である必要がある
+        if not isinstance(threshold, (int, float)):
+            type_name = type(threshold).__name__
+            msg = f"thresholdは数値である必要があります（受け取った型: {type_name}）"
+            raise ValueError(msg)
+
+        if not (0.0 <= threshold <= 5.0):
+            msg = (
+                f"thresholdは0.0～5.0の範囲内である必要があります"
+                f"（受け取った値: {threshold}）"
+            )
+            raise ValueError(msg)
+
+        return threshold
+
+    def _detect_convergence(
+        self, history: list[RefinementHistoryEntry], threshold: float
+    ) -> str | None:
+        """直近2イテレーションを比較して収束を判定する
+
+        Args:
+            history: これまでの履歴
+            threshold: 各フィールドの合格閾値
+
+        Returns:
+            収束していれば終了理由、していなければNone
+        """
+        if len(history) < 2:
+            return None
+
+        previous, current = history[-2], history[-1]
+
+        # 不合格フィールドとその値が前回と同じなら、再取得しても改善しない
+        previous_failures = self._failing_values(previous, threshold)
+        current_failures = self._failing_values(current, threshold)
+        if current_failures and current_failures == previous_failures:
+            return STOP_REASON_SAME_FAILURES
+
+        # 平均スコアがほとんど変化していなければ頭打ちとみなす
+        delta = self._average_score(current) - self._average_score(previous)
+        if abs(delta) < self.score_epsilon:
+            return STOP_REASON_SCORE_PLATEAU
+
+        return None
+
+    @staticmethod
+    def _failing_values(
+        entry: RefinementHistoryEntry, threshold: float
+    ) -> dict[str, object]:
+        """閾値未満のフィールド名とそのメタデータ値の辞書を返す"""
+        return {
+            score.field_name: getattr(entry.metadata, score.field_name, None)
+            for score in entry.evaluation.field_scores
+            if score.score < threshold
+        }
+
+    @staticmethod
+    def _average_score(entry: RefinementHistoryEntry) -> float:
+        """評価結果の平均スコアを返す"""
+        scores = entry.evaluation.field_scores
+        if not scores:
+            return 0.0
+        return sum(score.score for score in scores) / len(scores)
+
+    @staticmethod
+    def _build_result(
+        metadata: MovieMetadata,
+        history: list[RefinementHistoryEntry],
+        stop_reason: str,
+    ) -> MetadataRefinementResult:
+        """改善プロセスの結果を構築する"""
+        return MetadataRefinementResult(
+            final_metadata=metadata,
+            history=history,
+            success=stop_reason == STOP_REASON_PASSED,
+            total_iterations=len(history),
+            stop_reason=stop_reason,
+        )
@@ -0,0 +1,207 @@
+"""処理コストに基づく処理順序の計画モジュール
+
+映画ごとの処理コストは大きく異なります（情報の少ない作品は改善ループが
+上限まで回り、有名な作品は1回で合格します）。過去の実行の実績から各映画の
+処理時間を予測し、時間のかかる映画から先に処理する（LPT: Longest Processing Time
+first）ことで、並列実行時に最後まで残る処理（テール）を短くします。
+逐次実行では順序を変えても総処理時間は変わらないため、並列実行時のみ使用します。
+"""
+
+import json
+import logging
+import re
+import threading
+from collections.abc import Sequence
+from datetime import datetime
+from pathlib import Path
+
+from movie_metadata.atomic_io import GroupCommitWriter
+from movie_metadata.csv_reader import make_input_key
+from movie_metadata.models import MovieInput, ProcessingCostRecord
+from movie_metadata.normalization import normalize_text
+
+logger = logging.getLogger(__name__)
+
+# 実績がない場合に想定するイテレーション数
+DEFAULT_ITERATIONS = 2.0
+
+# 実績がない場合に想定する1イテレーションあたりの処理時間（秒）
+DEFAULT_SECONDS_PER_ITERATION = 10.0
+
+# 公開から間もない作品はモデルの知識が少なく改善が必要になりやすいため、
+# 想定するイテレーション数に加算する
+RECENT_RELEASE_EXTRA_ITERATIONS = 1.0
+
+
+class CostModel:
+    """映画ごとの処理時間を予測するクラス
+
+    同じ映画（正規化したタイトルと公開年が一致）の実績がある場合は、
+    処理時間の指数移動平均を予測値とします。実績がない場合は、同じ制作国の
+    平均イテレーション数（なければ全体の平均）に1イテレーションあたりの
+    平均処理時間を掛けて予測し、公開から間もない作品は多めに見積もります。
+    pathを指定した場合は実績をJSON Lines形式で追記保存し、次回以降の実行で使用します。
+
+    Args:
+        path: 実績の永続化先のJSON Linesファイルのパス（Noneの場合はメモリのみ）
+        smoothing: 指数移動平均の係数（新しい実績の重み、0より大きく1以下）
+        max_iterations: 想定するイテレーション数の上限
+        current_year: 公開から間もない作品の判定に使う年（Noneの場合は今年）
+
+    Raises:
+        ValueError: smoothingが範囲外の場合
+
+    Examples:
+        cost_model = CostModel(Path("data/cache/cost_history.jsonl"))
+        for position in order_by_cost(movies, cost_model):
+            executor.submit(refine, movies[position])
+        cost_model.record(movie, iterations=2, seconds=12.5)
+        cost_model.close()
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        smoothing: float = 0.5,
+        max_iterations: int = 3,
+        current_year: int | None = None,
+    ) -> None:
+        if not 0.0 < smoothing <= 1.0:
+            raise ValueError(
+                f"smoothingは0より大きく1以下を指定してください（指定値: {smoothing}）"
+            )
+        self._path = path
+        self._smoothing = smoothing
+        self._max_iterations = max_iterations
+        self._current_year = current_year or datetime.now().year
+        self._writer: GroupCommitWriter | None = None
+        self._lock = threading.Lock()
+        self._seconds: dict[tuple[str, str], float] = {}
+        self._total_iterations = 0
+        self._total_seconds = 0.0
+        self._record_count = 0
+        self._country_iterations: dict[str, tuple[int, int]] = {}
+        if path is not None and path.exists():
+            self._load(path)
+
+    def __len__(self) -> int:
+        return len(self._seconds)
+
+    def predict(self, movie: MovieInput) -> float:
+        """映画の処理時間を予測する
+
+        Args:
+            movie: 予測対象の映画
+
+        Returns:
+            予測した処理時間（秒）
+        """
+        with self._lock:
+            seconds = self._seconds.get(make_input_key(movie.title, movie.release_date))
+            if seconds is not None:
+                return seconds
+            return self._expected_iterations(movie) * self._seconds_per_iteration()
+
+    def record(self, movie: MovieInput, iterations: int, seconds: float) -> None:
+        """映画の処理実績を記録する
+
+        Args:
+            movie: 処理した映画
+            iterations: 実行したイテレーション数
+            seconds: 処理時間（秒）
+        """
+        record = ProcessingCostRecord(
+            title=movie.title,
+            release_date=movie.release_date,
+            country=movie.country,
+            iterations=iterations,
+            seconds=seconds,
+        )
+        with self._lock:
+            self._apply(record)
+            if self._path is not None:
+                if self._writer is None:
+                    self._writer = GroupCommitWriter(self._path)
+                self._writer.write_line(record.model_dump_json())
+
+    def close(self) -> None:
+        """未同期の追記内容を同期して永続化ファイルを閉じる"""
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+    def _apply(self, record: ProcessingCostRecord) -> None:
+        """実績を予測用の集計に反映する（ロック取得済みで呼び出す）"""
+        key = make_input_key(record.title, record.release_date)
+        previous = self._seconds.get(key)
+        self._seconds[key] = (
+            record.seconds
+            if previous is None
+            else self._smoothing * record.seconds + (1 - self._smoothing) * previous
+        )
+        self._total_iterations += record.iterations
+        self._total_seconds += record.seconds
+        self._record_count += 1
+        country = normalize_text(record.country)
+        iterations, count = self._country_iterations.get(country, (0, 0))
+        self._country_iterations[country] = (iterations + record.iterations, count + 1)
+
+    def _expected_iterations(self, movie: MovieInput) -> float:
+        """実績のない映画のイテレーション数を見積もる（ロック取得済みで呼び出す）"""
+        country_iterations = self._country_iterations.get(normalize_text(movie.country))
+        if country_iterations is not None:
+            iterations, count = country_iterations
+            expected = iterations / count
+        elif self._record_count:
+            expected = self._total_iterations / self._record_count
+        else:
+            expected = DEFAULT_ITERATIONS
+
+        match = re.match(r"\s*(\d{4})", movie.release_date)
+        if match and int(match.group(1)) >= self._current_year - 1:
+            expected += RECENT_RELEASE_EXTRA_ITERATIONS
+        return min(max(expected, 1.0), float(self._max_iterations))
+
+    def _seconds_per_iteration(self) -> float:
+        """1イテレーションあたりの平均処理時間（ロック取得済みで呼び出す）"""
+        if self._total_iterations:
+            return self._total_seconds / self._total_iterations
+        return DEFAULT_SECONDS_PER_ITERATION
+
+    def _load(self, path: Path) -> None:
+        """永続化ファイルから実績を読み込む（壊れた行はスキップ）"""
+        with path.open("r", encoding="utf-8") as f:
+            for line_num, line in enumerate(f, start=1):
+                try:
+                    self._apply(ProcessingCostRecord.model_validate(json.loads(line)))
+                except Exception as e:
+                    logger.warning(
+                        f"処理実績の {line_num} 行目をスキップしました（エラー: {e}）"
+                    )
+        logger.info(f"{path} から {self._record_count} 件の処理実績を読み込みました")
+
+
+def order_by_cost(movies: Sequence[MovieInput], cost_model: CostModel) -> list[int]:
+    """予測した処理時間の長い順（LPT順）に映画の位置を並べる
+
+    予測値が同じ映画は元の順序を維持します。入力そのものは並べ替えないため、
+    呼び出し側は位置を使って結果を入力の順序に戻せます。
+
+    Args:
+        movies: 処理対象の映画
+        cost_model: 処理時間の予測に使うモデル
+
+    Returns:
+        処理時間の長い順に並べたmoviesのインデックスのリスト
+    """
+    predicted = [cost_model.predict(movie) for movie in movies]
+    order = sorted(
+        range(len(predicted)), key=lambda position: predicted[position], reverse=True
+    )
+    if order:
+        logger.info(
+            f"予測処理時間の長い順に {len(order)} 件の投入順序を決めました"
+            f"（最大: {predicted[order[0]]:.1f}秒, 最小: {predicted[order[-1]]:.1f}秒）"
+        )
+    return order
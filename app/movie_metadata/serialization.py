@@ -0,0 +1,108 @@
+"""高速なJSONシリアライズモジュール
+
+PydanticモデルはRust実装のシリアライザ（pydantic_core.to_json）でPython辞書を経由せず
+直接UTF-8のバイト列に変換します。モデルを含まない辞書・リストは、
+orjsonがインストールされていればorjsonで変換します。
+"""
+
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+from typing import IO, Any
+
+import pydantic_core
+from pydantic import BaseModel
+
+from movie_metadata.atomic_io import atomic_write
+from movie_metadata.compressed_io import CompressionType, compressing
+
+try:
+    import orjson
+except ImportError:  # orjsonはオプション依存
+    orjson = None
+
+
+def _contains_model(value: Any) -> bool:
+    """値がPydanticモデル、またはモデルのシーケンスかを判定する"""
+    if isinstance(value, BaseModel):
+        return True
+    if isinstance(value, Sequence) and not isinstance(value, str | bytes):
+        return any(isinstance(item, BaseModel) for item in value)
+    return False
+
+
+def to_json_bytes(value: Any, pretty: bool = True) -> bytes:
+    """値をUTF-8のJSONバイト列に変換する
+
+    日本語はエスケープせずにそのまま出力します。
+
+    Args:
+        value: Pydanticモデル、モデルのリスト、またはJSON互換の辞書・リスト
+        pretty: Trueの場合は2スペースでインデントする
+
+    Returns:
+        JSONのバイト列
+    """
+    if orjson is not None and not _contains_model(value):
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2 if pretty else 0)
+    return pydantic_core.to_json(value, indent=2 if pretty else None)
+
+
+def write_json(
+    path: Path,
+    value: Any,
+    pretty: bool = True,
+    compression: CompressionType | None = None,
+    compression_level: int | None = None,
+) -> None:
+    """値をJSONファイルにアトミックに書き込む
+
+    Args:
+        path: 出力先ファイルのパス（拡張子はそのまま使用する）
+        value: Pydanticモデル、モデルのリスト、またはJSON互換の辞書・リスト
+        pretty: Trueの場合は2スペースでインデントする
+        compression: 圧縮形式（Noneの場合は無圧縮）
+        compression_level: 圧縮レベル（Noneの場合は各形式の既定値）
+
+    Raises:
+        OSError: ファイル書き込みに失敗した場合
+    """
+    data = to_json_bytes(value, pretty=pretty)
+    with (
+        atomic_write(path, mode="wb") as raw,
+        compressing(raw, compression, compression_level) as f,
+    ):
+        f.write(data)
+
+
+def write_json_array(
+    f: IO[bytes], elements: Iterable[bytes], pretty: bool = True, depth: int = 0
+) -> list[tuple[int, int]]:
+    """JSONの要素を配列としてストリーミングで書き込む
+
+    各要素を個別にto_json_bytes()で変換したバイト列を渡すと、
+    配列全体を一度に変換した場合と同じ形式で書き込みます。
+
+    Args:
+        f: 書き込み先のバイナリストリーム
+        elements: 各要素のJSONバイト列（prettyと同じ形式で変換したもの）
+        pretty: Trueの場合は2スペースでインデントする
+        depth: 配列のネストの深さ（整形時のインデントに使用）
+
+    Returns:
+        各要素の（配列の先頭からのバイト位置, バイト長）のリスト
+    """
+    indent = b"\n" + b"  " * (depth + 1)
+    spans: list[tuple[int, int]] = []
+    position = f.write(b"[")
+    for index, element in enumerate(elements):
+        if index > 0:
+            position += f.write(b",")
+        if pretty:
+            position += f.write(indent)
+            element = element.replace(b"\n", indent)
+        spans.append((position, len(element)))
+        position += f.write(element)
+    if pretty and spans:
+        f.write(b"\n" + b"  " * depth)
+    f.write(b"]")
+    return spans
@@ -0,0 +1,323 @@
+"""入力のシャーディングとシャード出力のマージモジュール
+
+同じCSVを複数のプロセス・マシンで協調なしに分担できるように、各映画を
+正規化キー（タイトルと公開年）の安定したハッシュでシャードに割り当てます。
+同じ映画の表記揺れは同じシャードに割り当てられるため、重複排除とも併用できます。
+各シャードが出力したファイルは merge_shard_outputs() で1つの結果にまとめます。
+
+出力ディレクトリのタイトル索引（index.jsonl）とメタデータストア（SQLite）は
+シャードで分けず、全シャードが同じファイルに書き込みます。索引は1行を1回の
+書き込みで追記するため行は混ざらず、ストアはSQLiteのロックで書き込みを排他します。
+ただしSQLiteのWALモードはネットワークファイルシステムでは使用できないため、
+複数のマシンで分担する場合はマシンごとに別のストアを指定してください。
+"""
+
+import argparse
+import hashlib
+import logging
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+from movie_metadata.atomic_io import atomic_write
+from movie_metadata.bulk_validation import load_metadata_json
+from movie_metadata.compressed_io import (
+    compressing,
+    detect_compression,
+    open_read,
+    read_json,
+)
+from movie_metadata.csv_reader import make_input_key
+from movie_metadata.models import DeduplicatedInput, MovieInput
+from movie_metadata.serialization import to_json_bytes, write_json_array
+
+logger = logging.getLogger(__name__)
+
+_MIXED_OUTPUTS_MESSAGE = "種類の異なる出力（メタデータとバッチ結果）は混在できません"
+
+
+def validate_shard(shard_index: int, shard_count: int) -> None:
+    """シャードの指定を検証する
+
+    Args:
+        shard_index: 担当するシャードの番号（0始まり）
+        shard_count: シャードの総数
+
+    Raises:
+        ValueError: shard_countが1未満、またはshard_indexが範囲外の場合
+    """
+    if shard_count < 1:
+        raise ValueError(
+            f"shard_countは1以上を指定してください（指定値: {shard_count}）"
+        )
+    if not 0 <= shard_index < shard_count:
+        raise ValueError(
+            f"shard_indexは0以上{shard_count}未満を指定してください"
+            f"（指定値: {shard_index}）"
+        )
+
+
+def parse_shard_args(
+    description: str,
+    argv: list[str] | None = None,
+    input_argument: bool = False,
+    watch_argument: bool = False,
+) -> argparse.Namespace:
+    """--shard-index / --shard-count のコマンドライン引数を解析する
+
+    Args:
+        description: コマンドの説明
+        argv: コマンドライン引数（Noneの場合は引数なしとして扱う）
+        input_argument: Trueの場合は入力元を指定する --input も受け付ける
+        watch_argument: Trueの場合は監視モードを指定する --watch も受け付ける
+
+    Returns:
+        shard_index, shard_count（input_argument / watch_argumentがTrueの場合は
+        input / watchも）を持つ解析結果
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        "--shard-index",
+        type=int,
+        default=0,
+        help="担当するシャードの番号（0始まり、デフォルト: 0）",
+    )
+    parser.add_argument(
+        "--shard-count",
+        type=int,
+        default=1,
+        help="シャードの総数（デフォルト: 1 = シャーディングしない）",
+    )
+    if input_argument:
+        parser.add_argument(
+            "--input",
+            type=Path,
+            help=(
+                "入力ファイル（CSV / JSON Lines、.gz / .zst も可）。"
+                '"-" で標準入力から読み込む（デフォルト: 設定のCSV_FILENAME）'
+            ),
+        )
+    if watch_argument:
+        parser.add_argument(
+            "--watch",
+            action="store_true",
+            help=(
+                "入力ファイルへの追記（ディレクトリの場合は新しいファイル）を監視し、"
+                "追加された映画を随時処理する"
+            ),
+        )
+    args = parser.parse_args([] if argv is None else argv)
+    try:
+        validate_shard(args.shard_index, args.shard_count)
+    except ValueError as e:
+        parser.error(str(e))
+    return args
+
+
+def shard_of(title: str, release_date: str, shard_count: int) -> int:
+    """映画を割り当てるシャードの番号を返す
+
+    Pythonのhash()はプロセスごとに異なるため、SHA-256を使用します。
+    どのマシンで計算しても同じ映画は同じシャードになります。
+
+    Args:
+        title: 映画のタイトル
+        release_date: 公開日（YYYY-MM-DD形式）
+        shard_count: シャードの総数
+
+    Returns:
+        シャードの番号（0始まり）
+    """
+    title_key, year = make_input_key(title, release_date)
+    digest = hashlib.sha256(f"{title_key}\x1f{year}".encode()).digest()
+    return int.from_bytes(digest[:8], "big") % shard_count
+
+
+def select_shard(
+    movies: Iterable[MovieInput], shard_index: int, shard_count: int
+) -> list[MovieInput]:
+    """担当するシャードに割り当てられた映画のみを返す
+
+    Args:
+        movies: 全シャードの映画
+        shard_index: 担当するシャードの番号（0始まり）
+        shard_count: シャードの総数
+
+    Returns:
+        担当するシャードの映画（元の順序を維持）
+
+    Raises:
+        ValueError: シャードの指定が不正な場合
+    """
+    validate_shard(shard_index, shard_count)
+    return [
+        movie
+        for movie in movies
+        if shard_of(movie.title, movie.release_date, shard_count) == shard_index
+    ]
+
+
+def select_shard_deduplicated(
+    deduplicated: DeduplicatedInput, shard_index: int, shard_count: int
+) -> DeduplicatedInput:
+    """重複を集約した入力から、担当するシャードの映画と行のみを取り出す
+
+    Args:
+        deduplicated: CSVReader.read_deduplicated()の戻り値
+        shard_index: 担当するシャードの番号（0始まり）
+        shard_count: シャードの総数
+
+    Returns:
+        担当するシャードの映画と、それに対応する行のみを含む入力
+
+    Raises:
+        ValueError: シャードの指定が不正な場合
+    """
+    validate_shard(shard_index, shard_count)
+    new_indices: dict[int, int] = {}
+    movies: list[MovieInput] = []
+    for index, movie in enumerate(deduplicated.movies):
+        if shard_of(movie.title, movie.release_date, shard_count) == shard_index:
+            new_indices[index] = len(movies)
+            movies.append(movie)
+    return DeduplicatedInput(
+        movies=movies,
+        row_to_movie=[
+            new_indices[index]
+            for index in deduplicated.row_to_movie
+            if index in new_indices
+        ],
+        # 集約された行は代表行と同じキーのため、同じシャードに属する
+        collapsed=[
+            row
+            for row in deduplicated.collapsed
+            if shard_of(row.title, row.release_date, shard_count) == shard_index
+        ],
+    )
+
+
+def shard_suffix(shard_index: int, shard_count: int) -> str:
+    """シャードごとの出力ファイル名に付与する接尾辞を返す
+
+    Args:
+        shard_index: 担当するシャードの番号（0始まり）
+        shard_count: シャードの総数
+
+    Returns:
+        接尾辞（例: "_shard-01-of-04"、シャーディングしない場合は空文字列）
+    """
+    if shard_count == 1:
+        return ""
+    width = len(str(shard_count))
+    return f"_shard-{shard_index:0{width}d}-of-{shard_count:0{width}d}"
+
+
+def shard_path(path: Path, shard_index: int, shard_count: int) -> Path:
+    """シャードごとに分けるファイルのパスを返す
+
+    監視状態・処理実績・評価キャッシュのように、各シャードのプロセスが追記・
+    上書きするファイルは、同時書き込みで壊れないようにシャードごとに分けます。
+
+    Args:
+        path: 元のパス（例: data/cache/watch_state.json）
+        shard_index: 担当するシャードの番号（0始まり）
+        shard_count: シャードの総数
+
+    Returns:
+        拡張子の前に接尾辞を付与したパス
+        （例: data/cache/watch_state_shard-1-of-4.json）
+    """
+    suffix = shard_suffix(shard_index, shard_count)
+    return path.with_name(f"{path.stem}{suffix}{path.suffix}")
+
+
+def merge_shard_outputs(input_paths: Iterable[Path], output_path: Path) -> int:
+    """各シャードの出力ファイルを1つのファイルにまとめる
+
+    メタデータの出力（JSON配列）とリファインメントのバッチ結果
+    （results と集計を持つJSON）のいずれにも対応します。バッチ結果の件数は合計し、
+    処理時間は並列実行の全体時間として最大値を使用します。
+    シャードの出力は1つずつ読み込んでレコードをストリーミングで書き込むため、
+    メモリに保持するのは1シャード分だけです。メタデータの出力は
+    load_metadata_json()でパースと検証を1回の呼び出しで行います。
+    出力パスの拡張子が .gz / .zst の場合は圧縮して書き込みます。
+
+    Args:
+        input_paths: 各シャードの出力ファイルのパス（.gz / .zst も可）
+        output_path: マージ結果の出力先パス
+
+    Returns:
+        マージしたレコードの件数
+
+    Raises:
+        ValueError: 入力が空、種類の異なる出力が混在している、
+            またはメタデータの内容が不正な場合
+    """
+    paths = list(input_paths)
+    if not paths:
+        raise ValueError("マージするシャードの出力が指定されていません")
+
+    # 先頭のシャードで出力の種類を判定する（JSON配列ならメタデータの出力）
+    is_batch = not _is_json_array(paths[0])
+
+    summary: dict[str, Any] = {
+        "total_count": 0,
+        "success_count": 0,
+        "error_count": 0,
+        "errors": [],
+        "processing_time": 0.0,
+    }
+    record_count = 0
+
+    def documents() -> Iterator[list[Any]]:
+        for path in paths:
+            if not is_batch:
+                if not _is_json_array(path):
+                    raise ValueError(_MIXED_OUTPUTS_MESSAGE)
+                yield load_metadata_json(path)
+                continue
+            document = read_json(path)
+            if not (isinstance(document, dict) and "results" in document):
+                raise ValueError(_MIXED_OUTPUTS_MESSAGE)
+            for key in ("total_count", "success_count", "error_count"):
+                summary[key] += document[key]
+            summary["errors"].extend(document["errors"])
+            summary["processing_time"] = max(
+                summary["processing_time"], document["processing_time"]
+            )
+            yield document["results"]
+
+    def records() -> Iterator[bytes]:
+        nonlocal record_count
+        for document in documents():
+            for record in document:
+                record_count += 1
+                yield to_json_bytes(record)
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with (
+        atomic_write(output_path, mode="wb") as raw,
+        compressing(raw, detect_compression(output_path)) as f,
+    ):
+        if is_batch:
+            # 集計部分（先頭の"{"を除く）を結果の配列の後ろに連結する
+            f.write(b'{\n  "results": ')
+            write_json_array(f, records(), depth=1)
+            f.write(b"," + to_json_bytes(summary)[1:])
+        else:
+            write_json_array(f, records())
+
+    logger.info(
+        f"{len(paths)} 件のシャード出力をマージしました"
+        f"（{record_count}件）: {output_path}"
+    )
+    return record_count
+
+
+def _is_json_array(path: Path) -> bool:
+    """JSONファイルの値が配列かを先頭の文字で判定する"""
+    with open_read(path) as f:
+        while char := f.read(1):
+            if not char.isspace():
+                return char == b"["
+    return False
@@ -0,0 +1,124 @@
+"""atomic_io.pyの単体テスト"""
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from movie_metadata.atomic_io import GroupCommitWriter, atomic_write
+
+
+def test_atomic_write_replaces_file(tmp_path: Path):
+    """書き込み完了後に最終パスへ置き換わり、一時ファイルが残らないことを確認"""
+    # Arrange
+    path = tmp_path / "result.json"
+    path.write_text("old", encoding="utf-8")
+
+    # Act
+    with atomic_write(path) as f:
+        f.write("新しい内容")
+
+    # Assert
+    assert path.read_text(encoding="utf-8") == "新しい内容"
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_atomic_write_keeps_original_on_error(tmp_path: Path):
+    """書き込み途中で例外が発生した場合に元のファイルが保持されることを確認"""
+    # Arrange
+    path = tmp_path / "result.json"
+    path.write_text("old", encoding="utf-8")
+
+    # Act
+    with pytest.raises(RuntimeError), atomic_write(path) as f:
+        f.write("途中まで")
+        raise RuntimeError("クラッシュ")
+
+    # Assert
+    assert path.read_text(encoding="utf-8") == "old"
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_atomic_write_binary_mode(tmp_path: Path):
+    """バイナリモードで書き込めることを確認"""
+    path = tmp_path / "result.bin"
+
+    with atomic_write(path, mode="wb") as f:
+        f.write(b"\x00\x01")
+
+    assert path.read_bytes() == b"\x00\x01"
+
+
+def test_atomic_write_rejects_append_mode(tmp_path: Path):
+    """書き込み以外のモードでValueErrorが発生することを確認"""
+    with pytest.raises(ValueError, match="mode"), atomic_write(tmp_path / "x", "a"):
+        pass
+
+
+def test_group_commit_syncs_by_record_count(tmp_path: Path):
+    """max_records件ごとにまとめてfsyncすることを確認"""
+    # Arrange
+    path = tmp_path / "journal" / "results.jsonl"
+
+    with (
+        patch("movie_metadata.atomic_io.os.fsync") as mock_fsync,
+        GroupCommitWriter(path, max_records=3, max_interval=3600) as writer,
+    ):
+        # Act
+        for i in range(7):
+            writer.write_line(f'{{"i": {i}}}')
+        synced_before_close = writer.sync_count
+
+    # Assert: 3件×2回 + close時の残り1件
+    assert synced_before_close == 2
+    assert writer.sync_count == 3
+    assert mock_fsync.call_count >= 3
+    assert path.read_text(encoding="utf-8").count("\n") == 7
+
+
+def test_group_commit_lines_visible_before_sync(tmp_path: Path):
+    """fsync前でも書き込んだ行が他の読み手から見えることを確認"""
+    path = tmp_path / "results.jsonl"
+
+    with GroupCommitWriter(path, max_records=100, max_interval=3600) as writer:
+        writer.write_line("line")
+        assert path.read_text(encoding="utf-8") == "line\n"
+        assert writer.sync_count == 0
+
+
+def test_group_commit_syncs_by_interval(tmp_path: Path):
+    """前回のfsyncからmax_interval秒経過した場合に同期することを確認"""
+    with GroupCommitWriter(tmp_path / "r.jsonl", max_interval=0) as writer:
+        writer.write_line("line")
+
+        assert writer.sync_count == 1
+
+
+def _append_lines(path: Path, prefix: str, count: int) -> None:
+    """別プロセスから同じファイルに長い行を追記する"""
+    with GroupCommitWriter(path) as writer:
+        for i in range(count):
+            writer.write_line(f"{prefix}{i:04d}" + "x" * 5000)
+
+
+def test_group_commit_lines_do_not_interleave_across_processes(tmp_path: Path):
+    """複数のプロセスが同じファイルに追記しても行が混ざらないことを確認"""
+    path = tmp_path / "index.jsonl"
+
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(_append_lines, path, prefix, 200) for prefix in "ab"]
+        for future in futures:
+            future.result()
+
+    lines = path.read_text().splitlines()
+    assert len(lines) == 400
+    assert all(line[:1] in "ab" and len(line) == 5005 for line in lines)
+
+
+def test_group_commit_invalid_arguments(tmp_path: Path):
+    """不正な引数でValueErrorが発生することを確認"""
+    with pytest.raises(ValueError, match="max_records"):
+        GroupCommitWriter(tmp_path / "r.jsonl", max_records=0)
+    with pytest.raises(ValueError, match="max_interval"):
+        GroupCommitWriter(tmp_path / "r.jsonl", max_interval=-1)
@@ -0,0 +1,111 @@
+"""blob_store.pyの単体テスト"""
+
+import os
+import time
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+
+from movie_metadata.blob_store import (
+    MetadataBlobStore,
+    canonical_metadata_bytes,
+    metadata_hash,
+)
+from movie_metadata.models import MovieMetadata
+
+
+def test_metadata_hash_is_equal_for_equal_content(
+    sample_movie_metadata: MovieMetadata,
+):
+    """同じ内容のメタデータは同じハッシュになることを確認"""
+    copied = MovieMetadata.model_validate(sample_movie_metadata.model_dump())
+    changed = sample_movie_metadata.model_copy(update={"box_office": "$2M"})
+
+    assert metadata_hash(copied) == metadata_hash(sample_movie_metadata)
+    assert metadata_hash(changed) != metadata_hash(sample_movie_metadata)
+
+
+def test_canonical_bytes_sorts_keys(sample_movie_metadata: MovieMetadata):
+    """正規化JSONはキーがソートされ、空白を含まないことを確認"""
+    data = canonical_metadata_bytes(sample_movie_metadata)
+
+    assert data.startswith(b'{"box_office":')
+    assert b": " not in data
+
+
+def test_put_stores_identical_metadata_once(
+    tmp_path: Path, sample_movie_metadata: MovieMetadata
+):
+    """同じ内容を何度保存しても1件のみ保存されることを確認"""
+    store = MetadataBlobStore(tmp_path / "blobs")
+
+    first = store.put(sample_movie_metadata)
+    second = MetadataBlobStore(tmp_path / "blobs").put(
+        sample_movie_metadata.model_copy()
+    )
+
+    assert first == second == metadata_hash(sample_movie_metadata)
+    assert len(store) == 1
+    assert first in store
+    assert store.get(first) == sample_movie_metadata
+
+
+def test_get_unknown_ref_raises_key_error(tmp_path: Path):
+    """存在しないハッシュの読み込みはKeyErrorになることを確認"""
+    store = MetadataBlobStore(tmp_path / "blobs")
+
+    with pytest.raises(KeyError):
+        store.get("0" * 64)
+
+
+def test_invalid_ref_is_rejected(tmp_path: Path):
+    """不正な形式のハッシュはValueErrorとなり、inではFalseを返すことを確認"""
+    store = MetadataBlobStore(tmp_path / "blobs")
+
+    with pytest.raises(ValueError, match="不正なメタデータの参照"):
+        store.get("../outside")
+    assert "../outside" not in store
+
+
+def test_sweep_removes_only_unreferenced_blobs(
+    tmp_path: Path, sample_movie_metadata: MovieMetadata
+):
+    """参照されていないメタデータのみ削除されることを確認"""
+    store = MetadataBlobStore(tmp_path / "blobs")
+    live = store.put(sample_movie_metadata)
+    dead = store.put(sample_movie_metadata.model_copy(update={"box_office": "$2M"}))
+
+    removed = store.sweep({live}, min_age=timedelta(0))
+
+    assert removed == 1
+    assert live in store
+    assert dead not in store
+
+
+def test_sweep_keeps_recent_blobs(tmp_path: Path, sample_movie_metadata: MovieMetadata):
+    """作成直後のメタデータは参照がなくても削除されないことを確認"""
+    store = MetadataBlobStore(tmp_path / "blobs")
+    ref = store.put(sample_movie_metadata)
+
+    removed = store.sweep(set(), min_age=timedelta(hours=1))
+
+    assert removed == 0
+    assert ref in store
+
+
+def test_put_refreshes_existing_blob(
+    tmp_path: Path, sample_movie_metadata: MovieMetadata
+):
+    """既存のメタデータを再度保存すると更新日時が新しくなることを確認"""
+    ref = MetadataBlobStore(tmp_path / "blobs").put(sample_movie_metadata)
+    blob_path = next((tmp_path / "blobs").glob("*/*.json.gz"))
+    old = time.time() - 7200
+    os.utime(blob_path, (old, old))
+
+    MetadataBlobStore(tmp_path / "blobs").put(sample_movie_metadata)
+    removed = MetadataBlobStore(tmp_path / "blobs").sweep(set())
+
+    assert removed == 0
+    assert blob_path.stat().st_mtime > old
+    assert blob_path.name == f"{ref[2:]}.json.gz"
@@ -0,0 +1,70 @@
+"""bulk_validationモジュールのテスト"""
+
+from pathlib import Path
+
+import pytest
+
+from movie_metadata.bulk_validation import load_metadata_json, validate_rows
+from movie_metadata.models import MovieMetadata
+from movie_metadata.serialization import write_json
+
+
+def test_validate_rows_all_valid() -> None:
+    """すべての行が正常な場合は行番号とともにMovieInputを返すテスト"""
+    # Arrange
+    records = [
+        (2, {"title": "A", "release_date": "2024-01-01", "country": "Japan"}),
+        (3, {"title": "B", "release_date": "2024-02-01", "country": "USA"}),
+    ]
+
+    # Act
+    rows, skipped = validate_rows(records)
+
+    # Assert
+    assert [(row_num, movie.title) for row_num, movie in rows] == [(2, "A"), (3, "B")]
+    assert skipped == []
+
+
+def test_validate_rows_maps_errors_to_row_numbers() -> None:
+    """不正な行はエラーを元の行番号に対応付けてスキップするテスト"""
+    # Arrange
+    records = [
+        (2, {"title": "A", "release_date": "2024-01-01", "country": "Japan"}),
+        (3, {"title": None, "release_date": "2024-02-01", "country": None}),
+        (4, {"title": "C", "release_date": "2024-03-01", "country": "UK"}),
+        (5, {"title": "D"}),
+    ]
+
+    # Act
+    rows, skipped = validate_rows(records)
+
+    # Assert
+    assert [row_num for row_num, _ in rows] == [2, 4]
+    assert [row_num for row_num, _ in skipped] == [3, 5]
+    assert "title" in skipped[0][1]
+    assert "country" in skipped[0][1]
+    assert "release_date: Field required" in skipped[1][1]
+
+
+def test_load_metadata_json(
+    tmp_path: Path, sample_movie_metadata: MovieMetadata
+) -> None:
+    """出力済みのメタデータのJSON配列（圧縮を含む）を読み込むテスト"""
+    # Arrange
+    path = tmp_path / "metadata.json.gz"
+    write_json(path, [sample_movie_metadata] * 3, compression="gzip")
+
+    # Act
+    metadata_list = load_metadata_json(path)
+
+    # Assert
+    assert metadata_list == [sample_movie_metadata] * 3
+
+
+def test_load_metadata_json_invalid(tmp_path: Path) -> None:
+    """メタデータとして不正なJSONはValueErrorとなるテスト"""
+    path = tmp_path / "metadata.json"
+    path.write_text('[{"title": "A"}]', encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        load_metadata_json(path)
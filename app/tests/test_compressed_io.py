@@ -0,0 +1,90 @@
+"""compressed_io.pyの単体テスト"""
+
+import gzip
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from movie_metadata import compressed_io
+from movie_metadata.atomic_io import GroupCommitWriter
+from movie_metadata.compressed_io import (
+    compressed_path,
+    detect_compression,
+    iter_lines,
+    read_json,
+)
+from movie_metadata.json_writer import JSONWriter
+from movie_metadata.models import MovieMetadata
+
+requires_zstd = pytest.mark.skipif(
+    compressed_io.zstd is None, reason="compression.zstdが利用できません"
+)
+COMPRESSIONS = ["gzip", pytest.param("zstd", marks=requires_zstd)]
+
+
+def test_compressed_path_and_detection():
+    """拡張子の付与と判定が対応していることを確認"""
+    path = Path("out/result.json")
+
+    assert compressed_path(path, None) == path
+    assert compressed_path(path, "gzip").name == "result.json.gz"
+    assert detect_compression(compressed_path(path, "zstd")) == "zstd"
+    assert detect_compression(path) is None
+
+
+@pytest.mark.parametrize("compression", COMPRESSIONS)
+def test_json_writer_round_trip(
+    tmp_path: Path, sample_movie_metadata: MovieMetadata, compression: str
+):
+    """圧縮出力したJSONを読み込めることを確認"""
+    # Arrange
+    writer = JSONWriter(compression=compression, compression_level=3)
+
+    # Act
+    writer.write([sample_movie_metadata] * 50, tmp_path / "metadata.json")
+
+    # Assert
+    [path] = tmp_path.iterdir()
+    assert detect_compression(path) == compression
+    assert read_json(path) == [sample_movie_metadata.model_dump()] * 50
+    uncompressed_size = len(json.dumps(read_json(path), ensure_ascii=False).encode())
+    assert path.stat().st_size * 5 < uncompressed_size
+
+
+@pytest.mark.parametrize("compression", COMPRESSIONS)
+def test_group_commit_compressed_journal(tmp_path: Path, compression: str):
+    """圧縮したJSON Linesを再オープンして追記し、ストリーミングで読めることを確認"""
+    # Arrange
+    path = compressed_path(tmp_path / "journal.jsonl", compression)
+
+    # Act
+    for start in (0, 3):
+        with GroupCommitWriter(path, max_records=2, compression=compression) as w:
+            for i in range(start, start + 3):
+                w.write_line(json.dumps({"i": i}))
+
+    # Assert
+    assert [json.loads(line)["i"] for line in iter_lines(path)] == list(range(6))
+
+
+def test_iter_lines_truncated_gzip(tmp_path: Path, caplog: pytest.LogCaptureFixture):
+    """途中で途切れたgzipは同期済みの行まで読み込むことを確認"""
+    # Arrange
+    path = tmp_path / "journal.jsonl.gz"
+    crashed_path = tmp_path / "crashed.jsonl.gz"
+    with GroupCommitWriter(path, max_records=1, compression="gzip") as writer:
+        writer.write_line("first")
+        writer.write_line("second")
+        # クラッシュを想定し、終端を書き込む前のファイルを退避する
+        shutil.copy(path, crashed_path)
+
+    # Act
+    lines = list(iter_lines(crashed_path))
+
+    # Assert
+    assert lines == ["first", "second"]
+    assert "途中で終了" in caplog.text
+    with pytest.raises(EOFError), gzip.open(crashed_path) as f:
+        f.read()
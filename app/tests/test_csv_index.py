@@ -0,0 +1,96 @@
+"""csv_indexモジュールのテスト"""
+
+import io
+import os
+from pathlib import Path
+
+import pytest
+
+from movie_metadata.csv_index import (
+    build_csv_index,
+    index_path_for,
+    iter_record_offsets,
+    load_csv_index,
+    locate_row,
+)
+
+
+def _write_csv(path: Path, rows: int) -> Path:
+    """テスト用のCSVファイルを作成する"""
+    lines = ["title,release_date,country"]
+    lines.extend(f"Movie {i},2024-01-01,Japan" for i in range(rows))
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+def test_iter_record_offsets_handles_quoted_newlines() -> None:
+    """引用符内の改行と空行をレコードの区切りとして扱わないテスト"""
+    # Arrange
+    data = 'title,country\n"Multi\nline",Japan\n\nフランス映画,"France, ""FR"""\n'
+
+    # Act
+    offsets = list(iter_record_offsets(io.BytesIO(data.encode("utf-8"))))
+
+    # Assert
+    raw = data.encode("utf-8")
+    assert offsets == [0, raw.index(b'"Multi'), raw.index("フランス".encode())]
+
+
+def test_build_csv_index_records_every_interval(tmp_path: Path) -> None:
+    """interval行ごとにデータ行の開始位置を記録するテスト"""
+    # Arrange
+    csv_file = _write_csv(tmp_path / "movies.csv", rows=25)
+    raw = csv_file.read_bytes()
+
+    # Act
+    index = build_csv_index(csv_file, interval=10)
+
+    # Assert
+    assert index.row_count == 25
+    assert index.offsets == [
+        raw.index(b"Movie 0,"),
+        raw.index(b"Movie 10,"),
+        raw.index(b"Movie 20,"),
+    ]
+    assert locate_row(index, 13) == (raw.index(b"Movie 10,"), 3)
+    with pytest.raises(IndexError):
+        locate_row(index, 25)
+
+
+def test_build_csv_index_invalid_interval(tmp_path: Path) -> None:
+    """intervalが1未満の場合はValueErrorとなるテスト"""
+    csv_file = _write_csv(tmp_path / "movies.csv", rows=1)
+
+    with pytest.raises(ValueError, match="interval"):
+        build_csv_index(csv_file, interval=0)
+
+
+def test_load_csv_index_saves_and_reuses(tmp_path: Path) -> None:
+    """作成したインデックスを保存し、CSVが変わらなければ再利用するテスト"""
+    # Arrange
+    csv_file = _write_csv(tmp_path / "movies.csv", rows=5)
+
+    # Act
+    first = load_csv_index(csv_file, interval=2)
+    saved_mtime = index_path_for(csv_file).stat().st_mtime_ns
+    second = load_csv_index(csv_file, interval=2)
+
+    # Assert
+    assert second == first
+    assert index_path_for(csv_file).stat().st_mtime_ns == saved_mtime
+
+
+def test_load_csv_index_rebuilds_when_csv_changes(tmp_path: Path) -> None:
+    """CSVが更新された場合はインデックスを作り直すテスト"""
+    # Arrange
+    csv_file = _write_csv(tmp_path / "movies.csv", rows=5)
+    load_csv_index(csv_file, interval=2)
+    _write_csv(csv_file, rows=8)
+    stat = csv_file.stat()
+    os.utime(csv_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    # Act
+    index = load_csv_index(csv_file, interval=2)
+
+    # Assert
+    assert index.row_count == 8
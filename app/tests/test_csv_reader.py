@@ -1,10 +1,12 @@
 """csv_readerモジュールのテスト"""
 
+import gzip
 from pathlib import Path
 
 import pytest
 
-from movie_metadata.csv_reader import CSVReader
+from movie_metadata.csv_index import build_csv_index
+from movie_metadata.csv_reader import CSVReader, make_input_key
 
 
 def test_csv_reader_success(tmp_path: Path) -> None:
@@ -115,3 +117,248 @@ def test_csv_reader_general_exception(tmp_path: Path) -> None:
     with pytest.raises(ValueError, match="CSVファイルの読み込みに失敗しました"):
         reader = CSVReader()
         reader.read(csv_dir)
+
+
+def test_make_input_key_normalizes_title_and_uses_year() -> None:
+    """表記揺れのあるタイトルと同じ公開年が同じキーになるテスト"""
+    # Act
+    keys = {
+        make_input_key("Spirited Away", "2001-07-20"),
+        make_input_key("spirited away ", "2001-12-01"),
+        make_input_key("Ｓｐｉｒｉｔｅｄ　Ａｗａｙ", "2001"),
+    }
+
+    # Assert
+    assert keys == {("spiritedaway", "2001")}
+    assert make_input_key("Spirited Away", "2002-01-01") not in keys
+
+
+def test_csv_reader_read_deduplicated(tmp_path: Path) -> None:
+    """重複する行が最初の行に集約され、各行と代表行の対応が返されるテスト"""
+    # Arrange
+    csv_file = tmp_path / "test.csv"
+    csv_file.write_text(
+        "title,release_date,country\n"
+        "Spirited Away,2001-07-20,Japan\n"
+        "Movie 2,2024-02-01,USA\n"
+        "spirited away ,2001-07-20,Japan\n"
+        "Ｓｐｉｒｉｔｅｄ Ａｗａｙ,2001-09-01,日本\n",
+        encoding="utf-8",
+    )
+
+    # Act
+    result = CSVReader().read_deduplicated(csv_file)
+
+    # Assert
+    assert [movie.title for movie in result.movies] == ["Spirited Away", "Movie 2"]
+    assert result.row_to_movie == [0, 1, 0, 0]
+    assert [row.row_number for row in result.collapsed] == [4, 5]
+    assert all(row.kept_row_number == 2 for row in result.collapsed)
+    assert result.collapsed[0].title == "spirited away "
+    assert result.collapsed[1].kept_title == "Spirited Away"
+
+
+def test_csv_reader_read_deduplicated_without_duplicates(tmp_path: Path) -> None:
+    """重複がない場合はすべての行がそのまま取得対象になるテスト"""
+    # Arrange
+    csv_file = tmp_path / "test.csv"
+    csv_file.write_text(
+        "title,release_date,country\n"
+        "Movie 1,2024-01-01,Japan\n"
+        "Movie 1,2025-01-01,Japan\n",
+        encoding="utf-8",
+    )
+
+    # Act
+    result = CSVReader().read_deduplicated(csv_file)
+
+    # Assert
+    assert len(result.movies) == 2
+    assert result.row_to_movie == [0, 1]
+    assert result.collapsed == []
+
+
+def test_csv_reader_read_range(tmp_path: Path) -> None:
+    """インデックスを使って指定した行範囲のみを読み込むテスト"""
+    # Arrange
+    csv_file = tmp_path / "test.csv"
+    lines = ["title,release_date,country"]
+    lines.extend(f'"Movie\n{i}",2024-01-01,Japan' for i in range(30))
+    csv_file.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    index = build_csv_index(csv_file, interval=7)
+
+    # Act
+    movies = CSVReader().read_range(csv_file, 12, 16, index=index)
+
+    # Assert
+    assert [movie.title for movie in movies] == [f"Movie\n{i}" for i in range(12, 16)]
+
+
+def test_csv_reader_read_range_to_end(tmp_path: Path) -> None:
+    """stopを省略すると最終行まで読み込み、範囲外は空リストになるテスト"""
+    # Arrange
+    csv_file = tmp_path / "test.csv"
+    csv_file.write_text(
+        "title,release_date,country\n"
+        "Movie 1,2024-01-01,Japan\n"
+        "Movie 2,2024-02-01,USA\n"
+        "Movie 3,2024-03-01,UK\n",
+        encoding="utf-8",
+    )
+    reader = CSVReader()
+
+    # Act
+    movies = reader.read_range(csv_file, 1)
+
+    # Assert
+    assert [movie.title for movie in movies] == ["Movie 2", "Movie 3"]
+    assert reader.read_range(csv_file, 3) == []
+    assert (tmp_path / "test.csv.idx.json").exists()
+
+
+def test_csv_reader_read_range_validates_header(tmp_path: Path) -> None:
+    """範囲読み込みでもヘッダーを検証するテスト"""
+    # Arrange
+    csv_file = tmp_path / "test.csv"
+    csv_file.write_text("name,date\nMovie 1,2024-01-01\n", encoding="utf-8")
+
+    # Act & Assert
+    with pytest.raises(ValueError, match="CSVに必要なフィールドがありません"):
+        CSVReader().read_range(csv_file, 0)
+
+
+def test_csv_reader_read_range_invalid_range(tmp_path: Path) -> None:
+    """開始行が終了行より後の場合はValueErrorとなるテスト"""
+    csv_file = tmp_path / "test.csv"
+    csv_file.write_text("title,release_date,country\n", encoding="utf-8")
+
+    with pytest.raises(ValueError, match="不正な行範囲"):
+        CSVReader().read_range(csv_file, 5, 2)
+
+
+def test_csv_reader_read_gzip_jsonl(tmp_path: Path) -> None:
+    """gzip圧縮されたJSON Linesを読み込むテスト"""
+    # Arrange
+    path = tmp_path / "movies.jsonl.gz"
+    path.write_bytes(
+        gzip.compress(
+            b'{"title": "Movie 1", "release_date": "2024-01-01", "country": "Japan"}\n'
+            b'{"title": "Movie 2", "release_date": "2024-02-01"}\n'
+            b'{"title": "Movie 3", "release_date": "2024-03-01", "country": "UK"}\n'
+        )
+    )
+
+    # Act
+    movies = CSVReader().read(path)
+
+    # Assert
+    assert [movie.title for movie in movies] == ["Movie 1", "Movie 3"]
+
+
+def test_csv_reader_iter_movies_is_lazy(tmp_path: Path) -> None:
+    """iter_movies()は要求された分だけ読み込むテスト"""
+    # Arrange
+    csv_file = tmp_path / "test.csv"
+    csv_file.write_text(
+        "title,release_date,country\n"
+        + "".join(f"Movie {i},2024-01-01,Japan\n" for i in range(100)),
+        encoding="utf-8",
+    )
+
+    # Act
+    movies = CSVReader().iter_movies(csv_file)
+    first = next(movies)
+    movies.close()
+
+    # Assert
+    assert first.title == "Movie 0"
+
+
+def test_csv_reader_iter_movies_file_not_found() -> None:
+    """iter_movies()はファイル不在を最初の要素の取得時に通知するテスト"""
+    movies = CSVReader().iter_movies(Path("nonexistent.csv"))
+
+    with pytest.raises(FileNotFoundError, match="CSVファイルが見つかりません"):
+        next(movies)
+
+
+@pytest.mark.parametrize("chunk_bytes", [1, 7, 200])
+def test_csv_reader_parallel_matches_sequential(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture, chunk_bytes: int
+) -> None:
+    """並列読み込みは逐次読み込みと同じ順序・同じスキップ警告になるテスト
+
+    チャンクの境界が引用符で囲まれたフィールドの内側になる場合も含む
+    """
+    # Arrange
+    csv_file = tmp_path / "catalog.csv"
+    rows = [
+        f'"Movie {i}\nPart ""2""",2024-01-01,Japan\n'
+        if i % 7 == 0
+        else f"Movie {i},2024-01-01,Japan\n"
+        for i in range(50)
+    ]
+    rows[10] = "Broken,2024-01-01\n"
+    csv_file.write_text(
+        "title,release_date,country\n" + "".join(rows), encoding="utf-8"
+    )
+    sequential = CSVReader().read(csv_file)
+    sequential_warnings = [r.message for r in caplog.records if "スキップ" in r.message]
+    caplog.clear()
+
+    # Act
+    parallel = CSVReader(parse_workers=2, chunk_bytes=chunk_bytes).read(csv_file)
+    parallel_warnings = [r.message for r in caplog.records if "スキップ" in r.message]
+
+    # Assert
+    assert parallel == sequential
+    assert len(parallel) == 49
+    assert parallel_warnings == sequential_warnings == [sequential_warnings[0]]
+    assert "行 12 " in parallel_warnings[0]
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["catalog.csv"]
+
+
+def test_csv_reader_parallel_falls_back_for_compressed_input(tmp_path: Path) -> None:
+    """圧縮ファイルは並列読み込みせずに逐次読み込みするテスト"""
+    # Arrange
+    path = tmp_path / "movies.csv.gz"
+    path.write_bytes(
+        gzip.compress(b"title,release_date,country\nMovie 1,2024-01-01,Japan\n")
+    )
+
+    # Act
+    movies = CSVReader(parse_workers=2).read(path)
+
+    # Assert
+    assert [movie.title for movie in movies] == ["Movie 1"]
+
+
+def test_csv_reader_invalid_parse_workers() -> None:
+    """parse_workersが1未満の場合はValueErrorとなるテスト"""
+    with pytest.raises(ValueError, match="parse_workers"):
+        CSVReader(parse_workers=0)
+
+
+def test_csv_reader_iter_movies_yields_stdin_rows_without_batching(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """標準入力は後続の行を待たずに1行ずつ返すテスト"""
+    # Arrange
+    consumed: list[int] = []
+
+    def fake_records(source, required_fields):
+        for i in range(3):
+            consumed.append(i)
+            yield (
+                i + 2,
+                {"title": f"Movie {i}", "release_date": "2024-01-01", "country": "JP"},
+            )
+
+    monkeypatch.setattr("movie_metadata.csv_reader.iter_records", fake_records)
+
+    # Act
+    movie = next(CSVReader().iter_movies("-"))
+
+    # Assert
+    assert movie.title == "Movie 0"
+    assert consumed == [0]
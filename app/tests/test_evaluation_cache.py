@@ -0,0 +1,80 @@
+"""evaluation_cache.pyの単体テスト"""
+
+from pathlib import Path
+
+import pytest
+
+from movie_metadata.evaluation_cache import EvaluationCache
+from movie_metadata.models import (
+    MetadataEvaluationOutput,
+    MetadataFieldScore,
+    MovieMetadata,
+)
+
+
+@pytest.fixture
+def sample_output() -> MetadataEvaluationOutput:
+    """テスト用MetadataEvaluationOutputフィクスチャ"""
+    return MetadataEvaluationOutput(
+        field_scores=[MetadataFieldScore(field_name="cast", score=4.0, reasoning="-")],
+        improvement_suggestions="なし",
+    )
+
+
+def test_key_depends_on_metadata_and_model(sample_movie_metadata: MovieMetadata):
+    """キーがメタデータの内容とモデル名に依存することを確認"""
+    copied = sample_movie_metadata.model_copy()
+    changed = sample_movie_metadata.model_copy(update={"cast": ["俳優Z"]})
+
+    key = EvaluationCache.make_key(sample_movie_metadata, "model-a")
+
+    assert EvaluationCache.make_key(copied, "model-a") == key
+    assert EvaluationCache.make_key(changed, "model-a") != key
+    assert EvaluationCache.make_key(sample_movie_metadata, "model-b") != key
+
+
+def test_get_and_put_in_memory(
+    sample_movie_metadata: MovieMetadata, sample_output: MetadataEvaluationOutput
+):
+    """メモリ上で保存・取得でき、ヒット数とミス数を記録することを確認"""
+    cache = EvaluationCache()
+    key = cache.make_key(sample_movie_metadata, "model")
+
+    assert cache.get(key) is None
+    cache.put(key, sample_output)
+
+    assert cache.get(key) == sample_output
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert len(cache) == 1
+
+
+def test_persists_across_instances(
+    tmp_path: Path,
+    sample_movie_metadata: MovieMetadata,
+    sample_output: MetadataEvaluationOutput,
+):
+    """ファイルに永続化され、別インスタンスで再利用できることを確認"""
+    path = tmp_path / "cache" / "evaluation_cache.jsonl"
+    key = EvaluationCache.make_key(sample_movie_metadata, "model")
+    EvaluationCache(path).put(key, sample_output)
+
+    reloaded = EvaluationCache(path)
+
+    assert reloaded.get(key) == sample_output
+
+
+def test_skips_corrupted_lines(
+    tmp_path: Path,
+    sample_movie_metadata: MovieMetadata,
+    sample_output: MetadataEvaluationOutput,
+):
+    """壊れた行をスキップして読み込むことを確認"""
+    path = tmp_path / "evaluation_cache.jsonl"
+    key = EvaluationCache.make_key(sample_movie_metadata, "model")
+    EvaluationCache(path).put(key, sample_output)
+    with path.open("a", encoding="utf-8") as f:
+        f.write('{"key": "truncated\n')
+
+    reloaded = EvaluationCache(path)
+
+    assert len(reloaded) == 1
@@ -5,12 +5,16 @@ from unittest.mock import MagicMock, patch
 import pytest
 from google.genai.errors import APIError, ClientError, ServerError
 
+from movie_metadata.evaluation_cache import EvaluationCache
 from movie_metadata.evaluator import MetadataEvaluator
 from movie_metadata.models import (
+    MetadataBatchEvaluationItem,
+    MetadataBatchEvaluationOutput,
     MetadataEvaluationOutput,
     MetadataFieldScore,
     MovieMetadata,
 )
+from movie_metadata.pre_evaluator import EVALUATED_FIELDS
 
 
 @pytest.fixture
@@ -329,3 +333,285 @@ def test_evaluate_boundary_score_one_below_3_5(sample_movie_metadata: MovieMetad
 
         # 1つでも閾値未満ならfail判定になることを確認
         assert result.overall_status == "fail"
+
+
+def test_evaluate_skips_llm_when_rule_based_decisive():
+    """ルールベース評価で全フィールドが確定した場合、LLMを呼び出さないテスト"""
+    evaluator = MetadataEvaluator(api_key="test_key", threshold=3.5)
+    default_metadata = MovieMetadata(
+        title="Unknown Movie",
+        japanese_titles=["情報なし"],
+        original_work="情報なし",
+        original_authors=["情報なし"],
+        release_date="2024-01-01",
+        country="Japan",
+        distributor="情報なし",
+        production_companies=["情報なし"],
+        box_office="情報なし",
+        cast=["情報なし"],
+        screenwriters=["情報なし"],
+        music=["情報なし"],
+        voice_actors=["情報なし"],
+    )
+
+    with patch("movie_metadata.evaluator.GenAIClient") as mock_client_class:
+        result = evaluator.evaluate(default_metadata, iteration=2)
+
+        mock_client_class.assert_not_called()
+
+    assert result.iteration == 2
+    assert result.overall_status == "fail"
+    # 声優は該当なしを許容するため、ルールベースでは判定しない
+    assert len(result.field_scores) == 9
+    assert all(score.score == 0.0 for score in result.field_scores)
+    assert "distributor" in result.improvement_suggestions
+
+
+def test_evaluate_overrides_llm_scores_with_rule_based(
+    sample_movie_metadata: MovieMetadata,
+    sample_evaluation_output_pass: MetadataEvaluationOutput,
+):
+    """ルールベースで検出したフィールドはLLMのスコアより優先されるテスト"""
+    evaluator = MetadataEvaluator(api_key="test_key", threshold=3.5)
+    metadata = sample_movie_metadata.model_copy(update={"distributor": "情報なし"})
+
+    with patch("movie_metadata.evaluator.GenAIClient") as mock_client_class:
+        mock_client_instance = MagicMock()
+        mock_client_class.return_value.__enter__.return_value = mock_client_instance
+        mock_client_instance.generate_content.return_value = (
+            sample_evaluation_output_pass.model_dump_json()
+        )
+
+        result = evaluator.evaluate(metadata)
+
+    distributor_score = next(
+        s for s in result.field_scores if s.field_name == "distributor"
+    )
+    assert distributor_score.score == 0.0
+    assert len(result.field_scores) == 10
+    assert result.overall_status == "fail"
+
+
+def test_evaluate_live_action_film_can_pass(
+    sample_movie_metadata: MovieMetadata,
+    sample_evaluation_output_pass: MetadataEvaluationOutput,
+):
+    """声優が['情報なし']の実写作品でもLLMのスコアで合格できるテスト"""
+    evaluator = MetadataEvaluator(api_key="test_key", threshold=3.5)
+    metadata = sample_movie_metadata.model_copy(update={"voice_actors": ["情報なし"]})
+
+    with patch("movie_metadata.evaluator.GenAIClient") as mock_client_class:
+        mock_client_instance = MagicMock()
+        mock_client_class.return_value.__enter__.return_value = mock_client_instance
+        mock_client_instance.generate_content.return_value = (
+            sample_evaluation_output_pass.model_dump_json()
+        )
+
+        result = evaluator.evaluate(metadata)
+
+    assert result.overall_status == "pass"
+    assert result.field_scores == sample_evaluation_output_pass.field_scores
+
+
+def _batch_item(
+    title: str, score: float, fields: tuple[str, ...] = EVALUATED_FIELDS
+) -> MetadataBatchEvaluationItem:
+    """バッチ評価テスト用の1作品分の出力を生成する"""
+    return MetadataBatchEvaluationItem(
+        title=title,
+        field_scores=[
+            MetadataFieldScore(field_name=field_name, score=score, reasoning="-")
+            for field_name in fields
+        ],
+        improvement_suggestions="なし" if score >= 3.5 else "キャストを補完",
+    )
+
+
+def test_evaluate_batch_single_request(sample_movie_metadata: MovieMetadata):
+    """複数作品を1回のリクエストで評価し、入力順の結果を返すテスト"""
+    evaluator = MetadataEvaluator(api_key="test_key", threshold=3.5)
+    movie_b = sample_movie_metadata.model_copy(update={"title": "Movie B"})
+    output = MetadataBatchEvaluationOutput(
+        results=[_batch_item("Movie B", 2.0), _batch_item("Test Movie", 4.5)]
+    )
+
+    with patch("movie_metadata.evaluator.GenAIClient") as mock_client_class:
+        mock_client_instance = MagicMock()
+        mock_client_class.return_value.__enter__.return_value = mock_client_instance
+        mock_client_instance.generate_content.return_value = output.model_dump_json()
+
+        results = evaluator.evaluate_batch([sample_movie_metadata, movie_b])
+
+    assert mock_client_instance.generate_content.call_count == 1
+    assert [r.overall_status for r in results] == ["pass", "fail"]
+    assert results[1].improvement_suggestions == "キャストを補完"
+
+
+def test_evaluate_batch_falls_back_for_missing_titles(
+    sample_movie_metadata: MovieMetadata,
+    sample_evaluation_output_pass: MetadataEvaluationOutput,
+):
+    """応答に含まれなかった作品を1件ずつの評価にフォールバックするテスト"""
+    evaluator = MetadataEvaluator(api_key="test_key", threshold=3.5)
+    movie_b = sample_movie_metadata.model_copy(update={"title": "Movie B"})
+    batch_output = MetadataBatchEvaluationOutput(
+        results=[_batch_item("Test Movie", 4.5), _batch_item("Unknown", 4.5)]
+    )
+
+    with patch("movie_metadata.evaluator.GenAIClient") as mock_client_class:
+        mock_client_instance = MagicMock()
+        mock_client_class.return_value.__enter__.return_value = mock_client_instance
+        mock_client_instance.generate_content.side_effect = [
+            batch_output.model_dump_json(),
+            sample_evaluation_output_pass.model_dump_json(),
+        ]
+
+        results = evaluator.evaluate_batch([sample_movie_metadata, movie_b])
+
+    assert mock_client_instance.generate_content.call_count == 2
+    assert len(results) == 2
+    assert len(results[1].field_scores) == 10
+
+
+def test_evaluate_batch_falls_back_for_incomplete_field_scores(
+    sample_movie_metadata: MovieMetadata,
+    sample_evaluation_output_pass: MetadataEvaluationOutput,
+):
+    """評価対象フィールドが欠けた作品を1件ずつの評価にフォールバックするテスト"""
+    evaluator = MetadataEvaluator(api_key="test_key", threshold=3.5)
+    movie_b = sample_movie_metadata.model_copy(update={"title": "Movie B"})
+    batch_output = MetadataBatchEvaluationOutput(
+        results=[
+            _batch_item("Test Movie", 4.5),
+            _batch_item("Movie B", 4.5, fields=("cast",)),
+        ]
+    )
+
+    with patch("movie_metadata.evaluator.GenAIClient") as mock_client_class:
+        mock_client_instance = MagicMock()
+        mock_client_class.return_value.__enter__.return_value = mock_client_instance
+        mock_client_instance.generate_content.side_effect = [
+            batch_output.model_dump_json(),
+            sample_evaluation_output_pass.model_dump_json(),
+        ]
+
+        results = evaluator.evaluate_batch([sample_movie_metadata, movie_b])
+
+    assert mock_client_instance.generate_content.call_count == 2
+    assert results[1].field_scores == sample_evaluation_output_pass.field_scores
+
+
+def test_evaluate_batch_falls_back_when_batch_request_fails(
+    sample_movie_metadata: MovieMetadata,
+    sample_evaluation_output_pass: MetadataEvaluationOutput,
+):
+    """バッチ応答が不正な場合、全作品を1件ずつ評価するテスト"""
+    evaluator = MetadataEvaluator(api_key="test_key", threshold=3.5)
+    movie_b = sample_movie_metadata.model_copy(update={"title": "Movie B"})
+
+    with patch("movie_metadata.evaluator.GenAIClient") as mock_client_class:
+        mock_client_instance = MagicMock()
+        mock_client_class.return_value.__enter__.return_value = mock_client_instance
+        mock_client_instance.generate_content.side_effect = [
+            "not json",
+            sample_evaluation_output_pass.model_dump_json(),
+            sample_evaluation_output_pass.model_dump_json(),
+        ]
+
+        results = evaluator.evaluate_batch([sample_movie_metadata, movie_b])
+
+    assert mock_client_instance.generate_content.call_count == 3
+    assert [r.overall_status for r in results] == ["pass", "pass"]
+
+
+def test_evaluate_batch_splits_by_batch_size(sample_movie_metadata: MovieMetadata):
+    """batch_sizeごとにリクエストを分割するテスト"""
+    evaluator = MetadataEvaluator(api_key="test_key", threshold=3.5)
+    movies = [
+        sample_movie_metadata.model_copy(update={"title": f"Movie {i}"})
+        for i in range(3)
+    ]
+    outputs = [
+        MetadataBatchEvaluationOutput(
+            results=[_batch_item(f"Movie {i}", 4.0) for i in indices]
+        ).model_dump_json()
+        for indices in ([0, 1], [2])
+    ]
+
+    with patch("movie_metadata.evaluator.GenAIClient") as mock_client_class:
+        mock_client_instance = MagicMock()
+        mock_client_class.return_value.__enter__.return_value = mock_client_instance
+        mock_client_instance.generate_content.side_effect = outputs
+
+        results = evaluator.evaluate_batch(movies, iteration=2, batch_size=2)
+
+    assert mock_client_instance.generate_content.call_count == 2
+    assert [r.iteration for r in results] == [2, 2, 2]
+
+
+def test_evaluate_batch_invalid_batch_size(sample_movie_metadata: MovieMetadata):
+    """batch_sizeが1未満の場合、ValueErrorを発生させるテスト"""
+    evaluator = MetadataEvaluator(api_key="test_key", threshold=3.5)
+
+    with pytest.raises(ValueError, match="batch_size"):
+        evaluator.evaluate_batch([sample_movie_metadata], batch_size=0)
+
+
+def test_evaluate_reuses_cache_with_different_threshold(
+    sample_movie_metadata: MovieMetadata,
+    sample_evaluation_output_pass: MetadataEvaluationOutput,
+):
+    """キャッシュ済みの評価を再利用し、合格判定は現在の閾値で再計算するテスト"""
+    evaluator = MetadataEvaluator(
+        api_key="test_key", threshold=3.5, cache=EvaluationCache()
+    )
+
+    with patch("movie_metadata.evaluator.GenAIClient") as mock_client_class:
+        mock_client_instance = MagicMock()
+        mock_client_class.return_value.__enter__.return_value = mock_client_instance
+        mock_client_instance.generate_content.return_value = (
+            sample_evaluation_output_pass.model_dump_json()
+        )
+
+        first = evaluator.evaluate(sample_movie_metadata, iteration=1)
+        evaluator.threshold = 4.5
+        second = evaluator.evaluate(sample_movie_metadata.model_copy(), iteration=2)
+
+    assert mock_client_instance.generate_content.call_count == 1
+    assert first.overall_status == "pass"
+    assert second.overall_status == "fail"
+    assert second.iteration == 2
+    assert second.field_scores == first.field_scores
+
+
+def test_evaluate_cache_stores_llm_output_and_reapplies_rules(
+    sample_movie_metadata: MovieMetadata,
+    sample_evaluation_output_pass: MetadataEvaluationOutput,
+):
+    """キャッシュにはLLMの出力を保存し、読み出し時に現在のルールで判定するテスト"""
+    cache = EvaluationCache()
+    metadata = sample_movie_metadata.model_copy(update={"distributor": "情報なし"})
+    first_evaluator = MetadataEvaluator(api_key="test_key", threshold=3.5, cache=cache)
+    # ルールを変更した評価器（ルールベースの判定なし）
+    pre_evaluator = MagicMock()
+    pre_evaluator.evaluate.return_value = []
+    pre_evaluator.is_decisive.return_value = False
+    pre_evaluator.merge.side_effect = lambda llm_scores, rule_scores: llm_scores
+    second_evaluator = MetadataEvaluator(
+        api_key="test_key", threshold=3.5, cache=cache, pre_evaluator=pre_evaluator
+    )
+
+    with patch("movie_metadata.evaluator.GenAIClient") as mock_client_class:
+        mock_client_instance = MagicMock()
+        mock_client_class.return_value.__enter__.return_value = mock_client_instance
+        mock_client_instance.generate_content.return_value = (
+            sample_evaluation_output_pass.model_dump_json()
+        )
+
+        first = first_evaluator.evaluate(metadata)
+        second = second_evaluator.evaluate(metadata)
+
+    assert mock_client_instance.generate_content.call_count == 1
+    assert first.overall_status == "fail"
+    assert second.overall_status == "pass"
+    assert second.field_scores == sample_evaluation_output_pass.field_scores
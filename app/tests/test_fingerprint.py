@@ -0,0 +1,28 @@
+"""fingerprint.pyの単体テスト"""
+
+from movie_metadata.fingerprint import canonical_metadata_json, metadata_fingerprint
+from movie_metadata.models import MovieMetadata
+
+
+def test_same_metadata_has_same_fingerprint(sample_movie_metadata: MovieMetadata):
+    """同じ内容のメタデータは同じフィンガープリントになることを確認"""
+    copied = MovieMetadata.model_validate_json(sample_movie_metadata.model_dump_json())
+
+    assert metadata_fingerprint(copied) == metadata_fingerprint(sample_movie_metadata)
+
+
+def test_different_metadata_has_different_fingerprint(
+    sample_movie_metadata: MovieMetadata,
+):
+    """内容が異なるメタデータは異なるフィンガープリントになることを確認"""
+    changed = sample_movie_metadata.model_copy(update={"cast": ["俳優Z"]})
+
+    assert metadata_fingerprint(changed) != metadata_fingerprint(sample_movie_metadata)
+
+
+def test_canonical_json_is_compact_and_sorted(sample_movie_metadata: MovieMetadata):
+    """正規化JSONがキー順でソートされ、日本語をエスケープしないことを確認"""
+    canonical = canonical_metadata_json(sample_movie_metadata)
+
+    assert canonical.startswith('{"box_office":"$1M","cast":["俳優A"]')
+    assert ": " not in canonical
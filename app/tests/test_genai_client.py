@@ -98,6 +98,23 @@ class TestGenAIClientGenerateContent:
         assert config.response_mime_type is None
         assert config.response_schema is None
 
+    def test_generate_content_with_temperature(
+        self, mock_genai_client: GenAIClient
+    ) -> None:
+        """temperature指定時に生成設定へ反映されるテスト"""
+        # Arrange
+        mock_response = MagicMock()
+        mock_response.text = "plain text"
+        mock_genai_client._client.models.generate_content.return_value = mock_response  # type: ignore[invalid-assignment]
+
+        # Act
+        mock_genai_client.generate_content("test prompt", temperature=0.7)
+
+        # Assert
+        call_kwargs = mock_genai_client._client.models.generate_content.call_args  # type: ignore[possibly-missing-attribute]
+        config = call_kwargs.kwargs["config"]
+        assert config.temperature == 0.7
+
     def test_generate_content_with_google_search(
         self, mock_genai_client: GenAIClient
     ) -> None:
@@ -0,0 +1,252 @@
+"""history_codec.pyの単体テスト"""
+
+import json
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+
+from movie_metadata.blob_store import MetadataBlobStore, metadata_hash
+from movie_metadata.history_codec import (
+    BLOB_REF_ENCODING,
+    HISTORY_ENCODING,
+    LazyRefinementResult,
+    collect_metadata_refs,
+    encode_refinement_result,
+    encode_refinement_result_refs,
+    load_refinement_results,
+)
+from movie_metadata.models import (
+    BatchRefinementResult,
+    MetadataEvaluationResult,
+    MetadataFieldScore,
+    MetadataRefinementResult,
+    MovieMetadata,
+    RefinementHistoryEntry,
+)
+from movie_metadata.refinement_writer import (
+    RefinementResultWriter,
+    find_refinement_outputs,
+)
+
+
+def _evaluation(iteration: int, score: float) -> MetadataEvaluationResult:
+    """テスト用の評価結果を生成する"""
+    return MetadataEvaluationResult(
+        iteration=iteration,
+        field_scores=[
+            MetadataFieldScore(field_name="cast", score=score, reasoning="理由")
+        ],
+        overall_status="pass" if score >= 4.0 else "fail",
+        improvement_suggestions="なし",
+    )
+
+
+@pytest.fixture
+def refinement_result(sample_movie_metadata: MovieMetadata) -> MetadataRefinementResult:
+    """3イテレーションのリファインメント結果"""
+    second = sample_movie_metadata.model_copy(update={"cast": ["俳優A", "俳優B"]})
+    third = second.model_copy(update={"box_office": "$2M"})
+    history = [
+        RefinementHistoryEntry(
+            iteration=i, metadata=metadata, evaluation=_evaluation(i, 3.0 + i * 0.5)
+        )
+        for i, metadata in enumerate([sample_movie_metadata, second, third], start=1)
+    ]
+    return MetadataRefinementResult(
+        final_metadata=third.model_copy(update={"music": ["作曲家X"]}),
+        history=history,
+        success=True,
+        total_iterations=3,
+        stop_reason="passed",
+    )
+
+
+def test_encode_stores_only_changed_fields(
+    refinement_result: MetadataRefinementResult,
+):
+    """2イテレーション目以降は変化したフィールドのみ保存することを確認"""
+    # Act
+    data = encode_refinement_result(refinement_result)
+
+    # Assert
+    assert data["history_encoding"] == HISTORY_ENCODING
+    assert data["history"][0]["metadata"]["title"] == "Test Movie"
+    assert data["history"][1]["metadata_diff"] == {"cast": ["俳優A", "俳優B"]}
+    assert data["history"][2]["metadata_diff"] == {"box_office": "$2M"}
+    assert data["final_metadata_diff"] == {"music": ["作曲家X"]}
+
+
+def test_lazy_result_round_trips(refinement_result: MetadataRefinementResult):
+    """差分エンコーディングから元の結果を復元できることを確認"""
+    # Arrange
+    data = json.loads(json.dumps(encode_refinement_result(refinement_result)))
+
+    # Act
+    lazy = LazyRefinementResult(data)
+
+    # Assert
+    assert lazy.success is True
+    assert len(lazy.history) == 3
+    assert lazy.history[-1].metadata == refinement_result.history[2].metadata
+    assert lazy.history[0:2] == refinement_result.history[0:2]
+    assert lazy.to_model() == refinement_result
+
+
+def test_lazy_result_accepts_uncompressed_dump(
+    refinement_result: MetadataRefinementResult,
+):
+    """従来形式（model_dump）の辞書も読み込めることを確認"""
+    # Act
+    lazy = LazyRefinementResult(refinement_result.model_dump())
+
+    # Assert
+    assert lazy.to_model() == refinement_result
+
+
+def test_lazy_history_index_out_of_range(
+    refinement_result: MetadataRefinementResult,
+):
+    """範囲外のインデックスでIndexErrorが発生することを確認"""
+    lazy = LazyRefinementResult(encode_refinement_result(refinement_result))
+
+    with pytest.raises(IndexError):
+        lazy.history[3]
+
+
+def test_compact_batch_is_smaller_and_loadable(
+    tmp_path: Path, refinement_result: MetadataRefinementResult
+):
+    """圧縮形式のバッチ出力が小さく、読み込みで復元できることを確認"""
+    # Arrange
+    batch = BatchRefinementResult(
+        results=[refinement_result] * 5,
+        total_count=5,
+        success_count=5,
+        error_count=0,
+        errors=[],
+        processing_time=1.0,
+    )
+    RefinementResultWriter().write_batch(batch, tmp_path / "full")
+    RefinementResultWriter(compact_history=True).write_batch(
+        batch, tmp_path / "compact"
+    )
+    full_path = next((tmp_path / "full").glob("*.json"))
+    compact_path = next((tmp_path / "compact").glob("*.json"))
+
+    # Act
+    results = load_refinement_results(compact_path)
+
+    # Assert
+    assert compact_path.stat().st_size * 2 < full_path.stat().st_size
+    assert [result.to_model() for result in results] == batch.results
+    assert [r.to_model() for r in load_refinement_results(full_path)] == batch.results
+
+
+def test_encode_refs_stores_metadata_in_blob_store(
+    tmp_path: Path, refinement_result: MetadataRefinementResult
+):
+    """ハッシュ参照形式はメタデータをストアに保存し、参照から復元できることを確認"""
+    store = MetadataBlobStore(tmp_path / "blobs")
+
+    data = encode_refinement_result_refs(refinement_result, store)
+    restored = LazyRefinementResult(json.loads(json.dumps(data)), store)
+
+    assert data["history_encoding"] == BLOB_REF_ENCODING
+    assert "metadata" not in data["history"][0]
+    assert restored.final_metadata_ref == metadata_hash(
+        refinement_result.final_metadata
+    )
+    assert restored.to_model() == refinement_result
+
+
+def test_lazy_result_with_refs_requires_blob_store(
+    tmp_path: Path, refinement_result: MetadataRefinementResult
+):
+    """ストアを渡さずにハッシュ参照を復元するとValueErrorになることを確認"""
+    data = encode_refinement_result_refs(
+        refinement_result, MetadataBlobStore(tmp_path / "blobs")
+    )
+
+    with pytest.raises(ValueError, match="MetadataBlobStore"):
+        _ = LazyRefinementResult(data).final_metadata
+
+
+def test_blob_refs_deduplicate_repeated_runs(
+    tmp_path: Path, refinement_result: MetadataRefinementResult
+):
+    """同じ結果を繰り返し出力してもメタデータは1度しか保存されないことを確認"""
+    store = MetadataBlobStore(tmp_path / "blobs")
+    writer = RefinementResultWriter(blob_store=store)
+    batch = BatchRefinementResult(
+        results=[refinement_result] * 3,
+        total_count=3,
+        success_count=3,
+        error_count=0,
+        errors=[],
+        processing_time=1.0,
+    )
+
+    writer.write_batch(batch, tmp_path / "first")
+    writer.write_batch(batch, tmp_path / "second")
+
+    # 3イテレーション分 + 最終メタデータ
+    assert len(store) == 4
+    output_file = next((tmp_path / "second").glob("*.json"))
+    loaded = load_refinement_results(output_file, store)
+    assert [result.to_model() for result in loaded] == batch.results
+
+
+def test_collect_refs_and_sweep(
+    tmp_path: Path,
+    refinement_result: MetadataRefinementResult,
+    sample_movie_metadata: MovieMetadata,
+):
+    """出力ファイルから参照を収集し、参照されないメタデータのみ削除できることを確認"""
+    store = MetadataBlobStore(tmp_path / "blobs")
+    writer = RefinementResultWriter(blob_store=store)
+    output_dir = tmp_path / "output"
+    writer.write(refinement_result, output_dir)
+    with writer.open_journal(output_dir) as journal:
+        journal.append(refinement_result)
+    orphan = store.put(sample_movie_metadata.model_copy(update={"title": "孤立"}))
+
+    referenced = collect_metadata_refs(find_refinement_outputs(output_dir))
+    removed = store.sweep(referenced, min_age=timedelta(0))
+
+    assert len(referenced) == 4
+    assert orphan not in referenced
+    assert removed == 1
+    assert all(ref in store for ref in referenced)
+
+
+def test_collect_refs_fails_on_unreadable_files(
+    tmp_path: Path, refinement_result: MetadataRefinementResult
+):
+    """読み込めない出力ファイルがある場合は参照の収集を失敗させることを確認"""
+    store = MetadataBlobStore(tmp_path / "blobs")
+    output_dir = tmp_path / "output"
+    RefinementResultWriter(blob_store=store).write(refinement_result, output_dir)
+    broken = output_dir / "Broken_refinement_20240101_000000.json"
+    broken.write_text("{not json", encoding="utf-8")
+
+    with pytest.raises(ValueError, match="Broken_refinement"):
+        collect_metadata_refs(sorted(output_dir.iterdir()))
+
+
+def test_find_refinement_outputs_matches_only_refinement_names(tmp_path: Path):
+    """一時ファイルや無関係な出力をリファインメント結果として扱わないことを確認"""
+    names = [
+        "Movie_refinement_20240101_120000.json",
+        "batch_refinement_result_20240101_120000_shard-1-of-4.json.gz",
+        "refinement_results_20240101_120000.jsonl",
+        ".batch_refinement_result_20240101_120000.json.0123abcd.tmp",
+        "Movie_20240101_120000.json",
+        "output_index.json",
+    ]
+    for name in names:
+        (tmp_path / name).write_text("{}", encoding="utf-8")
+
+    outputs = find_refinement_outputs(tmp_path)
+
+    assert [path.name for path in outputs] == sorted(names[:3])
@@ -0,0 +1,117 @@
+"""input_streamモジュールのテスト"""
+
+import gzip
+import io
+import sys
+from pathlib import Path
+
+import pytest
+
+from movie_metadata.input_stream import (
+    detect_input_format,
+    is_stdin,
+    iter_records,
+    open_input,
+)
+
+_REQUIRED = {"title", "release_date", "country"}
+
+
+def test_is_stdin() -> None:
+    """ "-" のみを標準入力と判定するテスト"""
+    assert is_stdin("-")
+    assert is_stdin(Path("-"))
+    assert not is_stdin(Path("movies.csv"))
+
+
+@pytest.mark.parametrize(
+    ("name", "head", "expected"),
+    [
+        ("movies.csv", b'{"title": "x"}', "csv"),
+        ("movies.jsonl", b"title,release_date", "jsonl"),
+        ("movies.ndjson.gz", b"", "jsonl"),
+        ("movies.csv.zst", b"", "csv"),
+        ("-", b'\n  {"title": "x"}', "jsonl"),
+        ("-", b"title,release_date,country\n", "csv"),
+    ],
+)
+def test_detect_input_format(name: str, head: bytes, expected: str) -> None:
+    """拡張子を優先し、判定できない場合は先頭の文字で形式を判定するテスト"""
+    assert detect_input_format(name, head) == expected
+
+
+def test_open_input_detects_gzip_by_magic_bytes(tmp_path: Path) -> None:
+    """拡張子がなくてもgzip圧縮を判定して展開するテスト"""
+    # Arrange
+    path = tmp_path / "movies"
+    path.write_bytes(gzip.compress(b"hello"))
+
+    # Act
+    with open_input(path) as f:
+        data = f.read()
+
+    # Assert
+    assert data == b"hello"
+
+
+def test_iter_records_csv(tmp_path: Path) -> None:
+    """CSVのレコードをヘッダーを1行目とした行番号とともに返すテスト"""
+    # Arrange
+    path = tmp_path / "movies.csv"
+    path.write_text("title,release_date,country\nA,2024-01-01,Japan\n")
+
+    # Act
+    records = list(iter_records(path, _REQUIRED))
+
+    # Assert
+    assert records == [
+        (2, {"title": "A", "release_date": "2024-01-01", "country": "Japan"})
+    ]
+
+
+def test_iter_records_csv_invalid_header(tmp_path: Path) -> None:
+    """CSVのヘッダーに必要なフィールドがない場合はValueErrorとなるテスト"""
+    path = tmp_path / "movies.csv"
+    path.write_text("title,country\nA,Japan\n")
+
+    with pytest.raises(ValueError, match="CSVに必要なフィールドがありません"):
+        list(iter_records(path, _REQUIRED))
+
+
+def test_iter_records_jsonl_skips_invalid_lines(tmp_path: Path) -> None:
+    """JSON Linesの不正な行と空行をスキップするテスト"""
+    # Arrange
+    path = tmp_path / "movies.jsonl.gz"
+    path.write_bytes(
+        gzip.compress(
+            b'{"title": "A", "release_date": "2024-01-01", "country": "Japan"}\n'
+            b"\n"
+            b"not json\n"
+            b"[1, 2]\n"
+            b'{"title": "B", "release_date": "2024-02-01", "country": "USA"}\n'
+        )
+    )
+
+    # Act
+    records = list(iter_records(path, _REQUIRED))
+
+    # Assert
+    assert [(num, record["title"]) for num, record in records] == [(1, "A"), (5, "B")]
+
+
+def test_iter_records_reads_stdin(monkeypatch: pytest.MonkeyPatch) -> None:
+    """ "-" を指定すると標準入力から読み込むテスト"""
+    # Arrange
+    stdin = io.TextIOWrapper(
+        io.BufferedReader(
+            io.BytesIO(b"title,release_date,country\nA,2024-01-01,Japan\n")
+        )
+    )
+    monkeypatch.setattr(sys, "stdin", stdin)
+
+    # Act
+    records = list(iter_records("-", _REQUIRED))
+
+    # Assert
+    assert [record["title"] for _, record in records] == ["A"]
+    assert not stdin.closed
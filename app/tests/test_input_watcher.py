@@ -0,0 +1,133 @@
+"""input_watcherモジュールのテスト"""
+
+import os
+import threading
+import time
+from pathlib import Path
+
+from movie_metadata.input_watcher import InputWatcher
+
+_HEADER = "title,release_date,country\n"
+
+
+def _append(path: Path, text: str) -> None:
+    with path.open("a", encoding="utf-8") as f:
+        f.write(text)
+
+
+def test_poll_reads_appended_rows_only(tmp_path: Path) -> None:
+    """処理済みの行以降に追記された完結した行のみを読み込むテスト"""
+    # Arrange
+    csv_path = tmp_path / "movies.csv"
+    csv_path.write_text(_HEADER + "Movie 1,2024-01-01,Japan\n", encoding="utf-8")
+    watcher = InputWatcher(csv_path, tmp_path / "state.json")
+    first = watcher.poll()
+    watcher.commit()
+    _append(csv_path, 'Movie 2,2024-02-01,USA\n"Movie\n3",2024-03')
+
+    # Act
+    second = watcher.poll()
+    watcher.commit()
+    _append(csv_path, "-01,UK\n")
+    third = watcher.poll()
+
+    # Assert
+    assert [movie.title for movie in first] == ["Movie 1"]
+    assert [movie.title for movie in second] == ["Movie 2"]
+    assert [movie.title for movie in third] == ["Movie\n3"]
+
+
+def test_poll_without_commit_returns_same_rows(tmp_path: Path) -> None:
+    """commit()しない場合は同じ行を再び返すテスト"""
+    csv_path = tmp_path / "movies.csv"
+    csv_path.write_text(_HEADER + "Movie 1,2024-01-01,Japan\n", encoding="utf-8")
+    watcher = InputWatcher(csv_path, tmp_path / "state.json")
+
+    assert watcher.poll() == watcher.poll()
+
+
+def test_state_is_restored_after_restart(tmp_path: Path) -> None:
+    """保存した処理位置から監視を再開するテスト"""
+    # Arrange
+    csv_path = tmp_path / "movies.csv"
+    state_path = tmp_path / "state.json"
+    csv_path.write_text(_HEADER + "Movie 1,2024-01-01,Japan\n", encoding="utf-8")
+    watcher = InputWatcher(csv_path, state_path)
+    watcher.poll()
+    watcher.commit()
+    _append(csv_path, "Movie 2,2024-02-01,USA\n")
+
+    # Act
+    movies = InputWatcher(csv_path, state_path).poll()
+
+    # Assert
+    assert [movie.title for movie in movies] == ["Movie 2"]
+
+
+def test_poll_rereads_truncated_file(tmp_path: Path) -> None:
+    """ファイルが切り詰められた場合は先頭から読み込み直すテスト"""
+    # Arrange
+    csv_path = tmp_path / "movies.csv"
+    csv_path.write_text(
+        _HEADER + "Movie 1,2024-01-01,Japan\nMovie 2,2024-02-01,USA\n",
+        encoding="utf-8",
+    )
+    watcher = InputWatcher(csv_path, tmp_path / "state.json")
+    watcher.poll()
+    watcher.commit()
+    csv_path.write_text(_HEADER + "Movie 3,2024-03-01,UK\n", encoding="utf-8")
+
+    # Act
+    movies = watcher.poll()
+
+    # Assert
+    assert [movie.title for movie in movies] == ["Movie 3"]
+
+
+def test_poll_directory_reads_new_settled_files(tmp_path: Path) -> None:
+    """投入ディレクトリの未処理のファイルを古い順に読み込むテスト"""
+    # Arrange
+    drop_dir = tmp_path / "drop"
+    drop_dir.mkdir()
+    old = time.time() - 60
+    (drop_dir / "b.csv").write_text(_HEADER + "Movie B,2024-01-01,Japan\n")
+    os.utime(drop_dir / "b.csv", (old, old))
+    (drop_dir / "a.jsonl").write_text(
+        '{"title": "Movie A", "release_date": "2024-01-01", "country": "USA"}\n'
+    )
+    os.utime(drop_dir / "a.jsonl", (old - 10, old - 10))
+    (drop_dir / ".c.csv").write_text(_HEADER + "Hidden,2024-01-01,Japan\n")
+    (drop_dir / "writing.csv").write_text(_HEADER + "Writing,2024-01-01,Japan\n")
+    watcher = InputWatcher(drop_dir, tmp_path / "state.json", poll_interval=30)
+
+    # Act
+    first = watcher.poll()
+    watcher.commit()
+    second = watcher.poll()
+
+    # Assert
+    assert [movie.title for movie in first] == ["Movie A", "Movie B"]
+    assert second == []
+    assert watcher.state.processed_files == ["a.jsonl", "b.csv"]
+
+
+def test_watch_yields_batches_until_stopped(tmp_path: Path) -> None:
+    """新しい行が追加されるたびに返し、停止イベントで終了するテスト"""
+    # Arrange
+    csv_path = tmp_path / "movies.csv"
+    csv_path.write_text(_HEADER + "Movie 1,2024-01-01,Japan\n", encoding="utf-8")
+    watcher = InputWatcher(csv_path, tmp_path / "state.json", poll_interval=0.01)
+    stop = threading.Event()
+    batches = []
+
+    # Act
+    for movies in watcher.watch(stop):
+        batches.append([movie.title for movie in movies])
+        if len(batches) == 1:
+            _append(csv_path, "Movie 2,2024-02-01,USA\n")
+        else:
+            stop.set()
+
+    # Assert
+    assert batches == [["Movie 1"], ["Movie 2"]]
+    assert watcher.state.row_count == 2
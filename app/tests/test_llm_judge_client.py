@@ -0,0 +1,54 @@
+"""llm_judge/client.pyの単体テスト"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from llm_judge.client import judge_client
+
+
+def test_judge_client_reuses_passed_client():
+    """渡されたクライアントを再利用し、閉じないことを確認"""
+    # Arrange
+    shared_client = MagicMock()
+
+    # Act
+    with (
+        patch("llm_judge.client.genai.Client") as mock_client_class,
+        judge_client("test_key", client=shared_client) as client,
+    ):
+        used = client
+
+    # Assert
+    assert used is shared_client
+    mock_client_class.assert_not_called()
+    shared_client.close.assert_not_called()
+
+
+def test_judge_client_closes_owned_client():
+    """クライアントを渡さない場合、生成したクライアントを終了時に閉じることを確認"""
+    # Act
+    with (
+        patch("llm_judge.client.genai.Client") as mock_client_class,
+        judge_client("test_key") as client,
+    ):
+        used = client
+
+    # Assert
+    mock_client_class.assert_called_once_with(api_key="test_key")
+    assert used is mock_client_class.return_value
+    mock_client_class.return_value.close.assert_called_once_with()
+
+
+def test_judge_client_closes_owned_client_on_error():
+    """呼び出しで例外が発生しても、生成したクライアントを閉じることを確認"""
+    # Act
+    with (
+        patch("llm_judge.client.genai.Client") as mock_client_class,
+        pytest.raises(RuntimeError, match="API error"),
+        judge_client("test_key"),
+    ):
+        raise RuntimeError("API error")
+
+    # Assert
+    mock_client_class.return_value.close.assert_called_once_with()
@@ -0,0 +1,106 @@
+"""llm_judge/pairwise_comparison.pyの単体テスト"""
+
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from llm_judge import pairwise_comparison
+from llm_judge.models import PairwiseComparisonResult
+from llm_judge.pairwise_comparison import compare_with_position_bias_check
+
+QUESTION = "質問"
+ANSWER_A = "回答A"
+ANSWER_B = "回答B"
+
+
+def _result(winner: str) -> PairwiseComparisonResult:
+    """テスト用の比較結果を生成する"""
+    return PairwiseComparisonResult(
+        winner=winner, reasoning=f"{winner}が優れている", confidence="high"
+    )
+
+
+def test_position_bias_check_submits_both_orderings_concurrently():
+    """A-BとB-Aを回答を入れ替えて同時に評価し、同じクライアントを使うことを確認"""
+    # Arrange
+    shared_client = MagicMock()
+    # 両方向の評価が同時に実行されていなければタイムアウトする
+    barrier = threading.Barrier(2, timeout=5)
+    calls: list[dict] = []
+
+    def fake_compare_single(**kwargs) -> PairwiseComparisonResult:
+        calls.append(kwargs)
+        barrier.wait()
+        return _result("A" if kwargs["answer_a"] == ANSWER_A else "B")
+
+    # Act
+    with patch.object(
+        pairwise_comparison, "_compare_single", side_effect=fake_compare_single
+    ):
+        result = compare_with_position_bias_check(
+            QUESTION, ANSWER_A, ANSWER_B, "test_key", client=shared_client
+        )
+
+    # Assert
+    orderings = {(call["answer_a"], call["answer_b"]) for call in calls}
+    assert orderings == {(ANSWER_A, ANSWER_B), (ANSWER_B, ANSWER_A)}
+    assert all(call["client"] is shared_client for call in calls)
+    assert result.final_winner == "A"
+
+
+def test_position_bias_check_passes_ab_result_first():
+    """B-Aが先に完了しても、一貫性チェックにA-Bの結果を先に渡すことを確認"""
+    # Arrange
+    ab_result = _result("A")
+    ba_result = _result("B")
+    ba_done = threading.Event()
+
+    def fake_compare_single(**kwargs) -> PairwiseComparisonResult:
+        if kwargs["answer_a"] == ANSWER_A:
+            assert ba_done.wait(timeout=5)
+            return ab_result
+        ba_done.set()
+        return ba_result
+
+    # Act
+    with (
+        patch.object(
+            pairwise_comparison, "_compare_single", side_effect=fake_compare_single
+        ),
+        patch.object(
+            pairwise_comparison,
+            "_check_consistency",
+            wraps=pairwise_comparison._check_consistency,
+        ) as spy,
+    ):
+        result = compare_with_position_bias_check(
+            QUESTION, ANSWER_A, ANSWER_B, "test_key", client=MagicMock()
+        )
+
+    # Assert
+    spy.assert_called_once_with(ab_result, ba_result)
+    assert result.comparison_ab is ab_result
+    assert result.comparison_ba is ba_result
+
+
+@pytest.mark.parametrize("failing_answer", [ANSWER_A, ANSWER_B])
+def test_position_bias_check_propagates_errors(failing_answer: str):
+    """どちらの方向の評価で例外が発生しても呼び出し元に伝播することを確認"""
+
+    # Arrange
+    def fake_compare_single(**kwargs) -> PairwiseComparisonResult:
+        if kwargs["answer_a"] == failing_answer:
+            raise RuntimeError("API error")
+        return _result("TIE")
+
+    # Act & Assert
+    with (
+        patch.object(
+            pairwise_comparison, "_compare_single", side_effect=fake_compare_single
+        ),
+        pytest.raises(RuntimeError, match="API error"),
+    ):
+        compare_with_position_bias_check(
+            QUESTION, ANSWER_A, ANSWER_B, "test_key", client=MagicMock()
+        )
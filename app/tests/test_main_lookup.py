@@ -0,0 +1,145 @@
+"""main_lookup.pyの単体テスト"""
+
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+import main_lookup
+from movie_metadata.blob_store import MetadataBlobStore
+from movie_metadata.json_writer import JSONWriter
+from movie_metadata.models import (
+    MetadataEvaluationResult,
+    MetadataFieldScore,
+    MetadataRefinementResult,
+    MovieInput,
+    MovieMetadata,
+    RefinementHistoryEntry,
+)
+from movie_metadata.output_index import INDEX_FILENAME, OutputIndex
+from movie_metadata.refinement_writer import RefinementResultWriter
+
+
+def test_main_lookup_prints_metadata(
+    tmp_path: Path, capsys, sample_movie_metadata: MovieMetadata
+):
+    """タイトルに一致するメタデータをJSONで表示することを確認"""
+    index = OutputIndex(tmp_path / INDEX_FILENAME)
+    JSONWriter(output_index=index).write(
+        [sample_movie_metadata], tmp_path / "movies.json"
+    )
+
+    exit_code = main_lookup.main(["テスト映画", "--output-dir", str(tmp_path)])
+
+    assert exit_code == 0
+    output = json.loads(capsys.readouterr().out)
+    assert output == sample_movie_metadata.model_dump()
+
+
+def test_main_lookup_defaults_to_configured_output_dir(
+    mocker, tmp_path: Path, capsys, sample_movie_metadata: MovieMetadata
+):
+    """--output-dirを省略した場合は設定の出力ディレクトリを検索することを確認"""
+    index = OutputIndex(tmp_path / INDEX_FILENAME)
+    JSONWriter(output_index=index).write(
+        [sample_movie_metadata], tmp_path / "movies.json"
+    )
+    mocker.patch(
+        "main_lookup.AppConfig", return_value=SimpleNamespace(output_dir=tmp_path)
+    )
+
+    exit_code = main_lookup.main(["テスト映画"])
+
+    assert exit_code == 0
+    output = json.loads(capsys.readouterr().out)
+    assert output == sample_movie_metadata.model_dump()
+
+
+def test_main_lookup_not_found(tmp_path: Path, capsys):
+    """見つからない場合は終了コード1を返すことを確認"""
+    exit_code = main_lookup.main(["Unknown", "--output-dir", str(tmp_path)])
+
+    assert exit_code == 1
+    assert "見つかりません" in capsys.readouterr().err
+
+
+def test_main_lookup_reports_blob_ref_output_without_blob_dir(
+    tmp_path: Path, capsys, sample_movie_metadata: MovieMetadata
+):
+    """ハッシュ参照形式の出力を--blob-dirなしで検索するとエラーを表示することを確認"""
+    store = MetadataBlobStore(tmp_path / "blobs")
+    evaluation = MetadataEvaluationResult(
+        iteration=1, field_scores=[], overall_status="pass", improvement_suggestions=""
+    )
+    RefinementResultWriter(
+        blob_store=store, output_index=OutputIndex(tmp_path / INDEX_FILENAME)
+    ).write(
+        MetadataRefinementResult(
+            final_metadata=sample_movie_metadata,
+            history=[
+                RefinementHistoryEntry(
+                    iteration=1, metadata=sample_movie_metadata, evaluation=evaluation
+                )
+            ],
+            success=True,
+            total_iterations=1,
+        ),
+        tmp_path,
+    )
+
+    exit_code = main_lookup.main(["Test Movie", "--output-dir", str(tmp_path)])
+
+    assert exit_code == 1
+    assert "--blob-dir" in capsys.readouterr().err
+
+
+def test_main_lookup_refresh_writes_speculative_result(
+    mocker, tmp_path: Path, capsys, sample_movie_metadata: MovieMetadata
+):
+    """--refreshで並列候補生成の結果を保存し、以降の検索で見つかることを確認"""
+    evaluation = MetadataEvaluationResult(
+        iteration=1,
+        field_scores=[MetadataFieldScore(field_name="cast", score=4.5, reasoning="-")],
+        overall_status="pass",
+        improvement_suggestions="なし",
+    )
+    mock_refiner = mocker.patch("main_lookup.MetadataRefiner").return_value
+    mock_refiner.refine_speculative.return_value = MetadataRefinementResult(
+        final_metadata=sample_movie_metadata,
+        history=[
+            RefinementHistoryEntry(
+                iteration=1, metadata=sample_movie_metadata, evaluation=evaluation
+            )
+        ],
+        success=True,
+        total_iterations=1,
+        stop_reason="passed",
+    )
+
+    exit_code = main_lookup.main(
+        [
+            "Test Movie",
+            "--release-date",
+            "2024-01-01",
+            "--country",
+            "日本",
+            "--refresh",
+            "--output-dir",
+            str(tmp_path),
+        ]
+    )
+
+    assert exit_code == 0
+    movie_input = mock_refiner.refine_speculative.call_args.args[0]
+    assert movie_input == MovieInput(
+        title="Test Movie", release_date="2024-01-01", country="日本"
+    )
+    assert json.loads(capsys.readouterr().out) == sample_movie_metadata.model_dump()
+    assert main_lookup.main(["テスト映画", "--output-dir", str(tmp_path)]) == 0
+
+
+def test_main_lookup_refresh_requires_release_date_and_country(tmp_path: Path):
+    """--refreshで公開日・制作国が指定されていない場合はエラーになることを確認"""
+    with pytest.raises(SystemExit):
+        main_lookup.main(["Test Movie", "--refresh", "--output-dir", str(tmp_path)])
@@ -1,6 +1,7 @@
 """main_refineモジュールのテスト"""
 
 import json
+import threading
 from pathlib import Path
 from types import SimpleNamespace
 
@@ -8,6 +9,7 @@ import pytest
 
 import main_refine
 from movie_metadata.csv_reader import CSVReader
+from movie_metadata.metadata_store import MetadataStore
 from movie_metadata.models import (
     MetadataEvaluationResult,
     MetadataFieldScore,
@@ -15,6 +17,8 @@ from movie_metadata.models import (
     MovieInput,
     RefinementHistoryEntry,
 )
+from movie_metadata.scheduler import CostModel
+from movie_metadata.sharding import select_shard
 
 
 @pytest.fixture
@@ -52,6 +56,18 @@ def test_main_refine_records_errors_and_writes_batch(
         log_level="INFO",
         csv_path=Path("data/movies.csv"),
         output_dir=Path("data/output"),
+        evaluation_cache_path=None,
+        metadata_store_path=None,
+        input_parse_workers=1,
+        refine_workers=1,
+        cost_history_path=None,
+        compact_history=False,
+        metadata_blob_dir=None,
+        metadata_blob_gc=False,
+        parquet_export=False,
+        output_index=False,
+        output_compression=None,
+        output_compression_level=None,
         quality_score_threshold=3.5,
     )
     mocker.patch("main_refine.AppConfig", return_value=dummy_config)
@@ -75,14 +91,19 @@ def test_main_refine_records_errors_and_writes_batch(
     with caplog.at_level("ERROR"):
         main_refine.main()
 
-    assert mock_writer.write_batch.call_count == 1
-    batch_result, output_dir = mock_writer.write_batch.call_args.args
-    assert batch_result.total_count == 2
-    assert batch_result.success_count == 1
-    assert batch_result.error_count == 1
-    assert batch_result.errors == [{"title": "Movie B", "message": "boom"}]
+    assert mock_writer.write_batch_from_journal.call_count == 1
+    journal_path, summary, output_dir = (
+        mock_writer.write_batch_from_journal.call_args.args
+    )
+    journal = mock_writer.open_journal.return_value.__enter__.return_value
+    assert journal_path == journal.path
+    assert summary.total_count == 2
+    assert summary.success_count == 1
+    assert summary.error_count == 1
+    assert summary.errors == [{"title": "Movie B", "message": "boom"}]
     expected_output_dir = Path(main_refine.__file__).parent / dummy_config.output_dir
     assert output_dir == expected_output_dir
+    mock_writer.open_journal.assert_called_once_with(expected_output_dir)
 
     assert "エラー件数: 1" in caplog.text
     assert "エラーが発生した映画: Movie B" in caplog.text
@@ -97,6 +118,18 @@ def test_main_refine_continues_after_error(mocker, sample_movie_metadata):
         log_level="INFO",
         csv_path=Path("data/movies.csv"),
         output_dir=Path("data/output"),
+        evaluation_cache_path=None,
+        metadata_store_path=None,
+        input_parse_workers=1,
+        refine_workers=1,
+        cost_history_path=None,
+        compact_history=False,
+        metadata_blob_dir=None,
+        metadata_blob_gc=False,
+        parquet_export=False,
+        output_index=False,
+        output_compression=None,
+        output_compression_level=None,
         quality_score_threshold=3.5,
     )
     mocker.patch("main_refine.AppConfig", return_value=dummy_config)
@@ -147,13 +180,16 @@ def test_main_refine_continues_after_error(mocker, sample_movie_metadata):
     main_refine.main()
 
     assert mock_refiner.refine.call_count == 3
-    batch_result, _ = mock_writer.write_batch.call_args.args
-    assert batch_result.total_count == 3
-    assert batch_result.success_count == 2
-    assert batch_result.error_count == 1
-    assert batch_result.errors == [{"title": "Unknown", "message": "not found"}]
-    assert len(batch_result.results) == 2
-    titles = {result.final_metadata.title for result in batch_result.results}
+    _, summary, _ = mock_writer.write_batch_from_journal.call_args.args
+    assert summary.total_count == 3
+    assert summary.success_count == 2
+    assert summary.error_count == 1
+    assert summary.errors == [{"title": "Unknown", "message": "not found"}]
+    journal = mock_writer.open_journal.return_value.__enter__.return_value
+    assert journal.append.call_count == 2
+    titles = {
+        call.args[0].final_metadata.title for call in journal.append.call_args_list
+    }
     assert titles == {"Movie A", "Movie C"}
 
 
@@ -166,6 +202,18 @@ def test_main_refine_logs_error_summary_for_multiple_errors(mocker, caplog):
         log_level="INFO",
         csv_path=Path("data/movies.csv"),
         output_dir=Path("data/output"),
+        evaluation_cache_path=None,
+        metadata_store_path=None,
+        input_parse_workers=1,
+        refine_workers=1,
+        cost_history_path=None,
+        compact_history=False,
+        metadata_blob_dir=None,
+        metadata_blob_gc=False,
+        parquet_export=False,
+        output_index=False,
+        output_compression=None,
+        output_compression_level=None,
         quality_score_threshold=3.5,
     )
     mocker.patch("main_refine.AppConfig", return_value=dummy_config)
@@ -204,6 +252,18 @@ def test_main_refine_logs_progress_for_each_record(
         log_level="INFO",
         csv_path=Path("data/movies.csv"),
         output_dir=Path("data/output"),
+        evaluation_cache_path=None,
+        metadata_store_path=None,
+        input_parse_workers=1,
+        refine_workers=1,
+        cost_history_path=None,
+        compact_history=False,
+        metadata_blob_dir=None,
+        metadata_blob_gc=False,
+        parquet_export=False,
+        output_index=False,
+        output_compression=None,
+        output_compression_level=None,
         quality_score_threshold=3.5,
     )
     mocker.patch("main_refine.AppConfig", return_value=dummy_config)
@@ -232,11 +292,12 @@ def test_main_refine_logs_progress_for_each_record(
 
 
 def test_main_refine_uses_csv_filename_env(
-    monkeypatch, mocker, sample_refinement_result
+    tmp_path, monkeypatch, mocker, sample_refinement_result
 ):
     """CSV_FILENAME環境変数が読み込まれることを確認"""
     monkeypatch.setenv("GEMINI_API_KEY", "test")
     monkeypatch.setenv("CSV_FILENAME", "movies_test.csv")
+    monkeypatch.setenv("METADATA_STORE_PATH", str(tmp_path / "metadata.sqlite3"))
     mocker.patch("main_refine.setup_logging")
 
     movies = [MovieInput(title="Movie A", release_date="2024-01-01", country="Japan")]
@@ -272,6 +333,18 @@ def test_main_refine_processes_all_records_in_movies_csv(
         log_level="INFO",
         csv_path=Path("data/movies.csv"),
         output_dir=Path("data/output"),
+        evaluation_cache_path=None,
+        metadata_store_path=None,
+        input_parse_workers=1,
+        refine_workers=1,
+        cost_history_path=None,
+        compact_history=False,
+        metadata_blob_dir=None,
+        metadata_blob_gc=False,
+        parquet_export=False,
+        output_index=False,
+        output_compression=None,
+        output_compression_level=None,
         quality_score_threshold=3.5,
     )
     mocker.patch("main_refine.AppConfig", return_value=dummy_config)
@@ -287,7 +360,297 @@ def test_main_refine_processes_all_records_in_movies_csv(
     main_refine.main()
 
     assert mock_refiner.refine.call_count == expected_count
-    assert mock_writer.write_batch.call_count == 1
+    assert mock_writer.write_batch_from_journal.call_count == 1
+
+
+def test_main_refine_processes_only_own_shard(mocker, sample_refinement_result):
+    """--shard-index / --shard-count 指定時は担当シャードのみを処理することを確認"""
+    csv_path = Path(main_refine.__file__).parent / Path("data/movies.csv")
+    expected = select_shard(CSVReader().read(csv_path), 0, 2)
+
+    dummy_config = SimpleNamespace(
+        gemini_api_key="test",
+        model_name="model",
+        rate_limit_sleep=0.0,
+        log_level="INFO",
+        csv_path=Path("data/movies.csv"),
+        output_dir=Path("data/output"),
+        evaluation_cache_path=None,
+        metadata_store_path=None,
+        input_parse_workers=1,
+        refine_workers=1,
+        cost_history_path=None,
+        compact_history=False,
+        metadata_blob_dir=None,
+        metadata_blob_gc=False,
+        parquet_export=False,
+        output_index=False,
+        output_compression=None,
+        output_compression_level=None,
+        quality_score_threshold=3.5,
+    )
+    mocker.patch("main_refine.AppConfig", return_value=dummy_config)
+    mocker.patch("main_refine.setup_logging")
+
+    mock_refiner = mocker.MagicMock()
+    mock_refiner.refine.return_value = sample_refinement_result
+    mocker.patch("main_refine.MetadataRefiner", return_value=mock_refiner)
+
+    mock_writer = mocker.MagicMock()
+    mock_writer_class = mocker.patch(
+        "main_refine.RefinementResultWriter", return_value=mock_writer
+    )
+
+    main_refine.main(["--shard-index", "0", "--shard-count", "2"])
+
+    refined = [
+        call.kwargs["movie_input"] for call in mock_refiner.refine.call_args_list
+    ]
+    assert refined == expected
+    assert mock_writer_class.call_args.kwargs["name_suffix"] == "_shard-0-of-2"
+
+
+def _refine_config(tmp_path: Path, **overrides) -> SimpleNamespace:
+    """main_refineのテスト用の設定を生成する"""
+    values = {
+        "gemini_api_key": "test",
+        "model_name": "model",
+        "rate_limit_sleep": 0.0,
+        "log_level": "INFO",
+        "csv_path": Path("data/movies.csv"),
+        "output_dir": tmp_path,
+        "evaluation_cache_path": None,
+        "metadata_store_path": None,
+        "input_parse_workers": 1,
+        "refine_workers": 1,
+        "cost_history_path": None,
+        "compact_history": False,
+        "metadata_blob_dir": None,
+        "metadata_blob_gc": False,
+        "parquet_export": False,
+        "output_index": False,
+        "output_compression": None,
+        "output_compression_level": None,
+        "quality_score_threshold": 3.5,
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def _build_titled_result(sample_movie_metadata, title: str) -> MetadataRefinementResult:
+    """タイトルを置き換えた合格済みのリファインメント結果を生成する"""
+    metadata = sample_movie_metadata.model_copy(update={"title": title})
+    evaluation = MetadataEvaluationResult(
+        iteration=1,
+        field_scores=[
+            MetadataFieldScore(field_name="title", score=4.0, reasoning="良好")
+        ],
+        overall_status="pass",
+        improvement_suggestions="改善の必要なし",
+    )
+    return MetadataRefinementResult(
+        final_metadata=metadata,
+        history=[
+            RefinementHistoryEntry(
+                iteration=1, metadata=metadata, evaluation=evaluation
+            )
+        ],
+        success=True,
+        total_iterations=1,
+    )
+
+
+def test_main_refine_parallel_submits_by_cost_and_keeps_input_order(
+    tmp_path, mocker, sample_movie_metadata
+):
+    """並列実行時は予測処理時間の長い映画から投入し、結果は入力の順序で追記することを確認"""
+    movies = [
+        MovieInput(title="Movie A", release_date="2024-01-01", country="Japan"),
+        MovieInput(title="Movie B", release_date="2024-01-02", country="Japan"),
+        MovieInput(title="Movie C", release_date="2024-01-03", country="Japan"),
+    ]
+    cost_history_path = tmp_path / "cost_history.jsonl"
+    history = CostModel(cost_history_path)
+    history.record(movies[2], iterations=3, seconds=10000.0)
+    history.record(movies[0], iterations=1, seconds=1.0)
+    history.close()
+    mocker.patch(
+        "main_refine.AppConfig",
+        return_value=_refine_config(
+            tmp_path, refine_workers=2, cost_history_path=cost_history_path
+        ),
+    )
+    mocker.patch("main_refine.setup_logging")
+    mock_csv_reader = mocker.MagicMock()
+    mock_csv_reader.read.return_value = movies
+    mocker.patch("main_refine.CSVReader", return_value=mock_csv_reader)
+
+    # 最初の映画は最後の映画が完了するまで終わらない（完了順は入力と異なる）
+    # 先に投入した2件はどちらも開始してから完了する（最後の映画の投入は空き待ち）
+    last_done = threading.Event()
+    both_started = threading.Barrier(2, timeout=5.0)
+    started: list[str] = []
+
+    def refine(movie_input, max_iterations, threshold):
+        started.append(movie_input.title)
+        if movie_input.title == "Movie A":
+            assert last_done.wait(timeout=5.0)
+        else:
+            both_started.wait()
+        if movie_input.title == "Movie C":
+            last_done.set()
+        return _build_titled_result(sample_movie_metadata, movie_input.title)
+
+    mock_refiner = mocker.MagicMock()
+    mock_refiner.refine.side_effect = refine
+    mocker.patch("main_refine.MetadataRefiner", return_value=mock_refiner)
+    mock_writer = mocker.MagicMock()
+    mocker.patch("main_refine.RefinementResultWriter", return_value=mock_writer)
+
+    main_refine.main()
+
+    assert "Movie C" in started[:2]
+    assert started[-1] == "Movie A"
+    journal = mock_writer.open_journal.return_value.__enter__.return_value
+    assert [
+        call.args[0].final_metadata.title for call in journal.append.call_args_list
+    ] == ["Movie A", "Movie B", "Movie C"]
+    assert len(cost_history_path.read_text(encoding="utf-8").splitlines()) == 2 + 3
+
+
+def test_refine_in_input_order_bounds_reorder_window(mocker, sample_movie_metadata):
+    """投入対象を未出力の先頭からの一定件数に限り、出力待ちの結果が増えないことを確認"""
+    # Arrange
+    movies = [
+        MovieInput(title=f"Movie {i}", release_date="2024-01-01", country="Japan")
+        for i in range(6)
+    ]
+    cost_model = CostModel()
+    cost_model.record(movies[5], iterations=3, seconds=10000.0)
+    mocker.patch.object(main_refine, "_REORDER_WINDOW_PER_WORKER", 1)
+    started: list[str] = []
+    lock = threading.Lock()
+
+    def refine(movie_input, max_iterations, threshold):
+        with lock:
+            started.append(movie_input.title)
+        return _build_titled_result(sample_movie_metadata, movie_input.title)
+
+    refiner = mocker.MagicMock()
+    refiner.refine.side_effect = refine
+
+    # Act
+    outcomes = list(
+        main_refine._refine_in_input_order(refiner, movies, 3.5, 2, cost_model)
+    )
+
+    # Assert
+    # 最も時間のかかる最後の映画も、先頭から2件の範囲に入るまで投入されない
+    assert started.index("Movie 5") >= 4
+    assert [movie.title for movie, _ in outcomes] == [m.title for m in movies]
+    assert [
+        result.final_metadata.title
+        for _, result in outcomes
+        if isinstance(result, MetadataRefinementResult)
+    ] == [m.title for m in movies]
+
+
+def test_main_refine_sequential_keeps_input_order(
+    tmp_path, mocker, sample_refinement_result
+):
+    """逐次実行時は処理実績があっても入力の順序で処理することを確認"""
+    csv_path = Path(main_refine.__file__).parent / Path("data/movies.csv")
+    movies = CSVReader().read(csv_path)
+    cost_history_path = tmp_path / "cost_history.jsonl"
+    history = CostModel(cost_history_path)
+    history.record(movies[-1], iterations=3, seconds=10000.0)
+    history.close()
+    mocker.patch(
+        "main_refine.AppConfig",
+        return_value=_refine_config(tmp_path, cost_history_path=cost_history_path),
+    )
+    mocker.patch("main_refine.setup_logging")
+    mock_refiner = mocker.MagicMock()
+    mock_refiner.refine.return_value = sample_refinement_result
+    mocker.patch("main_refine.MetadataRefiner", return_value=mock_refiner)
+    mocker.patch("main_refine.RefinementResultWriter")
+
+    main_refine.main()
+
+    refined = [
+        call.kwargs["movie_input"] for call in mock_refiner.refine.call_args_list
+    ]
+    assert refined == movies
+
+
+def test_main_refine_stores_results_under_input_key(
+    tmp_path, mocker, sample_movie_metadata
+):
+    """LLMがタイトルを変えて返しても、入力の値でストアから取得できることを確認"""
+    movie_input = MovieInput(
+        title="Spirited Away", release_date="2001-07-20", country="Japan"
+    )
+    store_path = tmp_path / "metadata.sqlite3"
+    mocker.patch(
+        "main_refine.AppConfig",
+        return_value=_refine_config(tmp_path, metadata_store_path=store_path),
+    )
+    mocker.patch("main_refine.setup_logging")
+    mock_csv_reader = mocker.MagicMock()
+    mock_csv_reader.read.return_value = [movie_input]
+    mocker.patch("main_refine.CSVReader", return_value=mock_csv_reader)
+    result = _build_titled_result(sample_movie_metadata, "千と千尋の神隠し")
+    mock_refiner = mocker.MagicMock()
+    mock_refiner.refine.return_value = result
+    mocker.patch("main_refine.MetadataRefiner", return_value=mock_refiner)
+    mocker.patch("main_refine.RefinementResultWriter")
+
+    main_refine.main()
+
+    with MetadataStore(store_path) as store:
+        assert (
+            store.get_refinement_result("Spirited Away", "2001-07-20", "Japan")
+            == result
+        )
+        assert (
+            store.get_metadata("Spirited Away", "2001-07-20", "Japan")
+            == result.final_metadata
+        )
+
+
+def test_main_refine_saves_to_store_in_batches(tmp_path, mocker, sample_movie_metadata):
+    """ストアへの保存をbatch_size件ごとにまとめ、残りを最後に保存することを確認"""
+    movies = [
+        MovieInput(title=f"Movie {i}", release_date="2024-01-01", country="日本")
+        for i in range(3)
+    ]
+    mocker.patch(
+        "main_refine.AppConfig",
+        return_value=_refine_config(
+            tmp_path, metadata_store_path=tmp_path / "metadata.sqlite3"
+        ),
+    )
+    mocker.patch("main_refine.setup_logging")
+    mock_csv_reader = mocker.MagicMock()
+    mock_csv_reader.read.return_value = movies
+    mocker.patch("main_refine.CSVReader", return_value=mock_csv_reader)
+    mock_refiner = mocker.MagicMock()
+    mock_refiner.refine.return_value = _build_titled_result(
+        sample_movie_metadata, "タイトル"
+    )
+    mocker.patch("main_refine.MetadataRefiner", return_value=mock_refiner)
+    mocker.patch("main_refine.RefinementResultWriter")
+    mock_store = mocker.patch("main_refine.MetadataStore").return_value
+    mock_store.batch_size = 2
+    saved: list[list[str]] = []
+    mock_store.upsert_refinement_results.side_effect = lambda records: saved.append(
+        [movie_input.title for movie_input, _ in records]
+    )
+
+    main_refine.main()
+
+    assert saved == [["Movie 0", "Movie 1"], ["Movie 2"]]
+    assert mock_store.upsert_metadata.call_count == 2
 
 
 def test_main_refine_writes_timestamped_batch_file(
@@ -301,6 +664,19 @@ def test_main_refine_writes_timestamped_batch_file(
         log_level="INFO",
         csv_path=Path("data/movies.csv"),
         output_dir=tmp_path,
+        evaluation_cache_path=None,
+        metadata_store_path=None,
+        input_parse_workers=1,
+        refine_workers=1,
+        cost_history_path=None,
+        compact_history=False,
+        metadata_blob_dir=None,
+        metadata_blob_gc=False,
+        parquet_export=False,
+        output_index=False,
+        output_compression=None,
+        output_compression_level=None,
+        quality_score_threshold=3.5,
     )
     mocker.patch("main_refine.AppConfig", return_value=dummy_config)
     mocker.patch("main_refine.setup_logging")
@@ -340,9 +716,22 @@ def test_main_refine_batch_json_contains_all_results(
         gemini_api_key="test",
         model_name="model",
         rate_limit_sleep=0.0,
+        quality_score_threshold=3.5,
         log_level="INFO",
         csv_path=Path("data/movies.csv"),
         output_dir=tmp_path,
+        evaluation_cache_path=None,
+        metadata_store_path=None,
+        input_parse_workers=1,
+        refine_workers=1,
+        cost_history_path=None,
+        compact_history=False,
+        metadata_blob_dir=None,
+        metadata_blob_gc=False,
+        parquet_export=False,
+        output_index=False,
+        output_compression=None,
+        output_compression_level=None,
     )
     mocker.patch("main_refine.AppConfig", return_value=dummy_config)
     mocker.patch("main_refine.setup_logging")
@@ -402,3 +791,31 @@ def test_main_refine_batch_json_contains_all_results(
     assert len(data["results"]) == len(movies)
     titles = {result["final_metadata"]["title"] for result in data["results"]}
     assert titles == {"Movie A", "Movie B"}
+
+
+def test_sweep_blob_store_skips_when_outputs_are_unreadable(tmp_path, mocker):
+    """参照を収集できない出力ファイルがある場合はメタデータを削除しないことを確認"""
+    # Arrange
+    (tmp_path / "batch_refinement_result_20240101_000000.json").write_text(
+        "{broken", encoding="utf-8"
+    )
+    blob_store = mocker.MagicMock()
+
+    # Act
+    main_refine._sweep_blob_store(blob_store, tmp_path, shard_count=1)
+
+    # Assert
+    blob_store.sweep.assert_not_called()
+
+
+def test_sweep_blob_store_skips_sharded_runs(tmp_path, mocker):
+    """シャーディング実行中はストアを共有するためメタデータを削除しないことを確認"""
+    # Arrange
+    blob_store = mocker.MagicMock()
+
+    # Act
+    main_refine._sweep_blob_store(blob_store, tmp_path, shard_count=2)
+    main_refine._sweep_blob_store(blob_store, tmp_path, shard_count=1)
+
+    # Assert
+    blob_store.sweep.assert_called_once_with(set())
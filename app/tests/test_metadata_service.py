@@ -1,6 +1,8 @@
 """metadata_serviceモジュールのテスト"""
 
+import json
 import logging
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
 from unittest.mock import MagicMock, call, patch
 
@@ -10,7 +12,9 @@ from movie_metadata.csv_reader import CSVReader
 from movie_metadata.genai_client import GenAIClient
 from movie_metadata.json_writer import JSONWriter
 from movie_metadata.metadata_service import MetadataService
+from movie_metadata.metadata_store import MetadataStore
 from movie_metadata.models import MovieInput, MovieMetadata
+from movie_metadata.sharding import select_shard
 
 
 @pytest.fixture
@@ -122,6 +126,36 @@ class TestMetadataServiceProcess:
         mock_csv_reader.read.assert_called_once_with(csv_path)
         mock_json_writer.write.assert_called_once()
 
+    def test_process_upserts_into_metadata_store(
+        self,
+        mock_client: MagicMock,
+        mock_csv_reader: MagicMock,
+        mock_json_writer: MagicMock,
+        sample_movies: list[MovieInput],
+        sample_metadata_list: list[MovieMetadata],
+        tmp_path: Path,
+    ) -> None:
+        """メタデータストアを指定した場合に取得結果がupsertされるテスト"""
+        # Arrange
+        mock_store = MagicMock(spec=MetadataStore)
+        service = MetadataService(
+            client=mock_client,
+            csv_reader=mock_csv_reader,
+            json_writer=mock_json_writer,
+            rate_limit_sleep=0,
+            metadata_store=mock_store,
+        )
+        mock_csv_reader.read.return_value = sample_movies
+
+        with patch.object(service._fetcher, "fetch", side_effect=sample_metadata_list):
+            # Act
+            service.process(tmp_path / "test.csv", tmp_path / "output")
+
+        # Assert
+        mock_store.upsert_metadata.assert_called_once_with(
+            list(zip(sample_movies, sample_metadata_list, strict=True))
+        )
+
     def test_process_with_partial_failure(
         self,
         service: MetadataService,
@@ -390,6 +424,200 @@ class TestMetadataServiceProcess:
             service.process(csv_path, output_dir)
 
 
+class TestMetadataServiceDeduplication:
+    """重複排除モードのテスト"""
+
+    def test_process_fetches_duplicates_once_and_fans_out(
+        self,
+        mock_client: MagicMock,
+        mock_json_writer: MagicMock,
+        sample_metadata_list: list[MovieMetadata],
+        tmp_path: Path,
+    ) -> None:
+        """重複する行は1回だけ取得し、結果を元の各行に展開して出力するテスト"""
+        # Arrange
+        csv_file = tmp_path / "test.csv"
+        csv_file.write_text(
+            "title,release_date,country\n"
+            "Movie 1,2024-01-01,Japan\n"
+            "movie 1 ,2024-01-01,Japan\n"
+            "Movie 2,2024-02-01,USA\n"
+            "ＭＯＶＩＥ　１,2024-03-01,Japan\n",
+            encoding="utf-8",
+        )
+        service = MetadataService(
+            client=mock_client,
+            csv_reader=CSVReader(),
+            json_writer=mock_json_writer,
+            rate_limit_sleep=0,
+            deduplicate=True,
+        )
+        output_dir = tmp_path / "output"
+
+        with patch.object(
+            service._fetcher, "fetch", side_effect=sample_metadata_list
+        ) as mock_fetch:
+            # Act
+            result = service.process(csv_file, output_dir)
+
+        # Assert
+        assert mock_fetch.call_count == 2
+        assert result == {
+            "total": 4,
+            "success": 4,
+            "failed": 0,
+            "cached": 0,
+            "collapsed": 2,
+        }
+        movie1, movie2 = sample_metadata_list
+        written = mock_json_writer.write.call_args.args[0]
+        assert written == [movie1, movie1, movie2, movie1]
+        report = json.loads(
+            next(output_dir.glob("collapsed_rows_*.json")).read_text(encoding="utf-8")
+        )
+        assert [row["row_number"] for row in report] == [3, 5]
+        assert report[0]["kept_row_number"] == 2
+
+    def test_process_counts_failures_per_row(
+        self,
+        mock_client: MagicMock,
+        mock_json_writer: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        """集約した映画の取得に失敗した場合は元の全行を失敗として数えるテスト"""
+        # Arrange
+        csv_file = tmp_path / "test.csv"
+        csv_file.write_text(
+            "title,release_date,country\n"
+            "Movie 1,2024-01-01,Japan\n"
+            "MOVIE 1,2024-01-01,Japan\n",
+            encoding="utf-8",
+        )
+        service = MetadataService(
+            client=mock_client,
+            csv_reader=CSVReader(),
+            json_writer=mock_json_writer,
+            rate_limit_sleep=0,
+            deduplicate=True,
+        )
+
+        with patch.object(
+            service._fetcher, "fetch", side_effect=RuntimeError("API error")
+        ):
+            # Act
+            result = service.process(csv_file, tmp_path / "output")
+
+        # Assert
+        assert result["total"] == 2
+        assert result["failed"] == 2
+        assert result["collapsed"] == 1
+        mock_json_writer.write.assert_not_called()
+
+
+class TestMetadataServiceSharding:
+    """シャーディングのテスト"""
+
+    def test_process_handles_only_own_shard(
+        self,
+        mock_client: MagicMock,
+        mock_csv_reader: MagicMock,
+        mock_json_writer: MagicMock,
+        sample_metadata_list: list[MovieMetadata],
+        tmp_path: Path,
+    ) -> None:
+        """担当するシャードの映画のみを取得し、シャードごとのファイルに出力するテスト"""
+        # Arrange
+        movies = [
+            MovieInput(title=f"Movie {i}", release_date="2024-01-01", country="Japan")
+            for i in range(20)
+        ]
+        mock_csv_reader.read.return_value = movies
+        service = MetadataService(
+            client=mock_client,
+            csv_reader=mock_csv_reader,
+            json_writer=mock_json_writer,
+            rate_limit_sleep=0,
+            shard_index=1,
+            shard_count=3,
+        )
+
+        with patch.object(
+            service._fetcher, "fetch", return_value=sample_metadata_list[0]
+        ) as mock_fetch:
+            # Act
+            result = service.process(tmp_path / "test.csv", tmp_path / "output")
+
+        # Assert
+        expected = select_shard(movies, 1, 3)
+        assert mock_fetch.call_args_list == [call(movie) for movie in expected]
+        assert result["total"] == len(expected)
+        output_path = mock_json_writer.write.call_args.args[1]
+        assert output_path.name.endswith("_shard-1-of-3.json")
+
+    def test_invalid_shard_raises(
+        self,
+        mock_client: MagicMock,
+        mock_csv_reader: MagicMock,
+        mock_json_writer: MagicMock,
+    ) -> None:
+        """不正なシャードの指定はValueErrorとなるテスト"""
+        with pytest.raises(ValueError, match="shard_index"):
+            MetadataService(
+                client=mock_client,
+                csv_reader=mock_csv_reader,
+                json_writer=mock_json_writer,
+                shard_index=3,
+                shard_count=3,
+            )
+
+
+class TestMetadataServiceWatch:
+    """監視モードのテスト"""
+
+    def test_watch_appends_results_to_stream_output(
+        self,
+        service: MetadataService,
+        sample_movies: list[MovieInput],
+        sample_metadata_list: list[MovieMetadata],
+        tmp_path: Path,
+    ) -> None:
+        """追加された映画を随時取得し、結果をJSON Linesの出力に追記するテスト"""
+        # Arrange
+        new_movie = MovieInput(title="Movie 3", release_date="2024-03-01", country="UK")
+        watcher = MagicMock()
+        watcher.watch.return_value = iter([sample_movies, [new_movie]])
+
+        with patch.object(
+            service._fetcher,
+            "fetch",
+            side_effect=[
+                sample_metadata_list[0],
+                Exception("API Error"),
+                sample_metadata_list[1],
+            ],
+        ):
+            # Act
+            result = service.watch(watcher, tmp_path / "output")
+
+        # Assert
+        assert result == {
+            "total": 3,
+            "success": 2,
+            "failed": 1,
+            "cached": 0,
+            "collapsed": 0,
+        }
+        lines = (
+            (tmp_path / "output" / "movie_metadata_stream.jsonl")
+            .read_text(encoding="utf-8")
+            .splitlines()
+        )
+        assert [MovieMetadata.model_validate_json(line) for line in lines] == [
+            sample_metadata_list[0],
+            sample_metadata_list[1],
+        ]
+
+
 class TestMetadataServiceLogging:
     """MetadataServiceのログ出力テスト"""
 
@@ -526,3 +754,229 @@ class TestMetadataServiceLogging:
 
         # Assert
         assert "エラー: メタデータを取得できませんでした" in caplog.text
+
+
+class TestMetadataServiceIncremental:
+    """MetadataService.processのインクリメンタルモードのテスト"""
+
+    @pytest.fixture
+    def store(self, tmp_path: Path):
+        """テスト用MetadataStore"""
+        with MetadataStore(tmp_path / "store.sqlite3") as store:
+            yield store
+
+    def _service(
+        self,
+        mock_client: MagicMock,
+        mock_csv_reader: MagicMock,
+        mock_json_writer: MagicMock,
+        store: MetadataStore,
+        **kwargs,
+    ) -> MetadataService:
+        """インクリメンタルモードのMetadataServiceを生成する"""
+        return MetadataService(
+            client=mock_client,
+            csv_reader=mock_csv_reader,
+            json_writer=mock_json_writer,
+            rate_limit_sleep=0,
+            metadata_store=store,
+            **kwargs,
+        )
+
+    def test_process_skips_fresh_and_refetches_new(
+        self,
+        mock_client: MagicMock,
+        mock_csv_reader: MagicMock,
+        mock_json_writer: MagicMock,
+        store: MetadataStore,
+        sample_movies: list[MovieInput],
+        sample_metadata_list: list[MovieMetadata],
+        tmp_path: Path,
+    ) -> None:
+        """新鮮な映画は取得を省略し、未保存の映画のみ取得するテスト"""
+        # Arrange
+        store.upsert_metadata([(sample_movies[0], sample_metadata_list[0])])
+        service = self._service(
+            mock_client,
+            mock_csv_reader,
+            mock_json_writer,
+            store,
+            ttl=timedelta(days=30),
+        )
+        mock_csv_reader.read.return_value = sample_movies
+
+        with patch.object(
+            service._fetcher, "fetch", return_value=sample_metadata_list[1]
+        ) as mock_fetch:
+            # Act
+            result = service.process(tmp_path / "test.csv", tmp_path / "output")
+
+        # Assert
+        mock_fetch.assert_called_once_with(sample_movies[1])
+        assert result == {
+            "total": 2,
+            "success": 2,
+            "failed": 0,
+            "cached": 1,
+            "collapsed": 0,
+        }
+        written = mock_json_writer.write.call_args.args[0]
+        assert written == sample_metadata_list
+
+    def test_process_refetches_when_field_ttl_expired(
+        self,
+        mock_client: MagicMock,
+        mock_csv_reader: MagicMock,
+        mock_json_writer: MagicMock,
+        store: MetadataStore,
+        sample_movies: list[MovieInput],
+        sample_metadata_list: list[MovieMetadata],
+        tmp_path: Path,
+    ) -> None:
+        """フィールドの有効期間を超えた映画は再取得されるテスト"""
+        # Arrange
+        store.upsert_metadata(
+            zip(sample_movies, sample_metadata_list, strict=True),
+            updated_at=datetime.now(UTC) - timedelta(days=10),
+        )
+        service = self._service(
+            mock_client,
+            mock_csv_reader,
+            mock_json_writer,
+            store,
+            ttl=timedelta(days=30),
+            field_ttls={"box_office": timedelta(days=7)},
+        )
+        refreshed = [
+            m.model_copy(update={"box_office": "$9M"}) for m in sample_metadata_list
+        ]
+        mock_csv_reader.read.return_value = sample_movies
+
+        with patch.object(service._fetcher, "fetch", side_effect=refreshed):
+            # Act
+            result = service.process(tmp_path / "test.csv", tmp_path / "output")
+
+        # Assert
+        assert result["cached"] == 0
+        assert result["success"] == 2
+        stored = store.get_metadata("Movie 1", "2024-01-01", "Japan")
+        assert stored is not None
+        assert stored.box_office == "$9M"
+
+    def test_process_keeps_stale_metadata_when_refetch_fails(
+        self,
+        mock_client: MagicMock,
+        mock_csv_reader: MagicMock,
+        mock_json_writer: MagicMock,
+        store: MetadataStore,
+        sample_movies: list[MovieInput],
+        sample_metadata_list: list[MovieMetadata],
+        tmp_path: Path,
+    ) -> None:
+        """再取得に失敗した場合は期限切れの保存済みメタデータを出力するテスト"""
+        # Arrange
+        store.upsert_metadata(
+            [(sample_movies[0], sample_metadata_list[0])],
+            updated_at=datetime.now(UTC) - timedelta(days=60),
+        )
+        service = self._service(
+            mock_client,
+            mock_csv_reader,
+            mock_json_writer,
+            store,
+            ttl=timedelta(days=30),
+        )
+        mock_csv_reader.read.return_value = sample_movies[:1]
+
+        with patch.object(
+            service._fetcher, "fetch", side_effect=RuntimeError("API error")
+        ):
+            # Act
+            result = service.process(tmp_path / "test.csv", tmp_path / "output")
+
+        # Assert
+        assert result == {
+            "total": 1,
+            "success": 0,
+            "failed": 1,
+            "cached": 0,
+            "collapsed": 0,
+        }
+        mock_json_writer.write.assert_called_once()
+        assert mock_json_writer.write.call_args.args[0] == sample_metadata_list[:1]
+
+    def test_process_skips_when_fetched_title_differs_from_input(
+        self,
+        mock_client: MagicMock,
+        mock_csv_reader: MagicMock,
+        mock_json_writer: MagicMock,
+        store: MetadataStore,
+        sample_metadata_list: list[MovieMetadata],
+        tmp_path: Path,
+    ) -> None:
+        """取得結果のタイトル・制作国が入力と異なっても、次回は保存済みを使うテスト"""
+        # Arrange
+        movies = [
+            MovieInput(
+                title="Spirited Away", release_date="2001-07-20", country="Japan"
+            )
+        ]
+        fetched = sample_metadata_list[0].model_copy(
+            update={
+                "title": "千と千尋の神隠し",
+                "release_date": "2001-07-20",
+                "country": "日本",
+            }
+        )
+        service = self._service(
+            mock_client,
+            mock_csv_reader,
+            mock_json_writer,
+            store,
+            ttl=timedelta(days=30),
+        )
+        mock_csv_reader.read.return_value = movies
+        with patch.object(service._fetcher, "fetch", return_value=fetched):
+            service.process(tmp_path / "test.csv", tmp_path / "output")
+
+        with patch.object(service._fetcher, "fetch") as mock_fetch:
+            # Act
+            result = service.process(tmp_path / "test.csv", tmp_path / "output")
+
+        # Assert
+        mock_fetch.assert_not_called()
+        assert result["cached"] == 1
+        assert mock_json_writer.write.call_args.args[0] == [fetched]
+
+    def test_ttl_without_store_raises(
+        self,
+        mock_client: MagicMock,
+        mock_csv_reader: MagicMock,
+        mock_json_writer: MagicMock,
+    ) -> None:
+        """ストアなしでttlを指定した場合にValueErrorが発生するテスト"""
+        with pytest.raises(ValueError, match="metadata_store"):
+            MetadataService(
+                client=mock_client,
+                csv_reader=mock_csv_reader,
+                json_writer=mock_json_writer,
+                ttl=timedelta(days=1),
+            )
+
+    def test_unknown_field_ttl_raises(
+        self,
+        mock_client: MagicMock,
+        mock_csv_reader: MagicMock,
+        mock_json_writer: MagicMock,
+        store: MetadataStore,
+    ) -> None:
+        """存在しないフィールドのTTLを指定した場合にValueErrorが発生するテスト"""
+        with pytest.raises(ValueError, match="unknown_field"):
+            self._service(
+                mock_client,
+                mock_csv_reader,
+                mock_json_writer,
+                store,
+                ttl=timedelta(days=1),
+                field_ttls={"unknown_field": timedelta(days=1)},
+            )
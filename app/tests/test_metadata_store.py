@@ -0,0 +1,184 @@
+"""metadata_store.pyの単体テスト"""
+
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+
+from movie_metadata.metadata_store import MetadataStore
+from movie_metadata.models import (
+    MetadataEvaluationResult,
+    MetadataRefinementResult,
+    MovieInput,
+    MovieMetadata,
+    RefinementHistoryEntry,
+)
+
+
+@pytest.fixture
+def store(tmp_path: Path):
+    """テスト用MetadataStore"""
+    with MetadataStore(tmp_path / "store.sqlite3", batch_size=2) as store:
+        yield store
+
+
+def _keyed(
+    metadata_list: list[MovieMetadata],
+) -> list[tuple[MovieInput, MovieMetadata]]:
+    """メタデータと同じタイトル・公開日・制作国の入力を対応付ける"""
+    return [
+        (
+            MovieInput(
+                title=metadata.title,
+                release_date=metadata.release_date,
+                country=metadata.country,
+            ),
+            metadata,
+        )
+        for metadata in metadata_list
+    ]
+
+
+def _refinement_result(metadata: MovieMetadata) -> MetadataRefinementResult:
+    """テスト用のリファインメント結果を生成する"""
+    evaluation = MetadataEvaluationResult(
+        iteration=1,
+        field_scores=[],
+        overall_status="pass",
+        improvement_suggestions="",
+    )
+    return MetadataRefinementResult(
+        final_metadata=metadata,
+        history=[
+            RefinementHistoryEntry(
+                iteration=1, metadata=metadata, evaluation=evaluation
+            )
+        ],
+        success=True,
+        total_iterations=1,
+        stop_reason="passed",
+    )
+
+
+def test_upsert_and_get_metadata_with_normalized_key(
+    store: MetadataStore, sample_movie_metadata: MovieMetadata
+):
+    """正規化したキーで保存・取得できることを確認"""
+    # Act
+    count = store.upsert_metadata(_keyed([sample_movie_metadata]))
+    result = store.get_metadata("ＴＥＳＴ　movie", "2024-01-01", "japan")
+
+    # Assert
+    assert count == 1
+    assert result == sample_movie_metadata
+    assert store.get_metadata("Test Movie", "2024-01-02", "Japan") is None
+
+
+def test_upsert_overwrites_existing_row(
+    store: MetadataStore, sample_movie_metadata: MovieMetadata
+):
+    """同じキーの再保存で最新の値に更新されることを確認"""
+    # Arrange
+    updated = sample_movie_metadata.model_copy(update={"box_office": "$2M"})
+    store.upsert_metadata(
+        _keyed([sample_movie_metadata]), updated_at=datetime(2024, 1, 1, tzinfo=UTC)
+    )
+
+    # Act
+    store.upsert_metadata(
+        _keyed([updated]), updated_at=datetime(2024, 2, 1, tzinfo=UTC)
+    )
+
+    # Assert
+    assert store.find_metadata_by_title("Test Movie") == [updated]
+    assert store.get_metadata_updated_at(
+        "Test Movie", "2024-01-01", "Japan"
+    ) == datetime(2024, 2, 1, tzinfo=UTC)
+
+
+def test_upsert_metadata_keys_by_input(
+    store: MetadataStore, sample_movie_metadata: MovieMetadata
+):
+    """LLMがタイトル・制作国を変えて返しても、入力の値で取得できることを確認"""
+    # Arrange
+    movie_input = MovieInput(
+        title="Spirited Away", release_date="2001-07-20", country="Japan"
+    )
+    fetched = sample_movie_metadata.model_copy(
+        update={
+            "title": "千と千尋の神隠し",
+            "release_date": "2001-07-20",
+            "country": "日本",
+        }
+    )
+
+    # Act
+    store.upsert_metadata([(movie_input, fetched)])
+
+    # Assert
+    assert store.get_metadata("spirited away", "2001-07-20", "Japan") == fetched
+    assert store.get_metadata("千と千尋の神隠し", "2001-07-20", "日本") is None
+
+
+def test_writes_in_batches_and_lists_updated_since(
+    store: MetadataStore, sample_movie_metadata: MovieMetadata
+):
+    """batch_sizeを超える件数を書き込み、更新日時で絞り込めることを確認"""
+    # Arrange
+    old = [
+        sample_movie_metadata.model_copy(update={"title": f"Old {i}"}) for i in range(3)
+    ]
+    new = [
+        sample_movie_metadata.model_copy(update={"title": f"New {i}"}) for i in range(2)
+    ]
+    store.upsert_metadata(_keyed(old), updated_at=datetime(2024, 1, 1))
+    store.upsert_metadata(_keyed(new), updated_at=datetime(2024, 3, 1))
+
+    # Act
+    result = store.list_metadata_updated_since(datetime(2024, 2, 1, tzinfo=UTC))
+
+    # Assert
+    assert [m.title for m in result] == ["New 0", "New 1"]
+
+
+def test_upsert_and_get_refinement_result(
+    store: MetadataStore, sample_movie_metadata: MovieMetadata
+):
+    """リファインメント結果をリファイン元の入力の値で保存・取得できることを確認"""
+    # Arrange
+    refinement = _refinement_result(sample_movie_metadata)
+
+    movie_input = MovieInput(
+        title="Test Movie (2024)", release_date="2024-01-01", country="JP"
+    )
+
+    # Act
+    store.upsert_refinement_results([(movie_input, refinement)])
+    result = store.get_refinement_result("test movie (2024)", "2024-01-01", "jp")
+
+    # Assert
+    assert result == refinement
+    assert store.get_refinement_result("Test Movie", "2024-01-01", "Japan") is None
+
+
+def test_persists_across_instances(
+    tmp_path: Path, sample_movie_metadata: MovieMetadata
+):
+    """別インスタンスから保存済みのデータを読めることを確認"""
+    # Arrange
+    db_path = tmp_path / "nested" / "store.sqlite3"
+    with MetadataStore(db_path) as store:
+        store.upsert_metadata(_keyed([sample_movie_metadata]))
+
+    # Act
+    with MetadataStore(db_path) as store:
+        result = store.get_metadata("Test Movie", "2024-01-01", "Japan")
+
+    # Assert
+    assert result == sample_movie_metadata
+
+
+def test_invalid_batch_size_raises(tmp_path: Path):
+    """batch_sizeが1未満の場合にValueErrorが発生することを確認"""
+    with pytest.raises(ValueError, match="batch_size"):
+        MetadataStore(tmp_path / "store.sqlite3", batch_size=0)
@@ -0,0 +1,24 @@
+"""normalization.pyの単体テスト"""
+
+import pytest
+
+from movie_metadata.normalization import normalize_text
+
+
+@pytest.mark.parametrize(
+    "value",
+    ["Spirited Away", "spirited away ", "ＳＰＩＲＩＴＥＤ　ＡＷＡＹ", "Spirited-Away!"],
+)
+def test_normalize_text_absorbs_variants(value: str):
+    """表記ゆれが同じキーに正規化されることを確認"""
+    assert normalize_text(value) == "spiritedaway"
+
+
+def test_normalize_text_keeps_japanese():
+    """日本語の文字は保持し、記号のみ除去することを確認"""
+    assert normalize_text("千と千尋の神隠し！") == "千と千尋の神隠し"
+
+
+def test_normalize_text_symbol_only_title():
+    """記号のみのタイトルは空文字にしないことを確認"""
+    assert normalize_text(" ?! ") == "?!"
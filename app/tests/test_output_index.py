@@ -0,0 +1,211 @@
+"""output_index.pyの単体テスト"""
+
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from movie_metadata.blob_store import MetadataBlobStore
+from movie_metadata.json_writer import JSONWriter
+from movie_metadata.models import (
+    BatchRefinementSummary,
+    MetadataEvaluationResult,
+    MetadataRefinementResult,
+    MovieMetadata,
+    OutputIndexEntry,
+    RefinementHistoryEntry,
+)
+from movie_metadata.output_index import INDEX_FILENAME, OutputIndex
+from movie_metadata.refinement_writer import RefinementResultWriter
+
+
+@pytest.fixture
+def index(tmp_path: Path) -> OutputIndex:
+    """出力ディレクトリのインデックス"""
+    return OutputIndex(tmp_path / INDEX_FILENAME)
+
+
+@pytest.fixture
+def movies(sample_movie_metadata: MovieMetadata) -> list[MovieMetadata]:
+    """タイトルの異なる2件のメタデータ"""
+    spirited_away = sample_movie_metadata.model_copy(
+        update={
+            "title": "Spirited Away",
+            "japanese_titles": ["千と千尋の神隠し"],
+            "release_date": "2001-07-20",
+        }
+    )
+    return [sample_movie_metadata, spirited_away]
+
+
+def _refinement_result(metadata: MovieMetadata) -> MetadataRefinementResult:
+    """1イテレーションのリファインメント結果を生成する"""
+    evaluation = MetadataEvaluationResult(
+        iteration=1, field_scores=[], overall_status="pass", improvement_suggestions=""
+    )
+    return MetadataRefinementResult(
+        final_metadata=metadata,
+        history=[
+            RefinementHistoryEntry(
+                iteration=1, metadata=metadata, evaluation=evaluation
+            )
+        ],
+        success=True,
+        total_iterations=1,
+    )
+
+
+def test_json_writer_indexes_each_record(
+    tmp_path: Path, index: OutputIndex, movies: list[MovieMetadata]
+):
+    """JSONWriterの出力がタイトル・日本語タイトルで検索できることを確認"""
+    JSONWriter(output_index=index).write(movies, tmp_path / "movies.json")
+
+    entries = index.find("spirited  away")
+
+    assert len(entries) == 1
+    assert entries[0].file == "movies.json"
+    assert entries[0].position == 1
+    assert entries[0].offset is not None
+    assert index.lookup("千と千尋の神隠し") == movies[1]
+    assert index.lookup("テスト映画") == movies[0]
+
+
+def test_lookup_reads_only_the_indexed_span(
+    tmp_path: Path, index: OutputIndex, movies: list[MovieMetadata]
+):
+    """検索時はファイル全体ではなくインデックスのバイト範囲のみを読むことを確認"""
+    output_path = tmp_path / "movies.json"
+    JSONWriter(output_index=index).write(movies, output_path)
+    entry = index.find("Spirited Away")[0]
+    # 対象レコード以外を壊しても読み込めること
+    data = bytearray(output_path.read_bytes())
+    data[: entry.offset] = b"x" * entry.offset
+    output_path.write_bytes(bytes(data))
+
+    assert index.lookup("Spirited Away") == movies[1]
+
+
+def test_compressed_output_is_indexed_by_position(
+    tmp_path: Path, index: OutputIndex, movies: list[MovieMetadata]
+):
+    """圧縮ファイルはバイト位置なしで登録され、配列の位置から読み込めることを確認"""
+    JSONWriter(compression="gzip", output_index=index).write(
+        movies, tmp_path / "movies.json"
+    )
+
+    entry = index.find("Spirited Away")[0]
+
+    assert entry.file == "movies.json.gz"
+    assert entry.offset is None
+    assert index.lookup("Spirited Away") == movies[1]
+
+
+def test_lookup_filters_and_prefers_newest(
+    tmp_path: Path, index: OutputIndex, movies: list[MovieMetadata]
+):
+    """公開日で絞り込め、同じタイトルは最新の出力が返されることを確認"""
+    old = movies[1]
+    new = old.model_copy(update={"box_office": "$395M"})
+    now = datetime.now(UTC)
+    JSONWriter(output_index=index).write([old], tmp_path / "old.json")
+    JSONWriter(output_index=index).write([new], tmp_path / "new.json")
+
+    assert index.lookup("Spirited Away") == new
+    assert index.lookup("Spirited Away", release_date="1999-01-01") is None
+    assert index.find("Spirited Away")[0].written_at >= now - timedelta(seconds=1)
+
+
+def test_lookup_skips_deleted_files(
+    tmp_path: Path, index: OutputIndex, movies: list[MovieMetadata]
+):
+    """出力ファイルが削除されている場合は次に新しいエントリを使うことを確認"""
+    JSONWriter(output_index=index).write(movies, tmp_path / "old.json")
+    newer = movies[1].model_copy(update={"box_office": "$395M"})
+    JSONWriter(output_index=index).write([newer], tmp_path / "new.json")
+    (tmp_path / "new.json").unlink()
+
+    assert index.lookup("Spirited Away") == movies[1]
+
+
+def test_index_picks_up_entries_added_by_other_writers(
+    tmp_path: Path, movies: list[MovieMetadata]
+):
+    """別のインスタンスが追記したエントリも検索できることを確認"""
+    reader = OutputIndex(tmp_path / INDEX_FILENAME)
+    assert reader.lookup("Spirited Away") is None
+
+    writer_index = OutputIndex(tmp_path / INDEX_FILENAME)
+    JSONWriter(output_index=writer_index).write(movies, tmp_path / "movies.json")
+
+    assert reader.lookup("Spirited Away") == movies[1]
+
+
+def test_refresh_parses_only_appended_lines(
+    mocker, tmp_path: Path, index: OutputIndex, movies: list[MovieMetadata]
+):
+    """2回目以降の検索では前回以降に追記された行のみをパースすることを確認"""
+    JSONWriter(output_index=index).write(movies[:1], tmp_path / "first.json")
+    assert index.lookup("Test Movie") == movies[0]
+    spy = mocker.spy(OutputIndexEntry, "model_validate_json")
+
+    JSONWriter(output_index=index).write(movies[1:], tmp_path / "second.json")
+    result = index.lookup("Spirited Away")
+
+    assert result == movies[1]
+    # Spirited Awayはタイトルと日本語タイトルの2エントリ
+    assert spy.call_count == 2
+
+
+def test_refresh_reloads_recreated_index(
+    tmp_path: Path, index: OutputIndex, movies: list[MovieMetadata]
+):
+    """インデックスが作り直された場合は最初から読み込み直すことを確認"""
+    JSONWriter(output_index=index).write(movies, tmp_path / "movies.json")
+    assert index.lookup("Spirited Away") == movies[1]
+
+    index.path.unlink()
+    JSONWriter(output_index=index).write(movies[:1], tmp_path / "movies.json")
+
+    assert index.lookup("Spirited Away") is None
+    assert index.lookup("Test Movie") == movies[0]
+
+
+@pytest.mark.parametrize("compact_history", [False, True])
+def test_refinement_batch_from_journal_is_indexed(
+    tmp_path: Path,
+    index: OutputIndex,
+    movies: list[MovieMetadata],
+    compact_history: bool,
+):
+    """ジャーナルから出力したバッチ結果の各結果をバイト位置で検索できることを確認"""
+    writer = RefinementResultWriter(compact_history=compact_history, output_index=index)
+    with writer.open_journal(tmp_path / "journal") as journal:
+        for metadata in movies:
+            journal.append(_refinement_result(metadata))
+    summary = BatchRefinementSummary(
+        total_count=2, success_count=2, error_count=0, errors=[], processing_time=1.0
+    )
+
+    writer.write_batch_from_journal(journal.path, summary, tmp_path)
+
+    entry = index.find("千と千尋の神隠し")[0]
+    assert entry.kind == "refinement"
+    assert entry.file.startswith("batch_refinement_result_")
+    assert entry.offset is not None
+    assert index.lookup("Spirited Away") == movies[1]
+    assert index.lookup("Test Movie") == movies[0]
+
+
+def test_refinement_write_with_blob_store_is_indexed(
+    tmp_path: Path, index: OutputIndex, movies: list[MovieMetadata]
+):
+    """ハッシュ参照形式の個別結果もストアを渡して検索できることを確認"""
+    store = MetadataBlobStore(tmp_path / "blobs")
+    writer = RefinementResultWriter(blob_store=store, output_index=index)
+
+    writer.write(_refinement_result(movies[1]), tmp_path)
+
+    assert index.lookup("Spirited Away", blob_store=store) == movies[1]
+    with pytest.raises(ValueError, match="MetadataBlobStore"):
+        index.lookup("Spirited Away")
@@ -0,0 +1,101 @@
+"""parquet_exporter.pyの単体テスト"""
+
+import builtins
+from pathlib import Path
+
+import pytest
+
+from movie_metadata.models import (
+    MetadataEvaluationResult,
+    MetadataFieldScore,
+    MetadataRefinementResult,
+    MovieMetadata,
+    RefinementHistoryEntry,
+)
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+from movie_metadata.parquet_exporter import ParquetExporter  # noqa: E402
+
+
+@pytest.fixture
+def refinement_result(sample_movie_metadata: MovieMetadata) -> MetadataRefinementResult:
+    """2イテレーションのリファインメント結果"""
+    history = [
+        RefinementHistoryEntry(
+            iteration=i,
+            metadata=sample_movie_metadata,
+            evaluation=MetadataEvaluationResult(
+                iteration=i,
+                field_scores=[
+                    MetadataFieldScore(
+                        field_name="cast", score=score, reasoning="理由"
+                    ),
+                    MetadataFieldScore(field_name="music", score=4.5, reasoning="理由"),
+                ],
+                overall_status=status,
+                improvement_suggestions="",
+            ),
+        )
+        for i, score, status in [(1, 3.0, "fail"), (2, 4.5, "pass")]
+    ]
+    return MetadataRefinementResult(
+        final_metadata=sample_movie_metadata,
+        history=history,
+        success=True,
+        total_iterations=2,
+    )
+
+
+def test_write_metadata_uses_list_columns(
+    tmp_path: Path, sample_movie_metadata: MovieMetadata
+):
+    """リスト型のフィールドがリスト列として出力されることを確認"""
+    # Arrange
+    output_path = tmp_path / "out" / "metadata.parquet"
+
+    # Act
+    rows = ParquetExporter().write_metadata([sample_movie_metadata], output_path)
+
+    # Assert
+    table = pq.read_table(output_path)
+    assert rows == 1
+    cast_type = table.schema.field("cast").type
+    assert cast_type.value_type == "string"
+    assert table.to_pylist() == [sample_movie_metadata.model_dump()]
+
+
+def test_write_field_scores_one_row_per_iteration_and_field(
+    tmp_path: Path, refinement_result: MetadataRefinementResult
+):
+    """イテレーション×フィールドごとに1行出力されることを確認"""
+    # Arrange
+    output_path = tmp_path / "field_scores.parquet"
+
+    # Act
+    rows = ParquetExporter().write_field_scores([refinement_result], output_path)
+
+    # Assert
+    table = pq.read_table(output_path)
+    assert rows == 4
+    assert table.column("iteration").to_pylist() == [1, 1, 2, 2]
+    assert table.column("score").to_pylist() == [3.0, 4.5, 4.5, 4.5]
+    column_meta = pq.ParquetFile(output_path).metadata.row_group(0).column(4)
+    assert "RLE_DICTIONARY" in str(column_meta.encodings)
+
+
+def test_missing_pyarrow_raises_import_error(monkeypatch: pytest.MonkeyPatch):
+    """pyarrowがない場合に導入方法を示すImportErrorが発生することを確認"""
+    # Arrange
+    original_import = builtins.__import__
+
+    def fake_import(name: str, *args, **kwargs):
+        if name.startswith("pyarrow"):
+            raise ImportError(name)
+        return original_import(name, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "__import__", fake_import)
+
+    # Act & Assert
+    with pytest.raises(ImportError, match="analytics"):
+        ParquetExporter()
@@ -0,0 +1,186 @@
+"""pre_evaluator.pyの単体テスト"""
+
+import pytest
+
+from movie_metadata.models import MetadataFieldScore, MovieMetadata
+from movie_metadata.pre_evaluator import EVALUATED_FIELDS, RuleBasedPreEvaluator
+
+
+@pytest.fixture
+def default_metadata() -> MovieMetadata:
+    """取得失敗時のデフォルト値と同じ内容のMovieMetadataフィクスチャ"""
+    return MovieMetadata(
+        title="Unknown Movie",
+        japanese_titles=["情報なし"],
+        original_work="情報なし",
+        original_authors=["情報なし"],
+        release_date="2024-01-01",
+        country="Japan",
+        distributor="情報なし",
+        production_companies=["情報なし"],
+        box_office="情報なし",
+        cast=["情報なし"],
+        screenwriters=["情報なし"],
+        music=["情報なし"],
+        voice_actors=["情報なし"],
+    )
+
+
+def test_evaluate_valid_metadata_returns_no_scores(
+    sample_movie_metadata: MovieMetadata,
+):
+    """正常なメタデータでは何も検出しないことを確認"""
+    scores = RuleBasedPreEvaluator().evaluate(sample_movie_metadata)
+
+    assert scores == []
+
+
+def test_evaluate_default_metadata_is_decisive(
+    default_metadata: MovieMetadata,
+):
+    """取得失敗時のデフォルト値は声優以外の全フィールドが0.0で確定することを確認"""
+    pre_evaluator = RuleBasedPreEvaluator()
+
+    scores = pre_evaluator.evaluate(default_metadata)
+
+    assert {score.field_name for score in scores} == set(EVALUATED_FIELDS) - {
+        "voice_actors"
+    }
+    assert all(score.score == 0.0 for score in scores)
+    assert pre_evaluator.is_decisive(scores) is True
+
+
+def test_evaluate_partial_violation_is_not_decisive(
+    sample_movie_metadata: MovieMetadata,
+):
+    """違反が一部のフィールドだけの場合はLLM評価が必要と判定することを確認"""
+    metadata = sample_movie_metadata.model_copy(
+        update={"distributor": "情報なし", "cast": []}
+    )
+    pre_evaluator = RuleBasedPreEvaluator()
+
+    scores = pre_evaluator.evaluate(metadata)
+
+    assert [score.field_name for score in scores] == ["distributor", "cast"]
+    assert pre_evaluator.is_decisive(scores) is False
+
+
+def test_evaluate_allows_empty_list_for_optional_fields(
+    sample_movie_metadata: MovieMetadata,
+):
+    """声優とオリジナル作品の原作者は空リストを許容することを確認"""
+    metadata = sample_movie_metadata.model_copy(
+        update={"voice_actors": [], "original_authors": []}
+    )
+
+    scores = RuleBasedPreEvaluator().evaluate(metadata)
+
+    assert scores == []
+
+
+def test_evaluate_empty_authors_with_original_work(
+    sample_movie_metadata: MovieMetadata,
+):
+    """原作がオリジナルでない場合、空の原作者リストを検出することを確認"""
+    metadata = sample_movie_metadata.model_copy(
+        update={"original_work": "千と千尋の神隠し（小説）", "original_authors": []}
+    )
+
+    scores = RuleBasedPreEvaluator().evaluate(metadata)
+
+    assert [score.field_name for score in scores] == ["original_authors"]
+
+
+@pytest.mark.parametrize("placeholder", [[], ["情報なし"]])
+def test_evaluate_live_action_film_allows_no_voice_actors(
+    sample_movie_metadata: MovieMetadata, placeholder: list[str]
+):
+    """実写作品の声優（空リスト・['情報なし']）を欠損と判定しないことを確認"""
+    # Arrange
+    metadata = sample_movie_metadata.model_copy(
+        update={
+            "original_work": "オリジナル",
+            "original_authors": placeholder,
+            "voice_actors": placeholder,
+        }
+    )
+    llm_scores = [
+        MetadataFieldScore(field_name=field_name, score=4.5, reasoning="LLM")
+        for field_name in EVALUATED_FIELDS
+    ]
+    pre_evaluator = RuleBasedPreEvaluator()
+
+    # Act
+    scores = pre_evaluator.evaluate(metadata)
+    merged = pre_evaluator.merge(llm_scores, scores)
+
+    # Assert
+    assert scores == []
+    assert all(score.score == 4.5 for score in merged)
+
+
+def test_evaluate_placeholder_authors_without_original_work(
+    sample_movie_metadata: MovieMetadata,
+):
+    """原作がオリジナルでない場合、['情報なし']のみの原作者を検出することを確認"""
+    metadata = sample_movie_metadata.model_copy(
+        update={"original_work": "小説", "original_authors": ["情報なし"]}
+    )
+
+    scores = RuleBasedPreEvaluator().evaluate(metadata)
+
+    assert [score.field_name for score in scores] == ["original_authors"]
+
+
+@pytest.mark.parametrize("box_office", ["不明", "N/A", "unknown", "-"])
+def test_evaluate_placeholder_box_office(
+    sample_movie_metadata: MovieMetadata, box_office: str
+):
+    """プレースホルダーの興行収入を検出することを確認"""
+    metadata = sample_movie_metadata.model_copy(update={"box_office": box_office})
+
+    scores = RuleBasedPreEvaluator().evaluate(metadata)
+
+    assert [score.field_name for score in scores] == ["box_office"]
+    assert scores[0].score == 0.0
+
+
+@pytest.mark.parametrize("box_office", ["約十億円", "大ヒット"])
+def test_evaluate_leaves_non_placeholder_box_office_to_llm(
+    sample_movie_metadata: MovieMetadata, box_office: str
+):
+    """算用数字を含まない興行収入でもプレースホルダー以外は判定しないことを確認"""
+    metadata = sample_movie_metadata.model_copy(update={"box_office": box_office})
+
+    scores = RuleBasedPreEvaluator().evaluate(metadata)
+
+    assert scores == []
+
+
+def test_evaluate_does_not_judge_release_date(sample_movie_metadata: MovieMetadata):
+    """入力由来の公開日は評価対象外のため判定しないことを確認"""
+    metadata = sample_movie_metadata.model_copy(update={"release_date": "2024/01/01"})
+
+    scores = RuleBasedPreEvaluator().evaluate(metadata)
+
+    assert scores == []
+
+
+def test_merge_prefers_rule_based_scores():
+    """LLMのスコアをルールベースのスコアで上書きし、不足分を追加することを確認"""
+    llm_scores = [
+        MetadataFieldScore(field_name="cast", score=3.0, reasoning="LLM"),
+        MetadataFieldScore(field_name="music", score=4.5, reasoning="LLM"),
+    ]
+    rule_scores = [
+        MetadataFieldScore(field_name="cast", score=0.0, reasoning="rule"),
+        MetadataFieldScore(field_name="box_office", score=0.0, reasoning="rule"),
+    ]
+
+    merged = RuleBasedPreEvaluator.merge(llm_scores, rule_scores)
+
+    assert [(s.field_name, s.reasoning) for s in merged] == [
+        ("cast", "rule"),
+        ("music", "LLM"),
+        ("box_office", "rule"),
+    ]
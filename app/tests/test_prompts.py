@@ -8,6 +8,7 @@ from movie_metadata.models import (
 )
 from movie_metadata.prompts import (
     build_improvement_proposal_prompt,
+    build_metadata_batch_evaluation_prompt,
     build_metadata_evaluation_prompt,
     build_metadata_fetch_prompt,
 )
@@ -306,6 +307,28 @@ class TestBuildImprovementProposalPrompt:
         assert "情報なし" in prompt
 
 
+class TestBuildMetadataBatchEvaluationPrompt:
+    """build_metadata_batch_evaluation_prompt関数のテスト"""
+
+    def test_build_prompt_contains_all_movies_and_rubric_once(
+        self, sample_movie_metadata
+    ):
+        """全作品のメタデータを含み、評価基準は1回だけ含まれることを確認"""
+        second = sample_movie_metadata.model_copy(
+            update={"title": "Second Movie", "cast": ["俳優Z"]}
+        )
+
+        prompt = build_metadata_batch_evaluation_prompt([sample_movie_metadata, second])
+
+        assert "評価対象の映画（2件）" in prompt
+        assert "## 映画 1/2" in prompt
+        assert "## 映画 2/2" in prompt
+        assert "**タイトル**: Test Movie" in prompt
+        assert "**タイトル**: Second Movie" in prompt
+        assert "  - 俳優Z" in prompt
+        assert prompt.count("## 評価基準") == 1
+
+
 class TestBuildMetadataFetchPrompt:
     """build_metadata_fetch_prompt関数のテスト"""
 
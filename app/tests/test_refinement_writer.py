@@ -7,8 +7,10 @@ from unittest.mock import mock_open, patch
 
 import pytest
 
+from movie_metadata.history_codec import iter_journal
 from movie_metadata.models import (
     BatchRefinementResult,
+    BatchRefinementSummary,
     MetadataEvaluationResult,
     MetadataFieldScore,
     MetadataRefinementResult,
@@ -269,3 +271,87 @@ class TestRefinementResultWriter:
         json_files = list(output_dir.glob("*.json"))
         assert len(json_files) == 1
         assert json_files[0].name == "batch_refinement_result_20260207_143025.json"
+
+
+class TestRefinementResultJournal:
+    """ジャーナル出力とジャーナルからのバッチ出力のテスト"""
+
+    @pytest.fixture
+    def summary(self) -> BatchRefinementSummary:
+        """テスト用BatchRefinementSummaryフィクスチャ"""
+        return BatchRefinementSummary(
+            total_count=2,
+            success_count=1,
+            error_count=1,
+            errors=[{"title": "Unknown", "message": "not found"}],
+            processing_time=12.5,
+        )
+
+    def test_journal_appends_one_line_per_result(
+        self, tmp_path: Path, sample_refinement_result: MetadataRefinementResult
+    ) -> None:
+        """結果ごとに1行追記され、iter_journal()で読み込めることをテスト"""
+        writer = RefinementResultWriter()
+
+        with writer.open_journal(tmp_path) as journal:
+            journal.append(sample_refinement_result)
+            journal.append(sample_refinement_result)
+
+        assert journal.path.name.startswith("refinement_results_")
+        assert journal.path.name.endswith(".jsonl")
+        lines = journal.path.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 2
+        restored = [result.to_model() for result in iter_journal(journal.path)]
+        assert restored == [sample_refinement_result, sample_refinement_result]
+
+    def test_journal_with_compact_history_round_trips(
+        self, tmp_path: Path, sample_refinement_result: MetadataRefinementResult
+    ) -> None:
+        """差分エンコーディングしたジャーナルも元の結果に復元できることをテスト"""
+        writer = RefinementResultWriter(compact_history=True)
+
+        with writer.open_journal(tmp_path) as journal:
+            journal.append(sample_refinement_result)
+
+        restored = [result.to_model() for result in iter_journal(journal.path)]
+        assert restored == [sample_refinement_result]
+
+    @pytest.mark.parametrize("compact_history", [False, True])
+    def test_write_batch_from_journal_matches_write_batch(
+        self,
+        tmp_path: Path,
+        sample_refinement_result: MetadataRefinementResult,
+        summary: BatchRefinementSummary,
+        compact_history: bool,
+    ) -> None:
+        """ジャーナルからの出力がwrite_batch()と同じ内容になることをテスト"""
+        writer = RefinementResultWriter(compact_history=compact_history)
+        batch_result = BatchRefinementResult(
+            results=[sample_refinement_result, sample_refinement_result],
+            **summary.model_dump(),
+        )
+        with writer.open_journal(tmp_path / "journal") as journal:
+            for result in batch_result.results:
+                journal.append(result)
+
+        writer.write_batch(batch_result, tmp_path / "expected")
+        writer.write_batch_from_journal(journal.path, summary, tmp_path / "actual")
+
+        expected = next((tmp_path / "expected").glob("*.json")).read_bytes()
+        actual = next((tmp_path / "actual").glob("*.json")).read_bytes()
+        assert json.loads(actual) == json.loads(expected)
+
+    def test_write_batch_from_empty_journal(
+        self, tmp_path: Path, summary: BatchRefinementSummary
+    ) -> None:
+        """結果が0件のジャーナルでも有効なJSONを出力することをテスト"""
+        writer = RefinementResultWriter()
+        with writer.open_journal(tmp_path / "journal") as journal:
+            pass
+
+        writer.write_batch_from_journal(journal.path, summary, tmp_path / "output")
+
+        output_file = next((tmp_path / "output").glob("*.json"))
+        data = json.loads(output_file.read_text(encoding="utf-8"))
+        assert data["results"] == []
+        assert data["total_count"] == 2
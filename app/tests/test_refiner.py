@@ -1,11 +1,13 @@
 """refinement_loopモジュールのテスト"""
 
+import threading
 from unittest.mock import MagicMock
 
 import pytest
 from google.genai.errors import APIError, ClientError, ServerError
 
 from movie_metadata.models import (
+    FetchVariant,
     MetadataEvaluationResult,
     MetadataFieldScore,
     MovieInput,
@@ -136,7 +138,7 @@ def test_refine_success_first_iteration(
     mock_fetcher.fetch_with_improvement.assert_not_called()
 
     # evaluateが1回だけ呼ばれたことを確認
-    mock_evaluator.evaluate.assert_called_once_with(sample_movie_metadata, 1)
+    mock_evaluator.evaluate.assert_called_once_with(sample_movie_metadata, 1, 3.5)
 
     # proposeは呼ばれないことを確認（初回で成功したため）
     mock_proposer.propose.assert_not_called()
@@ -167,7 +169,10 @@ def test_refine_success_second_iteration(
     mock_fetcher_class = mocker.patch("movie_metadata.refiner.MovieMetadataFetcher")
     mock_fetcher = MagicMock()
     mock_fetcher.fetch.return_value = sample_movie_metadata
-    mock_fetcher.fetch_with_improvement.return_value = sample_movie_metadata
+    improved_metadata = sample_movie_metadata.model_copy(
+        update={"cast": ["俳優A", "俳優E"]}
+    )
+    mock_fetcher.fetch_with_improvement.return_value = improved_metadata
     mock_fetcher_class.return_value = mock_fetcher
 
     # MetadataEvaluatorをモック化
@@ -195,7 +200,8 @@ def test_refine_success_second_iteration(
     # 検証
     assert result.success is True
     assert result.total_iterations == 2
-    assert result.final_metadata == sample_movie_metadata
+    assert result.final_metadata == improved_metadata
+    assert result.stop_reason == "passed"
     assert len(result.history) == 2
 
     # fetchが1回、fetch_with_improvementが1回呼ばれたことを確認
@@ -223,7 +229,13 @@ def test_refine_failure_max_iterations(
     mock_fetcher_class = mocker.patch("movie_metadata.refiner.MovieMetadataFetcher")
     mock_fetcher = MagicMock()
     mock_fetcher.fetch.return_value = sample_movie_metadata
-    mock_fetcher.fetch_with_improvement.return_value = sample_movie_metadata
+    final_metadata = sample_movie_metadata.model_copy(
+        update={"cast": ["俳優A", "俳優E", "俳優F"]}
+    )
+    mock_fetcher.fetch_with_improvement.side_effect = [
+        sample_movie_metadata.model_copy(update={"cast": ["俳優A", "俳優E"]}),
+        final_metadata,
+    ]
     mock_fetcher_class.return_value = mock_fetcher
 
     # MetadataEvaluatorをモック化（すべてfailを返す）
@@ -279,7 +291,8 @@ def test_refine_failure_max_iterations(
     # 検証
     assert result.success is False
     assert result.total_iterations == 3
-    assert result.final_metadata == sample_movie_metadata
+    assert result.final_metadata == final_metadata
+    assert result.stop_reason == "max_iterations"
     assert len(result.history) == 3
 
     # fetchが1回、fetch_with_improvementが2回呼ばれたことを確認
@@ -511,3 +524,268 @@ def test_refine_uses_default_threshold_when_none(
     assert result.success is True
     # AppConfigから読み込まれた閾値が使用される
     assert refiner.default_threshold == 0.5
+
+
+def _patch_refiner_dependencies(mocker, fetcher: MagicMock, evaluator: MagicMock):
+    """収束テスト用にGenAIClient・フェッチャー・評価器・提案器をモック化する"""
+    mock_genai_client_class = mocker.patch("movie_metadata.refiner.GenAIClient")
+    mock_genai_client_class.return_value.__enter__.return_value = MagicMock()
+    mock_genai_client_class.return_value.__exit__.return_value = None
+    mocker.patch("movie_metadata.refiner.MovieMetadataFetcher", return_value=fetcher)
+    mocker.patch("movie_metadata.refiner.MetadataEvaluator", return_value=evaluator)
+    mock_proposer = MagicMock()
+    mocker.patch(
+        "movie_metadata.refiner.ImprovementProposer", return_value=mock_proposer
+    )
+    mocker.patch("movie_metadata.refiner.time.sleep")
+    return mock_proposer
+
+
+def test_refine_stops_when_metadata_unchanged(
+    mocker, sample_movie_input, sample_movie_metadata, failing_evaluation
+):
+    """前回と同一のメタデータが返された場合、評価を省略して早期終了するテスト"""
+    mock_fetcher = MagicMock()
+    mock_fetcher.fetch.return_value = sample_movie_metadata
+    mock_fetcher.fetch_with_improvement.return_value = (
+        sample_movie_metadata.model_copy()
+    )
+    mock_evaluator = MagicMock()
+    mock_evaluator.evaluate.return_value = failing_evaluation
+    _patch_refiner_dependencies(mocker, mock_fetcher, mock_evaluator)
+
+    refiner = MetadataRefiner(api_key="test_api_key", rate_limit_sleep=0.0)
+    result = refiner.refine(sample_movie_input, max_iterations=3, threshold=3.5)
+
+    assert result.success is False
+    assert result.stop_reason == "unchanged_metadata"
+    assert result.total_iterations == 2
+    assert result.history[1].evaluation.iteration == 2
+    assert result.history[1].evaluation.field_scores == failing_evaluation.field_scores
+    # 同一メタデータの再評価は行わない
+    assert mock_evaluator.evaluate.call_count == 1
+
+
+def test_refine_stops_when_same_fields_fail_with_same_values(
+    mocker, sample_movie_input, sample_movie_metadata
+):
+    """同じフィールドが同じ値のまま不合格の場合、早期終了するテスト"""
+    mock_fetcher = MagicMock()
+    mock_fetcher.fetch.return_value = sample_movie_metadata
+    mock_fetcher.fetch_with_improvement.return_value = sample_movie_metadata.model_copy(
+        update={"music": ["作曲家E"]}
+    )
+    mock_evaluator = MagicMock()
+    mock_evaluator.evaluate.side_effect = [
+        MetadataEvaluationResult(
+            iteration=iteration,
+            field_scores=[
+                MetadataFieldScore(field_name="cast", score=2.0, reasoning="不足"),
+                MetadataFieldScore(field_name="music", score=score, reasoning="-"),
+            ],
+            overall_status="fail",
+            improvement_suggestions="キャスト情報を補完してください",
+        )
+        for iteration, score in [(1, 4.0), (2, 4.5)]
+    ]
+    mock_proposer = _patch_refiner_dependencies(mocker, mock_fetcher, mock_evaluator)
+
+    refiner = MetadataRefiner(api_key="test_api_key", rate_limit_sleep=0.0)
+    result = refiner.refine(sample_movie_input, max_iterations=3, threshold=3.5)
+
+    assert result.stop_reason == "same_failures"
+    assert result.total_iterations == 2
+    assert mock_proposer.propose.call_count == 1
+
+
+def test_refine_stops_on_score_plateau(
+    mocker, sample_movie_input, sample_movie_metadata
+):
+    """平均スコアの変化がイプシロン未満の場合、早期終了するテスト"""
+    mock_fetcher = MagicMock()
+    mock_fetcher.fetch.return_value = sample_movie_metadata
+    mock_fetcher.fetch_with_improvement.return_value = sample_movie_metadata.model_copy(
+        update={"cast": ["俳優E"]}
+    )
+    mock_evaluator = MagicMock()
+    mock_evaluator.evaluate.side_effect = [
+        MetadataEvaluationResult(
+            iteration=iteration,
+            field_scores=[
+                MetadataFieldScore(field_name="cast", score=score, reasoning="-"),
+            ],
+            overall_status="fail",
+            improvement_suggestions="キャスト情報を補完してください",
+        )
+        for iteration, score in [(1, 3.0), (2, 3.05)]
+    ]
+    _patch_refiner_dependencies(mocker, mock_fetcher, mock_evaluator)
+
+    refiner = MetadataRefiner(
+        api_key="test_api_key", rate_limit_sleep=0.0, score_epsilon=0.1
+    )
+    result = refiner.refine(sample_movie_input, max_iterations=3, threshold=3.5)
+
+    assert result.stop_reason == "score_plateau"
+    assert result.total_iterations == 2
+
+
+def _speculative_evaluation(cast_score: float, music_score: float):
+    """並列候補テスト用の評価結果を生成する"""
+    return MetadataEvaluationResult(
+        iteration=1,
+        field_scores=[
+            MetadataFieldScore(field_name="cast", score=cast_score, reasoning="-"),
+            MetadataFieldScore(field_name="music", score=music_score, reasoning="-"),
+        ],
+        overall_status="pass" if min(cast_score, music_score) >= 3.5 else "fail",
+        improvement_suggestions="改善してください",
+    )
+
+
+@pytest.fixture
+def speculative_candidates(sample_movie_metadata):
+    """温度ごとに異なるメタデータと評価を返す候補の組"""
+    cast_metadata = sample_movie_metadata.model_copy(update={"cast": ["俳優E"]})
+    music_metadata = sample_movie_metadata.model_copy(update={"music": ["作曲家F"]})
+    return {
+        0.4: (cast_metadata, _speculative_evaluation(4.5, 2.0)),
+        1.0: (music_metadata, _speculative_evaluation(2.5, 4.0)),
+    }
+
+
+def test_refine_speculative_merges_field_winners(
+    mocker, sample_movie_input, speculative_candidates
+):
+    """並列候補のフィールドごとの最高スコアを統合するテスト"""
+    mock_fetcher = MagicMock()
+    mock_fetcher.fetch.side_effect = lambda _movie, temperature: speculative_candidates[
+        temperature
+    ][0]
+    evaluations = {
+        metadata.model_dump_json(): evaluation
+        for metadata, evaluation in speculative_candidates.values()
+    }
+    mock_evaluator = MagicMock()
+    mock_evaluator.evaluate.side_effect = lambda metadata, _iteration, _threshold: (
+        evaluations[metadata.model_dump_json()]
+    )
+    _patch_refiner_dependencies(mocker, mock_fetcher, mock_evaluator)
+
+    refiner = MetadataRefiner(api_key="test_api_key", rate_limit_sleep=0.0)
+    result = refiner.refine_speculative(
+        sample_movie_input,
+        variants=[FetchVariant(temperature=0.4), FetchVariant(temperature=1.0)],
+        threshold=3.5,
+    )
+
+    assert result.success is True
+    assert result.stop_reason == "passed"
+    assert result.total_iterations == 1
+    assert result.final_metadata.cast == ["俳優E"]
+    assert result.final_metadata.music == ["作曲家F"]
+    scores = {s.field_name: s.score for s in result.history[0].evaluation.field_scores}
+    assert scores == {"cast": 4.5, "music": 4.0}
+    assert mock_fetcher.fetch.call_count == 2
+
+
+def test_refine_speculative_picks_best_candidate_without_merge(
+    mocker, sample_movie_input, speculative_candidates
+):
+    """merge_fields=Falseの場合、平均スコアが最も高い候補を採用するテスト"""
+    mock_fetcher = MagicMock()
+    mock_fetcher.fetch.side_effect = lambda _movie, temperature: speculative_candidates[
+        temperature
+    ][0]
+    evaluations = {
+        metadata.model_dump_json(): evaluation
+        for metadata, evaluation in speculative_candidates.values()
+    }
+    mock_evaluator = MagicMock()
+    mock_evaluator.evaluate.side_effect = lambda metadata, _iteration, _threshold: (
+        evaluations[metadata.model_dump_json()]
+    )
+    _patch_refiner_dependencies(mocker, mock_fetcher, mock_evaluator)
+
+    refiner = MetadataRefiner(api_key="test_api_key", rate_limit_sleep=0.0)
+    result = refiner.refine_speculative(
+        sample_movie_input,
+        variants=[FetchVariant(temperature=0.4), FetchVariant(temperature=1.0)],
+        threshold=3.5,
+        merge_fields=False,
+    )
+
+    assert result.success is False
+    assert result.stop_reason == "no_passing_candidate"
+    assert result.total_iterations == 1
+    assert result.final_metadata == speculative_candidates[0.4][0]
+
+
+def test_refine_speculative_breaks_ties_by_variant_order(
+    mocker, sample_movie_input, sample_movie_metadata
+):
+    """同点のフィールドは完了順ではなくバリエーションの順序で先の候補を採用するテスト"""
+    first = sample_movie_metadata.model_copy(update={"cast": ["俳優E"]})
+    second = sample_movie_metadata.model_copy(update={"cast": ["俳優F"]})
+    slow_first = threading.Event()
+    mock_fetcher = MagicMock()
+
+    def fetch(_movie, temperature):
+        if temperature == 0.4:
+            # 先のバリエーションが後から完了する状況を作る
+            slow_first.wait(timeout=1.0)
+            return first
+        slow_first.set()
+        return second
+
+    mock_fetcher.fetch.side_effect = fetch
+    mock_evaluator = MagicMock()
+    mock_evaluator.evaluate.return_value = _speculative_evaluation(4.0, 4.0)
+    _patch_refiner_dependencies(mocker, mock_fetcher, mock_evaluator)
+
+    refiner = MetadataRefiner(api_key="test_api_key", rate_limit_sleep=0.0)
+    result = refiner.refine_speculative(
+        sample_movie_input,
+        variants=[FetchVariant(temperature=0.4), FetchVariant(temperature=1.0)],
+        threshold=3.5,
+    )
+
+    assert result.final_metadata.cast == ["俳優E"]
+
+
+def test_refine_passes_threshold_without_mutating_evaluator(
+    mocker, sample_movie_input, sample_movie_metadata, failing_evaluation
+):
+    """閾値を評価器・提案器の属性に書き込まず、呼び出しごとに渡すテスト"""
+    mock_fetcher = MagicMock()
+    mock_fetcher.fetch.return_value = sample_movie_metadata
+    mock_fetcher.fetch_with_improvement.return_value = sample_movie_metadata.model_copy(
+        update={"music": ["作曲家E"]}
+    )
+    mock_evaluator = MagicMock()
+    mock_evaluator.threshold = 4.0
+    mock_evaluator.evaluate.return_value = failing_evaluation
+    mock_proposer = _patch_refiner_dependencies(mocker, mock_fetcher, mock_evaluator)
+    mock_proposer.threshold = 4.0
+
+    refiner = MetadataRefiner(api_key="test_api_key", rate_limit_sleep=0.0)
+    refiner.refine(sample_movie_input, max_iterations=2, threshold=3.5)
+
+    assert mock_evaluator.threshold == 4.0
+    assert mock_proposer.threshold == 4.0
+    mock_evaluator.evaluate.assert_any_call(sample_movie_metadata, 1, 3.5)
+    assert mock_proposer.propose.call_args.args[3] == 3.5
+
+
+def test_refine_speculative_raises_when_all_candidates_fail(mocker, sample_movie_input):
+    """すべての候補が失敗した場合、例外を再送出するテスト"""
+    mock_fetcher = MagicMock()
+    mock_fetcher.fetch.side_effect = ServerError(
+        code=500, response_json={"error": {"message": "Internal server error"}}
+    )
+    _patch_refiner_dependencies(mocker, mock_fetcher, MagicMock())
+
+    refiner = MetadataRefiner(api_key="test_api_key", rate_limit_sleep=0.0)
+
+    with pytest.raises(ServerError):
+        refiner.refine_speculative(sample_movie_input, threshold=3.5)
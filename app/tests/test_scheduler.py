@@ -0,0 +1,113 @@
+"""schedulerモジュールのテスト"""
+
+from pathlib import Path
+
+import pytest
+
+from movie_metadata.models import MovieInput
+from movie_metadata.scheduler import (
+    DEFAULT_ITERATIONS,
+    DEFAULT_SECONDS_PER_ITERATION,
+    CostModel,
+    order_by_cost,
+)
+
+
+def _movie(title: str, release_date: str = "2001-07-20", country: str = "日本"):
+    return MovieInput(title=title, release_date=release_date, country=country)
+
+
+def test_predict_without_history_uses_defaults() -> None:
+    """実績がない場合は既定のイテレーション数と処理時間で予測するテスト"""
+    cost_model = CostModel(current_year=2026)
+
+    assert cost_model.predict(_movie("A")) == pytest.approx(
+        DEFAULT_ITERATIONS * DEFAULT_SECONDS_PER_ITERATION
+    )
+
+
+def test_predict_uses_moving_average_of_same_movie() -> None:
+    """同じ映画（表記揺れを含む）の実績は指数移動平均で予測するテスト"""
+    # Arrange
+    cost_model = CostModel(smoothing=0.5, current_year=2026)
+    cost_model.record(_movie("Spirited Away"), iterations=3, seconds=30.0)
+    cost_model.record(_movie("Spirited Away"), iterations=1, seconds=10.0)
+
+    # Act
+    predicted = cost_model.predict(_movie("ＳＰＩＲＩＴＥＤ　ａｗａｙ", "2001-01-01"))
+
+    # Assert
+    assert predicted == pytest.approx(20.0)
+
+
+def test_predict_unseen_movie_uses_country_average() -> None:
+    """実績のない映画は同じ制作国の平均イテレーション数で予測するテスト"""
+    # Arrange
+    cost_model = CostModel(current_year=2026)
+    cost_model.record(_movie("Anime", country="日本"), iterations=3, seconds=30.0)
+    cost_model.record(_movie("Blockbuster", country="USA"), iterations=1, seconds=10.0)
+
+    # Act
+    japan = cost_model.predict(_movie("Other Anime", country="日本"))
+    usa = cost_model.predict(_movie("Other Blockbuster", country="USA"))
+    france = cost_model.predict(_movie("Film", country="France"))
+
+    # Assert（1イテレーションあたり10秒）
+    assert japan == pytest.approx(30.0)
+    assert usa == pytest.approx(10.0)
+    assert france == pytest.approx(20.0)
+
+
+def test_predict_recent_release_adds_iterations() -> None:
+    """公開から間もない作品は多めに見積もり、上限で制限するテスト"""
+    cost_model = CostModel(max_iterations=3, current_year=2026)
+
+    recent = cost_model.predict(_movie("New", release_date="2026-03-01"))
+    old = cost_model.predict(_movie("Old", release_date="1990-03-01"))
+
+    assert recent > old
+    assert recent <= 3 * DEFAULT_SECONDS_PER_ITERATION
+
+
+def test_cost_model_persists_history(tmp_path: Path) -> None:
+    """実績を永続化し、次回の実行で読み込むテスト（壊れた行はスキップ）"""
+    # Arrange
+    path = tmp_path / "cost_history.jsonl"
+    cost_model = CostModel(path)
+    cost_model.record(_movie("A"), iterations=2, seconds=42.0)
+    cost_model.close()
+    with path.open("a", encoding="utf-8") as f:
+        f.write("broken\n")
+
+    # Act
+    reloaded = CostModel(path)
+
+    # Assert
+    assert len(reloaded) == 1
+    assert reloaded.predict(_movie("A")) == pytest.approx(42.0)
+
+
+def test_cost_model_invalid_smoothing() -> None:
+    """smoothingが範囲外の場合はValueErrorとなるテスト"""
+    with pytest.raises(ValueError, match="smoothing"):
+        CostModel(smoothing=0.0)
+
+
+def test_order_by_cost_longest_first_and_stable() -> None:
+    """予測処理時間の長い順に並べ、同じ予測値は元の順序を維持するテスト"""
+    # Arrange
+    cost_model = CostModel(current_year=2026)
+    cost_model.record(_movie("Fast"), iterations=1, seconds=5.0)
+    cost_model.record(_movie("Slow"), iterations=3, seconds=60.0)
+    movies = [_movie("Fast"), _movie("Unknown 1"), _movie("Slow"), _movie("Unknown 2")]
+
+    # Act
+    order = order_by_cost(movies, cost_model)
+
+    # Assert
+    assert [movies[position].title for position in order] == [
+        "Slow",
+        "Unknown 1",
+        "Unknown 2",
+        "Fast",
+    ]
@@ -0,0 +1,75 @@
+"""serialization.pyの単体テスト"""
+
+import io
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+from movie_metadata.models import MovieMetadata
+from movie_metadata.serialization import to_json_bytes, write_json, write_json_array
+
+
+def test_to_json_bytes_matches_model_dump(sample_movie_metadata: MovieMetadata):
+    """モデルのリストがmodel_dump()と同じ内容のJSONになることを確認"""
+    # Act
+    data = to_json_bytes([sample_movie_metadata, sample_movie_metadata])
+
+    # Assert
+    assert json.loads(data) == [sample_movie_metadata.model_dump()] * 2
+    assert "テスト映画".encode() in data
+    assert b"\n  " in data
+
+
+def test_to_json_bytes_compact(sample_movie_metadata: MovieMetadata):
+    """pretty=Falseの場合は改行・インデントなしで出力されることを確認"""
+    data = to_json_bytes(sample_movie_metadata, pretty=False)
+
+    assert b"\n" not in data
+    assert json.loads(data) == sample_movie_metadata.model_dump()
+
+
+def test_to_json_bytes_plain_dict_without_orjson():
+    """orjsonがない場合も辞書を変換できることを確認"""
+    with patch("movie_metadata.serialization.orjson", None):
+        data = to_json_bytes({"タイトル": [1, 2.5]}, pretty=False)
+
+    assert data == '{"タイトル":[1,2.5]}'.encode()
+
+
+def test_write_json_writes_file(tmp_path: Path, sample_movie_metadata: MovieMetadata):
+    """ファイルにJSONが書き込まれることを確認"""
+    path = tmp_path / "out.json"
+
+    write_json(path, [sample_movie_metadata])
+
+    loaded = json.loads(path.read_text(encoding="utf-8"))
+    assert loaded == [sample_movie_metadata.model_dump()]
+
+
+def test_write_json_array_matches_to_json_bytes(sample_movie_metadata: MovieMetadata):
+    """要素ごとの書き込みが一括変換と同じ出力になり、各要素の位置を返すことを確認"""
+    records = [
+        sample_movie_metadata,
+        sample_movie_metadata.model_copy(update={"title": "別の映画"}),
+    ]
+    for pretty in (True, False):
+        buffer = io.BytesIO()
+
+        spans = write_json_array(
+            buffer, (to_json_bytes(r, pretty=pretty) for r in records), pretty=pretty
+        )
+
+        data = buffer.getvalue()
+        assert data == to_json_bytes(records, pretty=pretty)
+        restored = [json.loads(data[start : start + size]) for start, size in spans]
+        assert restored == [r.model_dump() for r in records]
+
+
+def test_write_json_array_empty():
+    """要素がない場合は空の配列を書き込むことを確認"""
+    buffer = io.BytesIO()
+
+    spans = write_json_array(buffer, [], pretty=True)
+
+    assert spans == []
+    assert buffer.getvalue() == b"[]"
@@ -0,0 +1,206 @@
+"""shardingモジュールのテスト"""
+
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+
+from movie_metadata.models import DeduplicatedInput, MovieInput, MovieMetadata
+from movie_metadata.sharding import (
+    merge_shard_outputs,
+    parse_shard_args,
+    select_shard,
+    select_shard_deduplicated,
+    shard_of,
+    shard_path,
+    shard_suffix,
+    validate_shard,
+)
+
+
+@pytest.fixture
+def movies() -> list[MovieInput]:
+    """テスト用の映画リスト"""
+    return [
+        MovieInput(title=f"Movie {i}", release_date="2024-01-01", country="Japan")
+        for i in range(50)
+    ]
+
+
+def test_shards_partition_all_movies(movies: list[MovieInput]) -> None:
+    """各シャードの映画が重複なく全映画を網羅するテスト"""
+    # Act
+    shards = [select_shard(movies, index, 4) for index in range(4)]
+
+    # Assert
+    titles = [movie.title for shard in shards for movie in shard]
+    assert sorted(titles) == sorted(movie.title for movie in movies)
+    assert len(titles) == len(set(titles))
+    assert all(shards)
+
+
+def test_shard_of_is_stable_across_spelling_variants() -> None:
+    """表記揺れのある同じ映画が同じシャードに割り当てられるテスト"""
+    # Act
+    shards = {
+        shard_of("Spirited Away", "2001-07-20", 8),
+        shard_of(" spirited away", "2001-12-01", 8),
+        shard_of("ＳＰＩＲＩＴＥＤ ＡＷＡＹ", "2001", 8),
+    }
+
+    # Assert
+    assert len(shards) == 1
+    # ハッシュはプロセスに依存しない（固定値）
+    assert shard_of("Spirited Away", "2001-07-20", 8) == shards.pop()
+
+
+def test_select_shard_deduplicated_remaps_rows() -> None:
+    """重複を集約した入力のシャード選択で行と代表行の対応が維持されるテスト"""
+    # Arrange
+    movies = [
+        MovieInput(title=f"Movie {i}", release_date="2024-01-01", country="Japan")
+        for i in range(10)
+    ]
+    deduplicated = DeduplicatedInput(
+        movies=movies, row_to_movie=[0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 0, 5]
+    )
+
+    # Act
+    shard = select_shard_deduplicated(deduplicated, 1, 3)
+
+    # Assert
+    expected = select_shard(movies, 1, 3)
+    assert shard.movies == expected
+    rows = [shard.movies[index].title for index in shard.row_to_movie]
+    kept = [movies[i].title for i in deduplicated.row_to_movie]
+    assert rows == [title for title in kept if title in {m.title for m in expected}]
+
+
+@pytest.mark.parametrize(("index", "count"), [(0, 0), (-1, 2), (2, 2)])
+def test_validate_shard_rejects_invalid(index: int, count: int) -> None:
+    """不正なシャードの指定はValueErrorとなるテスト"""
+    with pytest.raises(ValueError, match="shard_"):
+        validate_shard(index, count)
+
+
+def test_parse_shard_args() -> None:
+    """コマンドライン引数を解析し、不正な指定はエラー終了するテスト"""
+    args = parse_shard_args("test", ["--shard-index", "2", "--shard-count", "4"])
+    assert (args.shard_index, args.shard_count) == (2, 4)
+    assert parse_shard_args("test").shard_count == 1
+
+    with pytest.raises(SystemExit):
+        parse_shard_args("test", ["--shard-index", "4", "--shard-count", "4"])
+
+
+def test_parse_shard_args_input_argument() -> None:
+    """input_argumentを指定した場合のみ --input を受け付けるテスト"""
+    args = parse_shard_args("test", ["--input", "-"], input_argument=True)
+    assert args.input == Path("-")
+    assert parse_shard_args("test", input_argument=True).input is None
+
+    with pytest.raises(SystemExit):
+        parse_shard_args("test", ["--input", "-"])
+
+
+def test_shard_suffix() -> None:
+    """シャードの接尾辞の形式のテスト"""
+    assert shard_suffix(0, 1) == ""
+    assert shard_suffix(3, 16) == "_shard-03-of-16"
+
+
+def test_shard_path() -> None:
+    """シャードごとのファイルのパスは拡張子の前に接尾辞を付与するテスト"""
+    path = Path("data/cache/evaluation_cache.jsonl")
+
+    assert shard_path(path, 0, 1) == path
+    assert shard_path(path, 1, 4) == Path(
+        "data/cache/evaluation_cache_shard-1-of-4.jsonl"
+    )
+
+
+def test_merge_metadata_outputs(
+    tmp_path: Path, sample_movie_metadata: MovieMetadata
+) -> None:
+    """メタデータの出力（JSON配列）を連結するテスト"""
+    # Arrange
+    movie_a = sample_movie_metadata.model_copy(update={"title": "A"}).model_dump()
+    movie_b = sample_movie_metadata.model_copy(update={"title": "B"}).model_dump()
+    first = tmp_path / "a.json"
+    first.write_text(json.dumps([movie_a]), encoding="utf-8")
+    second = tmp_path / "b.json.gz"
+    second.write_bytes(gzip.compress(json.dumps([movie_b]).encode()))
+
+    # Act
+    count = merge_shard_outputs([first, second], tmp_path / "merged.json")
+
+    # Assert
+    assert count == 2
+    merged = json.loads((tmp_path / "merged.json").read_text(encoding="utf-8"))
+    assert merged == [movie_a, movie_b]
+
+
+def test_merge_rejects_invalid_metadata(tmp_path: Path) -> None:
+    """メタデータとして不正なレコードを含む出力はValueErrorとなるテスト"""
+    # Arrange
+    path = tmp_path / "a.json"
+    path.write_text(json.dumps([{"title": "A"}]), encoding="utf-8")
+
+    # Act & Assert
+    with pytest.raises(ValueError):
+        merge_shard_outputs([path], tmp_path / "merged.json")
+    assert not (tmp_path / "merged.json").exists()
+
+
+def test_merge_batch_refinement_outputs(tmp_path: Path) -> None:
+    """バッチ結果の結果を連結し、集計を合計するテスト"""
+    # Arrange
+    paths = []
+    for index, (results, errors, seconds) in enumerate(
+        [([{"id": 1}], [], 10.0), ([{"id": 2}, {"id": 3}], [{"title": "X"}], 12.5)]
+    ):
+        path = tmp_path / f"shard{index}.json"
+        path.write_text(
+            json.dumps(
+                {
+                    "results": results,
+                    "total_count": len(results) + len(errors),
+                    "success_count": len(results),
+                    "error_count": len(errors),
+                    "errors": errors,
+                    "processing_time": seconds,
+                }
+            ),
+            encoding="utf-8",
+        )
+        paths.append(path)
+
+    # Act
+    merge_shard_outputs(paths, tmp_path / "merged.json.gz")
+
+    # Assert
+    merged = json.loads(gzip.decompress((tmp_path / "merged.json.gz").read_bytes()))
+    assert merged["results"] == [{"id": 1}, {"id": 2}, {"id": 3}]
+    assert merged["total_count"] == 4
+    assert merged["success_count"] == 3
+    assert merged["error_count"] == 1
+    assert merged["errors"] == [{"title": "X"}]
+    assert merged["processing_time"] == 12.5
+
+
+def test_merge_rejects_mixed_outputs(tmp_path: Path) -> None:
+    """種類の異なる出力の混在はValueErrorとなるテスト"""
+    # Arrange
+    metadata = tmp_path / "a.json"
+    metadata.write_text("[]", encoding="utf-8")
+    batch = tmp_path / "b.json"
+    batch.write_text('{"results": []}', encoding="utf-8")
+
+    # Act & Assert
+    with pytest.raises(ValueError, match="混在"):
+        merge_shard_outputs([metadata, batch], tmp_path / "merged.json")
+    # 書き込み途中で失敗しても不完全なファイルを残さない
+    assert sorted(tmp_path.iterdir()) == [metadata, batch]
+    with pytest.raises(ValueError, match="指定されていません"):
+        merge_shard_outputs([], tmp_path / "merged.json")